@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal, List, Optional, Dict
 
 class QualityReview(BaseModel):
@@ -31,3 +31,112 @@ class MetaEvaluation(BaseModel):
     process_score: int
     waste_detected: bool
     better_path_suggestion: str
+
+
+# --- Structured judgements (structured_llm.complete_json) ---
+# Optional fields default to None and are dropped from the returned dict,
+# so callers keep their own .get(key, default) fallbacks.
+# extra="allow": unknown keys are kept (evaluation_result / reflection are stored as-is).
+
+GoalType = Literal["achievable", "continuous", "directional", "exploratory", "meta"]
+Trend = Literal["improving", "stable", "degrading"]
+Score = Field(default=None, ge=0.0, le=1.0)
+
+
+class Judgement(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class GoalProposal(Judgement):
+    title: str
+    description: Optional[str] = None
+    goal_type: Optional[GoalType] = None
+    reasoning: Optional[str] = None
+    complexity_increase: Optional[str] = None
+    priority: Optional[Literal["high", "medium", "low"]] = None
+
+
+class GoalEvaluation(Judgement):
+    passed: bool
+    score: Optional[float] = Score
+    reasoning: Optional[str] = None
+    gaps: Optional[List[str]] = None
+    improvements: Optional[List[str]] = None
+
+
+class BinaryEvaluation(Judgement):
+    passed: bool
+    confidence: Optional[float] = Score
+    evidence: Optional[List[str]] = None
+
+
+class ScalarEvaluation(Judgement):
+    score: float = Field(ge=0.0, le=1.0)
+    evidence: Optional[List[str]] = None
+    gaps: Optional[List[str]] = None
+
+
+class TrendEvaluation(Judgement):
+    trend: Trend
+    score: Optional[float] = Score
+    reasoning: Optional[str] = None
+    evidence: Optional[List[str]] = None
+    recommendations: Optional[List[str]] = None
+
+
+class ImprovementGoals(Judgement):
+    improvement_goals: Optional[List[GoalProposal]] = None
+
+
+class NextGoalProposal(Judgement):
+    next_goal: Optional[GoalProposal] = None
+
+
+class SuccessReflection(Judgement):
+    why_success: Optional[str] = None
+    success_factors: Optional[List[str]] = None
+    lessons_learned: Optional[List[str]] = None
+    patterns: Optional[List[str]] = None
+    recommendations: Optional[List[str]] = None
+    should_generate_next: Optional[bool] = None
+    next_goal_idea: Optional[str] = None
+
+
+class FailureReflection(Judgement):
+    why_failed: Optional[str] = None
+    root_causes: Optional[List[str]] = None
+    mistakes: Optional[List[str]] = None
+    missing_resources: Optional[List[str]] = None
+    remediation: Optional[List[GoalProposal]] = None
+
+
+class ReflectionSummary(Judgement):
+    why: Optional[str] = None
+    lessons_learned: Optional[List[str]] = None
+    recommendations: Optional[List[str]] = None
+    next_goal: Optional[GoalProposal] = None
+    action: Optional[Literal["complete", "continue", "adjust", "mutate"]] = None
+
+
+class StrengthenMutation(Judgement):
+    new_title: Optional[str] = None
+    new_description: Optional[str] = None
+    new_completion_criteria: Optional[Dict] = None
+    new_domains: Optional[List[str]] = None
+    added_constraints: Optional[List[str]] = None
+    strengthening_explanation: Optional[str] = None
+
+
+class WeakenMutation(Judgement):
+    new_title: Optional[str] = None
+    new_description: Optional[str] = None
+    new_completion_criteria: Optional[Dict] = None
+    removed_domains: Optional[List[str]] = None
+    removed_constraints: Optional[List[str]] = None
+    weakening_explanation: Optional[str] = None
+
+
+class GoalTypeChange(Judgement):
+    new_type: GoalType
+    reasoning: Optional[str] = None
+    suggested_changes: Optional[List[str]] = None
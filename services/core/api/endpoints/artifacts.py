@@ -1,12 +1,8 @@
 """
 Artifacts API Endpoints Module
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional
-import uuid
-from sqlalchemy import select
-from database import AsyncSessionLocal
-from models import Artifact, Goal
 
 router = APIRouter(prefix="/artifacts", tags=["artifacts"])
 
@@ -48,41 +44,46 @@ async def get_artifact(artifact_id: str):
 
 
 @router.get("/{artifact_id}/content")
-async def get_artifact_content(artifact_id: str):
-    """Возвращает содержимое артефакта (для FILE type)"""
-    import os
-    
-    async with AsyncSessionLocal() as db:
-        stmt = select(Artifact).where(Artifact.id == uuid.UUID(artifact_id))
-        result = await db.execute(stmt)
-        artifact = result.scalar_one_or_none()
-        
-        if not artifact:
-            raise HTTPException(status_code=404, detail="Artifact not found")
-        
-        file_path = artifact.content_location
-        if not file_path or not os.path.exists(file_path):
-            return {
-                "status": "error",
-                "message": "File not found on disk",
-                "file_path": file_path
-            }
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return {
-                "status": "ok",
-                "artifact_id": artifact_id,
-                "file_path": file_path,
-                "file_content": content,
-                "file_size": len(content)
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Failed to read file: {str(e)}"
-            }
+async def get_artifact_content(artifact_id: str, preview_kb: Optional[int] = Query(None, ge=1, le=1024)):
+    """Возвращает превью содержимого артефакта (первые preview_kb KB)"""
+    from artifact_content import resolve_artifact_file, read_preview, ArtifactContentError
+
+    try:
+        file_path, st = await resolve_artifact_file(artifact_id)
+        preview = await read_preview(file_path, st.st_size, preview_kb)
+    except ArtifactContentError as e:
+        if e.status_code != 404 or e.file_path is None:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        return {
+            "status": "error",
+            "message": e.message,
+            "file_path": e.file_path
+        }
+    except OSError as e:
+        return {
+            "status": "error",
+            "message": f"Failed to read file: {str(e)}"
+        }
+
+    return {
+        "status": "ok",
+        "artifact_id": artifact_id,
+        "file_path": file_path,
+        **preview,
+        "download_url": f"/artifacts/{artifact_id}/download"
+    }
+
+
+@router.get("/{artifact_id}/download")
+async def download_artifact_content(artifact_id: str, request: Request, compress: bool = True):
+    """Отдаёт файл артефакта потоково (Range, ETag, gzip)"""
+    from artifact_content import resolve_artifact_file, build_download_response, ArtifactContentError
+
+    try:
+        file_path, st = await resolve_artifact_file(artifact_id)
+        return await build_download_response(request, file_path, st, compress=compress)
+    except ArtifactContentError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
 
 
 @router.get("/goals-without-artifacts")
@@ -6,6 +6,8 @@ API for Phase 1: Controlled MVP autonomous decision-making.
 Endpoints:
 - GET  /autonomy/state - Get all system state
 - GET  /autonomy/state/{entity_name} - Get specific entity
+- GET  /autonomy/state/{entity_name}/history - Windowed time series (raw/hour/day)
+- GET  /autonomy/state/{entity_name}/trend - Rolling aggregates over a window
 - POST /autonomy/state - Update entity manually
 - GET  /autonomy/policies - List all policies
 - POST /autonomy/policies - Add new policy
@@ -14,6 +16,7 @@ Endpoints:
 - POST /autonomy/actions/{action_id}/approve - Approve action
 - POST /autonomy/actions/{action_id}/execute - Execute action
 """
+from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any, List, Optional
 from uuid import UUID
@@ -100,6 +103,56 @@ async def get_entity_state(entity_name: str):
     }
 
 
+@router.get("/state/{entity_name}/history")
+async def get_entity_history(
+    entity_name: str,
+    days: int = 7,
+    resolution: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """
+    Time series of an entity from system_state_history.
+    
+    Window is [start, end) or the last `days`; points are bucketed
+    by resolution (raw, hour, day) in SQL.
+    """
+    from autonomy.state_history import state_history, RESOLUTIONS
+    
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"Invalid resolution: {resolution}")
+    
+    # system_state_history.ts is naive UTC
+    start, end = (
+        t.astimezone(timezone.utc).replace(tzinfo=None) if t and t.tzinfo else t
+        for t in (start, end)
+    )
+    start = start or (end or datetime.utcnow()) - timedelta(days=days)
+    points = await state_history.series(entity_name, start, end, resolution=resolution)
+    
+    return {
+        "status": "ok",
+        "entity_name": entity_name,
+        "resolution": resolution,
+        "start": start.isoformat(),
+        "end": end.isoformat() if end else None,
+        "points": points
+    }
+
+
+@router.get("/state/{entity_name}/trend")
+async def get_entity_trend(entity_name: str, days: int = 7):
+    """Rolling average, min/max and trend over the last `days`"""
+    from autonomy.state_history import state_history
+    
+    stats = await state_history.window_stats(entity_name, days=days)
+    
+    return {
+        "status": "ok",
+        **stats
+    }
+
+
 @router.post("/state")
 async def update_state(req: StateUpdateRequest):
     """Manually update a state entity"""
@@ -152,6 +205,7 @@ async def list_policies():
 async def create_policy(req: PolicyCreateRequest):
     """Create a new policy rule"""
     from autonomy.policy_engine import PolicyEngine, EntityType, ActionType
+    from autonomy.policy_conditions import PolicyConditionError
     
     engine = PolicyEngine()
     
@@ -165,16 +219,19 @@ async def create_policy(req: PolicyCreateRequest):
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid action_type: {req.action_type}")
     
-    rule = await engine.add_rule(
-        name=req.name,
-        entity_name=req.entity_name,
-        entity_type=entity_type,
-        condition_expression=req.condition_expression,
-        action_type=action_type,
-        action_payload=req.action_payload,
-        priority=req.priority,
-        cooldown_minutes=req.cooldown_minutes
-    )
+    try:
+        rule = await engine.add_rule(
+            name=req.name,
+            entity_name=req.entity_name,
+            entity_type=entity_type,
+            condition_expression=req.condition_expression,
+            action_type=action_type,
+            action_payload=req.action_payload,
+            priority=req.priority,
+            cooldown_minutes=req.cooldown_minutes
+        )
+    except PolicyConditionError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid condition_expression: {e}")
     
     return {
         "status": "ok",
@@ -2,58 +2,76 @@
 API Middleware Module
 Rate limiting, CORS, and security middleware
 """
-from fastapi import Request, HTTPException
+from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+import math
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 import os
 
+from api.rate_limit import RateLimiter, RateLimitPolicy
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
-    Simple in-memory rate limiting middleware.
-    For production, use Redis-backed rate limiting.
+    Token bucket rate limiting middleware.
+
+    O(1) per request and per client (see api.rate_limit). Limits are shared
+    across uvicorn workers when RATE_LIMIT_REDIS_URL (or redis_url) is set,
+    otherwise enforced per process.
     """
     
-    def __init__(self, app, requests_per_minute: int = 60):
+    def __init__(
+        self,
+        app,
+        requests_per_minute: int = 60,
+        burst: Optional[int] = None,
+        route_policies: Optional[Dict[str, RateLimitPolicy]] = None,
+        api_key_policies: Optional[Dict[str, RateLimitPolicy]] = None,
+        redis_url: Optional[str] = None,
+        max_clients: int = 10000,
+        exempt_paths: tuple = ("/health",),
+    ):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, List[float]] = {}
+        self.exempt_paths = set(exempt_paths)
+        self.limiter = RateLimiter(
+            default_policy=RateLimitPolicy.per_minute(requests_per_minute, burst),
+            route_policies=route_policies,
+            api_key_policies=api_key_policies,
+            redis_url=redis_url,
+            max_clients=max_clients,
+        )
     
     async def dispatch(self, request: Request, call_next):
         # Skip rate limiting for health checks
-        if request.url.path == "/health":
+        if request.url.path in self.exempt_paths:
             return await call_next(request)
         
         # Get client identifier (IP or API key)
-        client_id = request.headers.get("X-API-Key") or request.client.host
-        current_time = time.time()
+        api_key = request.headers.get("X-API-Key")
+        client_id = api_key or (request.client.host if request.client else "unknown")
         
-        # Clean old requests
-        if client_id in self.requests:
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if current_time - req_time < 60
-            ]
-        else:
-            self.requests[client_id] = []
+        decision = await self.limiter.acquire(request.url.path, client_id, api_key)
         
-        # Check rate limit
-        if len(self.requests[client_id]) >= self.requests_per_minute:
-            raise HTTPException(
+        if not decision.allowed:
+            # HTTPException raised inside BaseHTTPMiddleware is not routed to
+            # exception handlers, so build the 429 response directly
+            return JSONResponse(
                 status_code=429,
-                detail=f"Rate limit exceeded: {self.requests_per_minute} requests per minute"
+                content={"detail": f"Rate limit exceeded: {decision.limit} requests burst"},
+                headers={
+                    "Retry-After": str(math.ceil(decision.retry_after)),
+                    "X-RateLimit-Limit": str(decision.limit),
+                    "X-RateLimit-Remaining": "0",
+                },
             )
         
-        # Record request
-        self.requests[client_id].append(current_time)
-        
         response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(
-            max(0, self.requests_per_minute - len(self.requests[client_id]))
-        )
+        response.headers["X-RateLimit-Limit"] = str(decision.limit)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
         return response
 
 
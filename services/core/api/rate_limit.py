@@ -0,0 +1,221 @@
+"""
+API Rate Limiting Module
+Token bucket rate limiter with in-process and Redis-shared stores
+
+PRINCIPLE: O(1) time and memory per client per request
+- Same TokenBucket semantics as occp_gateway (capacity + refill rate)
+- Local store: LRU of buckets, idle buckets evicted (lossless - a bucket idle
+  longer than its refill time is full again, same as a new one)
+- Redis store: one hash per client, updated atomically by a Lua script,
+  shared by all uvicorn workers; keys expire once the bucket would be full
+"""
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from occp_gateway import TokenBucket
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    Token bucket policy.
+
+    Args:
+        capacity: Max burst size (requests)
+        refill_rate: Requests per second refilled
+    """
+    capacity: int
+    refill_rate: float
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: int, burst: Optional[int] = None) -> "RateLimitPolicy":
+        return cls(capacity=burst or requests_per_minute, refill_rate=requests_per_minute / 60.0)
+
+    @property
+    def refill_seconds(self) -> float:
+        """Time for an empty bucket to become full again."""
+        return self.capacity / self.refill_rate
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+
+class LocalBucketStore:
+    """
+    In-process bucket table (fast path).
+
+    OrderedDict keeps buckets in access order, so idle-eviction only looks
+    at the oldest entries: amortized O(1) per request.
+    """
+
+    def __init__(self, max_clients: int = 10000):
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[TokenBucket, RateLimitPolicy]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, policy: RateLimitPolicy) -> RateLimitDecision:
+        entry = self._buckets.get(key)
+        if entry is None or entry[1] != policy:
+            entry = (TokenBucket(policy.capacity, policy.refill_rate), policy)
+            self._buckets[key] = entry
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        bucket = entry[0]
+        allowed = bucket.allow()
+        return _decision(allowed, policy, bucket.tokens)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop buckets that have been idle long enough to refill completely."""
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        while self._buckets:
+            key, (bucket, policy) = next(iter(self._buckets.items()))
+            if now - bucket.last_refill < policy.refill_seconds:
+                break
+            self._buckets.popitem(last=False)
+            evicted += 1
+        return evicted
+
+
+# KEYS[1] = bucket key, ARGV = capacity, refill_rate
+# Returns {allowed, tokens_after}
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """
+    Redis-shared bucket table (all API workers see the same limits).
+
+    One round trip per request (EVALSHA). Buckets live in hashes with a TTL,
+    so idle clients are evicted by Redis itself.
+    """
+
+    KEY_PREFIX = "ratelimit:"
+
+    def __init__(self, redis_url: str):
+        import redis.asyncio as aioredis
+        self._redis = aioredis.from_url(redis_url)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_LUA)
+
+    async def acquire(self, key: str, policy: RateLimitPolicy) -> RateLimitDecision:
+        allowed, tokens = await self._script(
+            keys=[self.KEY_PREFIX + key],
+            args=[policy.capacity, policy.refill_rate],
+        )
+        return _decision(bool(int(allowed)), policy, float(tokens))
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def _decision(allowed: bool, policy: RateLimitPolicy, tokens: float) -> RateLimitDecision:
+    retry_after = 0.0 if allowed else (1.0 - tokens) / policy.refill_rate
+    return RateLimitDecision(
+        allowed=allowed,
+        limit=policy.capacity,
+        remaining=max(0, int(tokens)),
+        retry_after=retry_after,
+    )
+
+
+class RateLimiter:
+    """
+    Resolves the policy for a request and acquires a token.
+
+    Policy precedence: API key policy > longest matching route prefix > default.
+    Buckets are keyed per (scope, client) so per-route limits do not share
+    tokens with the default limit.
+    """
+
+    EVICT_INTERVAL_SECONDS = 30.0
+
+    def __init__(
+        self,
+        default_policy: RateLimitPolicy,
+        route_policies: Optional[Dict[str, RateLimitPolicy]] = None,
+        api_key_policies: Optional[Dict[str, RateLimitPolicy]] = None,
+        redis_url: Optional[str] = None,
+        max_clients: int = 10000,
+    ):
+        self.default_policy = default_policy
+        self.api_key_policies = api_key_policies or {}
+        # Longest prefix first - first match wins
+        self.route_policies = sorted(
+            (route_policies or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.local = LocalBucketStore(max_clients=max_clients)
+        self.shared: Optional[RedisBucketStore] = None
+        self._last_evict = time.monotonic()
+
+        redis_url = redis_url or os.getenv("RATE_LIMIT_REDIS_URL")
+        if redis_url:
+            try:
+                self.shared = RedisBucketStore(redis_url)
+            except ImportError:
+                logger.warning("rate_limit_redis_unavailable", reason="redis package not installed")
+
+    def resolve(self, path: str, api_key: Optional[str]) -> Tuple[str, RateLimitPolicy]:
+        """Return (scope, policy) for a request."""
+        if api_key and api_key in self.api_key_policies:
+            return f"key:{api_key}", self.api_key_policies[api_key]
+        for prefix, policy in self.route_policies:
+            if path.startswith(prefix):
+                return f"route:{prefix}", policy
+        return "default", self.default_policy
+
+    async def acquire(self, path: str, client_id: str, api_key: Optional[str] = None) -> RateLimitDecision:
+        scope, policy = self.resolve(path, api_key)
+        key = f"{scope}:{client_id}"
+
+        if self.shared is not None:
+            try:
+                return await self.shared.acquire(key, policy)
+            except Exception as e:
+                # Availability over strictness: fall back to per-process limits
+                logger.warning("rate_limit_redis_error", error=str(e))
+
+        self._maybe_evict()
+        return self.local.acquire(key, policy)
+
+    def _maybe_evict(self):
+        now = time.monotonic()
+        if now - self._last_evict >= self.EVICT_INTERVAL_SECONDS:
+            self._last_evict = now
+            self.local.evict_idle(now)
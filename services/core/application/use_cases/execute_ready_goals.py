@@ -5,9 +5,12 @@ CRITICAL: This is the ONLY allowed entry point for goal execution.
 
 ARCHITECTURE v3.0:
     PHASE 1: COLLECT DECISIONS (no mutations)
-        - Select goals
-        - Execute via pure function
-        - Collect ExecutionIntent list
+        - Select goals (one wave = wave_size goals); a leased selector
+          (infrastructure.goal_work_queue) claims them so that other
+          replicas skip them, leases are released after PHASE 2
+        - Execute via pure function, up to `concurrency` goals at a time,
+          each with its own read-only session
+        - Collect ExecutionIntent list (in selection order)
 
     PHASE 1.5: ARBITRATE (new!)
         - Estimate features (utility, cost, risk)
@@ -22,6 +25,9 @@ ARCHITECTURE v3.0:
         - Publish immutable events
         - Handlers decide what to do
 """
+import asyncio
+import logging
+import os
 from typing import TYPE_CHECKING
 from dataclasses import dataclass
 from uuid import UUID
@@ -31,6 +37,12 @@ if TYPE_CHECKING:
     from infrastructure.uow import UnitOfWork
 
 
+# Wave = goals selected per run; concurrency = goals executed at once in PHASE 1.
+# concurrency=1 keeps the sequential single-session behaviour.
+DEFAULT_WAVE_SIZE = int(os.getenv("EXECUTE_WAVE_SIZE", "10"))
+DEFAULT_CONCURRENCY = int(os.getenv("EXECUTE_CONCURRENCY", "5"))
+
+
 @dataclass
 class ExecutionResult:
     """Result of batch execution with arbitration metrics"""
@@ -116,22 +128,62 @@ class ExecuteReadyGoalsUseCase:
         bulk_engine,
         arbitrator,
         capital_allocator,
-        event_bus=None
+        event_bus=None,
+        wave_size: int = DEFAULT_WAVE_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        read_uow_factory=None,
+        selector: GoalSelector | None = None,
+        goal_repository=None
     ):
         self._uow_factory = uow_factory
         self._executor = executor
         self._bulk_engine = bulk_engine
         self._arbitrator = arbitrator
         self._capital_allocator = capital_allocator
-        self._selector = GoalSelector()
+        self._selector = selector or GoalSelector()
         self._event_bus = event_bus
+        self._wave_size = wave_size
+        self._concurrency = max(1, concurrency)
+
+        self._read_uow_factory = read_uow_factory
+
+        if goal_repository is None:
+            from infrastructure.uow import GoalRepository
+            goal_repository = GoalRepository()
+        self._repo = goal_repository
+
+    def _open_read_uow(self):
+        if self._read_uow_factory is None:
+            # Use READ-ONLY UoW for execution (hard guarantee)
+            from infrastructure.uow import get_uow
+            return get_uow(read_only=True)
+        return self._read_uow_factory()
+
+    async def _release(self, goal_ids: list[UUID]) -> None:
+        release = getattr(self._selector, "release", None)
+        if release is None or not goal_ids:
+            return
+        try:
+            await release(goal_ids)
+        except Exception as e:
+            # Not fatal: expired leases are claimable again anyway
+            logging.getLogger(__name__).warning(f"goal_lease_release_failed: {e}")
 
     async def run(
         self,
         *,
         limit: int | None = None,
-        actor: str = "system"
+        actor: str = "system",
+        concurrency: int | None = None
     ) -> ExecutionResult:
+        """
+        Execute one wave.
+
+        Args:
+            limit: Goals per wave (default: wave_size)
+            actor: Who triggered the run
+            concurrency: Override for PHASE 1 concurrency
+        """
         from application.events.execution_events import (
             GoalExecutionFinished,
             BatchExecutionCompleted
@@ -146,169 +198,209 @@ class ExecuteReadyGoalsUseCase:
             pass  # Not in test mode
 
         start_time = datetime.utcnow()
+        wave_size = limit if limit is not None else self._wave_size
+        concurrency = max(1, concurrency or self._concurrency)
 
         # =====================================================================
         # PHASE 1: COLLECT DECISIONS (read-only execution)
         # =====================================================================
         intents: list[ExecutionIntent] = []
 
-        # Use READ-ONLY UoW for execution (hard guarantee)
-        from infrastructure.uow import get_uow
-        readonly_uow_factory = lambda: get_uow(read_only=True)
-
-        async with readonly_uow_factory() as read_uow:
-            # Select candidates
-            goal_ids = await self._selector.select_ready(read_uow, limit)
+        goal_ids: list[UUID] = []
+        try:
+            async with self._open_read_uow() as read_uow:
+                # Select candidates
+                goal_ids = await self._selector.select_ready(read_uow, wave_size)
+
+                if not goal_ids:
+                    return ExecutionResult.empty()
+
+                if concurrency == 1:
+                    # Sequential: all goals share the selection session
+                    for goal_id in goal_ids:
+                        intent = await self._collect_intent(read_uow, goal_id)
+                        if intent is not None:
+                            intents.append(intent)
+
+            if concurrency > 1:
+                intents = await self._collect_intents_concurrently(goal_ids, concurrency)
+
+            # =====================================================================
+            # PHASE 1.5: ARBITRATE (estimate → policy → select → log)
+            # =====================================================================
+            # Get current budget
+            budget = await self._capital_allocator.current_budget()
+
+            # Run arbitration pipeline
+            arbitration_result = await self._arbitrator.evaluate(
+                intents=intents,
+                budget=budget
+            )
 
-            if not goal_ids:
-                return ExecutionResult.empty()
+            # Extract selected intents for application
+            selected_intents = [s.intent for s in arbitration_result.selected]
+
+            logger = logging.getLogger("arbitration")
+            logger.info(
+                f"arbitration_completed: total={len(intents)}, "
+                f"selected={len(selected_intents)}, "
+                f"rejected={len(arbitration_result.rejected)}, "
+                f"selection_rate={arbitration_result.selection_rate:.2f}, "
+                f"budget_spent={arbitration_result.total_cost}, "
+                f"budget_remaining={arbitration_result.budget_remaining}"
+            )
 
-            # Execute goals (pure function, no mutations)
-            for goal_id in goal_ids:
-                try:
-                    # Read goal snapshot for version check
-                    from infrastructure.uow import GoalRepository
-                    repo = GoalRepository()
-                    goal_snapshot = await repo.get(read_uow.session, goal_id)
-
-                    if not goal_snapshot:
-                        # Goal disappeared between selection and execution
-                        continue
-
-                    # Execute with pure function
-                    outcome = await self._executor.execute_goal(
-                        goal_id=str(goal_id),
-                        uow=read_uow  # Read-only access
-                    )
+            # =====================================================================
+            # PHASE 2: APPLY BATCH ATOMICALLY (ONE transaction)
+            # =====================================================================
+            # Write barrier: Allow writes from this point
+            try:
+                from tests.stress.write_barrier import WRITE_BARRIER
+                WRITE_BARRIER.allow()
+            except ImportError:
+                pass
+
+            async with self._uow_factory() as write_uow:
+                apply_result = await self._bulk_engine.apply_execution_intents(
+                    uow=write_uow,
+                    intents=selected_intents,  # ← ONLY selected intents applied
+                    actor=actor
+                )
+                # ← ONE COMMIT for entire batch here
 
-                    # Convert outcome → intent (with optimistic lock)
-                    from application.execution.intents import ArtifactData
+            # =====================================================================
+            # PHASE 3: EMIT FACTS (after commit, outside transaction)
+            # =====================================================================
+            end_time = datetime.utcnow()
+            execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
 
-                    artifact_data_list = [
-                        ArtifactData(
-                            artifact_type=a.get("type", "FILE"),
-                            content_kind=a.get("content_kind", "file"),
-                            content_location=a.get("content_location", ""),
-                            verification_rule=a.get("verification_rule")
-                        )
-                        for a in outcome.artifacts
-                    ]
-
-                    intents.append(
-                        ExecutionIntent(
-                            goal_id=goal_id,
-                            expected_version=goal_snapshot.updated_at,  # Optimistic lock
-                            outcome=outcome.status,
-                            confidence=outcome.confidence,
-                            attempts=outcome.attempts,
-                            artifacts=artifact_data_list,
-                            error=None
+            if self._event_bus:
+                # Publish individual completion events (for SELECTED intents only)
+                for intent in selected_intents:
+                    await self._event_bus.publish(
+                        GoalExecutionFinished(
+                            goal_id=intent.goal_id,
+                            status=intent.outcome,
+                            confidence=intent.confidence,
+                            attempts=intent.attempts,
+                            artifacts_registered=len(intent.artifacts),
+                            finished_at=datetime.utcnow(),
+                            error_message=intent.error
                         )
                     )
 
-                except Exception as e:
-                    import logging
-                    logger = logging.getLogger("use_cases")
-                    logger.error(
-                        f"execution_failed goal_id={str(goal_id)[:8]} error={str(e)[:100]}"
-                    )
+                # Publish batch completion event
+                batch_event = BatchExecutionCompleted(
+                    total_goals=len(selected_intents),  # ← Selected count, not total
+                    completed=apply_result["applied"],
+                    failed=apply_result["failed"],
+                    started_at=start_time,
+                    finished_at=end_time,
+                    execution_time_ms=execution_time_ms
+                )
+                await self._event_bus.publish(batch_event)
 
-                    # Still create intent for error (without version since goal might not exist)
-                    intents.append(
-                        ExecutionIntent(
-                            goal_id=goal_id,
-                            expected_version=datetime.utcnow(),  # Dummy version for error
-                            outcome="error",
-                            confidence=0.0,
-                            attempts=0,
-                            artifacts=[],
-                            error=str(e)[:100]
-                        )
-                    )
+            return ExecutionResult(
+                total_found=len(intents),
+                completed=apply_result["applied"],
+                failed=apply_result["failed"],
+                skipped=apply_result.get("skipped", 0),
+                execution_time_ms=execution_time_ms,
+                arbitration_selected=len(selected_intents),
+                arbitration_rejected=len(arbitration_result.rejected),
+                arbitration_selection_rate=arbitration_result.selection_rate
+            )
+        finally:
+            # Leased selector: unfinished goals go back to the queue
+            await self._release(goal_ids)
 
-        # =====================================================================
-        # PHASE 1.5: ARBITRATE (estimate → policy → select → log)
-        # =====================================================================
-        # Get current budget
-        budget = await self._capital_allocator.current_budget()
+    # =========================================================================
+    # PHASE 1 helpers
+    # =========================================================================
 
-        # Run arbitration pipeline
-        arbitration_result = await self._arbitrator.evaluate(
-            intents=intents,
-            budget=budget
-        )
+    async def _collect_intents_concurrently(
+        self,
+        goal_ids: list[UUID],
+        concurrency: int
+    ) -> list:
+        """
+        Run PHASE 1 for a wave with at most `concurrency` goals in flight.
+
+        Each goal gets its own read-only session (an AsyncSession can not be
+        shared by concurrent tasks). Intents keep selection order, so
+        arbitration sees the same input as in sequential mode.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def collect(goal_id: UUID):
+            async with semaphore:
+                try:
+                    async with self._open_read_uow() as goal_uow:
+                        return await self._collect_intent(goal_uow, goal_id)
+                except Exception as e:
+                    # Session could not be opened/closed - same as an execution error
+                    return self._error_intent(goal_id, e)
 
-        # Extract selected intents for application
-        selected_intents = [s.intent for s in arbitration_result.selected]
-
-        import logging
-        logger = logging.getLogger("arbitration")
-        logger.info(
-            f"arbitration_completed: total={len(intents)}, "
-            f"selected={len(selected_intents)}, "
-            f"rejected={len(arbitration_result.rejected)}, "
-            f"selection_rate={arbitration_result.selection_rate:.2f}, "
-            f"budget_spent={arbitration_result.total_cost}, "
-            f"budget_remaining={arbitration_result.budget_remaining}"
-        )
+        results = await asyncio.gather(*(collect(goal_id) for goal_id in goal_ids))
+        return [intent for intent in results if intent is not None]
+
+    async def _collect_intent(self, read_uow: "UnitOfWork", goal_id: UUID):
+        """Execute one goal (pure function) and convert the outcome to an intent."""
+        from application.execution.intents import ExecutionIntent, ArtifactData
 
-        # =====================================================================
-        # PHASE 2: APPLY BATCH ATOMICALLY (ONE transaction)
-        # =====================================================================
-        # Write barrier: Allow writes from this point
         try:
-            from tests.stress.write_barrier import WRITE_BARRIER
-            WRITE_BARRIER.allow()
-        except ImportError:
-            pass
+            # Read goal snapshot for version check
+            goal_snapshot = await self._repo.get(read_uow.session, goal_id)
 
-        async with self._uow_factory() as write_uow:
-            apply_result = await self._bulk_engine.apply_execution_intents(
-                uow=write_uow,
-                intents=selected_intents,  # ← ONLY selected intents applied
-                actor=actor
+            if not goal_snapshot:
+                # Goal disappeared between selection and execution
+                return None
+
+            # Execute with pure function
+            outcome = await self._executor.execute_goal(
+                goal_id=str(goal_id),
+                uow=read_uow  # Read-only access
             )
-            # ← ONE COMMIT for entire batch here
 
-        # =====================================================================
-        # PHASE 3: EMIT FACTS (after commit, outside transaction)
-        # =====================================================================
-        if self._event_bus:
-            # Publish individual completion events (for SELECTED intents only)
-            for intent in selected_intents:
-                await self._event_bus.publish(
-                    GoalExecutionFinished(
-                        goal_id=intent.goal_id,
-                        status=intent.outcome,
-                        confidence=intent.confidence,
-                        attempts=intent.attempts,
-                        artifacts_registered=len(intent.artifacts),
-                        finished_at=datetime.utcnow(),
-                        error_message=intent.error
-                    )
+            # Convert outcome → intent (with optimistic lock)
+            artifact_data_list = [
+                ArtifactData(
+                    artifact_type=a.get("type", "FILE"),
+                    content_kind=a.get("content_kind", "file"),
+                    content_location=a.get("content_location", ""),
+                    verification_rule=a.get("verification_rule")
                 )
+                for a in outcome.artifacts
+            ]
+
+            return ExecutionIntent(
+                goal_id=goal_id,
+                expected_version=goal_snapshot.updated_at,  # Optimistic lock
+                outcome=outcome.status,
+                confidence=outcome.confidence,
+                attempts=outcome.attempts,
+                artifacts=artifact_data_list,
+                error=None
+            )
 
-            # Publish batch completion event
-            end_time = datetime.utcnow()
-            execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        except Exception as e:
+            return self._error_intent(goal_id, e)
 
-            batch_event = BatchExecutionCompleted(
-                total_goals=len(selected_intents),  # ← Selected count, not total
-                completed=apply_result["applied"],
-                failed=apply_result["failed"],
-                started_at=start_time,
-                finished_at=end_time,
-                execution_time_ms=execution_time_ms
-            )
-            await self._event_bus.publish(batch_event)
-
-        return ExecutionResult(
-            total_found=len(intents),
-            completed=apply_result["applied"],
-            failed=apply_result["failed"],
-            skipped=apply_result.get("skipped", 0),
-            execution_time_ms=execution_time_ms,
-            arbitration_selected=len(selected_intents),
-            arbitration_rejected=len(arbitration_result.rejected),
-            arbitration_selection_rate=arbitration_result.selection_rate
+    def _error_intent(self, goal_id: UUID, error: Exception):
+        from application.execution.intents import ExecutionIntent
+
+        logger = logging.getLogger("use_cases")
+        logger.error(
+            f"execution_failed goal_id={str(goal_id)[:8]} error={str(error)[:100]}"
+        )
+
+        # Still create intent for error (without version since goal might not exist)
+        return ExecutionIntent(
+            goal_id=goal_id,
+            expected_version=datetime.utcnow(),  # Dummy version for error
+            outcome="error",
+            confidence=0.0,
+            attempts=0,
+            artifacts=[],
+            error=str(error)[:100]
         )
@@ -0,0 +1,333 @@
+"""
+ARTIFACT CONTENT - Non-blocking serving of artifact files
+=========================================================
+
+Two access paths for FILE artifacts:
+
+  preview   GET /artifacts/{id}/content   → JSON, first N KB only
+  download  GET /artifacts/{id}/download  → streamed bytes
+
+Download path:
+- File is read in chunks in the threadpool - the event loop never blocks
+  on disk I/O and memory per request is O(chunk), not O(file)
+- HTTP Range (single range) → 206 / 416, If-Range honoured
+- Strong ETag = sha256 of the content; computed once per (path, size,
+  mtime) in the threadpool and cached, concurrent first requests share
+  one hash computation. If-None-Match → 304
+- Optional gzip for text-like content when the client accepts it
+  (never combined with Range)
+- Size limit: ARTIFACT_MAX_DOWNLOAD_MB → 413
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import asyncio
+import codecs
+import hashlib
+import mimetypes
+import os
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+CHUNK_SIZE = 256 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+PREVIEW_DEFAULT_KB = int(os.getenv("ARTIFACT_PREVIEW_KB", "256"))
+PREVIEW_MAX_KB = 1024
+MAX_DOWNLOAD_BYTES = int(os.getenv("ARTIFACT_MAX_DOWNLOAD_MB", "1024")) * 1024 * 1024
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+GZIP_TYPES = ("text/", "application/json", "application/xml", "application/javascript")
+
+ETAG_CACHE_SIZE = 1024
+
+
+class ArtifactContentError(Exception):
+    """Content can not be served; status_code maps to the HTTP response."""
+
+    def __init__(self, status_code: int, message: str, file_path: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.file_path = file_path
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+# =============================================================================
+# Lookup
+# =============================================================================
+
+async def resolve_artifact_file(artifact_id: str) -> Tuple[str, os.stat_result]:
+    """
+    Artifact id → (path, stat) of its file on disk.
+
+    Only the content_location column is loaded.
+    """
+    from sqlalchemy import select
+    from database import AsyncSessionLocal
+    from models import Artifact
+
+    try:
+        artifact_uuid = uuid.UUID(artifact_id)
+    except ValueError:
+        raise ArtifactContentError(400, "Invalid artifact_id format")
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Artifact.content_location).where(Artifact.id == artifact_uuid)
+        )
+        row = result.first()
+
+    if row is None:
+        raise ArtifactContentError(404, "Artifact not found")
+
+    file_path = row.content_location
+    if not file_path:
+        raise ArtifactContentError(404, "No file location for this artifact")
+
+    try:
+        st = await asyncio.to_thread(os.stat, file_path)
+    except OSError:
+        raise ArtifactContentError(404, "File not found on disk", file_path)
+    if not os.path.isfile(file_path):
+        raise ArtifactContentError(404, "Artifact location is not a regular file", file_path)
+
+    return file_path, st
+
+
+# =============================================================================
+# Preview
+# =============================================================================
+
+def clamp_preview_kb(preview_kb: Optional[int]) -> int:
+    if preview_kb is None:
+        preview_kb = PREVIEW_DEFAULT_KB
+    return max(1, min(preview_kb, PREVIEW_MAX_KB))
+
+
+def _read_head(path: str, max_bytes: int) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(max_bytes)
+
+
+async def read_preview(path: str, file_size: int, preview_kb: Optional[int] = None) -> Dict:
+    """First N KB of the file, decoded as UTF-8 (invalid bytes replaced)."""
+    max_bytes = clamp_preview_kb(preview_kb) * 1024
+    head = await asyncio.to_thread(_read_head, path, max_bytes)
+    truncated = file_size > len(head)
+    # Incremental decoder drops a multi-byte character split by the cut
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    return {
+        "file_content": decoder.decode(head, final=not truncated),
+        "file_size": file_size,
+        "preview_bytes": len(head),
+        "truncated": truncated,
+    }
+
+
+# =============================================================================
+# ETag
+# =============================================================================
+
+_etag_cache: "OrderedDict[Tuple[str, int, int], asyncio.Task]" = OrderedDict()
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+async def file_etag(path: str, st: os.stat_result) -> str:
+    """
+    Content-hash ETag, cached per (path, size, mtime_ns).
+
+    The cache holds tasks, so concurrent requests for a new file await a
+    single hash computation.
+    """
+    key = (path, st.st_size, st.st_mtime_ns)
+    task = _etag_cache.get(key)
+    if task is None:
+        task = asyncio.ensure_future(asyncio.to_thread(_hash_file, path))
+        _etag_cache[key] = task
+        if len(_etag_cache) > ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    else:
+        _etag_cache.move_to_end(key)
+
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        _etag_cache.pop(key, None)
+        raise
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefix and the -gzip variant suffix are ignored
+    base = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        value = candidate.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        value = value.strip('"')
+        if value.endswith("-gzip"):
+            value = value[:-5]
+        if value == base:
+            return True
+    return False
+
+
+# =============================================================================
+# Range
+# =============================================================================
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end).
+
+    Returns None when the header is absent, malformed or multi-range
+    (the full body is served - allowed by RFC 9110).
+    Raises RangeNotSatisfiable when the range lies outside the file.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    start_s, end_s = (part.strip() for part in spec.split("-", 1))
+    try:
+        if start_s == "":
+            # Suffix range: last N bytes
+            length = int(end_s)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - length), size - 1
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start < 0 or end < start:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+# =============================================================================
+# Streaming
+# =============================================================================
+
+async def iter_file(path: str, start: int = 0, end: Optional[int] = None,
+                    chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield bytes [start, end] (inclusive) reading in the threadpool."""
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        if start:
+            await asyncio.to_thread(f.seek, start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = await asyncio.to_thread(f.read, size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def iter_gzip(chunks: AsyncIterator[bytes], level: int = GZIP_LEVEL) -> AsyncIterator[bytes]:
+    """Gzip a byte stream chunk by chunk (compression runs in the threadpool)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    async for chunk in chunks:
+        out = await asyncio.to_thread(compressor.compress, chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        if parts[0].lower() in ("gzip", "*"):
+            return not any(p.replace(" ", "") in ("q=0", "q=0.0") for p in parts[1:])
+    return False
+
+
+def _is_compressible(media_type: str) -> bool:
+    return media_type.startswith(GZIP_TYPES)
+
+
+async def build_download_response(request, path: str, st: os.stat_result, compress: bool = True):
+    """
+    Streaming response for an artifact file honouring Range, ETag and gzip.
+    """
+    from fastapi.responses import Response, StreamingResponse
+
+    size = st.st_size
+    if size > MAX_DOWNLOAD_BYTES:
+        raise ArtifactContentError(413, f"Artifact exceeds download limit of {MAX_DOWNLOAD_BYTES} bytes", path)
+
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    etag = await file_etag(path, st)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'inline; filename="{os.path.basename(path)}"',
+        "Vary": "Accept-Encoding",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range and if_range.strip() != etag:
+        range_header = None  # File changed since the client's partial copy
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is not None:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            iter_file(path, start, end), status_code=206, media_type=media_type, headers=headers
+        )
+
+    if (compress and size >= GZIP_MIN_BYTES and _is_compressible(media_type)
+            and _accepts_gzip(request.headers.get("accept-encoding"))):
+        headers["ETag"] = etag[:-1] + '-gzip"'
+        headers["Content-Encoding"] = "gzip"
+        # Ranges address the identity representation only
+        headers.pop("Accept-Ranges")
+        return StreamingResponse(iter_gzip(iter_file(path)), media_type=media_type, headers=headers)
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(iter_file(path), media_type=media_type, headers=headers)
@@ -21,6 +21,7 @@ from database import AsyncSessionLocal
 from models import Artifact, Goal
 from artifact_verifier import artifact_verifier, VerificationResult
 from infrastructure.uow import UnitOfWork
+from change_feed import publish_in_session, ARTIFACT_REGISTERED
 
 
 class ArtifactRegistry:
@@ -159,6 +160,15 @@ class ArtifactRegistry:
         await uow.session.flush()
         await uow.session.refresh(artifact)
 
+        # Delivered to /ui/stream on COMMIT only
+        await publish_in_session(uow.session, ARTIFACT_REGISTERED, {
+            "artifactId": str(artifact.id),
+            "goalId": goal_id,
+            "artifactType": artifact_type,
+            "contentKind": content_kind,
+            "skillName": skill_name,
+        })
+
         verification_results = []
         verification_status = "pending"
 
@@ -250,7 +260,8 @@ class ArtifactRegistry:
             "content_location": artifact.content_location
         }
 
-        verification_results = artifact_verifier.verify(artifact_data)
+        # File reads/CSV parsing off the event loop
+        verification_results = await artifact_verifier.verify_async(artifact_data)
         results_dict = [r.to_dict() for r in verification_results]
         overall_status = artifact_verifier.get_overall_status(verification_results)
 
@@ -285,24 +296,58 @@ class ArtifactRegistry:
             result = await db.execute(stmt)
             artifacts = result.scalars().all()
 
-            return [
-                {
-                    "id": str(a.id),
-                    "type": a.type,
-                    "content_kind": a.content_kind,
-                    "content_location": a.content_location,
-                    "skill_name": a.skill_name,
-                    "agent_role": a.agent_role,
-                    "domains": a.domains,
-                    "tags": a.tags,
-                    "language": a.language,
-                    "verification_status": a.verification_status,
-                    "verification_results": a.verification_results,
-                    "reusable": a.reusable,
-                    "created_at": a.created_at.isoformat()
-                }
-                for a in artifacts
-            ]
+            return [self._to_dict(a) for a in artifacts]
+
+    async def list_by_goals(self, goal_ids: List[str], session=None) -> Dict[str, List[Dict]]:
+        """
+        Возвращает артефакты нескольких целей ОДНИМ запросом
+
+        Args:
+            goal_ids: ID целей
+            session: Сессия вызывающего (UoW); если None - открывается своя
+
+        Returns:
+            {goal_id: [артефакты, новые первыми]} - для каждой запрошенной цели
+        """
+        grouped: Dict[str, List[Dict]] = {str(goal_id): [] for goal_id in goal_ids}
+        if not grouped:
+            return grouped
+
+        stmt = (
+            select(Artifact)
+            .where(Artifact.goal_id.in_([uuid.UUID(goal_id) for goal_id in grouped]))
+            .order_by(Artifact.created_at.desc())
+        )
+
+        if session is not None:
+            result = await session.execute(stmt)
+            artifacts = result.scalars().all()
+        else:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(stmt)
+                artifacts = result.scalars().all()
+
+        for a in artifacts:
+            grouped[str(a.goal_id)].append(self._to_dict(a))
+        return grouped
+
+    @staticmethod
+    def _to_dict(a: Artifact) -> Dict:
+        return {
+            "id": str(a.id),
+            "type": a.type,
+            "content_kind": a.content_kind,
+            "content_location": a.content_location,
+            "skill_name": a.skill_name,
+            "agent_role": a.agent_role,
+            "domains": a.domains,
+            "tags": a.tags,
+            "language": a.language,
+            "verification_status": a.verification_status,
+            "verification_results": a.verification_results,
+            "reusable": a.reusable,
+            "created_at": a.created_at.isoformat() if a.created_at else None
+        }
 
     async def get(self, artifact_id: str) -> Optional[Dict]:
         """
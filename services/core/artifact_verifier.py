@@ -1,5 +1,5 @@
 """
-ARTIFACT VERIFIER - v1.1
+ARTIFACT VERIFIER - v1.2
 Code-based verification of artifacts (NOT LLM-based)
 
 Key principle: Code decides, not LLM suggestions
@@ -8,13 +8,38 @@ v1.1 Changes:
 - Support for absolute paths and /tmp/artifacts
 - Smart content_kind detection for FILE artifacts
 - Better handling of inline content (not file paths)
+
+v1.2 Changes:
+- File checks stream the file in chunks and stop as soon as the
+  minimum-length checks are satisfied (.json files are still parsed whole)
+- CSV rows counted with csv.reader instead of pandas.read_csv
+- File results cached by (path, size, mtime_ns): a hit does no file I/O.
+  On a miss the content fingerprint (sha256 of the file, or of head+tail
+  for big files) lets a file rewritten with the same content reuse its
+  results
+- verify_async() / verify_many() run checks in a thread pool
 """
+import asyncio
+import csv
+import hashlib
 import os
 import json
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 
 
+READ_CHUNK_CHARS = 64 * 1024
+CSV_CHUNK_BYTES = 1024 * 1024
+FINGERPRINT_FULL_BYTES = 1024 * 1024  # files up to 1MB are hashed whole
+FINGERPRINT_SAMPLE_BYTES = 64 * 1024  # bigger files: head + tail
+VERIFY_CACHE_SIZE = int(os.getenv("ARTIFACT_VERIFY_CACHE_SIZE", "10000"))
+VERIFY_WORKERS = int(os.getenv("ARTIFACT_VERIFY_WORKERS", "8"))
+
+
 class VerificationResult:
     """Результат одной проверки"""
     def __init__(self, name: str, passed: bool, details: Optional[str] = None):
@@ -30,6 +55,162 @@ class VerificationResult:
         }
 
 
+def _scan_text(path: str, min_length: int, min_stripped: Optional[int] = None) -> tuple[int, bool, bool]:
+    """
+    Stream a UTF-8 text file until the length checks are decided.
+
+    Returns (length, exhausted, stripped_ok):
+        length       - characters read (the full length if exhausted)
+        exhausted    - whole file was read
+        stripped_ok  - len(content.strip()) >= min_stripped
+
+    Stops once length >= min_length and stripped_ok, so decode errors
+    after that point are not detected (they were with a full read()).
+    """
+    length = 0
+    first_visible = None
+    stripped_ok = min_stripped is None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_CHARS)
+            if not chunk:
+                return length, True, stripped_ok
+
+            if not stripped_ok:
+                if first_visible is None:
+                    lstripped = chunk.lstrip()
+                    if lstripped:
+                        first_visible = length + len(chunk) - len(lstripped)
+                if first_visible is not None:
+                    rstripped = chunk.rstrip()
+                    if rstripped:
+                        last_visible = length + len(rstripped) - 1
+                        stripped_ok = last_visible - first_visible + 1 >= min_stripped
+
+            length += len(chunk)
+            if length >= min_length and stripped_ok:
+                return length, False, stripped_ok
+
+
+_BLANK_LINE = re.compile(rb'\n(?=\n)')
+_NOT_CSV_SKELETON = bytes(b for b in range(256) if b not in b',\n')
+
+
+class _NeedsTokenizer(Exception):
+    """Quoted fields / bare CR line endings need the real csv tokenizer."""
+
+
+def _count_csv(path: str) -> tuple[int, int]:
+    """
+    Stream a CSV file: (data rows, columns).
+
+    Matches pandas.read_csv defaults used before: header row, blank lines
+    skipped, rows wider than the header are an error.
+
+    Files without quotes are counted on raw byte chunks (comma counts per
+    line, no per-field objects); a quote or bare CR switches to csv.reader.
+    """
+    try:
+        return _count_csv_unquoted(path)
+    except _NeedsTokenizer:
+        return _count_csv_reader(path)
+
+
+def _too_wide(columns: int, line_num: int, fields: int) -> ValueError:
+    return ValueError(f"Error tokenizing data. Expected {columns} fields in line {line_num}, saw {fields}")
+
+
+def _count_csv_unquoted(path: str) -> tuple[int, int]:
+    columns = None
+    rows = 0
+    line_num = 0
+    tail = b''
+
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CSV_CHUNK_BYTES)
+            data = tail + chunk
+            if chunk:
+                # Only whole lines; the rest waits for the next chunk
+                cut = data.rfind(b'\n') + 1
+                if cut == 0:
+                    tail = data
+                    continue
+                data, tail = data[:cut], data[cut:]
+
+            if b'"' in data:
+                raise _NeedsTokenizer()
+            data.decode('utf-8')  # same UnicodeDecodeError as a text read
+            data = data.replace(b'\r\n', b'\n')
+            if b'\r' in data:
+                raise _NeedsTokenizer()
+
+            if columns is None:
+                # Header = first non-blank line
+                stripped = data.lstrip(b'\n')
+                line_num += len(data) - len(stripped)
+                data = stripped
+                if data:
+                    end = data.find(b'\n') + 1 or len(data)
+                    columns = data[:end].count(b',') + 1
+                    line_num += 1
+                    data = data[end:]
+
+            if data:
+                lines = data.count(b'\n') + (0 if data.endswith(b'\n') else 1)
+                blank = 0
+                if data.startswith(b'\n') or b'\n\n' in data:
+                    blank = data.startswith(b'\n') + len(_BLANK_LINE.findall(data))
+                rows += lines - blank
+
+                # Skeleton of commas and newlines: a run of `columns` commas
+                # is a line with more fields than the header
+                if b',' * columns in data.translate(None, _NOT_CSV_SKELETON):
+                    for i, line in enumerate(data.split(b'\n')):
+                        if line.count(b',') + 1 > columns:
+                            raise _too_wide(columns, line_num + i + 1, line.count(b',') + 1)
+                line_num += lines
+
+            if not chunk:
+                break
+
+    if columns is None:
+        raise ValueError("No columns to parse from file")
+    return rows, columns
+
+
+def _count_csv_reader(path: str) -> tuple[int, int]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next((row for row in reader if row), None)
+        if header is None:
+            raise ValueError("No columns to parse from file")
+
+        columns = len(header)
+        rows = 0
+        for row in reader:
+            if not row:
+                continue
+            if len(row) > columns:
+                raise _too_wide(columns, reader.line_num, len(row))
+            rows += 1
+        return rows, columns
+
+
+def _fingerprint(path: str, size: int) -> str:
+    """sha256 of the content (head + tail for files over FINGERPRINT_FULL_BYTES)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        if size <= FINGERPRINT_FULL_BYTES:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+            f.seek(size - FINGERPRINT_SAMPLE_BYTES)
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
 class ArtifactVerifier:
     """
     Верификатор артефактов - CODE-BASED проверки
@@ -52,12 +233,23 @@ class ArtifactVerifier:
         "./artifacts",
     ]
 
-    def __init__(self, base_path: str = None):
+    def __init__(self, base_path: str = None, cache_size: int = VERIFY_CACHE_SIZE, workers: int = VERIFY_WORKERS):
         if base_path is None:
             base_path = os.getenv("ARTIFACTS_PATH", "/data/artifacts")
         self.base_path = base_path
         os.makedirs(base_path, exist_ok=True)
 
+        # (path, size, mtime_ns, type) and ("content", fingerprint, size, type)
+        # -> file verification results
+        self._cache: "OrderedDict[tuple, List[VerificationResult]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
     def _resolve_file_path(self, location: str) -> tuple[str, bool]:
         """
         Resolve file location to actual path.
@@ -183,6 +375,71 @@ class ArtifactVerifier:
 
         return results
 
+    # =========================================================================
+    # ASYNC API
+    # =========================================================================
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="artifact-verify")
+        return self._executor
+
+    async def verify_async(self, artifact_data: Dict) -> List[VerificationResult]:
+        """verify() in the thread pool - file I/O never blocks the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.verify, artifact_data)
+
+    async def verify_many(self, artifacts: List[Dict]) -> List[List[VerificationResult]]:
+        """
+        Verify a batch concurrently (bounded by the pool size).
+
+        Returns results in the same order as artifacts.
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(self.executor, self.verify, a) for a in artifacts)
+        )
+
+    # =========================================================================
+    # RESULT CACHE
+    # =========================================================================
+
+    def _cache_get(self, key: tuple) -> Optional[List[VerificationResult]]:
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+            return list(cached)
+
+    def _cache_count(self, hit: bool) -> None:
+        with self._cache_lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def _cache_put(self, key: tuple, results: List[VerificationResult]) -> None:
+        with self._cache_lock:
+            self._cache[key] = list(results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def get_cache_stats(self) -> Dict:
+        with self._cache_lock:
+            return {
+                "size": len(self._cache),
+                "max_size": self._cache_size,
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+            }
+
     def _verify_inline_content(self, artifact_type: str, content: str) -> List[VerificationResult]:
         """Verify inline content (not stored as file)"""
         results = []
@@ -228,6 +485,39 @@ class ArtifactVerifier:
             results.append(VerificationResult("file_exists", False, f"File not found: {full_path or location}"))
             return results  # Если файла нет - дальше нет смысла проверять
 
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            st = None
+
+        stat_key = content_key = None
+        cached = None
+        if st is not None:
+            stat_key = (full_path, st.st_size, st.st_mtime_ns, artifact_type)
+            cached = self._cache_get(stat_key)
+            if cached is None:
+                # Miss: same content under a new mtime (re-written / touched)?
+                try:
+                    content_key = ("content", _fingerprint(full_path, st.st_size), st.st_size, artifact_type)
+                    cached = self._cache_get(content_key)
+                except OSError:
+                    content_key = None
+                if cached is not None:
+                    self._cache_put(stat_key, cached)
+        self._cache_count(cached is not None)
+        if cached is not None:
+            return cached
+
+        results.extend(self._verify_file_content(artifact_type, full_path))
+        for key in (stat_key, content_key):
+            if key:
+                self._cache_put(key, results)
+        return results
+
+    def _verify_file_content(self, artifact_type: str, full_path: str) -> List[VerificationResult]:
+        """Проверки содержимого существующего файла (кэшируются)"""
+        results = []
+
         # 2. Файл не пустой
         file_size = os.path.getsize(full_path)
         if file_size > 0:
@@ -251,28 +541,40 @@ class ArtifactVerifier:
         """Проверка обычного файла"""
         results = []
 
-        # Читаем файл
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if path.endswith('.json'):
+                # JSON валидность требует весь файл
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                results.append(self._min_length_result("min_length", 10, len(content), True))
+                results.extend(self._verify_json_content(content))
+                return results
+
+            is_markdown = path.endswith('.md')
+            length, exhausted, stripped_ok = _scan_text(path, 10, 21 if is_markdown else None)
 
             # Минимальная длина (не менее 10 символов)
-            if len(content) >= 10:
-                results.append(VerificationResult("min_length", True, f"Content length: {len(content)}"))
-            else:
-                results.append(VerificationResult("min_length", False, f"Content too short: {len(content)}"))
+            results.append(self._min_length_result("min_length", 10, length, exhausted))
 
-            # Определяем тип по расширению
-            if path.endswith('.json'):
-                results.extend(self._verify_json_content(content))
-            elif path.endswith('.md'):
-                results.extend(self._verify_markdown_content(content))
+            if is_markdown:
+                if stripped_ok:
+                    results.append(VerificationResult("markdown_not_empty", True, "Markdown has content"))
+                else:
+                    results.append(VerificationResult("markdown_not_empty", False, "Markdown too short"))
 
         except Exception as e:
             results.append(VerificationResult("readable", False, f"Cannot read file: {e}"))
 
         return results
 
+    @staticmethod
+    def _min_length_result(name: str, minimum: int, length: int, exhausted: bool) -> VerificationResult:
+        if length < minimum:
+            return VerificationResult(name, False, f"Content too short: {length}")
+        if exhausted:
+            return VerificationResult(name, True, f"Content length: {length}")
+        return VerificationResult(name, True, f"Content length: >= {length}")
+
     def _verify_json_content(self, content: str) -> List[VerificationResult]:
         """Проверяет JSON контент"""
         results = []
@@ -285,32 +587,18 @@ class ArtifactVerifier:
 
         return results
 
-    def _verify_markdown_content(self, content: str) -> List[VerificationResult]:
-        """Проверяет Markdown контент"""
-        results = []
-
-        # Не пустой после удаления пробелов
-        stripped = content.strip()
-        if len(stripped) > 20:
-            results.append(VerificationResult("markdown_not_empty", True, "Markdown has content"))
-        else:
-            results.append(VerificationResult("markdown_not_empty", False, "Markdown too short"))
-
-        return results
-
     def _verify_knowledge_file(self, path: str) -> List[VerificationResult]:
         """Проверка knowledge файла"""
         results = []
 
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            length, exhausted, _ = _scan_text(path, 100)
 
             # Минимум 100 символов для knowledge chunk
-            if len(content) >= 100:
-                results.append(VerificationResult("min_knowledge_length", True, f"Length: {len(content)}"))
+            if length >= 100:
+                results.append(VerificationResult("min_knowledge_length", True, f"Length: {'' if exhausted else '>= '}{length}"))
             else:
-                results.append(VerificationResult("min_knowledge_length", False, f"Too short: {len(content)}"))
+                results.append(VerificationResult("min_knowledge_length", False, f"Too short: {length}"))
 
         except Exception as e:
             results.append(VerificationResult("knowledge_readable", False, str(e)))
@@ -322,16 +610,14 @@ class ArtifactVerifier:
         results = []
 
         try:
-            import pandas as pd
-
-            # Пытаемся прочитать как CSV
+            # Пытаемся прочитать как CSV (потоково, без загрузки в память)
             if path.endswith('.csv'):
-                df = pd.read_csv(path)
-                results.append(VerificationResult("csv_readable", True, f"Rows: {len(df)}, Columns: {len(df.columns)}"))
+                rows, columns = _count_csv(path)
+                results.append(VerificationResult("csv_readable", True, f"Rows: {rows}, Columns: {columns}"))
 
                 # Минимум 1 строка + header
-                if len(df) >= 1:
-                    results.append(VerificationResult("dataset_not_empty", True, f"Dataset has {len(df)} rows"))
+                if rows >= 1:
+                    results.append(VerificationResult("dataset_not_empty", True, f"Dataset has {rows} rows"))
                 else:
                     results.append(VerificationResult("dataset_not_empty", False, "Dataset is empty"))
 
@@ -345,14 +631,13 @@ class ArtifactVerifier:
         results = []
 
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            length, exhausted, _ = _scan_text(path, 200)
 
             # Минимум 200 символов для отчета
-            if len(content) >= 200:
-                results.append(VerificationResult("report_min_length", True, f"Length: {len(content)}"))
+            if length >= 200:
+                results.append(VerificationResult("report_min_length", True, f"Length: {'' if exhausted else '>= '}{length}"))
             else:
-                results.append(VerificationResult("report_min_length", False, f"Report too short: {len(content)}"))
+                results.append(VerificationResult("report_min_length", False, f"Report too short: {length}"))
 
         except Exception as e:
             results.append(VerificationResult("report_readable", False, str(e)))
@@ -0,0 +1,238 @@
+"""
+CONSTRAINT COUNTERS - Real-time Values for Safety Constraints
+
+SafetyConstraints needs "how many goals are active" and "how many goals
+were created in the last hour / day" for every check. Counting the goals
+table per check is too expensive for DecisionEngine, so the values are
+kept in memory and queried in O(1):
+
+- SlidingWindowCounter: ring of per-minute buckets + running total
+  (goals created in the last hour / 24h)
+- concurrent gauge: goals currently in ACTIVE_STATES
+
+Updates (infrastructure.session_changes.SessionChangeTracker):
+    Goal INSERT / status change (any code path: GoalExecutor, decomposers,
+    GoalTransitionService) -> Session after_flush collects deltas
+    -> applied on COMMIT (dropped on ROLLBACK)
+
+Reconciliation:
+    Every RECONCILE_SECONDS the counters are rebuilt from the goals table
+    (one grouped query). This corrects drift and picks up goals created by
+    other processes (Celery workers).
+
+Usage:
+    from autonomy.constraint_counters import goal_counters
+
+    goal_counters.install()
+    await goal_counters.ensure_fresh()
+    goal_counters.created_last_hour()
+"""
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from infrastructure.session_changes import SessionChangeTracker
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RECONCILE_SECONDS = float(os.getenv("CONSTRAINT_COUNTERS_RECONCILE_SECONDS", "30"))
+
+BUCKET_SECONDS = 60
+HOUR_SECONDS = 3600
+DAY_SECONDS = 86400
+
+# Goals counted against MAX_CONCURRENT_GOALS
+ACTIVE_STATES = frozenset({"pending", "active"})
+
+
+class SlidingWindowCounter:
+    """
+    Event count over the last `window_seconds`.
+
+    Fixed ring of buckets (bucket_seconds each) and a running total.
+    Expired buckets are cleared lazily when time advances, so add() and
+    count() are amortized O(1). Resolution is one bucket.
+    """
+
+    __slots__ = ("bucket_seconds", "size", "buckets", "total", "_head")
+
+    def __init__(self, window_seconds: int, bucket_seconds: int = BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self.size = window_seconds // bucket_seconds
+        self.buckets: List[int] = [0] * self.size
+        self.total = 0
+        self._head: Optional[int] = None   # newest bucket number
+
+    def _advance(self, bucket: int):
+        if self._head is None:
+            self._head = bucket
+            return
+        if bucket <= self._head:
+            return
+        if bucket - self._head >= self.size:
+            self.buckets = [0] * self.size
+            self.total = 0
+        else:
+            for b in range(self._head + 1, bucket + 1):
+                slot = b % self.size
+                self.total -= self.buckets[slot]
+                self.buckets[slot] = 0
+        self._head = bucket
+
+    def add(self, n: int = 1, at: Optional[float] = None):
+        bucket = int((time.time() if at is None else at) // self.bucket_seconds)
+        self._advance(bucket)
+        if bucket <= self._head - self.size:
+            return  # older than the window
+        bucket = min(bucket, self._head)
+        self.buckets[bucket % self.size] += n
+        self.total += n
+
+    def count(self, now: Optional[float] = None) -> int:
+        self._advance(int((time.time() if now is None else now) // self.bucket_seconds))
+        return self.total
+
+    def load(self, bucket_counts: Dict[int, int], now: Optional[float] = None):
+        """Replace contents with {bucket number: count} (reconciliation)"""
+        self.buckets = [0] * self.size
+        self.total = 0
+        self._head = int((time.time() if now is None else now) // self.bucket_seconds)
+        for bucket, n in bucket_counts.items():
+            if self._head - self.size < bucket <= self._head:
+                self.buckets[bucket % self.size] += n
+                self.total += n
+
+
+class GoalCounters(SessionChangeTracker):
+    """
+    In-memory goal counters for SafetyConstraints.
+
+    All reads are O(1) and never touch the database; ensure_fresh()
+    reconciles with the goals table at most every reconcile_seconds.
+    """
+
+    changes_key_prefix = "constraint_counter_deltas"
+
+    def __init__(self, reconcile_seconds: float = RECONCILE_SECONDS):
+        super().__init__(reconcile_seconds)
+        self.created_hour = SlidingWindowCounter(HOUR_SECONDS)
+        self.created_day = SlidingWindowCounter(DAY_SECONDS)
+        self.concurrent = 0
+
+    # =========================================================================
+    # READS (O(1))
+    # =========================================================================
+
+    def created_last_hour(self) -> int:
+        return self.created_hour.count()
+
+    def created_last_day(self) -> int:
+        return self.created_day.count()
+
+    def concurrent_goals(self) -> int:
+        return self.concurrent
+
+    # =========================================================================
+    # UPDATES
+    # =========================================================================
+
+    def goal_created(self, status: Optional[str] = "active", at: Optional[float] = None):
+        self.created_hour.add(at=at)
+        self.created_day.add(at=at)
+        if status in ACTIVE_STATES:
+            self.concurrent += 1
+
+    def goal_transitioned(self, from_status: Optional[str], to_status: Optional[str]):
+        delta = (to_status in ACTIVE_STATES) - (from_status in ACTIVE_STATES)
+        if delta:
+            self.concurrent = max(0, self.concurrent + delta)
+
+    # =========================================================================
+    # SESSION CHANGES
+    # =========================================================================
+
+    def collect(self, session) -> List:
+        from sqlalchemy import inspect
+        from models import Goal
+
+        deltas = [
+            ("created", None, obj._status or "active")
+            for obj in session.new if isinstance(obj, Goal)
+        ]
+        for obj in session.dirty:
+            if not isinstance(obj, Goal):
+                continue
+            history = inspect(obj).attrs._status.history
+            if history.added and history.deleted:
+                deltas.append(("transitioned", history.deleted[0], history.added[0]))
+        return deltas
+
+    def apply(self, deltas: List):
+        for kind, from_status, to_status in deltas:
+            if kind == "created":
+                self.goal_created(to_status)
+            else:
+                self.goal_transitioned(from_status, to_status)
+
+    # =========================================================================
+    # RECONCILIATION
+    # =========================================================================
+
+    async def reconcile(self):
+        """
+        Rebuild counters from the goals table.
+
+        On failure the in-memory values are kept and the next
+        ensure_fresh() retries after reconcile_seconds.
+        """
+        from sqlalchemy import select, func
+        from database import AsyncSessionLocal
+        from models import Goal
+
+        now = time.time()
+        self.last_reconciled = now
+        since = datetime.fromtimestamp(now - DAY_SECONDS, timezone.utc)
+        minute = func.floor(func.extract("epoch", Goal.created_at) / BUCKET_SECONDS)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                created = await session.execute(
+                    select(minute, func.count())
+                    .where(Goal.created_at >= since)
+                    .group_by(minute)
+                )
+                bucket_counts = {int(bucket): n for bucket, n in created.all()}
+                concurrent = await session.scalar(
+                    select(func.count()).select_from(Goal).where(Goal._status.in_(ACTIVE_STATES))
+                )
+        except Exception as e:
+            logger.warning("constraint_counters_reconcile_failed", error=str(e))
+            return
+
+        self.created_hour.load(bucket_counts, now)
+        self.created_day.load(bucket_counts, now)
+        self.concurrent = concurrent or 0
+
+        logger.debug(
+            "constraint_counters_reconciled",
+            concurrent=self.concurrent,
+            created_hour=self.created_hour.total,
+            created_day=self.created_day.total
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "concurrent_goals": self.concurrent_goals(),
+            "goals_last_hour": self.created_last_hour(),
+            "goals_last_day": self.created_last_day(),
+            "last_reconciled": (
+                datetime.fromtimestamp(self.last_reconciled, timezone.utc).isoformat()
+                if self.last_reconciled else None
+            )
+        }
+
+
+# Singleton instance
+goal_counters = GoalCounters()
@@ -15,11 +15,13 @@ from enum import Enum
 from uuid import UUID, uuid4
 from dataclasses import dataclass, field
 
+from database import AsyncSessionLocal
 from logging_config import get_logger
 
 from autonomy.system_state import SystemStateManager, EntityType
-from autonomy.state_mutation import StateMutation, apply_state_mutation
+from autonomy.state_mutation import StateMutation
 from autonomy.policy_engine import PolicyEngine, PolicyEvaluationResult, ActionType
+from autonomy.safety_constraints import SafetyConstraints
 
 logger = get_logger(__name__)
 
@@ -80,6 +82,7 @@ class DecisionEngine:
     def __init__(self):
         self.state_manager = SystemStateManager()
         self.policy_engine = PolicyEngine()
+        self.safety = SafetyConstraints()
     
     async def process_artifact_mutations(
         self,
@@ -91,11 +94,12 @@ class DecisionEngine:
         
         This is the main entry point for autonomous operation.
         
-        Pipeline:
-        1. Apply each mutation to state
-        2. Evaluate policies for affected entities
-        3. Generate actions from triggered rules
-        4. Return actions for approval/execution
+        Pipeline (one transaction, a fixed number of round trips):
+        1. Load all affected state rows in one query, apply mutations in memory
+        2. Upsert changed entities in one statement
+        3. Evaluate policies over all updated snapshots at once
+        4. Mark triggered rules in one UPDATE
+        5. Return actions for approval/execution
         
         Args:
             mutations: List of state mutations from artifact
@@ -105,56 +109,39 @@ class DecisionEngine:
             List of actions generated by policy evaluations
         """
         actions = []
+        if not mutations:
+            return actions
         
         for mutation in mutations:
             mutation.source_artifact_id = artifact_id
-            
-            # 1. Get current state (if exists)
-            current_entity = await self.state_manager.get_entity(mutation.entity_name)
-            current_value = current_entity.current_value if current_entity else None
-            
-            # 2. Calculate new value
-            new_value = await apply_state_mutation(mutation, current_value)
-            
-            # 3. Determine entity type (default to metric)
-            entity_type = EntityType.METRIC
-            if current_entity:
-                entity_type = current_entity.entity_type
-            
-            # 4. Update state
-            updated_entity = await self.state_manager.update_entity(
-                entity_name=mutation.entity_name,
-                entity_type=entity_type,
-                new_value=new_value,
-                source_artifact_id=artifact_id,
-                confidence=mutation.confidence
-            )
-            
-            logger.info(
-                "state_updated",
-                entity_name=mutation.entity_name,
-                new_value=new_value,
-                source_artifact=str(artifact_id)
+        
+        async with AsyncSessionLocal() as session:
+            # 1-2. Batched state update
+            updated_entities = await self.state_manager.apply_mutations(
+                mutations, source_artifact_id=artifact_id, session=session
             )
             
-            # 5. Evaluate policies
-            evaluation_results = await self.policy_engine.evaluate(updated_entity)
+            # 3. Evaluate policies for all updated snapshots in one pass
+            rules = await self.policy_engine.load_rules(session=session)
+            evaluation_results = await self.policy_engine.evaluate_batch(updated_entities, rules=rules)
             
-            # 6. Generate actions from triggered rules
+            # Generate actions from triggered rules
             for result in evaluation_results:
                 if result.triggered:
-                    action = DecisionAction(
+                    actions.append(DecisionAction(
                         id=uuid4(),
                         action_type=result.rule.action_type,
                         action_payload=result.rule.action_payload,
                         source_entity_name=result.entity.entity_name,
                         source_rule_name=result.rule.name,
                         reason=result.reason
-                    )
-                    actions.append(action)
-                    
-                    # Mark rule as triggered
-                    await self.policy_engine.mark_triggered(result.rule.id)
+                    ))
+            
+            # 4. Mark rules as triggered (cooldown) together with the state update
+            await self.policy_engine.mark_triggered_many(
+                [r.rule.id for r in evaluation_results if r.triggered], session=session
+            )
+            await session.commit()
         
         logger.info(
             "mutations_processed",
@@ -179,6 +166,9 @@ class DecisionEngine:
         - DEACTIVATE_STRATEGY: Mark strategy as inactive
         - ACTIVATE_STRATEGY: Mark strategy as active
         
+        CREATE_GOAL is checked against SafetyConstraints first
+        (in-memory counters, no DB round trip unless reconciliation is due).
+        
         Args:
             action: The action to execute
             
@@ -190,6 +180,18 @@ class DecisionEngine:
         
         result = {"status": "pending", "action_type": action.action_type.value}
         
+        if action.action_type == ActionType.CREATE_GOAL:
+            allowed, violation = await self.safety.can_create_goal()
+            if not allowed:
+                result = {
+                    "status": "blocked",
+                    "constraint": violation.constraint_type.value,
+                    "limit": violation.limit,
+                    "actual": violation.actual
+                }
+                action.result = result
+                return result
+        
         try:
             if action.action_type == ActionType.CREATE_GOAL:
                 # Create goal via goal_executor
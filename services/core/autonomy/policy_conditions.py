@@ -0,0 +1,355 @@
+"""
+POLICY CONDITIONS - Compiled Condition Language
+
+Policy rule conditions are parsed ONCE into closures and then evaluated
+against SystemStateEntity snapshots without any string processing.
+
+Grammar:
+    expr       := or_expr
+    or_expr    := and_expr ("or" and_expr)*
+    and_expr   := not_expr ("and" not_expr)*
+    not_expr   := "not" not_expr | comparison
+    comparison := operand (("<" | "<=" | ">" | ">=" | "==" | "!=") operand)?
+    operand    := number | 'string' | true | false | null | field | "(" expr ")"
+
+Fields:
+- value, delta, trend          - current_value["value"], its delta and trend
+- confidence                   - entity confidence
+- rolling_average, window_days - from current_value (window_days defaults to 7)
+- current.X, previous.X        - any key of current_value / previous_value
+- delta.X, trend.X             - delta / trend of any key
+- any other name               - current_value[name]
+
+A comparison with a missing operand (e.g. delta on the first measurement)
+is False, never an error - also for != - unless the other operand is the
+literal null ("delta == null", "delta != null").
+
+Usage:
+    from autonomy.policy_conditions import compile_condition
+
+    condition = compile_condition("delta < 0 and (confidence >= 0.8 or trend.value == 'down')")
+    if condition(entity):
+        reason = condition.explain(entity)
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class PolicyConditionError(ValueError):
+    """Raised when a condition expression cannot be compiled"""
+    pass
+
+
+# =============================================================================
+# TOKENIZER
+# =============================================================================
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<num>\d+\.?\d*|\.\d+)
+      | (?P<str>'[^']*'|"[^"]*")
+      | (?P<op><=|>=|==|!=|<|>|\(|\)|-)
+      | (?P<name>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)
+    )
+""", re.VERBOSE)
+
+_COMPARATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_LITERALS = {"true": True, "false": False, "null": None, "none": None}
+_KEYWORDS = {"and", "or", "not"}
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    end = len(expression.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(expression, pos)
+        if match is None or match.end() == pos:
+            raise PolicyConditionError(f"Unexpected character at {pos}: {expression[pos:pos + 10]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+# =============================================================================
+# FIELD RESOLVERS
+# =============================================================================
+
+# Resolver: entity -> value (None = not available)
+Resolver = Callable[[Any], Any]
+
+
+def _current(key: str) -> Resolver:
+    return lambda entity: entity.current_value.get(key)
+
+
+def _previous(key: str) -> Resolver:
+    return lambda entity: (entity.previous_value or {}).get(key)
+
+
+def _delta(key: str) -> Resolver:
+    return lambda entity: entity.get_delta(key)
+
+
+def _trend(key: str) -> Resolver:
+    return lambda entity: entity.get_trend(key)
+
+
+_FIELDS = {
+    "value": _current("value"),
+    "delta": _delta("value"),
+    "trend": _trend("value"),
+    "confidence": lambda entity: entity.confidence,
+    "rolling_average": _current("rolling_average"),
+    "window_days": lambda entity: entity.current_value.get("window_days", 7),
+}
+
+_FIELD_PREFIXES = {
+    "current": _current,
+    "previous": _previous,
+    "delta": _delta,
+    "trend": _trend,
+}
+
+
+def _resolve_field(name: str) -> Resolver:
+    if name in _FIELDS:
+        return _FIELDS[name]
+    prefix, _, key = name.partition(".")
+    if key and prefix in _FIELD_PREFIXES:
+        return _FIELD_PREFIXES[prefix](key)
+    return _current(name)
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+# =============================================================================
+# COMPILER
+# =============================================================================
+
+# Compiled node: (test(entity) -> bool, explain(entity) -> str)
+Node = Tuple[Callable[[Any], bool], Callable[[Any], str]]
+
+
+class _Operand:
+    """Literal or field reference"""
+    __slots__ = ("text", "resolve", "is_field")
+
+    def __init__(self, text: str, resolve: Resolver, is_field: bool):
+        self.text = text
+        self.resolve = resolve
+        self.is_field = is_field
+
+    def describe(self, value: Any) -> str:
+        if not self.is_field:
+            return self.text
+        if value is None:
+            return f"{self.text} (unavailable)"
+        return f"{self.text} ({_format(value)})"
+
+
+class _Parser:
+    """Recursive descent parser producing closures"""
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise PolicyConditionError("Unexpected end of expression")
+        self.pos += 1
+        return token
+
+    def accept(self, text: str) -> bool:
+        token = self.peek()
+        if token is not None and token[1] == text:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise PolicyConditionError("Empty condition")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise PolicyConditionError(f"Unexpected token: {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self) -> Node:
+        nodes = [self.parse_and()]
+        while self.accept("or"):
+            nodes.append(self.parse_and())
+        if len(nodes) == 1:
+            return nodes[0]
+        tests = tuple(test for test, _ in nodes)
+        explains = tuple(explain for _, explain in nodes)
+
+        def test(entity):
+            for t in tests:
+                if t(entity):
+                    return True
+            return False
+
+        def explain(entity):
+            for t, e in zip(tests, explains):
+                if t(entity):
+                    return e(entity)
+            return " or ".join(e(entity) for e in explains)
+
+        return test, explain
+
+    def parse_and(self) -> Node:
+        nodes = [self.parse_not()]
+        while self.accept("and"):
+            nodes.append(self.parse_not())
+        if len(nodes) == 1:
+            return nodes[0]
+        tests = tuple(test for test, _ in nodes)
+        explains = tuple(explain for _, explain in nodes)
+
+        def test(entity):
+            for t in tests:
+                if not t(entity):
+                    return False
+            return True
+
+        def explain(entity):
+            return " and ".join(e(entity) for e in explains)
+
+        return test, explain
+
+    def parse_not(self) -> Node:
+        if self.accept("not"):
+            inner_test, inner_explain = self.parse_not()
+            return (
+                lambda entity: not inner_test(entity),
+                lambda entity: f"not ({inner_explain(entity)})",
+            )
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Node:
+        if self.accept("("):
+            node = self.parse_or()
+            if not self.accept(")"):
+                raise PolicyConditionError("Missing ')'")
+            return node
+
+        left = self.parse_operand()
+        token = self.peek()
+        if token is None or token[1] not in _COMPARATORS:
+            # Bare operand: truthiness of the field
+            resolve = left.resolve
+            return (
+                lambda entity: bool(resolve(entity)),
+                lambda entity: left.describe(resolve(entity)),
+            )
+
+        op = self.take()[1]
+        right = self.parse_operand()
+        return self._compile_comparison(left, op, right)
+
+    def parse_operand(self) -> _Operand:
+        negative = self.accept("-")
+        kind, text = self.take()
+        if kind == "num":
+            value = float(text)
+            if negative:
+                value, text = -value, f"-{text}"
+            return _Operand(text, lambda entity: value, is_field=False)
+        if negative:
+            raise PolicyConditionError(f"Unary '-' only applies to numbers, got {text!r}")
+        if kind == "str":
+            value = text[1:-1]
+            return _Operand(text, lambda entity: value, is_field=False)
+        if kind == "name":
+            lowered = text.lower()
+            if lowered in _LITERALS:
+                value = _LITERALS[lowered]
+                return _Operand(text, lambda entity: value, is_field=False)
+            if lowered in _KEYWORDS:
+                raise PolicyConditionError(f"Unexpected keyword: {text!r}")
+            return _Operand(text, _resolve_field(text), is_field=True)
+        raise PolicyConditionError(f"Unexpected token: {text!r}")
+
+    @staticmethod
+    def _compile_comparison(left: _Operand, op: str, right: _Operand) -> Node:
+        compare = _COMPARATORS[op]
+        get_left = left.resolve
+        get_right = right.resolve
+        # "field == null" / "field != null" test presence; any other
+        # comparison with a missing value is False (== and != included)
+        null_check = any(not o.is_field and o.resolve(None) is None for o in (left, right))
+
+        def test(entity):
+            a = get_left(entity)
+            b = get_right(entity)
+            if (a is None or b is None) and not null_check:
+                return False
+            try:
+                return compare(a, b)
+            except TypeError:
+                return False
+
+        def explain(entity):
+            return f"{left.describe(get_left(entity))} {op} {right.describe(get_right(entity))}"
+
+        return test, explain
+
+
+class CompiledCondition:
+    """
+    A parsed condition expression.
+
+    Calling it evaluates the condition against an entity (no parsing, no I/O);
+    explain() renders the same expression with the entity's values.
+    """
+    __slots__ = ("expression", "unmet_reason", "_test", "_explain")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.unmet_reason = f"does not meet: {expression}"
+        self._test, self._explain = _Parser(expression).parse()
+
+    def __call__(self, entity) -> bool:
+        return self._test(entity)
+
+    def evaluate(self, entity) -> Tuple[bool, str]:
+        """(condition_met, reason) - values are only rendered when met"""
+        if self._test(entity):
+            return True, self._explain(entity)
+        return False, self.unmet_reason
+
+    def explain(self, entity) -> str:
+        return self._explain(entity)
+
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.expression!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(expression: str) -> CompiledCondition:
+    """Compile (and cache) a condition expression"""
+    return CompiledCondition(expression.strip())
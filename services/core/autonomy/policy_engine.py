@@ -24,15 +24,15 @@ Usage:
         priority=2
     ))
     
-    # Evaluate
+    # Evaluate (conditions are compiled once, see autonomy.policy_conditions)
     actions = await engine.evaluate(state_entity)
+    results = await engine.evaluate_batch([leads, revenue, burn_rate])
 """
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from enum import Enum
 from uuid import UUID, uuid4
 from dataclasses import dataclass, field
-import re
 
 from sqlalchemy import Column, String, Float, DateTime, JSON, Text, Integer, Boolean
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
@@ -40,6 +40,7 @@ from database import Base, AsyncSessionLocal
 from logging_config import get_logger
 
 from autonomy.system_state import SystemStateEntity, EntityType
+from autonomy.policy_conditions import CompiledCondition, PolicyConditionError, compile_condition
 
 logger = get_logger(__name__)
 
@@ -138,45 +139,67 @@ class PolicyEngine:
     def __init__(self):
         self._rule_cache: Dict[str, PolicyRule] = {}
     
-    async def load_rules(self) -> List[PolicyRule]:
-        """Load all enabled rules from database"""
-        async with AsyncSessionLocal() as session:
-            from sqlalchemy import select
-            
-            stmt = select(PolicyRuleDB).where(
-                PolicyRuleDB.enabled == True
-            ).order_by(PolicyRuleDB.priority.desc())
-            
+    async def load_rules(self, session=None) -> List[PolicyRule]:
+        """
+        Load all enabled rules from database
+        
+        Args:
+            session: Caller's session; if None - own session
+        """
+        from sqlalchemy import select
+        
+        stmt = select(PolicyRuleDB).where(
+            PolicyRuleDB.enabled == True
+        ).order_by(PolicyRuleDB.priority.desc())
+        
+        if session is not None:
             result = await session.execute(stmt)
             db_rules = result.scalars().all()
-            
-            rules = []
-            for db_rule in db_rules:
-                rule = PolicyRule(
-                    id=db_rule.id,
-                    name=db_rule.name,
-                    entity_name=db_rule.entity_name,
-                    entity_type=EntityType(db_rule.entity_type),
-                    condition_expression=db_rule.condition_expression,
-                    action_type=ActionType(db_rule.action_type),
-                    action_payload=db_rule.action_payload,
-                    priority=db_rule.priority,
-                    enabled=db_rule.enabled,
-                    cooldown_minutes=db_rule.cooldown_minutes,
-                    last_triggered=db_rule.last_triggered,
-                    created_at=db_rule.created_at
-                )
-                rules.append(rule)
-                self._rule_cache[rule.name] = rule
-            
-            logger.info("policy_rules_loaded", count=len(rules))
-            return rules
+        else:
+            async with AsyncSessionLocal() as own_session:
+                result = await own_session.execute(stmt)
+                db_rules = result.scalars().all()
+        
+        rules = []
+        for db_rule in db_rules:
+            rule = PolicyRule(
+                id=db_rule.id,
+                name=db_rule.name,
+                entity_name=db_rule.entity_name,
+                entity_type=EntityType(db_rule.entity_type),
+                condition_expression=db_rule.condition_expression,
+                action_type=ActionType(db_rule.action_type),
+                action_payload=db_rule.action_payload,
+                priority=db_rule.priority,
+                enabled=db_rule.enabled,
+                cooldown_minutes=db_rule.cooldown_minutes,
+                last_triggered=db_rule.last_triggered,
+                created_at=db_rule.created_at
+            )
+            rules.append(rule)
+            self._rule_cache[rule.name] = rule
+        
+        logger.info("policy_rules_loaded", count=len(rules))
+        return rules
     
     async def get_rules_for_entity(self, entity_name: str) -> List[PolicyRule]:
         """Get all rules that apply to a specific entity"""
         rules = await self.load_rules()
         return [r for r in rules if r.entity_name == entity_name]
     
+    def compiled_condition(self, rule: PolicyRule) -> Optional[CompiledCondition]:
+        """Compiled condition of a rule (None if the expression is invalid)"""
+        try:
+            return compile_condition(rule.condition_expression)
+        except PolicyConditionError as e:
+            logger.warning(
+                "policy_condition_invalid",
+                rule_name=rule.name,
+                condition=rule.condition_expression,
+                error=str(e)
+            )
+            return None
+
     def evaluate_condition(
         self,
         condition: str,
@@ -185,148 +208,27 @@ class PolicyEngine:
         """
         Evaluate a condition expression against an entity.
         
-        Supported expressions:
-        - "delta < 0" - negative change
-        - "delta > X" - positive change above threshold
-        - "value < X" - value below threshold
-        - "value > X" - value above threshold
-        - "trend == 'down'" - trend direction
-        - "confidence < 0.5" - low confidence
+        The expression is compiled once and cached (autonomy.policy_conditions):
+        - "delta < 0", "value > 100", "confidence < 0.5"
+        - "trend == 'down'", "rolling_average >= 10", "window_days > 7"
+        - "delta < -5 and (confidence >= 0.8 or trend.revenue == 'down')"
+        - "current.churn > previous.churn"
         
         Returns:
             (condition_met, reason) tuple
         """
         try:
-            # Get delta
-            delta = entity.get_delta("value")
-            
-            # Get current value
-            value = entity.current_value.get("value")
-            
-            # Get trend
-            trend = entity.get_trend("value")
-            
-            # Parse condition
-            condition = condition.strip()
-            
-            # delta comparisons
-            if condition.startswith("delta"):
-                if delta is None:
-                    return False, "No delta available (first measurement)"
-                
-                match = re.match(r"delta\s*([<>=!]+)\s*(-?\d+\.?\d*)", condition)
-                if match:
-                    op, threshold = match.groups()
-                    threshold = float(threshold)
-                    
-                    if op == "<" and delta < threshold:
-                        return True, f"delta ({delta:.2f}) < {threshold}"
-                    elif op == ">" and delta > threshold:
-                        return True, f"delta ({delta:.2f}) > {threshold}"
-                    elif op == "<=" and delta <= threshold:
-                        return True, f"delta ({delta:.2f}) <= {threshold}"
-                    elif op == ">=" and delta >= threshold:
-                        return True, f"delta ({delta:.2f}) >= {threshold}"
-                    elif op == "==" and delta == threshold:
-                        return True, f"delta ({delta:.2f}) == {threshold}"
-                    else:
-                        return False, f"delta ({delta:.2f}) does not meet: {condition}"
-            
-            # value comparisons
-            elif condition.startswith("value"):
-                if value is None:
-                    return False, "No 'value' key in current_value"
-                
-                match = re.match(r"value\s*([<>=!]+)\s*(-?\d+\.?\d*)", condition)
-                if match:
-                    op, threshold = match.groups()
-                    threshold = float(threshold)
-                    
-                    if op == "<" and value < threshold:
-                        return True, f"value ({value}) < {threshold}"
-                    elif op == ">" and value > threshold:
-                        return True, f"value ({value}) > {threshold}"
-                    elif op == "<=" and value <= threshold:
-                        return True, f"value ({value}) <= {threshold}"
-                    elif op == ">=" and value >= threshold:
-                        return True, f"value ({value}) >= {threshold}"
-                    elif op == "==" and value == threshold:
-                        return True, f"value ({value}) == {threshold}"
-                    else:
-                        return False, f"value ({value}) does not meet: {condition}"
-            
-            # trend comparisons
-            elif condition.startswith("trend"):
-                match = re.match(r"trend\s*==\s*['\"](\w+)['\"]", condition)
-                if match:
-                    expected_trend = match.group(1)
-                    if trend == expected_trend:
-                        return True, f"trend is '{trend}'"
-                    else:
-                        return False, f"trend is '{trend}', expected '{expected_trend}'"
-            
-            # rolling_average comparisons (Phase 2)
-            elif condition.startswith("rolling_average"):
-                match = re.match(r"rolling_average\s*([<>=!]+)\s*(-?\d+\.?\d*)", condition)
-                if match:
-                    op, threshold = match.groups()
-                    threshold = float(threshold)
-                    
-                    # Need to fetch from SystemStateDB since rolling_average isn't in SystemStateEntity
-                    # For now, check if it exists in extra_data or current_value
-                    rolling_avg = entity.current_value.get("rolling_average")
-                    
-                    if rolling_avg is None:
-                        return False, "No rolling_average available"
-                    
-                    if op == "<" and rolling_avg < threshold:
-                        return True, f"rolling_average ({rolling_avg:.2f}) < {threshold}"
-                    elif op == ">" and rolling_avg > threshold:
-                        return True, f"rolling_average ({rolling_avg:.2f}) > {threshold}"
-                    elif op == "<=" and rolling_avg <= threshold:
-                        return True, f"rolling_average ({rolling_avg:.2f}) <= {threshold}"
-                    elif op == ">=" and rolling_avg >= threshold:
-                        return True, f"rolling_average ({rolling_avg:.2f}) >= {threshold}"
-                    else:
-                        return False, f"rolling_average ({rolling_avg:.2f}) does not meet: {condition}"
-            
-            # window_days comparisons (Phase 2)
-            elif condition.startswith("window_days"):
-                match = re.match(r"window_days\s*([<>=!]+)\s*(\d+)", condition)
-                if match:
-                    op, threshold = match.groups()
-                    threshold = int(threshold)
-                    
-                    window_days = entity.current_value.get("window_days", 7)
-                    
-                    if op == "<" and window_days < threshold:
-                        return True, f"window_days ({window_days}) < {threshold}"
-                    elif op == ">" and window_days > threshold:
-                        return True, f"window_days ({window_days}) > {threshold}"
-                    elif op == "==" and window_days == threshold:
-                        return True, f"window_days ({window_days}) == {threshold}"
-                    else:
-                        return False, f"window_days ({window_days}) does not meet: {condition}"
-            
-            # confidence comparisons
-            elif condition.startswith("confidence"):
-                match = re.match(r"confidence\s*([<>=!]+)\s*(\d+\.?\d*)", condition)
-                if match:
-                    op, threshold = match.groups()
-                    threshold = float(threshold)
-                    conf = entity.confidence
-                    
-                    if op == "<" and conf < threshold:
-                        return True, f"confidence ({conf}) < {threshold}"
-                    elif op == ">" and conf > threshold:
-                        return True, f"confidence ({conf}) > {threshold}"
-                    else:
-                        return False, f"confidence ({conf}) does not meet: {condition}"
-            
-            return False, f"Unknown condition format: {condition}"
-            
+            compiled = compile_condition(condition)
+        except PolicyConditionError as e:
+            return False, f"Invalid condition: {e}"
+        return self._check(compiled, entity)
+    
+    @staticmethod
+    def _check(compiled: CompiledCondition, entity: SystemStateEntity) -> tuple[bool, str]:
+        try:
+            return compiled.evaluate(entity)
         except Exception as e:
-            logger.error("condition_evaluation_error", error=str(e), condition=condition)
+            logger.error("condition_evaluation_error", error=str(e), condition=compiled.expression)
             return False, f"Evaluation error: {str(e)}"
     
     def is_in_cooldown(self, rule: PolicyRule) -> bool:
@@ -351,33 +253,93 @@ class PolicyEngine:
         Returns:
             List of evaluation results (including non-triggered)
         """
-        results = []
-        rules = await self.get_rules_for_entity(entity.entity_name)
+        return await self.evaluate_batch([entity])
+    
+    async def evaluate_batch(
+        self,
+        entities: List[SystemStateEntity],
+        rules: Optional[List[PolicyRule]] = None
+    ) -> List[PolicyEvaluationResult]:
+        """
+        Evaluate all active rules against a batch of entity snapshots.
         
-        for rule in rules:
-            condition_met, reason = self.evaluate_condition(
-                rule.condition_expression, entity
-            )
-            
-            triggered = condition_met and not self.is_in_cooldown(rule)
+        Rules are loaded once per batch and indexed by entity_name
+        ("*" rules apply to every entity of their entity_type), so the cost
+        is one pass over the applicable compiled rules per snapshot.
+        
+        A rule triggers at most once per batch (later snapshots of the same
+        entity see it as in cooldown), as if mark_triggered ran in between.
+        
+        Args:
+            entities: State snapshots, evaluated in order
+            rules: Pre-loaded rules (default: load enabled rules)
             
-            result = PolicyEvaluationResult(
-                rule=rule,
-                entity=entity,
-                triggered=triggered,
-                condition_met=condition_met,
-                reason=reason
-            )
-            results.append(result)
+        Returns:
+            Evaluation results in (entity, rule priority) order
+        """
+        if not entities:
+            return []
+        if rules is None:
+            rules = await self.load_rules()
+        
+        by_entity: Dict[str, List[Tuple[PolicyRule, Optional[CompiledCondition]]]] = {}
+        wildcard: List[Tuple[PolicyRule, Optional[CompiledCondition]]] = []
+        for rule in sorted(rules, key=lambda r: r.priority, reverse=True):
+            if not rule.enabled:
+                continue
+            entry = (rule, self.compiled_condition(rule))
+            if rule.entity_name == "*":
+                wildcard.append(entry)
+            else:
+                by_entity.setdefault(rule.entity_name, []).append(entry)
+        
+        applicable_cache: Dict[Tuple[str, EntityType], list] = {}
+        triggered_rules = set()
+        results = []
+        
+        for entity in entities:
+            key = (entity.entity_name, entity.entity_type)
+            applicable = applicable_cache.get(key)
+            if applicable is None:
+                applicable = by_entity.get(entity.entity_name, []) + [
+                    entry for entry in wildcard if entry[0].entity_type == entity.entity_type
+                ]
+                applicable.sort(key=lambda entry: entry[0].priority, reverse=True)
+                applicable_cache[key] = applicable
             
-            if triggered:
-                logger.info(
-                    "policy_rule_triggered",
-                    rule_name=rule.name,
-                    entity_name=entity.entity_name,
-                    action=rule.action_type.value,
-                    reason=reason
+            for rule, compiled in applicable:
+                if compiled is None:
+                    condition_met, reason = False, f"Invalid condition: {rule.condition_expression}"
+                else:
+                    try:
+                        condition_met, reason = compiled.evaluate(entity)
+                    except Exception as e:
+                        logger.error("condition_evaluation_error", error=str(e), condition=compiled.expression)
+                        condition_met, reason = False, f"Evaluation error: {str(e)}"
+                
+                triggered = (
+                    condition_met
+                    and rule.id not in triggered_rules
+                    and not self.is_in_cooldown(rule)
                 )
+                
+                results.append(PolicyEvaluationResult(
+                    rule=rule,
+                    entity=entity,
+                    triggered=triggered,
+                    condition_met=condition_met,
+                    reason=reason
+                ))
+                
+                if triggered:
+                    triggered_rules.add(rule.id)
+                    logger.info(
+                        "policy_rule_triggered",
+                        rule_name=rule.name,
+                        entity_name=entity.entity_name,
+                        action=rule.action_type.value,
+                        reason=reason
+                    )
         
         return results
     
@@ -392,7 +354,14 @@ class PolicyEngine:
         priority: int = 1,
         cooldown_minutes: int = 60
     ) -> PolicyRule:
-        """Add a new policy rule"""
+        """
+        Add a new policy rule
+        
+        Raises:
+            PolicyConditionError: condition_expression does not compile
+        """
+        compile_condition(condition_expression)
+        
         async with AsyncSessionLocal() as session:
             db_rule = PolicyRuleDB(
                 name=name,
@@ -428,15 +397,30 @@ class PolicyEngine:
     
     async def mark_triggered(self, rule_id: UUID) -> None:
         """Mark a rule as triggered (for cooldown tracking)"""
-        async with AsyncSessionLocal() as session:
-            from sqlalchemy import select, update
-            
-            stmt = update(PolicyRuleDB).where(
-                PolicyRuleDB.id == rule_id
-            ).values(last_triggered=datetime.utcnow())
-            
+        await self.mark_triggered_many([rule_id])
+    
+    async def mark_triggered_many(self, rule_ids: List[UUID], session=None) -> None:
+        """
+        Mark rules as triggered with one UPDATE
+        
+        Args:
+            rule_ids: Triggered rules
+            session: Caller's session (caller commits); if None - own session
+        """
+        if not rule_ids:
+            return
+        from sqlalchemy import update
+        
+        stmt = update(PolicyRuleDB).where(
+            PolicyRuleDB.id.in_(set(rule_ids))
+        ).values(last_triggered=datetime.utcnow())
+        
+        if session is not None:
             await session.execute(stmt)
-            await session.commit()
+        else:
+            async with AsyncSessionLocal() as own_session:
+                await own_session.execute(stmt)
+                await own_session.commit()
 
 
 # Default policy rules for autonomous operation
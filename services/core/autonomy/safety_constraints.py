@@ -23,13 +23,13 @@ Usage:
         # Log violation
         logger.warning("goal_creation_blocked", reason="max_concurrent_reached")
 """
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, Any, Optional, List
 from enum import Enum
-from dataclasses import dataclass, field
-from uuid import UUID
+from dataclasses import dataclass, field, replace
 
-from sqlalchemy import select, func, text
+from sqlalchemy import select
 from database import AsyncSessionLocal, Base
 from sqlalchemy import Column, String, Float, DateTime, Integer, JSON, Boolean
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
@@ -163,94 +163,90 @@ class SafetyConstraints:
     """
     Manager for safety constraints.
     
-    All methods are async and query the database for current state.
-    No LLM - pure deterministic checks.
+    Constraint definitions are cached (DEFINITIONS_TTL_SECONDS, dropped on
+    update_constraint); current values come from in-memory counters
+    (autonomy.constraint_counters), so checks normally make no DB round
+    trips. No LLM - pure deterministic checks.
     """
     
-    def __init__(self):
+    DEFINITIONS_TTL_SECONDS = 60.0
+    
+    def __init__(self, counters=None):
+        from autonomy.constraint_counters import goal_counters
+        
         self._cache: Dict[ConstraintType, SafetyConstraint] = {}
+        self._cache_loaded_at: Optional[float] = None
+        self.counters = counters or goal_counters
+        self.counters.install()
     
-    async def get_constraint(self, constraint_type: ConstraintType) -> SafetyConstraint:
-        """Get a constraint with current values"""
+    async def _load_definitions(self) -> Dict[ConstraintType, SafetyConstraint]:
+        """All constraint definitions (DB overrides defaults), one query per TTL"""
+        now = time.monotonic()
+        if self._cache_loaded_at is not None and now - self._cache_loaded_at < self.DEFINITIONS_TTL_SECONDS:
+            return self._cache
+        
+        definitions = dict(DEFAULT_CONSTRAINTS)
         async with AsyncSessionLocal() as session:
-            # Try to load from DB
-            stmt = select(SafetyConstraintsDB).where(
-                SafetyConstraintsDB.constraint_type == constraint_type.value
-            )
-            result = await session.execute(stmt)
-            db_constraint = result.scalar_one_or_none()
-            
-            if db_constraint:
-                constraint = SafetyConstraint(
+            result = await session.execute(select(SafetyConstraintsDB))
+            for db_constraint in result.scalars():
+                try:
+                    constraint_type = ConstraintType(db_constraint.constraint_type)
+                except ValueError:
+                    continue
+                definitions[constraint_type] = SafetyConstraint(
                     constraint_type=constraint_type,
                     limit=db_constraint.limit_value,
                     enabled=db_constraint.enabled,
                     description=db_constraint.description or ""
                 )
-            else:
-                # Use default
-                constraint = DEFAULT_CONSTRAINTS.get(constraint_type)
-                if not constraint:
-                    raise ValueError(f"Unknown constraint type: {constraint_type}")
-            
-            # Get current value
-            constraint.current_value = await self._get_current_value(constraint_type)
-            
-            return constraint
+        
+        self._cache = definitions
+        self._cache_loaded_at = now
+        return definitions
     
-    async def _get_current_value(self, constraint_type: ConstraintType) -> float:
-        """Get current value for a constraint type"""
-        async with AsyncSessionLocal() as session:
-            if constraint_type == ConstraintType.MAX_CONCURRENT_GOALS:
-                stmt = select(func.count()).select_from(
-                    select(1).where(
-                        # Active, pending, executing goals
-                        # We need to use raw SQL or proper model
-                        # For now, return 0
-                        # TODO: Import Goal model and count active
-                    )
-                )
-                # Simplified - count from goals table
-                result = await session.execute(
-                    select(func.count()).select_from(
-                        select(1).where(
-                            # This is a placeholder - actual implementation needs Goal model
-                            # For now, we'll return 0
-                            text("1=1")
-                        )
-                    )
-                )
-                # Return 0 for now
-                return 0.0
-            
-            elif constraint_type == ConstraintType.MAX_GOALS_PER_HOUR:
-                # Count goals created in last hour
-                one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-                # TODO: Implement with Goal model
-                return 0.0
-            
-            elif constraint_type == ConstraintType.MAX_GOALS_PER_DAY:
-                # Count goals created today
-                today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-                # TODO: Implement with Goal model
-                return 0.0
-            
-            elif constraint_type in [ConstraintType.MAX_BUDGET_PER_DAY, ConstraintType.MAX_BUDGET_PER_WEEK]:
-                # TODO: Implement budget tracking
-                return 0.0
-            
-            elif constraint_type == ConstraintType.MAX_STRATEGIES:
-                # Count active strategies
-                # TODO: Implement with Strategy model
-                return 0.0
-            
-            elif constraint_type == ConstraintType.MAX_EXPERIMENTS:
-                # Count active experiments
-                # TODO: Implement experiment tracking
-                return 0.0
-            
-            else:
-                return 0.0
+    def invalidate_cache(self):
+        self._cache_loaded_at = None
+    
+    async def get_constraint(self, constraint_type: ConstraintType) -> SafetyConstraint:
+        """Get a constraint with current values"""
+        definitions = await self._load_definitions()
+        definition = definitions.get(constraint_type)
+        if not definition:
+            raise ValueError(f"Unknown constraint type: {constraint_type}")
+        
+        await self.counters.ensure_fresh()
+        
+        # Copy: cached definitions (and DEFAULT_CONSTRAINTS) are shared
+        return replace(definition, current_value=self._get_current_value(constraint_type))
+    
+    def _get_current_value(self, constraint_type: ConstraintType) -> float:
+        """Get current value for a constraint type (O(1), in-memory counters)"""
+        if constraint_type == ConstraintType.MAX_CONCURRENT_GOALS:
+            return float(self.counters.concurrent_goals())
+        
+        elif constraint_type == ConstraintType.MAX_GOALS_PER_HOUR:
+            return float(self.counters.created_last_hour())
+        
+        elif constraint_type == ConstraintType.MAX_GOALS_PER_DAY:
+            # Sliding 24h window
+            return float(self.counters.created_last_day())
+        
+        elif constraint_type in [ConstraintType.MAX_BUDGET_PER_DAY, ConstraintType.MAX_BUDGET_PER_WEEK]:
+            # TODO: Implement budget tracking
+            return 0.0
+        
+        elif constraint_type == ConstraintType.MAX_STRATEGIES:
+            # Count active strategies
+            # TODO: Implement with Strategy model
+            return 0.0
+        
+        elif constraint_type == ConstraintType.MAX_EXPERIMENTS:
+            # Count active experiments
+            # TODO: Implement experiment tracking
+            return 0.0
+        
+        else:
+            return 0.0
     
     async def can_create_goal(self) -> tuple[bool, Optional[SafetyViolation]]:
         """Check if a new goal can be created"""
@@ -417,6 +413,8 @@ class SafetyConstraints:
             
             await session.commit()
             
+            self.invalidate_cache()
+            
             logger.info(
                 "constraint_updated",
                 constraint=constraint_type.value,
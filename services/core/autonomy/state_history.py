@@ -0,0 +1,394 @@
+"""
+STATE HISTORY - Time-series Storage for SystemState
+
+Append-only (entity, ts, value) history instead of the ever-growing
+SystemStateDB.trend_history JSON list.
+
+Resolutions:
+- raw:  every recorded point (count=1)
+- hour: hourly rollups of raw points older than RAW_RETENTION_DAYS
+- day:  daily rollups of hourly points older than HOURLY_RETENTION_DAYS
+
+Each period is stored at exactly one resolution (downsample() rolls points
+up and deletes them in one transaction), so aggregates over a window are
+count-weighted sums over all rows in the window - no double counting.
+
+Costs:
+- record / record_many: one INSERT, independent of history size
+- window_stats: one aggregate query (rolling average, min/max, trend
+  halves by running point count), index range scan over the window only
+- series: windowed points bucketed by raw/hour/day in SQL
+
+Usage:
+    from autonomy.state_history import state_history
+
+    await state_history.record("monthly_leads", 145)
+    stats = await state_history.window_stats("monthly_leads", days=7)
+    points = await state_history.series("monthly_leads", start, end, resolution="day")
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, Integer, String, and_, case, cast, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from database import Base, AsyncSessionLocal
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RAW_RETENTION_DAYS = int(os.getenv("STATE_HISTORY_RAW_RETENTION_DAYS", "7"))
+HOURLY_RETENTION_DAYS = int(os.getenv("STATE_HISTORY_HOURLY_RETENTION_DAYS", "90"))
+
+RESOLUTIONS = ("raw", "hour", "day")
+
+# Relative change between window halves below which the trend is "stable"
+TREND_THRESHOLD = 0.05
+
+
+class SystemStateHistoryDB(Base):
+    """Append-only state history (raw points and rollups)"""
+    __tablename__ = "system_state_history"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    entity_name = Column(String(255), nullable=False)
+    resolution = Column(String(8), nullable=False, default="raw")  # raw, hour, day
+    ts = Column(DateTime, nullable=False)  # raw: point time, rollups: bucket start
+    value = Column(Float, nullable=False)  # raw: value, rollups: mean
+    count = Column(Integer, nullable=False, default=1)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("idx_state_history_entity_ts", "entity_name", "ts"),
+        Index("idx_state_history_resolution_ts", "resolution", "ts"),
+        # One rollup row per (entity, resolution, bucket) - target of downsample upserts
+        Index(
+            "uq_state_history_rollup", "entity_name", "resolution", "ts",
+            unique=True, postgresql_where=(resolution != "raw")
+        ),
+    )
+
+
+def _mean(weighted_sum, count_sum):
+    """Count-weighted mean (float division, NULL for empty input)"""
+    return weighted_sum / cast(func.nullif(count_sum, 0), Float)
+
+
+def classify_trend(first_avg: Optional[float], second_avg: Optional[float]) -> str:
+    """up / down / stable from the averages of the window halves"""
+    if first_avg is None or second_avg is None:
+        return "stable"
+    delta = second_avg - first_avg
+    threshold = abs(first_avg) * TREND_THRESHOLD
+    if delta > threshold:
+        return "up"
+    if delta < -threshold:
+        return "down"
+    return "stable"
+
+
+def numeric_value(value: Dict[str, Any], key: str = "value") -> Optional[float]:
+    """Numeric point from a state value dict (None if missing / not a number)"""
+    v = value.get(key) if value else None
+    if isinstance(v, bool) or not isinstance(v, (int, float)):
+        return None
+    return float(v)
+
+
+class StateHistory:
+    """Time-series reads and writes for system_state_history"""
+
+    def __init__(
+        self,
+        raw_retention_days: int = RAW_RETENTION_DAYS,
+        hourly_retention_days: int = HOURLY_RETENTION_DAYS
+    ):
+        self.raw_retention_days = raw_retention_days
+        self.hourly_retention_days = hourly_retention_days
+
+    # =========================================================================
+    # WRITE
+    # =========================================================================
+
+    async def record(
+        self,
+        entity_name: str,
+        value: float,
+        ts: Optional[datetime] = None,
+        session=None
+    ) -> None:
+        """Append one raw point"""
+        await self.record_many([(entity_name, value, ts)], session=session)
+
+    async def record_many(
+        self,
+        points: Iterable[Tuple[str, float, Optional[datetime]]],
+        session=None
+    ) -> int:
+        """
+        Append raw points with one INSERT
+
+        Args:
+            points: (entity_name, value, ts) - ts None means now
+            session: Caller's session (caller commits); if None - own session
+
+        Returns:
+            Number of points written
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                "entity_name": entity_name,
+                "resolution": "raw",
+                "ts": ts or now,
+                "value": value,
+                "count": 1,
+                "min_value": value,
+                "max_value": value
+            }
+            for entity_name, value, ts in points
+        ]
+        if not rows:
+            return 0
+
+        stmt = insert(SystemStateHistoryDB).values(rows)
+        if session is not None:
+            await session.execute(stmt)
+        else:
+            async with AsyncSessionLocal() as own_session:
+                await own_session.execute(stmt)
+                await own_session.commit()
+        return len(rows)
+
+    # =========================================================================
+    # READ
+    # =========================================================================
+
+    @staticmethod
+    def window_stats_query(entity_name: str, since: datetime, until: Optional[datetime] = None):
+        """
+        Rolling aggregates over [since, until) in one query.
+
+        Trend halves split the window's N raw points as the old
+        trend_history[:N//2] / [N//2:] did: a row belongs to the first half
+        if its first point is among the first floor(N/2) points (running
+        sum of count over ts). Raw rows split exactly; a rollup row stays
+        whole on the side where it starts.
+        """
+        h = SystemStateHistoryDB
+        conditions = [h.entity_name == entity_name, h.ts >= since]
+        if until is not None:
+            conditions.append(h.ts < until)
+
+        points_through = func.sum(h.count).over(order_by=(h.ts, h.id), rows=(None, 0))
+        total_points = func.sum(h.count).over()
+        rows = select(
+            h.value,
+            h.count,
+            h.min_value,
+            h.max_value,
+            # 2 * first_point <= N  <=>  first_point <= floor(N / 2)
+            case(
+                ((points_through - h.count + 1) * 2 <= total_points, literal(1)),
+                else_=literal(2)
+            ).label("half")
+        ).where(and_(*conditions)).subquery()
+
+        weighted = rows.c.value * rows.c.count
+
+        def half_avg(half: int):
+            return _mean(
+                func.sum(case((rows.c.half == half, weighted), else_=literal(0.0))),
+                func.sum(case((rows.c.half == half, rows.c.count), else_=0))
+            )
+
+        return select(
+            _mean(func.sum(weighted), func.sum(rows.c.count)).label("average"),
+            func.coalesce(func.sum(rows.c.count), 0).label("count"),
+            func.min(rows.c.min_value).label("min"),
+            func.max(rows.c.max_value).label("max"),
+            half_avg(1).label("first_half_average"),
+            half_avg(2).label("second_half_average")
+        )
+
+    async def window_stats(
+        self,
+        entity_name: str,
+        days: int = 7,
+        until: Optional[datetime] = None,
+        session=None
+    ) -> Dict[str, Any]:
+        """
+        Rolling aggregates of an entity over the last `days`.
+
+        Returns:
+            {
+                "entity_name": str,
+                "window_days": int,
+                "rolling_average": float | None,
+                "count": int,            # raw points covered
+                "min": float | None,
+                "max": float | None,
+                "trend": "up" | "down" | "stable"
+            }
+        """
+        end = until or datetime.utcnow()
+        stmt = self.window_stats_query(entity_name, end - timedelta(days=days), until)
+
+        if session is not None:
+            row = (await session.execute(stmt)).one()
+        else:
+            async with AsyncSessionLocal() as own_session:
+                row = (await own_session.execute(stmt)).one()
+
+        return {
+            "entity_name": entity_name,
+            "window_days": days,
+            "rolling_average": row.average,
+            "count": int(row.count),
+            "min": row.min,
+            "max": row.max,
+            "trend": classify_trend(row.first_half_average, row.second_half_average)
+        }
+
+    async def series(
+        self,
+        entity_name: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        resolution: str = "hour",
+        session=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Points of an entity in [start, end), bucketed in SQL.
+
+        Args:
+            resolution: raw (stored rows as is), hour or day (count-weighted
+                buckets over raw points and rollups)
+
+        Returns:
+            [{"ts", "value", "count", "min", "max"}] ordered by ts
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+
+        h = SystemStateHistoryDB
+        conditions = [h.entity_name == entity_name, h.ts >= start]
+        if end is not None:
+            conditions.append(h.ts < end)
+
+        if resolution == "raw":
+            stmt = select(
+                h.ts.label("ts"),
+                h.value.label("value"),
+                h.count.label("count"),
+                h.min_value.label("min"),
+                h.max_value.label("max")
+            ).where(and_(*conditions)).order_by(h.ts)
+        else:
+            bucket = func.date_trunc(resolution, h.ts)
+            stmt = select(
+                bucket.label("ts"),
+                _mean(func.sum(h.value * h.count), func.sum(h.count)).label("value"),
+                func.sum(h.count).label("count"),
+                func.min(h.min_value).label("min"),
+                func.max(h.max_value).label("max")
+            ).where(and_(*conditions)).group_by(bucket).order_by(bucket)
+
+        if session is not None:
+            rows = (await session.execute(stmt)).all()
+        else:
+            async with AsyncSessionLocal() as own_session:
+                rows = (await own_session.execute(stmt)).all()
+
+        return [
+            {
+                "ts": row.ts.isoformat(),
+                "value": row.value,
+                "count": int(row.count),
+                "min": row.min,
+                "max": row.max
+            }
+            for row in rows
+        ]
+
+    # =========================================================================
+    # DOWNSAMPLING
+    # =========================================================================
+
+    @staticmethod
+    def rollup_statements(source: str, target: str, cutoff: datetime):
+        """
+        INSERT ... SELECT rollup of `source` rows older than cutoff into
+        `target` buckets (merged into existing buckets), then DELETE them.
+        """
+        h = SystemStateHistoryDB
+        older = and_(h.resolution == source, h.ts < cutoff)
+        bucket = func.date_trunc(target, h.ts)
+
+        rollup = select(
+            h.entity_name,
+            literal(target),
+            bucket,
+            _mean(func.sum(h.value * h.count), func.sum(h.count)),
+            func.sum(h.count),
+            func.min(h.min_value),
+            func.max(h.max_value)
+        ).where(older).group_by(h.entity_name, bucket)
+
+        stmt = insert(h).from_select(
+            ["entity_name", "resolution", "ts", "value", "count", "min_value", "max_value"],
+            rollup
+        )
+        # Bucket already rolled up earlier (late points): count-weighted merge
+        upsert = stmt.on_conflict_do_update(
+            index_elements=[h.entity_name, h.resolution, h.ts],
+            index_where=(h.resolution != "raw"),
+            set_={
+                "value": _mean(
+                    h.value * h.count + stmt.excluded.value * stmt.excluded.count,
+                    h.count + stmt.excluded.count
+                ),
+                "count": h.count + stmt.excluded.count,
+                "min_value": func.least(h.min_value, stmt.excluded.min_value),
+                "max_value": func.greatest(h.max_value, stmt.excluded.max_value)
+            }
+        )
+        return upsert, delete(h).where(older)
+
+    async def downsample(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Roll raw points into hourly and hourly into daily buckets.
+
+        Cutoffs are aligned to bucket boundaries, so a bucket is never
+        split between resolutions. One transaction.
+
+        Returns:
+            {"raw_to_hour": deleted raw rows, "hour_to_day": deleted hourly rows}
+        """
+        now = now or datetime.utcnow()
+        raw_cutoff = (now - timedelta(days=self.raw_retention_days)).replace(minute=0, second=0, microsecond=0)
+        hourly_cutoff = (now - timedelta(days=self.hourly_retention_days)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+        result = {}
+        async with AsyncSessionLocal() as session:
+            for name, source, target, cutoff in (
+                ("raw_to_hour", "raw", "hour", raw_cutoff),
+                ("hour_to_day", "hour", "day", hourly_cutoff),
+            ):
+                rollup, purge = self.rollup_statements(source, target, cutoff)
+                await session.execute(rollup)
+                deleted = await session.execute(purge)
+                result[name] = deleted.rowcount or 0
+            await session.commit()
+
+        logger.info("state_history_downsampled", **result)
+        return result
+
+
+# Singleton instance
+state_history = StateHistory()
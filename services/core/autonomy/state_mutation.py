@@ -104,6 +104,14 @@ async def apply_state_mutation(
     Returns:
         New state value after mutation
     """
+    return compute_state_mutation(mutation, current_value)
+
+
+def compute_state_mutation(
+    mutation: StateMutation,
+    current_value: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Synchronous apply_state_mutation (batch pipeline, see SystemStateManager.apply_mutations)"""
     if mutation.mutation_type == MutationType.UPDATE:
         return mutation.new_value
     
@@ -27,8 +27,8 @@ Usage:
     # Get current state
     leads = await manager.get_entity("monthly_leads")
 """
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 from uuid import UUID, uuid4
 from dataclasses import dataclass, field
@@ -39,6 +39,9 @@ from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from database import Base, AsyncSessionLocal
 from logging_config import get_logger
 
+from autonomy.state_mutation import StateMutation, compute_state_mutation
+from autonomy.state_history import numeric_value, state_history
+
 logger = get_logger(__name__)
 
 
@@ -105,6 +108,8 @@ class SystemStateDB(Base):
     evaluation_window_days = Column(Integer, default=7)  # How many days to consider for trend
     rolling_average = Column(Float, nullable=True)  # Rolling average over window
     trend = Column(String(20), default="stable")  # up, down, stable
+    # LEGACY: no longer written - history lives in system_state_history
+    # (autonomy.state_history, migrations/add_state_history.sql)
     trend_history = Column(JSON, nullable=True)  # [{"date": "...", "value": 100}, ...]
 
 
@@ -202,6 +207,10 @@ class SystemStateManager:
                     entity_type=entity_type.value
                 )
             
+            value = numeric_value(new_value)
+            if value is not None:
+                await state_history.record(entity_name, value, session=session)
+            
             await session.commit()
             await session.refresh(db_entity)
             
@@ -216,6 +225,154 @@ class SystemStateManager:
                 source_artifact_id=db_entity.source_artifact_id
             )
     
+    @staticmethod
+    def plan_mutations(
+        mutations: List[StateMutation],
+        existing: Dict[str, SystemStateEntity],
+        source_artifact_id: Optional[UUID] = None,
+        now: Optional[datetime] = None
+    ) -> Tuple[List[SystemStateEntity], Dict[str, SystemStateEntity]]:
+        """
+        Apply mutations in memory (no DB).
+        
+        Mutations of the same entity are applied in order, each on top of
+        the previous one - as sequential update_entity() calls.
+        
+        Args:
+            mutations: Mutations in arrival order
+            existing: Current state of affected entities by name
+            source_artifact_id: Artifact that proposed the mutations
+            now: Update timestamp
+            
+        Returns:
+            (snapshots, final): one snapshot per mutation (previous_value =
+            value before that mutation) and the final state per entity
+        """
+        now = now or datetime.utcnow()
+        final: Dict[str, SystemStateEntity] = {}
+        snapshots = []
+        
+        for mutation in mutations:
+            current = final.get(mutation.entity_name) or existing.get(mutation.entity_name)
+            current_value = current.current_value if current else None
+            
+            snapshot = SystemStateEntity(
+                id=current.id if current else uuid4(),
+                entity_name=mutation.entity_name,
+                # New entities default to metric
+                entity_type=current.entity_type if current else EntityType.METRIC,
+                current_value=compute_state_mutation(mutation, current_value),
+                previous_value=current_value,
+                confidence=mutation.confidence,
+                last_updated=now,
+                source_artifact_id=source_artifact_id
+            )
+            snapshots.append(snapshot)
+            final[mutation.entity_name] = snapshot
+        
+        return snapshots, final
+    
+    async def apply_mutations(
+        self,
+        mutations: List[StateMutation],
+        source_artifact_id: Optional[UUID] = None,
+        session=None
+    ) -> List[SystemStateEntity]:
+        """
+        Apply a batch of mutations in one transaction.
+        
+        One SELECT ... FOR UPDATE for all affected rows, values computed in
+        memory (plan_mutations), one multi-row upsert and one INSERT of
+        numeric points into system_state_history.
+        
+        Args:
+            mutations: Mutations in arrival order
+            source_artifact_id: Artifact that proposed the mutations
+            session: Caller's session (caller commits); if None - own session
+            
+        Returns:
+            One snapshot per mutation, in order
+        """
+        if not mutations:
+            return []
+        if session is None:
+            async with AsyncSessionLocal() as own_session:
+                snapshots = await self.apply_mutations(mutations, source_artifact_id, session=own_session)
+                await own_session.commit()
+                return snapshots
+        
+        from sqlalchemy import select
+        from sqlalchemy.dialects.postgresql import insert
+        
+        names = sorted({m.entity_name for m in mutations})
+        result = await session.execute(
+            select(SystemStateDB)
+            .where(SystemStateDB.entity_name.in_(names))
+            .with_for_update()
+        )
+        existing = {e.entity_name: self._to_entity(e) for e in result.scalars()}
+        
+        snapshots, final = self.plan_mutations(mutations, existing, source_artifact_id)
+        
+        # previous_value = value before the LAST mutation of the entity
+        stmt = insert(SystemStateDB).values([
+            {
+                "id": entity.id,
+                "entity_name": entity.entity_name,
+                "entity_type": entity.entity_type.value,
+                "current_value": entity.current_value,
+                "previous_value": entity.previous_value,
+                "confidence": entity.confidence,
+                "last_updated": entity.last_updated,
+                "source_artifact_id": entity.source_artifact_id
+            }
+            for entity in final.values()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SystemStateDB.entity_name],
+            set_={
+                "current_value": stmt.excluded.current_value,
+                "previous_value": stmt.excluded.previous_value,
+                "confidence": stmt.excluded.confidence,
+                "last_updated": stmt.excluded.last_updated,
+                "source_artifact_id": stmt.excluded.source_artifact_id
+            }
+        )
+        await session.execute(stmt)
+        
+        # Time series: one raw point per numeric mutation, same transaction
+        await state_history.record_many(
+            [
+                (snapshot.entity_name, value, snapshot.last_updated)
+                for snapshot in snapshots
+                if (value := numeric_value(snapshot.current_value)) is not None
+            ],
+            session=session
+        )
+        
+        created = len(final.keys() - existing.keys())
+        logger.info(
+            "state_mutations_applied",
+            mutations=len(mutations),
+            entities_updated=len(final) - created,
+            entities_created=created
+        )
+        
+        return snapshots
+    
+    @staticmethod
+    def _to_entity(db_entity: SystemStateDB) -> SystemStateEntity:
+        return SystemStateEntity(
+            id=db_entity.id,
+            entity_name=db_entity.entity_name,
+            entity_type=EntityType(db_entity.entity_type),
+            current_value=db_entity.current_value,
+            previous_value=db_entity.previous_value,
+            confidence=db_entity.confidence,
+            last_updated=db_entity.last_updated,
+            source_artifact_id=db_entity.source_artifact_id
+        )
+    
     async def get_all_metrics(self) -> List[SystemStateEntity]:
         """Get all metric-type entities"""
         async with AsyncSessionLocal() as session:
@@ -279,6 +436,10 @@ class SystemStateManager:
         """
         Update entity with automatic trend calculation.
         
+        The point is appended to system_state_history (autonomy.state_history);
+        rolling_average and trend are computed in SQL over the window and
+        cached on the row. Cost does not grow with history length.
+        
         Args:
             entity_name: Unique name for the entity
             entity_type: Type of entity
@@ -291,75 +452,37 @@ class SystemStateManager:
         Returns:
             Updated SystemStateEntity
         """
+        from sqlalchemy import select
+        
         async with AsyncSessionLocal() as session:
-            from sqlalchemy import select
-            
-            stmt = select(SystemStateDB).where(SystemStateDB.entity_name == entity_name)
+            stmt = select(SystemStateDB).where(SystemStateDB.entity_name == entity_name).with_for_update()
             result = await session.execute(stmt)
             db_entity = result.scalar_one_or_none()
             
             now = datetime.utcnow()
-            new_numeric_value = new_value.get(value_key, 0)
+            value = numeric_value(new_value, value_key)
+            if value is not None:
+                await state_history.record(entity_name, value, ts=now, session=session)
+            stats = await state_history.window_stats(entity_name, days=evaluation_window_days, session=session)
             
             if db_entity:
-                # Get or init trend history
-                history = db_entity.trend_history or []
-                
-                # Add new entry
-                history.append({
-                    "date": now.isoformat(),
-                    "value": new_numeric_value
-                })
-                
-                # Filter to window
-                cutoff = (now - timedelta(days=evaluation_window_days)).isoformat()
-                history = [h for h in history if h["date"] >= cutoff]
-                
-                # Calculate rolling average
-                if history:
-                    rolling_avg = sum(h["value"] for h in history) / len(history)
-                else:
-                    rolling_avg = new_numeric_value
-                
-                # Calculate trend
-                if len(history) >= 2:
-                    first_half = history[:len(history)//2]
-                    second_half = history[len(history)//2:]
-                    first_avg = sum(h["value"] for h in first_half) / len(first_half)
-                    second_avg = sum(h["value"] for h in second_half) / len(second_half)
-                    
-                    delta = second_avg - first_avg
-                    threshold = first_avg * 0.05  # 5% threshold for "stable"
-                    
-                    if delta > threshold:
-                        trend = "up"
-                    elif delta < -threshold:
-                        trend = "down"
-                    else:
-                        trend = "stable"
-                else:
-                    trend = "stable"
-                
-                # Update entity
                 db_entity.previous_value = db_entity.current_value
                 db_entity.current_value = new_value
                 db_entity.confidence = confidence
                 db_entity.last_updated = now
                 db_entity.source_artifact_id = source_artifact_id
                 db_entity.evaluation_window_days = evaluation_window_days
-                db_entity.rolling_average = rolling_avg
-                db_entity.trend = trend
-                db_entity.trend_history = history
+                db_entity.rolling_average = stats["rolling_average"]
+                db_entity.trend = stats["trend"]
                 
                 logger.info(
                     "state_entity_updated_with_trend",
                     entity_name=entity_name,
-                    trend=trend,
-                    rolling_average=rolling_avg,
+                    trend=stats["trend"],
+                    rolling_average=stats["rolling_average"],
                     window_days=evaluation_window_days
                 )
             else:
-                # Create new entity
                 db_entity = SystemStateDB(
                     entity_name=entity_name,
                     entity_type=entity_type.value,
@@ -368,9 +491,8 @@ class SystemStateManager:
                     confidence=confidence,
                     source_artifact_id=source_artifact_id,
                     evaluation_window_days=evaluation_window_days,
-                    rolling_average=new_numeric_value,
-                    trend="stable",
-                    trend_history=[{"date": now.isoformat(), "value": new_numeric_value}]
+                    rolling_average=stats["rolling_average"],
+                    trend=stats["trend"]
                 )
                 session.add(db_entity)
                 
@@ -383,21 +505,15 @@ class SystemStateManager:
             await session.commit()
             await session.refresh(db_entity)
             
-            return SystemStateEntity(
-                id=db_entity.id,
-                entity_name=db_entity.entity_name,
-                entity_type=EntityType(db_entity.entity_type),
-                current_value=db_entity.current_value,
-                previous_value=db_entity.previous_value,
-                confidence=db_entity.confidence,
-                last_updated=db_entity.last_updated,
-                source_artifact_id=db_entity.source_artifact_id
-            )
+            return self._to_entity(db_entity)
     
     async def get_trend_summary(self, entity_name: str) -> Optional[Dict[str, Any]]:
         """
         Get trend summary for an entity.
         
+        Aggregates over the entity's evaluation window are computed in SQL
+        from system_state_history.
+        
         Returns:
             {
                 "entity_name": str,
@@ -407,20 +523,23 @@ class SystemStateManager:
                 "history_count": int
             }
         """
+        from sqlalchemy import select
+        
         async with AsyncSessionLocal() as session:
-            from sqlalchemy import select
-            
-            stmt = select(SystemStateDB).where(SystemStateDB.entity_name == entity_name)
+            stmt = select(SystemStateDB.evaluation_window_days).where(SystemStateDB.entity_name == entity_name)
             result = await session.execute(stmt)
-            db_entity = result.scalar_one_or_none()
+            row = result.one_or_none()
             
-            if not db_entity:
+            if not row:
                 return None
             
+            window_days = row.evaluation_window_days or 7
+            stats = await state_history.window_stats(entity_name, days=window_days, session=session)
+            
             return {
-                "entity_name": db_entity.entity_name,
-                "trend": db_entity.trend,
-                "rolling_average": db_entity.rolling_average,
-                "window_days": db_entity.evaluation_window_days,
-                "history_count": len(db_entity.trend_history or [])
+                "entity_name": entity_name,
+                "trend": stats["trend"],
+                "rolling_average": stats["rolling_average"],
+                "window_days": window_days,
+                "history_count": stats["count"]
             }
@@ -73,6 +73,10 @@ class Skill(ABC):
 
     produces_artifacts: List[str]  # Какие типы артефактов производит
 
+    # ---- RUNTIME HINTS (see skill_runtime.py) ----
+    execution_mode: str = "thread"  # thread | process (CPU-heavy) | inline (trivial)
+    timeout_seconds: Optional[float] = None  # None = SKILL_TIMEOUT_SECONDS
+
     # ---- EXECUTION ----
     @abstractmethod
     def execute(self, input_data: Dict[str, Any], context: Dict[str, Any]) -> SkillResult:
@@ -37,6 +37,9 @@ class WebResearchSkill(Skill):
 
     produces_artifacts = ['KNOWLEDGE', 'FILE']
 
+    # Several sequential HTTP calls with timeout=10 each
+    timeout_seconds = 120
+
     def execute(self, input_data: dict, context: dict) -> SkillResult:
         """Execute web research on keywords"""
         try:
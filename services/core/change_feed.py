@@ -0,0 +1,340 @@
+"""
+CHANGE FEED - Real-time goal/artifact/execution deltas for /ui/stream
+=====================================================================
+
+Instead of the dashboard re-polling /graph, /goals/list and /timeline,
+producers publish small deltas and the API pushes them over SSE.
+
+Architecture:
+  GoalTransitionService / ArtifactRegistry    ExecutionEventEmitter
+         ↓ pg_notify in the SAME transaction         ↓ pg_notify (own conn)
+                     Postgres LISTEN/NOTIFY channel
+                                ↓  (one LISTEN connection per API process)
+                          ChangeFeedHub ring buffer (seq numbers)
+                                ↓  (one append, all subscribers woken)
+                        SSE subscribers (/ui/stream)
+
+Properties:
+- Transactional: a transition rolled back is never published
+  (NOTIFY is delivered on COMMIT only)
+- Works across processes: Celery workers publish, API processes listen
+- Resume: SSE id is "<epoch>:<seq>"; reconnecting with Last-Event-ID
+  replays missed events from the ring buffer. If the client is too far
+  behind (or the API restarted) a RESYNC event tells it to refetch once.
+- Fan-out cost: each event is serialized once; subscribers only read
+  pre-rendered frames from the ring.
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+CHANNEL = os.getenv("CHANGE_FEED_CHANNEL", "ai_os_changes")
+RING_CAPACITY = int(os.getenv("CHANGE_FEED_RING_CAPACITY", "10000"))
+HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+LISTENER_CHECK_SECONDS = 5.0
+
+# Postgres NOTIFY payload limit is 8000 bytes
+PG_NOTIFY_MAX_BYTES = 7900
+
+
+# =============================================================================
+# Event types (match dashboard_v2 SystemEvent names)
+# =============================================================================
+
+GOAL_STATUS_CHANGED = "GOAL_STATUS_CHANGED"
+ARTIFACT_REGISTERED = "ARTIFACT_REGISTERED"
+EXECUTION_PROGRESS = "EXECUTION_PROGRESS"
+RESYNC = "RESYNC"
+
+
+def _encode(event_type: str, data: Dict[str, Any]) -> str:
+    """
+    Serialize a delta for NOTIFY.
+
+    Oversized payloads are reduced to identifiers only - clients refetch
+    the entity if they need the rest.
+    """
+    event = {"type": event_type, "timestamp": datetime.utcnow().isoformat(), **data}
+    payload = json.dumps(event, default=str)
+    if len(payload.encode("utf-8")) > PG_NOTIFY_MAX_BYTES:
+        slim = {k: v for k, v in event.items() if k in ("type", "timestamp") or k.endswith("Id")}
+        slim["truncated"] = True
+        payload = json.dumps(slim, default=str)
+    return payload
+
+
+# =============================================================================
+# Publishing
+# =============================================================================
+
+async def publish_in_session(session, event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Publish inside the caller's transaction (delivered on COMMIT).
+
+    Use from UoW-based code: GoalTransitionService, ArtifactRegistry.
+    """
+    from sqlalchemy import text
+
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANNEL, "payload": _encode(event_type, data)},
+    )
+
+
+async def publish(event_type: str, data: Dict[str, Any]) -> None:
+    """Publish outside of any transaction (own short connection)."""
+    from sqlalchemy import text
+    from database import engine
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": _encode(event_type, data)},
+            )
+            await conn.commit()
+    except Exception as e:
+        # Change feed is best-effort for non-transactional events
+        logger.warning("change_feed_publish_failed", event_type=event_type, error=str(e))
+
+
+_pending_publishes: set = set()
+
+
+def publish_nowait(event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Fire-and-forget publish from sync code running inside an event loop.
+
+    Without a running loop (scripts, sync tests) the event is dropped.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(publish(event_type, data))
+    # Keep a reference until done - the loop only holds weak refs to tasks
+    _pending_publishes.add(task)
+    task.add_done_callback(_pending_publishes.discard)
+
+
+async def publish_goal_transition(
+    session,
+    goal_id,
+    from_state: Optional[str],
+    to_state: str,
+    reason: Optional[str] = None,
+    actor: Optional[str] = None,
+) -> None:
+    """Transactional GOAL_STATUS_CHANGED delta."""
+    await publish_in_session(session, GOAL_STATUS_CHANGED, {
+        "goalId": str(goal_id),
+        "oldStatus": from_state,
+        "newStatus": to_state,
+        "reason": reason,
+        "actor": actor,
+    })
+
+
+# =============================================================================
+# Hub (API process side)
+# =============================================================================
+
+class ChangeFeedHub:
+    """
+    In-process fan-out of change events to SSE subscribers.
+
+    Events are kept in a fixed-size ring indexed by sequence number, so
+    resume (read_since) is O(missed events) and memory is bounded.
+    """
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self.epoch = uuid.uuid4().hex[:8]
+        self._ring: List[Optional[Tuple[int, str]]] = [None] * capacity
+        self._next_seq = 1
+        self._changed = asyncio.Event()
+        self.subscribers = 0
+        self.published = 0
+
+        self._conn = None
+        self._driver = None
+        self._watchdog: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Ring buffer
+    # ------------------------------------------------------------------
+
+    @property
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    def append(self, payload: str) -> int:
+        """Store a JSON payload, assign seq, wake all subscribers."""
+        seq = self._next_seq
+        self._next_seq += 1
+        frame = f"id: {self.epoch}:{seq}\ndata: {payload}\n\n"
+        self._ring[seq % self.capacity] = (seq, frame)
+        self.published += 1
+
+        # Swap the event: current waiters wake up, new waiters wait for the next one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return seq
+
+    def read_since(self, last_seq: int) -> Tuple[List[str], bool]:
+        """
+        Frames with seq > last_seq.
+
+        Returns (frames, lagged). lagged=True means events were overwritten
+        and the subscriber must resync.
+        """
+        oldest = max(1, self._next_seq - self.capacity)
+        lagged = last_seq + 1 < oldest
+        start = max(last_seq + 1, oldest)
+        frames = [self._ring[s % self.capacity][1] for s in range(start, self._next_seq)]
+        return frames, lagged
+
+    def parse_event_id(self, event_id: Optional[str]) -> Tuple[int, bool]:
+        """
+        Resume point for a Last-Event-ID.
+
+        Returns (last_seq, needs_resync). Unknown epoch (API restarted or
+        another API worker) -> resync from the current position.
+        """
+        if not event_id:
+            return self.last_seq, False
+        try:
+            epoch, seq = event_id.split(":", 1)
+            seq = int(seq)
+        except ValueError:
+            return self.last_seq, True
+        if epoch != self.epoch or seq > self.last_seq:
+            return self.last_seq, True
+        return seq, False
+
+    def _resync_frame(self) -> str:
+        payload = json.dumps({"type": RESYNC, "timestamp": datetime.utcnow().isoformat()})
+        return f"id: {self.epoch}:{self.last_seq}\ndata: {payload}\n\n"
+
+    # ------------------------------------------------------------------
+    # Subscription
+    # ------------------------------------------------------------------
+
+    async def subscribe(
+        self,
+        last_event_id: Optional[str] = None,
+        heartbeat_seconds: float = HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[str]:
+        """
+        Yield SSE frames (already formatted) starting after last_event_id.
+
+        Sends an SSE comment as heartbeat when idle.
+        """
+        cursor, needs_resync = self.parse_event_id(last_event_id)
+        self.subscribers += 1
+        try:
+            if needs_resync:
+                yield self._resync_frame()
+
+            while True:
+                waiter = self._changed
+                frames, lagged = self.read_since(cursor)
+                if lagged:
+                    yield self._resync_frame()
+                    cursor = self.last_seq
+                    continue
+                if frames:
+                    cursor = self.last_seq
+                    for frame in frames:
+                        yield frame
+                    continue
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+        finally:
+            self.subscribers -= 1
+
+    # ------------------------------------------------------------------
+    # Postgres LISTEN
+    # ------------------------------------------------------------------
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.append(payload)
+
+    async def start(self) -> None:
+        """
+        Start the connection watchdog. It opens the LISTEN connection and
+        keeps retrying every LISTENER_CHECK_SECONDS while the database is
+        unreachable, so a database that is down at startup recovers too.
+        """
+        if self._watchdog is None:
+            self._watchdog = asyncio.create_task(self._watch())
+
+    async def _listen(self) -> None:
+        from database import engine
+
+        self._conn = await engine.connect()
+        raw = await self._conn.get_raw_connection()
+        self._driver = raw.driver_connection  # asyncpg.Connection
+        await self._driver.add_listener(CHANNEL, self._on_notify)
+        logger.info("change_feed_listening", channel=CHANNEL, epoch=self.epoch)
+
+    async def _watch(self) -> None:
+        """(Re)connect whenever the LISTEN connection is missing or dead.
+
+        After a reconnect events may have been lost -> RESYNC.
+        """
+        connected_before = False
+        while True:
+            if self._driver is None or self._driver.is_closed():
+                try:
+                    await self._close_conn()
+                    await self._listen()
+                    if connected_before:
+                        self.append(json.dumps({"type": RESYNC, "timestamp": datetime.utcnow().isoformat()}))
+                    connected_before = True
+                except Exception as e:
+                    await self._close_conn()
+                    logger.warning("change_feed_connect_failed", error=str(e))
+            await asyncio.sleep(LISTENER_CHECK_SECONDS)
+
+    async def _close_conn(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._driver = None
+
+    async def stop(self) -> None:
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None
+        if self._driver is not None and not self._driver.is_closed():
+            await self._driver.remove_listener(CHANNEL, self._on_notify)
+        await self._close_conn()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "last_seq": self.last_seq,
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "listening": self._driver is not None and not self._driver.is_closed(),
+        }
+
+
+change_feed_hub = ChangeFeedHub()
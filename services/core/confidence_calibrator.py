@@ -47,7 +47,7 @@ class ConfidenceCalibrator:
         raw_confidence: float,
         action_type: str,
         tier: str,
-        metrics: Dict[str, float]
+        metrics: Optional[Dict[str, float]] = None
     ) -> float:
         """
         Калибрует confidence на основе исторических метрик.
@@ -56,11 +56,16 @@ class ConfidenceCalibrator:
             raw_confidence: Исходный confidence от tier
             action_type: Тип действия
             tier: Tier (ML/Clusters/Rules)
-            metrics: {direction_acc, mae, bias, sample_count}
+            metrics: {direction_acc, mae, bias, sample_count};
+                по умолчанию - tier_reliability_tracker (O(1))
 
         Returns:
             Калиброванный confidence
         """
+        if metrics is None:
+            from tier_reliability import tier_reliability_tracker
+            metrics = tier_reliability_tracker.get_reliability(action_type, tier)
+
         if metrics["sample_count"] < 10:
             # Недостаточно данных → не калибруем
             return raw_confidence
@@ -166,7 +171,7 @@ class ConfidenceCalibrator:
         summary = {}
 
         for key, value in self.calibration_cache.items():
-            action_type, tier = key.split("_")
+            action_type, tier = key.rsplit("_", 1)
             summary[key] = {
                 "action_type": action_type,
                 "tier": tier,
@@ -9,281 +9,564 @@ STEP 2.7 — Intervention Readiness Layer
 Architectural invariants:
 - Simulation ≠ Prediction (only replay + deterministic recompute)
 - NO stochasticity
-- One intervention at a time
+- Each intervention is replayed independently against the same frozen window
 - Fixed window
 - Same input data
 - If not deterministic → simulation rejected
+
+Replay engine:
+- The whole window is loaded ONCE into columnar NumPy arrays:
+  predicted / actual deltas as (N × 4) matrices (NaN = dimension absent),
+  forecast confidence, tier and action codes
+- Interventions are vectorized transforms returning only the rows they change
+- Metrics are kept as per-row contributions, so "after" metrics of any number
+  of candidates cost O(changed rows) each
 """
 
-from typing import Dict, Optional, List
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import select, and_, func, text
-from database import get_db
+from sqlalchemy import select, text
+from database import AsyncSessionLocal
 from models import (
-    EmotionalForecast,
-    EmotionalOutcome,
     InterventionCandidate,
     InterventionSimulation
 )
+from logging_config import get_logger
 import hashlib
 import json
 import uuid
 
+import numpy as np
 
-# =============================================================================
-# SIMULATION ENGINE
-# =============================================================================
 
-class CounterfactualSimulator:
-    """
-    Симулирует "что если бы мы применили вмешательство" на исторических данных.
+logger = get_logger(__name__)
 
-    Pipeline:
-    1. Select outcomes (window)
-    2. Freeze inputs
-    3. Apply virtual intervention
-    4. Recompute predictions
-    5. Recompute metrics
-    6. Compare before/after
-    """
+# Порядок столбцов в (N × 4) матрицах дельт
+DIMENSIONS = ("arousal", "valence", "focus", "confidence")
 
-    def simulate_intervention(
-        self,
-        intervention_id: str,
-        replay_window_days: int = 30
-    ) -> Optional[InterventionSimulation]:
-        """
-        Симулирует эффект вмешательства на исторических данных.
+# Коды tier (int8); "Rules(simulated)" - ML-прогноз, виртуально переведённый на Rules
+TIER_NAMES = ("ML", "Clusters", "Rules", "other", "Rules(simulated)")
+TIER_CODES = {name: code for code, name in enumerate(TIER_NAMES)}
+TIER_OTHER = TIER_CODES["other"]
 
-        Args:
-            intervention_id: ID кандидата для симуляции
-            replay_window_days: Окно исторических данных (дней)
+MIN_REPLAY_RECORDS = 10
+WORSEN_THRESHOLD = 0.02  # 2% worsening = side effect
 
-        Returns:
-            InterventionSimulation или None (если симуляция не удалась)
-        """
-        db = next(get_db())
 
-        try:
-            # 1. Load intervention candidate
-            stmt_candidate = select(InterventionCandidate).where(
-                InterventionCandidate.id == intervention_id
-            )
-            result_candidate = db.execute(stmt_candidate)
-            candidate = result_candidate.scalar_one_or_none()
+# =============================================================================
+# REPLAY WINDOW (columnar)
+# =============================================================================
 
-            if not candidate:
-                logger.info(f"⚠️  [Simulator] Candidate {intervention_id} not found")
-                return None
+@dataclass
+class ReplayEffect:
+    """
+    Result of a virtual intervention: only the rows it changes.
 
-            # 2. Get historical data (forecasts + outcomes)
-            window_start = datetime.now(timezone.utc) - timedelta(days=replay_window_days)
-
-            stmt_data = text("""
-                SELECT
-                    ef.id as forecast_id,
-                    ef.used_tier,
-                    ef.action_type,
-                    ef.predicted_deltas,
-                    ef.forecast_confidence,
-                    eo.actual_deltas,
-                    eo.outcome
-                FROM emotional_forecasts ef
-                JOIN emotional_outcomes eo ON eo.forecast_id = ef.id
-                WHERE ef.created_at >= :window_start
-                ORDER BY ef.created_at DESC
-                LIMIT 100
-            """)
-
-            result_data = db.execute(stmt_data, {"window_start": window_start})
-            historical_records = result_data.fetchall()
-
-            if len(historical_records) < 10:
-                logger.info(f"⚠️  [Simulator] Insufficient historical data: {len(historical_records)} records")
-                return None
+    predicted / confidence / tier are None when the intervention
+    leaves that column untouched.
+    """
+    rows: np.ndarray
+    predicted: Optional[np.ndarray] = None
+    confidence: Optional[np.ndarray] = None
+    tier: Optional[np.ndarray] = None
 
-            # 3. Compute metrics BEFORE intervention (baseline)
-            metrics_before = self._compute_metrics_on_records(historical_records)
 
-            # 4. Apply virtual intervention to records
-            modified_records = self._apply_intervention_to_records(
-                records=historical_records,
-                intervention=candidate
-            )
+@dataclass
+class ReplayWindow:
+    """
+    Frozen forecast/outcome history in columnar form.
 
-            # 5. Compute metrics AFTER intervention
-            metrics_after = self._compute_metrics_on_records(modified_records)
+    predicted, actual: (N, 4) float64 in DIMENSIONS order, NaN = absent
+    confidence: (N,) forecast_confidence
+    tier: (N,) int8 codes into TIER_NAMES
+    action: (N,) int32 codes into actions
+    """
+    predicted: np.ndarray
+    actual: np.ndarray
+    confidence: np.ndarray
+    tier: np.ndarray
+    action: np.ndarray
+    actions: List[str]
+    window_start: Optional[datetime] = None
+
+    # Per-row metric contributions (baseline), filled in __post_init__
+    row_correct: np.ndarray = field(init=False, repr=False)
+    row_abs_error: np.ndarray = field(init=False, repr=False)
+    row_pairs: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.row_correct, self.row_abs_error, self.row_pairs = _row_contributions(
+            self.predicted, self.actual
+        )
+
+    def __len__(self) -> int:
+        return len(self.confidence)
+
+    @classmethod
+    def from_columns(
+        cls,
+        tiers,
+        actions,
+        confidence,
+        predicted,
+        actual,
+        window_start: Optional[datetime] = None
+    ) -> "ReplayWindow":
+        """Build from column sequences (deltas: N rows × 4, None = absent)"""
+        count = len(confidence)
+        action_index: Dict[str, int] = {}
+        action_codes = np.fromiter(
+            (action_index.setdefault(a, len(action_index)) for a in actions),
+            dtype=np.int32, count=count
+        )
+        return cls(
+            predicted=np.array(predicted, dtype=np.float64).reshape(count, len(DIMENSIONS)),
+            actual=np.array(actual, dtype=np.float64).reshape(count, len(DIMENSIONS)),
+            confidence=np.array(confidence, dtype=np.float64).reshape(count),
+            tier=np.fromiter(
+                (TIER_CODES.get(t, TIER_OTHER) for t in tiers), dtype=np.int8, count=count
+            ),
+            action=action_codes,
+            actions=list(action_index),
+            window_start=window_start
+        )
+
+    @classmethod
+    def from_records(cls, records: list, window_start: Optional[datetime] = None) -> "ReplayWindow":
+        """
+        Build from row tuples
+        (forecast_id, used_tier, action_type, predicted_deltas, forecast_confidence, actual_deltas, outcome)
+        with deltas as dicts or JSON strings.
+        """
+        def deltas(value):
+            value = json.loads(value) if isinstance(value, str) else (value or {})
+            return [value.get(dim) for dim in DIMENSIONS]
+
+        return cls.from_columns(
+            tiers=[r[1] for r in records],
+            actions=[r[2] for r in records],
+            confidence=[r[4] for r in records],
+            predicted=[deltas(r[3]) for r in records],
+            actual=[deltas(r[5]) for r in records],
+            window_start=window_start
+        )
+
+    @classmethod
+    async def load(cls, db, window_start: datetime) -> "ReplayWindow":
+        """
+        Load the whole window in one query.
 
-            # 6. Compute delta
-            delta_metrics = self._compute_delta(metrics_before, metrics_after)
+        Deltas are unpacked by PostgreSQL (->>) so rows arrive as flat
+        floats - no per-row JSON decoding in Python.
+        """
+        predicted_cols = ", ".join(
+            f"(ef.predicted_deltas->>'{dim}')::float AS p_{dim}" for dim in DIMENSIONS
+        )
+        actual_cols = ", ".join(
+            f"(eo.actual_deltas->>'{dim}')::float AS a_{dim}" for dim in DIMENSIONS
+        )
+        stmt = text(f"""
+            SELECT
+                ef.used_tier,
+                ef.action_type,
+                ef.forecast_confidence,
+                {predicted_cols},
+                {actual_cols}
+            FROM emotional_forecasts ef
+            JOIN emotional_outcomes eo ON eo.forecast_id = ef.id
+            WHERE ef.created_at >= :window_start
+            ORDER BY ef.created_at DESC
+        """)
+
+        result = await db.execute(stmt, {"window_start": window_start})
+        rows = result.fetchall()
+
+        width = len(DIMENSIONS)
+        columns = list(zip(*rows)) if rows else [()] * (3 + 2 * width)
+        return cls.from_columns(
+            tiers=columns[0],
+            actions=columns[1],
+            confidence=columns[2],
+            predicted=np.array(columns[3:3 + width], dtype=np.float64).T,
+            actual=np.array(columns[3 + width:], dtype=np.float64).T,
+            window_start=window_start
+        )
+
+    def action_codes(self, names) -> np.ndarray:
+        """Codes of the given action types present in the window"""
+        index = {name: code for code, name in enumerate(self.actions)}
+        return np.array([index[n] for n in names if n in index], dtype=np.int32)
+
+    def select(self, scope: Dict) -> np.ndarray:
+        """Boolean row mask for a target_scope (tier / action / disable_context)"""
+        selected = np.ones(len(self), dtype=bool)
+
+        tier = scope.get("tier")
+        if tier and tier != "*":
+            selected &= self.tier == TIER_CODES.get(tier, TIER_OTHER)
+
+        actions = scope.get("disable_context", scope.get("action"))
+        if isinstance(actions, str):
+            actions = None if actions == "*" else [actions]
+        if actions:
+            selected &= np.isin(self.action, self.action_codes(actions))
+
+        return selected
+
+
+def _row_contributions(predicted: np.ndarray, actual: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-row (direction-correct dims, absolute error sum, compared dims).
 
-            # 7. Detect side effects (where things got worse)
-            side_effects = self._detect_side_effects(metrics_before, metrics_after)
+    Only dimensions present in both predicted and actual are compared.
+    """
+    compared = ~(np.isnan(predicted) | np.isnan(actual))
+    correct = (np.sign(predicted) == np.sign(actual)) & compared
+    abs_error = np.where(compared, np.abs(predicted - actual), 0.0)
+    return correct.sum(axis=1), abs_error.sum(axis=1), compared.sum(axis=1)
+
+
+def _metrics(
+    correct: np.ndarray,
+    abs_error: np.ndarray,
+    pairs: np.ndarray,
+    confidence_sum: float,
+    sample_count: int
+) -> Dict:
+    """
+    Metrics from per-tier sums (arrays indexed by tier code).
 
-            # 8. Generate determinism hash
-            determinism_hash = self._generate_determinism_hash(
-                intervention=candidate,
-                record_count=len(historical_records),
-                window_start=window_start
-            )
+    - direction_accuracy: % правильных направлений
+    - mae: средняя абсолютная ошибка
+    - calibration_gap: разрыв между confidence и accuracy
+    """
+    if sample_count == 0:
+        return {
+            "direction_accuracy": 0.0,
+            "mae": 0.0,
+            "calibration_gap": 0.0,
+            "sample_count": 0
+        }
 
-            # 9. Create simulation record
-            simulation = InterventionSimulation(
-                id=uuid.uuid4(),
-                intervention_id=intervention_id,
-                replay_window=timedelta(days=replay_window_days),
-                metrics_before=metrics_before,
-                metrics_after=metrics_after,
-                delta_metrics=delta_metrics,
-                side_effects=side_effects,
-                determinism_hash=determinism_hash,
-                created_at=datetime.now(timezone.utc)
-            )
+    total_pairs = pairs.sum()
+    direction_accuracy = correct.sum() / total_pairs if total_pairs > 0 else 0.0
+    mae = abs_error.sum() / total_pairs if total_pairs > 0 else 0.0
+    avg_confidence = confidence_sum / sample_count
+
+    by_tier = {}
+    for code, name in enumerate(TIER_NAMES):
+        if code < len(pairs) and pairs[code] > 0:
+            by_tier[name] = {
+                "direction_accuracy": round(float(correct[code] / pairs[code]), 4),
+                "mae": round(float(abs_error[code] / pairs[code]), 4),
+                "compared_dimensions": int(pairs[code])
+            }
 
-            db.add(simulation)
+    return {
+        "direction_accuracy": round(float(direction_accuracy), 4),
+        "mae": round(float(mae), 4),
+        # Calibration gap = stated confidence - observed accuracy
+        "calibration_gap": round(float(avg_confidence - direction_accuracy), 4),
+        "avg_confidence": round(float(avg_confidence), 4),
+        "sample_count": int(sample_count),
+        "by_tier": by_tier
+    }
 
-            # Update candidate status
-            candidate.status = "simulated"
 
-            db.commit()
+# =============================================================================
+# VECTORIZED INTERVENTIONS
+# =============================================================================
 
-            logger.info(f"🎮 [Simulator] Completed simulation for {candidate.intervention_type}")
-            logger.info(f"   Records: {len(historical_records)}")
-            logger.info(f"   Direction accuracy: {metrics_before['direction_accuracy']:.3f} → {metrics_after['direction_accuracy']:.3f}")
-            logger.info(f"   Delta: {delta_metrics.get('direction_accuracy', 0):.3f}")
-            logger.info(f"   Determinism hash: {determinism_hash}")
+def _adjust_confidence_scaling(window: ReplayWindow, scope: Dict) -> ReplayEffect:
+    # Scale down confidence
+    rows = np.flatnonzero(window.select(scope))
+    factor = scope.get("estimated_factor", 0.9)
+    return ReplayEffect(rows=rows, confidence=np.clip(window.confidence[rows] * factor, 0.0, 1.0))
 
-            return simulation
 
-        except Exception as e:
-            logger.info(f"⚠️  [Simulator] Simulation failed: {e}")
-            import traceback
-            traceback.print_exc()
-            db.rollback()
-            return None
+def _raise_arousal_guardrail(window: ReplayWindow, scope: Dict) -> ReplayEffect:
+    # Penalize high-arousal predictions: reduce magnitude of all dimensions
+    threshold = scope.get("proposed_threshold", 0.65)
+    arousal = np.nan_to_num(window.predicted[:, DIMENSIONS.index("arousal")], nan=0.0)
+    rows = np.flatnonzero((arousal > threshold) & window.select(scope))
+    return ReplayEffect(rows=rows, predicted=window.predicted[rows] * 0.5)
 
-        finally:
-            db.close()
 
-    def _compute_metrics_on_records(self, records: list) -> Dict:
-        """
-        Вычисляет метрики на наборе records.
+def _lower_tier_weight(window: ReplayWindow, scope: Dict) -> ReplayEffect:
+    # Tier weights only matter for tier selection, which is not replayed:
+    # report the affected rows, metrics stay unchanged
+    return ReplayEffect(rows=np.flatnonzero(window.select(scope)))
 
-        Metrics:
-        - direction_accuracy: % правильных направлений
-        - mae: средняя абсолютная ошибка
-        - calibration_gap: разрыв между confidence и accuracy
-        """
 
-        if not records:
-            return {
-                "direction_accuracy": 0.0,
-                "mae": 0.0,
-                "calibration_gap": 0.0,
-                "sample_count": 0
-            }
+def _disable_ml_for_context(window: ReplayWindow, scope: Dict) -> ReplayEffect:
+    # ML forecasts in the disabled context switch to Rules (simulated);
+    # the forecast itself is not re-run
+    scope = {**scope, "tier": "ML"}
+    rows = np.flatnonzero(window.select(scope))
+    return ReplayEffect(
+        rows=rows,
+        tier=np.full(len(rows), TIER_CODES["Rules(simulated)"], dtype=np.int8)
+    )
 
-        direction_correct = 0
-        mae_sum = 0.0
-        confidence_sum = 0.0
-        count = 0
 
-        for record in records:
-            # Extract data from record tuple
-            # (forecast_id, used_tier, action_type, predicted_deltas, forecast_confidence, actual_deltas, outcome)
-            predicted = json.loads(record[3]) if isinstance(record[3], str) else record[3]
-            actual = json.loads(record[5]) if isinstance(record[5], str) else record[5]
-            confidence = record[4]
+INTERVENTION_TRANSFORMS = {
+    "adjust_confidence_scaling": _adjust_confidence_scaling,
+    "raise_arousal_guardrail": _raise_arousal_guardrail,
+    "lower_tier_weight": _lower_tier_weight,
+    "disable_ml_for_context": _disable_ml_for_context,
+}
 
-            # Check direction correctness for each dimension
-            for dim in predicted:
-                if dim in actual:
-                    pred_sign = 1 if predicted[dim] > 0 else (-1 if predicted[dim] < 0 else 0)
-                    actual_sign = 1 if actual[dim] > 0 else (-1 if actual[dim] < 0 else 0)
 
-                    if pred_sign == actual_sign:
-                        direction_correct += 1
-                    count += 1
+# =============================================================================
+# SIMULATION ENGINE
+# =============================================================================
 
-            # Compute MAE
-            for dim in predicted:
-                if dim in actual:
-                    mae_sum += abs(predicted[dim] - actual[dim])
+class CounterfactualSimulator:
+    """
+    Симулирует "что если бы мы применили вмешательство" на исторических данных.
 
-            confidence_sum += confidence
+    Pipeline:
+    1. Select outcomes (window) - one columnar load
+    2. Freeze inputs
+    3. Apply virtual intervention (vectorized transform)
+    4. Recompute predictions
+    5. Recompute metrics (only changed rows)
+    6. Compare before/after
+    """
 
-        # Compute aggregated metrics
-        direction_accuracy = direction_correct / count if count > 0 else 0.0
-        mae = mae_sum / count if count > 0 else 0.0
-        avg_confidence = confidence_sum / len(records) if records else 0.0
+    async def load_window(self, replay_window_days: int = 30) -> ReplayWindow:
+        """Загружает окно replay (один запрос) для нескольких симуляций"""
+        window_start = datetime.now(timezone.utc) - timedelta(days=replay_window_days)
+        async with AsyncSessionLocal() as db:
+            return await ReplayWindow.load(db, window_start)
 
-        # Calibration gap = stated confidence - observed accuracy
-        calibration_gap = avg_confidence - direction_accuracy
+    async def simulate_intervention(
+        self,
+        intervention_id: str,
+        replay_window_days: int = 30,
+        window: Optional[ReplayWindow] = None
+    ) -> Optional[InterventionSimulation]:
+        """
+        Симулирует эффект вмешательства на исторических данных.
 
-        return {
-            "direction_accuracy": round(direction_accuracy, 4),
-            "mae": round(mae, 4),
-            "calibration_gap": round(calibration_gap, 4),
-            "avg_confidence": round(avg_confidence, 4),
-            "sample_count": len(records)
-        }
+        Args:
+            intervention_id: ID кандидата для симуляции
+            replay_window_days: Окно исторических данных (дней)
+            window: Уже загруженное окно (load_window), иначе загружается
 
-    def _apply_intervention_to_records(
+        Returns:
+            InterventionSimulation или None (если симуляция не удалась)
+        """
+        async with AsyncSessionLocal() as db:
+            try:
+                # 1. Load intervention candidate
+                stmt_candidate = select(InterventionCandidate).where(
+                    InterventionCandidate.id == intervention_id
+                )
+                result_candidate = await db.execute(stmt_candidate)
+                candidate = result_candidate.scalar_one_or_none()
+
+                if not candidate:
+                    logger.info(f"⚠️  [Simulator] Candidate {intervention_id} not found")
+                    return None
+
+                # 2. Get historical data (forecasts + outcomes) - whole window
+                if window is None:
+                    window_start = datetime.now(timezone.utc) - timedelta(days=replay_window_days)
+                    window = await ReplayWindow.load(db, window_start)
+                window_start = window.window_start
+
+                if len(window) < MIN_REPLAY_RECORDS:
+                    logger.info(f"⚠️  [Simulator] Insufficient historical data: {len(window)} records")
+                    return None
+
+                # 3-7. Replay
+                metrics_before = self.compute_baseline(window)
+                replay = self.replay(window, candidate, metrics_before)
+
+                # 8. Generate determinism hash
+                determinism_hash = self._generate_determinism_hash(
+                    intervention=candidate,
+                    record_count=len(window),
+                    window_start=window_start
+                )
+
+                # 9. Create simulation record
+                simulation = InterventionSimulation(
+                    id=uuid.uuid4(),
+                    intervention_id=intervention_id,
+                    replay_window=timedelta(days=replay_window_days),
+                    metrics_before=metrics_before,
+                    metrics_after=replay["metrics_after"],
+                    delta_metrics=replay["delta_metrics"],
+                    side_effects=replay["side_effects"],
+                    determinism_hash=determinism_hash,
+                    created_at=datetime.now(timezone.utc)
+                )
+
+                db.add(simulation)
+
+                # Update candidate status
+                candidate.status = "simulated"
+
+                await db.commit()
+
+                logger.info(f"🎮 [Simulator] Completed simulation for {candidate.intervention_type}")
+                logger.info(f"   Records: {len(window)} (affected: {replay['affected_records']})")
+                logger.info(f"   Direction accuracy: {metrics_before['direction_accuracy']:.3f} → {replay['metrics_after']['direction_accuracy']:.3f}")
+                logger.info(f"   Delta: {replay['delta_metrics'].get('direction_accuracy', 0):.3f}")
+                logger.info(f"   Determinism hash: {determinism_hash}")
+
+                return simulation
+
+            except Exception as e:
+                logger.info(f"⚠️  [Simulator] Simulation failed: {e}")
+                import traceback
+                traceback.print_exc()
+                await db.rollback()
+                return None
+
+    async def compare_candidates(
         self,
-        records: list,
-        intervention: InterventionCandidate
-    ) -> list:
+        status: str = "proposed",
+        replay_window_days: int = 30,
+        window: Optional[ReplayWindow] = None
+    ) -> Dict:
         """
-        Применяет виртуальное вмешательство к records.
+        Replays ALL candidates with the given status against one window load.
 
-        Модифицирует predicted_deltas или forecast_confidence
-        в зависимости от типа вмешательства.
+        Nothing is persisted - this is a ranking for review.
 
-        ВАЖНО: НЕ сохраняет в БД — только в памяти.
+        Returns:
+            Dict: metrics_before and per-candidate results, best
+            direction_accuracy gain first
         """
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(InterventionCandidate)
+                .where(InterventionCandidate.status == status)
+                .order_by(InterventionCandidate.created_at.desc())
+            )
+            result = await db.execute(stmt)
+            candidates = result.scalars().all()
 
-        modified_records = []
+            if window is None:
+                window_start = datetime.now(timezone.utc) - timedelta(days=replay_window_days)
+                window = await ReplayWindow.load(db, window_start)
 
-        for record in records:
-            # Convert to list for modification
-            record_list = list(record)
+        if len(window) < MIN_REPLAY_RECORDS:
+            return {
+                "record_count": len(window),
+                "metrics_before": None,
+                "candidates": [],
+                "error": f"Insufficient historical data: {len(window)} records"
+            }
 
-            predicted = json.loads(record[3]) if isinstance(record[3], str) else record[3]
-            confidence = record[4]
+        return self.replay_many(window, candidates)
 
-            # Apply intervention based on type
-            if intervention.intervention_type == "adjust_confidence_scaling":
-                # Scale down confidence
-                scaling_factor = intervention.target_scope.get("estimated_factor", 0.9)
-                new_confidence = confidence * scaling_factor
-                record_list[4] = max(0.0, min(1.0, new_confidence))
+    def compute_baseline(self, window: ReplayWindow) -> Dict:
+        """Метрики на окне ДО вмешательства"""
+        return _metrics(*self._baseline_sums(window), sample_count=len(window))
 
-            elif intervention.intervention_type == "raise_arousal_guardrail":
-                # Modify predicted deltas if arousal is high
-                proposed_threshold = intervention.target_scope.get("proposed_threshold", 0.65)
-                arousal_pred = predicted.get("arousal", 0)
+    def replay(
+        self,
+        window: ReplayWindow,
+        intervention: InterventionCandidate,
+        metrics_before: Optional[Dict] = None,
+        baseline_sums: Optional[Tuple] = None
+    ) -> Dict:
+        """
+        Применяет виртуальное вмешательство к окну и пересчитывает метрики.
 
-                if arousal_pred > proposed_threshold:
-                    # Penalize high-arousal predictions
-                    for dim in predicted:
-                        predicted[dim] *= 0.5  # Reduce magnitude
-                    record_list[3] = json.dumps(predicted)
+        ВАЖНО: НЕ сохраняет в БД — только в памяти; окно не изменяется.
+        """
+        if metrics_before is None:
+            metrics_before = self.compute_baseline(window)
+        if baseline_sums is None:
+            baseline_sums = self._baseline_sums(window)
+        correct, abs_error, pairs, confidence_sum = baseline_sums
+
+        transform = INTERVENTION_TRANSFORMS.get(intervention.intervention_type)
+        effect = transform(window, intervention.target_scope or {}) if transform else None
+
+        if effect is not None and len(effect.rows):
+            rows = effect.rows
+            tiers = len(TIER_NAMES)
+            old_tier = window.tier[rows]
+            new_tier = old_tier if effect.tier is None else effect.tier
+
+            # Remove the old contributions of changed rows, add the new ones
+            if effect.predicted is not None:
+                new_correct, new_abs_error, new_pairs = _row_contributions(
+                    effect.predicted, window.actual[rows]
+                )
+            else:
+                new_correct = window.row_correct[rows]
+                new_abs_error = window.row_abs_error[rows]
+                new_pairs = window.row_pairs[rows]
+
+            def moved(before, old_values, new_values):
+                return (
+                    before
+                    - np.bincount(old_tier, weights=old_values, minlength=tiers)
+                    + np.bincount(new_tier, weights=new_values, minlength=tiers)
+                )
+
+            correct = moved(correct, window.row_correct[rows], new_correct)
+            abs_error = moved(abs_error, window.row_abs_error[rows], new_abs_error)
+            pairs = moved(pairs, window.row_pairs[rows], new_pairs)
+            if effect.confidence is not None:
+                confidence_sum = confidence_sum - window.confidence[rows].sum() + effect.confidence.sum()
+
+        metrics_after = _metrics(correct, abs_error, pairs, float(confidence_sum), len(window))
+        affected = int(len(effect.rows)) if effect is not None else 0
+        metrics_after["affected_records"] = affected
 
-            elif intervention.intervention_type == "lower_tier_weight":
-                # This is more complex — for now just mark as "would affect"
-                # In real implementation, this would change tier selection logic
-                pass
+        return {
+            "intervention_id": str(intervention.id),
+            "intervention_type": intervention.intervention_type,
+            "affected_records": affected,
+            "metrics_after": metrics_after,
+            "delta_metrics": self._compute_delta(metrics_before, metrics_after),
+            "side_effects": self._detect_side_effects(metrics_before, metrics_after)
+        }
+
+    def replay_many(self, window: ReplayWindow, interventions: list) -> Dict:
+        """
+        Replays many candidates on the same frozen window in one pass.
 
-            elif intervention.intervention_type == "disable_ml_for_context":
-                # If ML tier, switch to rules (simplified)
-                if record[1] == "ML":
-                    # In real simulation, this would re-run forecast with Rules tier
-                    # For now, just mark as modified
-                    record_list[1] = "Rules(simulated)"
+        The baseline (per-row contributions, per-tier sums) is computed once;
+        each candidate costs O(rows it changes).
+        """
+        metrics_before = self.compute_baseline(window)
+        baseline_sums = self._baseline_sums(window)
+
+        results = [
+            self.replay(window, intervention, metrics_before, baseline_sums)
+            for intervention in interventions
+        ]
+        results.sort(key=lambda r: (
+            -r["delta_metrics"].get("direction_accuracy", 0.0),
+            r["delta_metrics"].get("mae", 0.0),
+            r["side_effects"] is not None
+        ))
 
-            modified_records.append(tuple(record_list))
+        return {
+            "record_count": len(window),
+            "metrics_before": metrics_before,
+            "candidates": results
+        }
 
-        return modified_records
+    @staticmethod
+    def _baseline_sums(window: ReplayWindow) -> Tuple:
+        tiers = len(TIER_NAMES)
+        return (
+            np.bincount(window.tier, weights=window.row_correct, minlength=tiers),
+            np.bincount(window.tier, weights=window.row_abs_error, minlength=tiers),
+            np.bincount(window.tier, weights=window.row_pairs, minlength=tiers),
+            float(window.confidence.sum())
+        )
 
     def _compute_delta(self, before: Dict, after: Dict) -> Dict:
         """Вычисляет разницу между метриками (after - before)."""
@@ -295,38 +578,39 @@ class CounterfactualSimulator:
 
         return delta
 
-    def _detect_side_effects(self, before: Dict, after: Dict) -> Dict:
+    def _detect_side_effects(self, before: Dict, after: Dict) -> Optional[Dict]:
         """
         Обнаруживает негативные побочные эффекты.
 
-        Side effect: метрика стала значительно хуже.
+        Side effect: метрика стала значительно хуже - в целом или для
+        отдельного tier (улучшение в среднем может скрывать ухудшение в tier).
         """
 
         side_effects = {}
 
-        WORSEN_THRESHOLD = 0.02  # 2% worsening = side effect
-
-        for key in before:
-            if isinstance(before[key], (int, float)):
-                delta = after.get(key, 0) - before[key]
-
-                # For MAE and calibration_gap: lower is better
-                if key in ["mae", "calibration_gap"]:
-                    if delta > WORSEN_THRESHOLD:
-                        side_effects[key] = {
-                            "before": before[key],
-                            "after": after[key],
-                            "delta": round(delta, 4)
-                        }
-
-                # For direction_accuracy: higher is better
-                elif key == "direction_accuracy":
-                    if delta < -WORSEN_THRESHOLD:
-                        side_effects[key] = {
-                            "before": before[key],
-                            "after": after[key],
-                            "delta": round(delta, 4)
-                        }
+        def check(key: str, metric: str, b: Dict, a: Dict):
+            if metric not in b or metric not in a:
+                return
+            delta = a[metric] - b[metric]
+
+            # For MAE and calibration_gap: lower is better
+            # For direction_accuracy: higher is better
+            worse = delta > WORSEN_THRESHOLD if metric in ("mae", "calibration_gap") else delta < -WORSEN_THRESHOLD
+            if worse:
+                side_effects[key] = {
+                    "before": b[metric],
+                    "after": a[metric],
+                    "delta": round(delta, 4)
+                }
+
+        for metric in ("direction_accuracy", "mae", "calibration_gap"):
+            check(metric, metric, before, after)
+
+        after_tiers = after.get("by_tier", {})
+        for tier, tier_before in before.get("by_tier", {}).items():
+            if tier in after_tiers:
+                for metric in ("direction_accuracy", "mae"):
+                    check(f"{tier}.{metric}", metric, tier_before, after_tiers[tier])
 
         return side_effects if side_effects else None
 
@@ -353,20 +637,18 @@ class CounterfactualSimulator:
         hash_string = json.dumps(hash_input, sort_keys=True)
         return hashlib.sha256(hash_string.encode()).hexdigest()
 
-    def get_simulation(self, intervention_id: str) -> Optional[Dict]:
+    async def get_simulation(self, intervention_id: str) -> Optional[Dict]:
         """
         Get simulation results for intervention.
 
         Returns:
             Dict with simulation details or None
         """
-        db = next(get_db())
-
-        try:
+        async with AsyncSessionLocal() as db:
             stmt = select(InterventionSimulation).where(
                 InterventionSimulation.intervention_id == intervention_id
             )
-            result = db.execute(stmt)
+            result = await db.execute(stmt)
             simulation = result.scalar_one_or_none()
 
             if not simulation:
@@ -384,9 +666,6 @@ class CounterfactualSimulator:
                 "created_at": simulation.created_at.isoformat() if simulation.created_at else None
             }
 
-        finally:
-            db.close()
-
 
 # =============================================================================
 # GLOBAL INSTANCE
@@ -7,11 +7,117 @@ EMOTIONAL ERROR STORE - Forecast Error History
 - tier (ML/Clusters/Rules)
 - confidence
 - errors по каждой размерности
+
+Метрики (action_type, tier) поддерживаются онлайн: окно последних
+записей ключа + скользящие суммы, обновляются в record() за O(1).
+Окна сохраняются в Redis (save_snapshot / load_snapshot) и переживают рестарт.
 """
 
-from typing import Dict, List, Optional
+import json
+import os
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timezone
 
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+SNAPSHOT_KEY = "emotional:error_stats"
+
+# Окно метрик по ключу (совпадает с limit=50 get_metrics_for_key / TierReliabilityTracker)
+STATS_WINDOW = 50
+
+# Запись окна: (sum abs, sum signed, direction matches, dimensions)
+Entry = Tuple[float, float, int, int]
+
+
+def _empty_metrics() -> Dict[str, float]:
+    return {
+        "direction_acc": 0.0,
+        "mae": 0.0,
+        "bias": 0.0,
+        "sample_count": 0
+    }
+
+
+class RollingErrorStats:
+    """
+    Скользящие метрики одного (action_type, tier).
+
+    Фиксированное окно последних записей и суммы по нему:
+    добавление с вытеснением - O(1), metrics() - O(1).
+    """
+
+    __slots__ = ("entries", "abs_sum", "signed_sum", "matches", "dims", "_updates")
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.entries: Deque[Entry] = deque(maxlen=window)
+        self.abs_sum = 0.0
+        self.signed_sum = 0.0
+        self.matches = 0
+        self.dims = 0
+        self._updates = 0
+
+    @staticmethod
+    def entry_from_errors(errors: Dict[str, Dict[str, float]]) -> Entry:
+        abs_sum = signed_sum = 0.0
+        matches = 0
+        for dim_err in errors.values():
+            abs_sum += dim_err["abs"]
+            signed_sum += dim_err["signed"]
+            matches += 1 if dim_err["direction_match"] else 0
+        return abs_sum, signed_sum, matches, len(errors)
+
+    def add(self, entry: Entry):
+        if len(self.entries) == self.entries.maxlen:
+            old_abs, old_signed, old_matches, old_dims = self.entries[0]
+            self.abs_sum -= old_abs
+            self.signed_sum -= old_signed
+            self.matches -= old_matches
+            self.dims -= old_dims
+        self.entries.append(entry)
+        self.abs_sum += entry[0]
+        self.signed_sum += entry[1]
+        self.matches += entry[2]
+        self.dims += entry[3]
+
+        # Периодический пересчёт - без накопления ошибки округления
+        self._updates += 1
+        if self._updates >= self.entries.maxlen:
+            self._resum()
+
+    def _resum(self):
+        self.abs_sum = sum(e[0] for e in self.entries)
+        self.signed_sum = sum(e[1] for e in self.entries)
+        self.matches = sum(e[2] for e in self.entries)
+        self.dims = sum(e[3] for e in self.entries)
+        self._updates = 0
+
+    def metrics(self) -> Dict[str, float]:
+        n = self.dims
+        if n == 0:
+            return _empty_metrics()
+        return {
+            "direction_acc": round(self.matches / n, 4),
+            "mae": round(self.abs_sum / n, 4),
+            "bias": round(self.signed_sum / n, 4),
+            "sample_count": n
+        }
+
+    def to_list(self) -> List[List]:
+        return [list(e) for e in self.entries]
+
+    @classmethod
+    def from_list(cls, entries: List[List], window: int = STATS_WINDOW) -> "RollingErrorStats":
+        stats = cls(window)
+        for abs_sum, signed_sum, matches, dims in entries[-window:]:
+            stats.entries.append((float(abs_sum), float(signed_sum), int(matches), int(dims)))
+        stats._resum()
+        return stats
+
 
 class EmotionalErrorStore:
     """
@@ -27,9 +133,23 @@ class EmotionalErrorStore:
     - errors (signed, abs, direction_match)
     """
 
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, stats_window: int = STATS_WINDOW, redis_client=None):
         self.max_history = max_history
-        self.history: List[Dict] = []
+        self.history: Deque[Dict] = deque(maxlen=max_history)
+
+        # Онлайн метрики по (action_type, tier)
+        self.stats_window = stats_window
+        self.stats: Dict[Tuple[str, str], RollingErrorStats] = {}
+        self._changed: Set[Tuple[str, str]] = set()   # для TierReliabilityTracker
+        self._unsaved: Set[Tuple[str, str]] = set()   # для save_snapshot
+        self._redis = redis_client
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+        return self._redis
 
     def record(
         self,
@@ -61,11 +181,21 @@ class EmotionalErrorStore:
             "risk_flag_triggered": risk_flag_triggered
         }
 
+        # deque(maxlen) сам вытесняет старые записи
         self.history.append(record)
 
-        # Ограничиваем размер истории
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
+        key = (action_type, tier)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RollingErrorStats(self.stats_window)
+        stats.add(RollingErrorStats.entry_from_errors(errors))
+        self._changed.add(key)
+        self._unsaved.add(key)
+
+    def take_changed(self) -> Set[Tuple[str, str]]:
+        """Ключи (action_type, tier), обновлённые с прошлого вызова"""
+        changed, self._changed = self._changed, set()
+        return changed
 
     def get_recent(
         self,
@@ -81,19 +211,14 @@ class EmotionalErrorStore:
             tier: Фильтр по tier
             limit: Максимум записей
         """
-        records = self.history
-
-        # Фильтруем
-        if action_type:
-            records = [r for r in records if r["action_type"] == action_type]
-
-        if tier:
-            records = [r for r in records if r["tier"] == tier]
+        # История append-only: с конца = новые сначала, без сортировки
+        records = (
+            r for r in reversed(self.history)
+            if (not action_type or r["action_type"] == action_type)
+            and (not tier or r["tier"] == tier)
+        )
 
-        # Сортируем по timestamp (новые сначала)
-        records = sorted(records, key=lambda x: x["timestamp"], reverse=True)
-
-        return records[:limit]
+        return list(islice(records, limit))
 
     def get_metrics_for_key(
         self,
@@ -111,16 +236,17 @@ class EmotionalErrorStore:
                 "bias": -0.03,
                 "sample_count": 45
             }
+
+        limit == stats_window → O(1) из онлайн окна, иначе пересчёт по history.
         """
+        if limit == self.stats_window:
+            stats = self.stats.get((action_type, tier))
+            return stats.metrics() if stats is not None else _empty_metrics()
+
         records = self.get_recent(action_type=action_type, tier=tier, limit=limit)
 
         if not records:
-            return {
-                "direction_acc": 0.0,
-                "mae": 0.0,
-                "bias": 0.0,
-                "sample_count": 0
-            }
+            return _empty_metrics()
 
         # Агрегируем по всем записям
         all_abs_errors = []
@@ -135,12 +261,7 @@ class EmotionalErrorStore:
 
         n = len(all_abs_errors)
         if n == 0:
-            return {
-                "direction_acc": 0.0,
-                "mae": 0.0,
-                "bias": 0.0,
-                "sample_count": 0
-            }
+            return _empty_metrics()
 
         direction_acc = sum(all_direction_matches) / n
         mae = sum(all_abs_errors) / n
@@ -242,6 +363,52 @@ class EmotionalErrorStore:
             "alternative_mae": round(best_mae, 4)
         }
 
+    # =========================================================================
+    # SNAPSHOT (Redis)
+    # =========================================================================
+
+    async def save_snapshot(self) -> int:
+        """
+        Сохраняет окна ключей, изменённых с прошлого снапшота.
+
+        Returns:
+            Количество сохранённых ключей
+        """
+        if not self._unsaved:
+            return 0
+        keys, self._unsaved = self._unsaved, set()
+        mapping = {
+            f"{action_type}|{tier}": json.dumps(self.stats[(action_type, tier)].to_list())
+            for action_type, tier in keys
+        }
+        try:
+            await self.redis.hset(SNAPSHOT_KEY, mapping=mapping)
+        except Exception as e:
+            self._unsaved |= keys
+            logger.warning("error_stats_snapshot_failed", error=str(e), keys=len(keys))
+            return 0
+        return len(mapping)
+
+    async def load_snapshot(self) -> int:
+        """
+        Восстанавливает окна после рестарта (ключи, уже записанные
+        в этом процессе, не перезаписываются).
+
+        Returns:
+            Количество восстановленных ключей
+        """
+        snapshot = await self.redis.hgetall(SNAPSHOT_KEY)
+        restored = 0
+        for field, value in snapshot.items():
+            action_type, _, tier = field.rpartition("|")
+            key = (action_type, tier)
+            if key in self.stats:
+                continue
+            self.stats[key] = RollingErrorStats.from_list(json.loads(value), self.stats_window)
+            self._changed.add(key)
+            restored += 1
+        return restored
+
 
 # =============================================================================
 # GLOBAL INSTANCE
@@ -183,8 +183,9 @@ class EmotionalFeedbackLoop:
                             risk_flag_triggered=bool(forecast.risk_flags)
                         )
 
-                        # 6. Обновляем надежность tiers
+                        # 6. Обновляем надежность tiers (только изменившийся ключ)
                         tier_reliability_tracker.update_reliability(emotional_error_store)
+                        await emotional_error_store.save_snapshot()
 
                         logger.info(f"📊 [Self-Eval] Recorded forecast error:")
                         logger.info(f"   Forecast: {forecast.id}")
@@ -235,7 +236,7 @@ class EmotionalFeedbackLoop:
                         for candidate in new_candidates:
                             try:
                                 # 1. Run simulation
-                                simulation = counterfactual_simulator.simulate_intervention(
+                                simulation = await counterfactual_simulator.simulate_intervention(
                                     intervention_id=str(candidate.id),
                                     replay_window_days=30
                                 )
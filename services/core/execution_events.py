@@ -142,6 +142,21 @@ class ExecutionEventEmitter:
     стандартизированных событий.
     """
 
+    def _emit(self, event: ExecutionEvent) -> ExecutionEvent:
+        """Publish event to the change feed (/ui/stream) and return it."""
+        from change_feed import publish_nowait, EXECUTION_PROGRESS
+
+        publish_nowait(EXECUTION_PROGRESS, {
+            "nodeId": str(event.goal_id),
+            "goalId": str(event.goal_id),
+            "eventId": event.event_id,
+            "eventType": event.event_type.value,
+            "stepId": event.step_id,
+            "result": event.result,
+            "message": event.message,
+        })
+        return event
+
     def _create_event_id(self) -> str:
         """Generate unique event ID."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:21]
@@ -158,7 +173,7 @@ class ExecutionEventEmitter:
         context: Optional[Dict[str, Any]] = None
     ) -> ExecutionEvent:
         """Emit step started event."""
-        return ExecutionEvent(
+        return self._emit(ExecutionEvent(
             event_id=self._create_event_id(),
             event_type=ExecutionEventType.STEP_STARTED,
             goal_id=goal_id,
@@ -169,7 +184,7 @@ class ExecutionEventEmitter:
             message=f"Step {step_number} started: {step_id}",
             agent_role=agent_role,
             context=context or {}
-        )
+        ))
 
     def emit_step_completed(
         self,
@@ -183,7 +198,7 @@ class ExecutionEventEmitter:
         context: Optional[Dict[str, Any]] = None
     ) -> ExecutionEvent:
         """Emit step completed event."""
-        return ExecutionEvent(
+        return self._emit(ExecutionEvent(
             event_id=self._create_event_id(),
             event_type=ExecutionEventType.STEP_COMPLETED,
             goal_id=goal_id,
@@ -196,7 +211,7 @@ class ExecutionEventEmitter:
             artifacts=artifacts or [],
             metrics=metrics or {},
             context=context or {}
-        )
+        ))
 
     def emit_step_failed(
         self,
@@ -211,7 +226,7 @@ class ExecutionEventEmitter:
         context: Optional[Dict[str, Any]] = None
     ) -> ExecutionEvent:
         """Emit step failed event."""
-        return ExecutionEvent(
+        return self._emit(ExecutionEvent(
             event_id=self._create_event_id(),
             event_type=ExecutionEventType.STEP_FAILED,
             goal_id=goal_id,
@@ -225,7 +240,7 @@ class ExecutionEventEmitter:
             error_message=error_message,
             error_traceback=error_traceback,
             context=context or {}
-        )
+        ))
 
     def emit_goal_completed(
         self,
@@ -239,7 +254,7 @@ class ExecutionEventEmitter:
         context: Optional[Dict[str, Any]] = None
     ) -> ExecutionEvent:
         """Emit goal completed event."""
-        return ExecutionEvent(
+        return self._emit(ExecutionEvent(
             event_id=self._create_event_id(),
             event_type=ExecutionEventType.GOAL_COMPLETED,
             goal_id=goal_id,
@@ -255,7 +270,7 @@ class ExecutionEventEmitter:
                 "success_rate": steps_completed / steps_total if steps_total > 0 else 0.0
             },
             context=context or {}
-        )
+        ))
 
     def emit_goal_failed(
         self,
@@ -269,7 +284,7 @@ class ExecutionEventEmitter:
         context: Optional[Dict[str, Any]] = None
     ) -> ExecutionEvent:
         """Emit goal failed event."""
-        return ExecutionEvent(
+        return self._emit(ExecutionEvent(
             event_id=self._create_event_id(),
             event_type=ExecutionEventType.GOAL_FAILED,
             goal_id=goal_id,
@@ -284,7 +299,7 @@ class ExecutionEventEmitter:
             error_type=error_type,
             error_message=error_message,
             context=context or {}
-        )
+        ))
 
     def emit_error(
         self,
@@ -297,7 +312,7 @@ class ExecutionEventEmitter:
         context: Optional[Dict[str, Any]] = None
     ) -> ExecutionEvent:
         """Emit error event."""
-        return ExecutionEvent(
+        return self._emit(ExecutionEvent(
             event_id=self._create_event_id(),
             event_type=event_type,
             goal_id=goal_id,
@@ -308,7 +323,7 @@ class ExecutionEventEmitter:
             error_message=error_message,
             error_traceback=error_traceback,
             context=context or {}
-        )
+        ))
 
 
 # =============================================================================
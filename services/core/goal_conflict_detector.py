@@ -17,12 +17,17 @@ NS1/NS2: "Goal Linking (Связывание целей)" - строит вза
 
 from typing import List, Dict, Optional, Tuple
 from sqlalchemy import select, and_
+from sqlalchemy.orm import aliased
 from database import AsyncSessionLocal
 from models import Goal, GoalRelation, GoalConflict, UserProfile, UserValue
+from goal_conflict_index import ConflictRules, GoalConflictIndex, ACTIVE_STATES
+from logging_config import get_logger
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
 
+logger = get_logger(__name__)
+
 
 # =============================================================================
 # Pydantic Schemas
@@ -91,11 +96,46 @@ class GoalConflictDetector:
         ("больше отдыха", "повысить продуктивность"),
     ]
 
+    # Severity / описание / предложение по типу конфликта
+    CONFLICT_TEMPLATES = {
+        "mutually_exclusive": (
+            "critical",
+            "Цели '{t1}' и '{t2}' являются взаимоисключающими",
+            "Выберите одну из целей: '{t1}' ИЛИ '{t2}', но не обе одновременно"
+        ),
+        "resource": (
+            "medium",
+            "Обе цели требуют ограниченных ресурсов: '{t1}' и '{t2}'",
+            "Приоритизировать одну цель и отложить другую, или найти способ распределить ресурсы"
+        ),
+        "time": (
+            "low",
+            "Обе цели требуют регулярного времени: '{t1}' и '{t2}'",
+            "Разнести по времени или объединить в один routine"
+        ),
+    }
+
+    def __init__(self, index: GoalConflictIndex = None):
+        self.rules = ConflictRules(
+            self.MUTUALLY_EXCLUSIVE_PAIRS, self.RESOURCE_KEYWORDS, self.TIME_KEYWORDS
+        )
+        self.index = index or GoalConflictIndex(self.rules)
+        self.index.install()
+
+    @staticmethod
+    def _active_top_level():
+        """Цели, с которыми проверяются конфликты по умолчанию"""
+        return and_(Goal.parent_id == None, Goal.status.in_(ACTIVE_STATES))  # noqa: E711
+
     async def check_goal_conflicts(self, goal_id: str,
                                   check_against: List[str] = None) -> ConflictDetectionResult:
         """
         Проверить цель на конфликты с другими целями.
 
+        Сравнивается только с кандидатами из GoalConflictIndex (цели с
+        ключевыми словами парных правил) и с целями, для которых конфликт
+        уже записан. Постоянное число запросов, одна транзакция.
+
         Args:
             goal_id: ID цели для проверки
             check_against: Список ID целей для проверки (если None - проверить со всеми активными)
@@ -112,27 +152,63 @@ class GoalConflictDetector:
             if not goal:
                 return ConflictDetectionResult(has_conflicts=False, conflicts=[])
 
-            # Получить цели для проверки
+            tags = self.rules.tags(goal.title)
+
+            # Область проверки и кандидаты
             if check_against is None:
-                # Все активные goals (без user_id - проверяем все топ-уровневые)
-                stmt_other = select(Goal)\
-                    .where(Goal.id != goal_id)\
-                    .where(Goal.parent_id == None)\
-                    .where(Goal.status.in_(["active", "pending", "in_progress"]))
-                result_other = await db.execute(stmt_other)
-                other_goals = result_other.scalars().all()
+                # Все активные top-level goals (без user_id), кандидаты - из индекса
+                await self.index.ensure_fresh()
+                scope = and_(self._active_top_level(), Goal.id != goal.id)
+                candidate_ids = self.index.candidates(tags) - {goal.id}
             else:
-                stmt_other = select(Goal).where(Goal.id.in_(check_against))
-                result_other = await db.execute(stmt_other)
-                other_goals = result_other.scalars().all()
+                scope = Goal.id.in_(check_against)
+                candidate_ids = None
+
+            # Уже записанные конфликты (goal_1 = проверяемая цель) - один запрос
+            stmt_existing = select(GoalConflict, Goal)\
+                .join(Goal, Goal.id == GoalConflict.goal_2_id)\
+                .where(GoalConflict.goal_1_id == goal.id)\
+                .where(scope)
+            existing = {}
+            for conflict, other_goal in (await db.execute(stmt_existing)).all():
+                # Нерешённый конфликт важнее решённого
+                current = existing.get(other_goal.id)
+                if current is None or current[0].status == "resolved":
+                    existing[other_goal.id] = (conflict, other_goal)
 
             conflicts = []
+            for conflict, other_goal in existing.values():
+                if conflict.status != "resolved":
+                    conflicts.append(self._conflict_dict(
+                        conflict.id, goal, other_goal, conflict.conflict_type, conflict.severity,
+                        conflict.description, conflict.resolution_suggestion, conflict.status
+                    ))
+
+            # Кандидаты без открытого конфликта - проверить правила
+            open_ids = {other_id for other_id, (c, _) in existing.items() if c.status != "resolved"}
+            if candidate_ids is None or candidate_ids - open_ids:
+                stmt_other = select(Goal).where(scope)
+                if candidate_ids is not None:
+                    stmt_other = stmt_other.where(Goal.id.in_(candidate_ids - open_ids))
+                other_goals = (await db.execute(stmt_other)).scalars().all()
+            else:
+                other_goals = []
 
-            # Проверить каждую пару
+            changed = False
             for other_goal in other_goals:
-                conflict = await self._detect_conflict_between(db, goal, other_goal)
-                if conflict:
-                    conflicts.append(conflict)
+                if other_goal.id in open_ids:
+                    continue
+                conflict_type = self.rules.match(tags, self.rules.tags(other_goal.title))
+                if not conflict_type:
+                    continue
+                previous = existing.get(other_goal.id)
+                conflicts.append(self._record_conflict(
+                    db, goal, other_goal, conflict_type, previous[0] if previous else None
+                ))
+                changed = True
+
+            if changed:
+                await db.commit()
 
             # Определить общий severity
             if not conflicts:
@@ -152,124 +228,94 @@ class GoalConflictDetector:
                 severity=severity
             )
 
-    async def _detect_conflict_between(self, db, goal_1: Goal, goal_2: Goal) -> Optional[Dict]:
+    async def scan_conflicts(self) -> Dict:
         """
-        Обнаружить конфликт между двумя целями.
+        Batch-проверка всех активных top-level целей.
+
+        Пары перечисляются по posting lists индекса (только цели с общими
+        правилами), затем одним запросом загружаются их цели и уже
+        записанные конфликты. Новые конфликты записываются одной
+        транзакцией; существующие (в т.ч. resolved) не переоткрываются.
 
         Returns:
-            Dict с описанием конфликта или None
+            {"candidate_pairs": int, "created": int}
         """
-        # 1. Проверить уже обнаруженные конфликты
-        stmt_existing = select(GoalConflict).where(
-            and_(
-                GoalConflict.goal_1_id == goal_1.id,
-                GoalConflict.goal_2_id == goal_2.id,
-                GoalConflict.status != "resolved"
-            )
-        )
-        result_existing = await db.execute(stmt_existing)
-        existing = result_existing.scalar_one_or_none()
-
-        if existing:
-            return {
-                "id": str(existing.id),
-                "goal_1_id": str(goal_1.id),
-                "goal_1_title": goal_1.title,
-                "goal_2_id": str(goal_2.id),
-                "goal_2_title": goal_2.title,
-                "conflict_type": existing.conflict_type,
-                "severity": existing.severity,
-                "description": existing.description,
-                "resolution_suggestion": existing.resolution_suggestion,
-                "status": existing.status
-            }
-
-        # 2. Проверить mutually exclusive
-        for pair in self.MUTUALLY_EXCLUSIVE_PAIRS:
-            title_1_lower = goal_1.title.lower()
-            title_2_lower = goal_2.title.lower()
-
-            if (pair[0] in title_1_lower and pair[1] in title_2_lower) or \
-               (pair[0] in title_2_lower and pair[1] in title_1_lower):
-                return await self._create_conflict(
-                    db, goal_1, goal_2,
-                    conflict_type="mutually_exclusive",
-                    severity="critical",
-                    description=f"Цели '{goal_1.title}' и '{goal_2.title}' являются взаимоисключающими",
-                    resolution_suggestion=f"Выберите одну из целей: '{goal_1.title}' ИЛИ '{goal_2.title}', но не обе одновременно"
-                )
+        await self.index.ensure_fresh()
+        pairs = self.index.pairs()
+        if not pairs:
+            return {"candidate_pairs": 0, "created": 0}
 
-        # 3. Проверить resource conflicts
-        has_resource_1 = any(kw in goal_1.title.lower() for kw in self.RESOURCE_KEYWORDS)
-        has_resource_2 = any(kw in goal_2.title.lower() for kw in self.RESOURCE_KEYWORDS)
-
-        if has_resource_1 and has_resource_2:
-            return await self._create_conflict(
-                db, goal_1, goal_2,
-                conflict_type="resource",
-                severity="medium",
-                description=f"Обе цели требуют ограниченных ресурсов: '{goal_1.title}' и '{goal_2.title}'",
-                resolution_suggestion=f"Приоритизировать одну цель и отложить другую, или найти способ распределить ресурсы"
-            )
-
-        # 4. Проверить value conflicts (если есть personality profile)
-        # Это требует интеграции с Personality Engine
+        goal_ids = {goal_id for pair in pairs for goal_id in pair}
+        created = 0
 
-        # 5. Проверить временные конфликты (если оба require daily/weekly)
-        has_time_1 = any(kw in goal_1.title.lower() for kw in self.TIME_KEYWORDS)
-        has_time_2 = any(kw in goal_2.title.lower() for kw in self.TIME_KEYWORDS)
+        async with AsyncSessionLocal() as db:
+            stmt_goals = select(Goal).where(Goal.id.in_(goal_ids)).where(self._active_top_level())
+            goals = {g.id: g for g in (await db.execute(stmt_goals)).scalars().all()}
 
-        if has_time_1 and has_time_2:
-            return await self._create_conflict(
-                db, goal_1, goal_2,
-                conflict_type="time",
-                severity="low",
-                description=f"Обе цели требуют регулярного времени: '{goal_1.title}' и '{goal_2.title}'",
-                resolution_suggestion=f"Разнести по времени или объединить в один routine"
+            stmt_existing = select(GoalConflict.goal_1_id, GoalConflict.goal_2_id).where(
+                GoalConflict.goal_1_id.in_(goals),
+                GoalConflict.goal_2_id.in_(goals)
             )
+            existing = {frozenset(row) for row in (await db.execute(stmt_existing)).all()}
+
+            for goal_1_id, goal_2_id in pairs:
+                goal_1, goal_2 = goals.get(goal_1_id), goals.get(goal_2_id)
+                if not goal_1 or not goal_2 or frozenset((goal_1_id, goal_2_id)) in existing:
+                    continue
+                # Заголовки могли измениться после индексации
+                conflict_type = self.rules.match(
+                    self.rules.tags(goal_1.title), self.rules.tags(goal_2.title)
+                )
+                if conflict_type:
+                    self._record_conflict(db, goal_1, goal_2, conflict_type)
+                    created += 1
 
-        return None
+            if created:
+                await db.commit()
 
-    async def _create_conflict(self, db, goal_1: Goal, goal_2: Goal,
-                              conflict_type: str, severity: str,
-                              description: str, resolution_suggestion: str) -> Dict:
+        result = {"candidate_pairs": len(pairs), "created": created}
+        logger.info("goal_conflicts_scanned", **result)
+        return result
+
+    def _record_conflict(self, db, goal_1: Goal, goal_2: Goal, conflict_type: str,
+                         existing: Optional[GoalConflict] = None) -> Dict:
         """
-        Создать запись о конфликте в БД.
+        Записать конфликт (caller commits): переоткрыть existing или
+        добавить новый GoalConflict.
 
         Returns:
             Dict с конфликтом
         """
-        # Проверить, не существует ли уже
-        stmt_check = select(GoalConflict).where(
-            and_(
-                GoalConflict.goal_1_id == goal_1.id,
-                GoalConflict.goal_2_id == goal_2.id
-            )
-        )
-        result_check = await db.execute(stmt_check)
-        existing = result_check.scalar_one_or_none()
+        severity, description, suggestion = self.CONFLICT_TEMPLATES[conflict_type]
+        description = description.format(t1=goal_1.title, t2=goal_2.title)
+        suggestion = suggestion.format(t1=goal_1.title, t2=goal_2.title)
 
-        if existing:
+        if existing is not None:
             # Обновить статус
             existing.status = "detected"
-            await db.commit()
-            conflict_id = existing.id
-        else:
-            # Создать новый
-            conflict = GoalConflict(
-                goal_1_id=goal_1.id,
-                goal_2_id=goal_2.id,
-                conflict_type=conflict_type,
-                severity=severity,
-                description=description,
-                resolution_suggestion=resolution_suggestion,
-                status="detected"
+            return self._conflict_dict(
+                existing.id, goal_1, goal_2, conflict_type, severity, description, suggestion, "detected"
             )
-            db.add(conflict)
-            await db.commit()
-            await db.refresh(conflict)
-            conflict_id = conflict.id
 
+        conflict = GoalConflict(
+            id=uuid.uuid4(),
+            goal_1_id=goal_1.id,
+            goal_2_id=goal_2.id,
+            conflict_type=conflict_type,
+            severity=severity,
+            description=description,
+            resolution_suggestion=suggestion,
+            status="detected"
+        )
+        db.add(conflict)
+        return self._conflict_dict(
+            conflict.id, goal_1, goal_2, conflict_type, severity, description, suggestion, "detected"
+        )
+
+    @staticmethod
+    def _conflict_dict(conflict_id, goal_1: Goal, goal_2: Goal, conflict_type: str,
+                       severity: str, description: str, resolution_suggestion: Optional[str],
+                       status: str) -> Dict:
         return {
             "id": str(conflict_id),
             "goal_1_id": str(goal_1.id),
@@ -280,7 +326,7 @@ class GoalConflictDetector:
             "severity": severity,
             "description": description,
             "resolution_suggestion": resolution_suggestion,
-            "status": "detected"
+            "status": status
         }
 
     async def get_conflicts_for_user(self, user_id: str,
@@ -289,6 +335,8 @@ class GoalConflictDetector:
         """
         Получить все конфликты пользователя.
 
+        Один запрос: конфликты вместе с заголовками обеих целей.
+
         Args:
             user_id: UUID пользователя
             status: Фильтр по статусу (detected, resolved, ignored)
@@ -297,19 +345,14 @@ class GoalConflictDetector:
         Returns:
             List[SingleConflict]
         """
-        async with AsyncSessionLocal() as db:
-            # Получить все ID целей (так как нет user_id)
-            stmt_goals = select(Goal.id)
-            result_goals = await db.execute(stmt_goals)
-            goal_ids = [g[0] for g in result_goals.all()]
-
-            if not goal_ids:
-                return []
+        goal_1 = aliased(Goal)
+        goal_2 = aliased(Goal)
 
-            # Получить конфликты
-            stmt = select(GoalConflict).where(
-                GoalConflict.goal_1_id.in_(goal_ids)
-            )
+        async with AsyncSessionLocal() as db:
+            # Все конфликты между существующими целями (так как нет user_id)
+            stmt = select(GoalConflict, goal_1.title, goal_2.title)\
+                .join(goal_1, goal_1.id == GoalConflict.goal_1_id)\
+                .join(goal_2, goal_2.id == GoalConflict.goal_2_id)
 
             if status:
                 stmt = stmt.where(GoalConflict.status == status)
@@ -319,35 +362,22 @@ class GoalConflictDetector:
             stmt = stmt.order_by(GoalConflict.detected_at.desc())
 
             result = await db.execute(stmt)
-            conflicts = result.scalars().all()
-
-            # Загрузить данные о целях
-            result_list = []
-            for c in conflicts:
-                # Получить цели
-                stmt_g1 = select(Goal).where(Goal.id == c.goal_1_id)
-                res_g1 = await db.execute(stmt_g1)
-                goal_1 = res_g1.scalar_one_or_none()
-
-                stmt_g2 = select(Goal).where(Goal.id == c.goal_2_id)
-                res_g2 = await db.execute(stmt_g2)
-                goal_2 = res_g2.scalar_one_or_none()
-
-                if goal_1 and goal_2:
-                    result_list.append(SingleConflict(
-                        id=str(c.id),
-                        goal_1_id=str(c.goal_1_id),
-                        goal_1_title=goal_1.title,
-                        goal_2_id=str(c.goal_2_id),
-                        goal_2_title=goal_2.title,
-                        conflict_type=c.conflict_type,
-                        severity=c.severity,
-                        description=c.description,
-                        resolution_suggestion=c.resolution_suggestion,
-                        status=c.status
-                    ))
 
-            return result_list
+            return [
+                SingleConflict(
+                    id=str(c.id),
+                    goal_1_id=str(c.goal_1_id),
+                    goal_1_title=title_1,
+                    goal_2_id=str(c.goal_2_id),
+                    goal_2_title=title_2,
+                    conflict_type=c.conflict_type,
+                    severity=c.severity,
+                    description=c.description,
+                    resolution_suggestion=c.resolution_suggestion,
+                    status=c.status
+                )
+                for c, title_1, title_2 in result.all()
+            ]
 
     async def resolve_conflict(self, conflict_id: str,
                               resolution: str,
@@ -0,0 +1,260 @@
+"""
+Goal Conflict Index - inverted index правил конфликтов по активным целям
+
+GoalConflictDetector сравнивал новую цель со ВСЕМИ активными целями
+(O(goals × rules) проверок подстрок + запрос на каждую пару). Здесь каждая
+цель один раз сопоставляется с ключевыми словами правил и попадает в
+posting lists своих тегов:
+
+    mx:<i>:<side>  - содержит сторону side пары MUTUALLY_EXCLUSIVE_PAIRS[i]
+    resource       - содержит одно из RESOURCE_KEYWORDS
+    time           - содержит одно из TIME_KEYWORDS
+
+Кандидаты для цели - только цели из posting lists, с которыми её теги
+образуют правило (противоположная сторона пары, resource, time). Цели
+без тегов не индексируются: ни одно правило их не свяжет.
+
+Updates (infrastructure.session_changes.SessionChangeTracker):
+    Goal INSERT / UPDATE / DELETE (любой код) -> Session after_flush
+    собирает изменения -> применяются на COMMIT (сбрасываются на ROLLBACK)
+
+Reconciliation:
+    Раз в RECONCILE_SECONDS индекс перестраивается из goals (один запрос
+    id, title) - подхватывает цели из других процессов (Celery).
+
+Usage:
+    from goal_conflict_index import ConflictRules, GoalConflictIndex
+
+    index = GoalConflictIndex(ConflictRules(...))
+    index.install()
+    await index.ensure_fresh()
+    candidates = index.candidates(index.rules.tags(goal.title))
+"""
+import os
+import time
+from itertools import combinations, product
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from infrastructure.session_changes import SessionChangeTracker
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RECONCILE_SECONDS = float(os.getenv("GOAL_CONFLICT_INDEX_RECONCILE_SECONDS", "60"))
+
+# Цели, участвующие в проверке конфликтов (только top-level)
+ACTIVE_STATES = ("active", "pending", "in_progress")
+
+
+# =============================================================================
+# Rules
+# =============================================================================
+
+class ConflictRules:
+    """
+    Правила конфликтов, скомпилированные в теги.
+
+    Семантика совпадает с прежними проверками: ключевое слово - подстрока
+    заголовка в нижнем регистре; правила проверяются по порядку
+    mutually_exclusive -> resource -> time, срабатывает первое.
+    """
+
+    RESOURCE = "resource"
+    TIME = "time"
+
+    def __init__(
+        self,
+        mutually_exclusive_pairs: Iterable[Tuple[str, str]],
+        resource_keywords: Iterable[str],
+        time_keywords: Iterable[str]
+    ):
+        self.mutually_exclusive_pairs = [tuple(p) for p in mutually_exclusive_pairs]
+        self.resource_keywords = list(resource_keywords)
+        self.time_keywords = list(time_keywords)
+
+    def tags(self, title: Optional[str]) -> FrozenSet[str]:
+        """Теги правил, которым соответствует заголовок"""
+        text = (title or "").lower()
+        tags = set()
+        for i, pair in enumerate(self.mutually_exclusive_pairs):
+            for side, keyword in enumerate(pair):
+                if keyword in text:
+                    tags.add(f"mx:{i}:{side}")
+        if any(kw in text for kw in self.resource_keywords):
+            tags.add(self.RESOURCE)
+        if any(kw in text for kw in self.time_keywords):
+            tags.add(self.TIME)
+        return frozenset(tags)
+
+    @staticmethod
+    def partner_tags(tags: FrozenSet[str]) -> Set[str]:
+        """Теги, совместно с которыми tags образуют правило"""
+        partners = set()
+        for tag in tags:
+            if tag.startswith("mx:"):
+                _, i, side = tag.split(":")
+                partners.add(f"mx:{i}:{1 - int(side)}")
+            else:
+                partners.add(tag)
+        return partners
+
+    def match(self, tags_1: FrozenSet[str], tags_2: FrozenSet[str]) -> Optional[str]:
+        """
+        Тип конфликта между целями с тегами tags_1 и tags_2
+
+        Returns:
+            "mutually_exclusive" | "resource" | "time" | None
+        """
+        for tag in tags_1:
+            if tag.startswith("mx:"):
+                _, i, side = tag.split(":")
+                if f"mx:{i}:{1 - int(side)}" in tags_2:
+                    return "mutually_exclusive"
+        if self.RESOURCE in tags_1 and self.RESOURCE in tags_2:
+            return "resource"
+        if self.TIME in tags_1 and self.TIME in tags_2:
+            return "time"
+        return None
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+class GoalConflictIndex(SessionChangeTracker):
+    """
+    Inverted index: тег правила -> активные top-level цели.
+
+    candidates() и pairs() не обращаются к БД; ensure_fresh()
+    перестраивает индекс не чаще раза в reconcile_seconds.
+    """
+
+    changes_key_prefix = "goal_conflict_index_changes"
+
+    def __init__(self, rules: ConflictRules, reconcile_seconds: float = RECONCILE_SECONDS):
+        super().__init__(reconcile_seconds)
+        self.rules = rules
+        self.goal_tags: Dict = {}                 # goal_id -> tags
+        self.postings: Dict[str, Set] = {}        # tag -> goal_ids
+
+    # =========================================================================
+    # READS
+    # =========================================================================
+
+    def candidates(self, tags: FrozenSet[str]) -> Set:
+        """Цели, которые могут конфликтовать с целью с тегами tags"""
+        result = set()
+        for tag in self.rules.partner_tags(tags):
+            result.update(self.postings.get(tag, ()))
+        return result
+
+    def pairs(self) -> Set[Tuple]:
+        """
+        Все пары проиндексированных целей, для которых срабатывает правило.
+
+        Пары перечисляются по posting lists, цели без общих правил не
+        сравниваются. Каждая пара один раз, ориентация (goal_1, goal_2).
+        """
+        seen = set()
+        result = set()
+
+        def add(a, b):
+            if a != b and frozenset((a, b)) not in seen:
+                seen.add(frozenset((a, b)))
+                result.add((a, b))
+
+        for i in range(len(self.rules.mutually_exclusive_pairs)):
+            left = self.postings.get(f"mx:{i}:0", ())
+            right = self.postings.get(f"mx:{i}:1", ())
+            for a, b in product(left, right):
+                add(a, b)
+        for tag in (ConflictRules.RESOURCE, ConflictRules.TIME):
+            for a, b in combinations(self.postings.get(tag, ()), 2):
+                add(a, b)
+        return result
+
+    # =========================================================================
+    # UPDATES
+    # =========================================================================
+
+    def upsert(self, goal_id, title: Optional[str], active: bool = True):
+        """Обновить цель в индексе (active=False - убрать)"""
+        self.remove(goal_id)
+        if not active:
+            return
+        tags = self.rules.tags(title)
+        if not tags:
+            return
+        self.goal_tags[goal_id] = tags
+        for tag in tags:
+            self.postings.setdefault(tag, set()).add(goal_id)
+
+    def remove(self, goal_id):
+        for tag in self.goal_tags.pop(goal_id, ()):
+            posting = self.postings.get(tag)
+            if posting is not None:
+                posting.discard(goal_id)
+                if not posting:
+                    del self.postings[tag]
+
+    def load(self, goals: Iterable[Tuple]):
+        """Заменить содержимое списком (goal_id, title) активных целей"""
+        self.goal_tags = {}
+        self.postings = {}
+        for goal_id, title in goals:
+            self.upsert(goal_id, title)
+
+    # =========================================================================
+    # SESSION CHANGES
+    # =========================================================================
+
+    def collect(self, session) -> List[Tuple]:
+        from models import Goal
+
+        changes = [
+            (obj.id, obj.title, obj.parent_id is None and obj._status in ACTIVE_STATES)
+            for obj in list(session.new) + list(session.dirty)
+            if isinstance(obj, Goal)
+        ]
+        changes.extend(
+            (obj.id, None, False) for obj in session.deleted if isinstance(obj, Goal)
+        )
+        return changes
+
+    def apply(self, changes: List[Tuple]):
+        for goal_id, title, active in changes:
+            self.upsert(goal_id, title, active)
+
+    # =========================================================================
+    # RECONCILIATION
+    # =========================================================================
+
+    async def reconcile(self):
+        """
+        Перестроить индекс из goals (id, title активных top-level целей).
+
+        При ошибке индекс сохраняется, повтор через reconcile_seconds.
+        """
+        from sqlalchemy import select
+        from database import AsyncSessionLocal
+        from models import Goal
+
+        self.last_reconciled = time.time()
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(Goal.id, Goal.title)
+                    .where(Goal.parent_id == None)  # noqa: E711
+                    .where(Goal._status.in_(ACTIVE_STATES))
+                )
+                goals: List[Tuple] = result.all()
+        except Exception as e:
+            logger.warning("goal_conflict_index_reconcile_failed", error=str(e))
+            return
+
+        self.load(goals)
+        logger.debug(
+            "goal_conflict_index_reconciled",
+            indexed=len(self.goal_tags),
+            active=len(goals)
+        )
@@ -8,17 +8,20 @@ import os
 import uuid
 from typing import Dict, List, Optional
 from datetime import datetime
-from langchain_core.messages import HumanMessage
 from sqlalchemy import select, and_
 from database import AsyncSessionLocal
 from models import Goal
-from agent_graph import app_graph
+from structured_llm import complete_json
+from agents.schemas import GoalEvaluation, ImprovementGoals, NextGoalProposal, TrendEvaluation
+from logging_config import get_logger
 
 # UoW imports для новой архитектуры
 from infrastructure.uow import UnitOfWork, GoalRepository
 from goal_transition_service import transition_service
 
 
+logger = get_logger(__name__)
+
 TELEGRAM_URL = os.getenv("TELEGRAM_URL", "http://telegram:8004")
 
 
@@ -87,19 +90,7 @@ class GoalEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=eval_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            evaluation = json.loads(result)
+            evaluation = await complete_json(eval_prompt, GoalEvaluation)
 
             passed = evaluation.get("passed", False)
             score = evaluation.get("score", 0.0)
@@ -159,19 +150,7 @@ class GoalEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=eval_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            evaluation = json.loads(result)
+            evaluation = await complete_json(eval_prompt, TrendEvaluation)
 
             trend = evaluation.get("trend", "stable")
             score = evaluation.get("score", 0.5)
@@ -255,19 +234,7 @@ class GoalEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=improvement_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            data = json.loads(result)
+            data = await complete_json(improvement_prompt, ImprovementGoals)
 
             created_goals = []
             for goal_data in data.get("improvement_goals", []):
@@ -335,19 +302,7 @@ class GoalEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=next_goal_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            data = json.loads(result)
+            data = await complete_json(next_goal_prompt, NextGoalProposal)
             next_goal_data = data.get("next_goal")
 
             if not next_goal_data:
@@ -472,19 +427,7 @@ class GoalEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=eval_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            evaluation = json.loads(result)
+            evaluation = await complete_json(eval_prompt, GoalEvaluation)
 
             passed = evaluation.get("passed", False)
             score = evaluation.get("score", 0.0)
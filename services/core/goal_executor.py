@@ -7,7 +7,6 @@ Author: AI-OS Core Team
 Date: 2026-02-12
 """
 import os
-import asyncio
 import httpx
 import uuid
 from uuid import UUID
@@ -231,6 +230,8 @@ class GoalExecutor:
                     goal_id=goal_id,
                     goal_title=goal.title
                 )
+                # V2 commits the "active" transition itself and re-locks
+                # the goal to apply the result (see execute_goal_with_uow)
                 from goal_executor_v2 import goal_executor_v2
                 return await goal_executor_v2.execute_goal_with_uow(
                     uow, goal_id, session_id
@@ -316,25 +317,8 @@ goal_executor = GoalExecutor()
 
 # CELERY TASKS
 from celery_config import celery_app
-
-
-# NEW: Proper async execution without asyncio.run()
-def _run_async(coro):
-    """
-    Run async coroutine in existing event loop.
-    Replaces asyncio.run() which creates new loop each time.
-    """
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, coro)
-                return future.result()
-        else:
-            return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+# Persistent per-process loop, DB pool and HTTP client (see worker_runtime)
+from worker_runtime import run_async as _run_async
 
 
 @celery_app.task(bind=True)
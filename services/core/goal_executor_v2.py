@@ -44,6 +44,7 @@ from executor_feedback_wiring import executor_with_feedback, ExecutionMustStopEx
 # Import UoW infrastructure
 from infrastructure.uow import GoalRepository
 from goal_transition_service import transition_service
+from skill_runtime import skill_runtime
 
 # Import Execution Policy (Phase 2 architectural change)
 try:
@@ -449,7 +450,7 @@ class GoalExecutorV2:
             "previous_failures": len(previous_feedback)
         }
 
-        result = skill.execute(inputs, context)
+        result = await skill_runtime.execute(skill, inputs, context)
 
         evaluation = evaluation_engine.evaluate_goal(
             goal_completion_criteria=goal_snapshot.get("completion_criteria"),
@@ -901,6 +902,13 @@ class GoalExecutorV2:
 
         ARCHITECTURE v3.0: Transaction managed by caller via UnitOfWork.
 
+        TRANSACTION CONTRACT: для atomic goal вызов делает uow.commit()
+        после перехода в "active" (см. _execute_atomic_goal_with_uow) -
+        всё, что caller сделал в UoW до вызова, и сам переход "active"
+        фиксируются до выполнения навыка. Rollback caller'а после вызова
+        откатывает только применение результата; ошибки выполнения
+        переводят цель в "blocked" внутри вызова.
+
         Args:
             uow: UnitOfWork с активной транзакцией
             goal_id: ID цели
@@ -941,7 +949,10 @@ class GoalExecutorV2:
         7. Evaluate
         8. Check completion
 
-        All operations use the passed UoW - NO internal commit/rollback.
+        All operations use the passed UoW. The transaction is split with
+        uow.commit() after the "active" transition: steps 3-5 run without
+        a transaction (no row lock, no pinned connection), steps 6-8 and
+        the error path re-lock the goal and are committed by the caller.
         """
         logger.info("atomic_goal_execution_started", goal_title=goal.title, goal_id=str(goal.id))
 
@@ -974,6 +985,9 @@ class GoalExecutorV2:
         # This is passed from caller, defaults to legacy if not specified
         execution_engine = getattr(goal, '_execution_engine', None)
 
+        # True once PHASE A has committed: the goal row is no longer locked
+        lock_released = False
+
         try:
             # Step 1: Parse requirements
             requirements = self._parse_requirements(goal)
@@ -1022,6 +1036,20 @@ class GoalExecutorV2:
             execution_rec.skill_id = skill_id_normalized
             execution_rec.execution_engine = execution_engine
 
+            # PHASE A: short locked section - mark active and commit, so the
+            # goal row lock and the DB connection are not held while the
+            # LLM input generation and the skill run
+            await transition_service.transition(
+                uow=uow,
+                goal_id=goal.id,
+                new_state="active",
+                reason="Starting atomic goal execution",
+                actor="goal_executor_v2"
+            )
+            await self._save_goal_with_uow(uow, goal)
+            await uow.commit()
+            lock_released = True
+
             # Step 3: Prepare inputs (async for LLM generation)
             inputs = await self._prepare_inputs(goal, skill)
             logger.debug("skill_inputs", inputs=list(inputs.keys()))
@@ -1031,15 +1059,7 @@ class GoalExecutorV2:
                 "inputs_provided": list(inputs.keys())
             })
 
-            await transition_service.transition(
-                uow=uow,
-                goal_id=goal.id,
-                new_state="active",
-                reason="Starting atomic goal execution",
-                actor="goal_executor_v2"
-            )
-
-            # Step 4: Execute skill
+            # Step 4: Execute skill (SkillRuntime: thread/process pool + timeout)
             context = {
                 "goal_id": str(goal.id),
                 "session_id": session_id or f"goal_{goal.id}",
@@ -1048,7 +1068,7 @@ class GoalExecutorV2:
 
             execution_step_start = datetime.utcnow()
 
-            result: SkillResult = skill.execute(inputs, context)
+            result: SkillResult = await skill_runtime.execute(skill, inputs, context)
 
             execution_step_end = datetime.utcnow()
 
@@ -1067,6 +1087,44 @@ class GoalExecutorV2:
                 "error": result.error if not result.success else None
             })
 
+            # Step 5: Verify result (still outside the transaction)
+            is_valid = False
+            if result.success:
+                verification_start = datetime.utcnow()
+                is_valid = await skill_runtime.verify(skill, result)
+                verification_end = datetime.utcnow()
+
+                logger.info("artifact_verification", is_valid=is_valid)
+
+                trace["steps"].append({
+                    "step": "verify_result",
+                    "verification_passed": is_valid,
+                    "duration_ms": int((verification_end - verification_start).total_seconds() * 1000)
+                })
+
+            # PHASE B: re-lock the goal to apply the result. Reload it - the
+            # goal may have been frozen or cancelled while the skill ran.
+            await uow.session.refresh(goal, with_for_update=True)
+            if goal.status != "active":
+                logger.warning(
+                    "goal_changed_during_skill_execution",
+                    goal_id=str(goal.id),
+                    status=goal.status
+                )
+                trace["steps"].append({
+                    "step": "apply_result",
+                    "skipped": True,
+                    "reason": f"Goal status changed to {goal.status} during execution"
+                })
+                goal.execution_trace = trace
+                await self._save_goal_with_uow(uow, goal)
+                return {
+                    "status": "superseded",
+                    "message": f"Goal status changed to {goal.status} during execution",
+                    "goal_id": str(goal.id),
+                    "trace": trace
+                }
+
             if not result.success:
                 await transition_service.transition(
                     uow=uow,
@@ -1113,22 +1171,9 @@ class GoalExecutorV2:
                     "trace": trace
                 }
 
-            # Step 5: Verify result
             goal.progress = 0.6
             await self._save_goal_with_uow(uow, goal)
 
-            verification_start = datetime.utcnow()
-            is_valid = skill.verify(result)
-            verification_end = datetime.utcnow()
-
-            logger.info("artifact_verification", is_valid=is_valid)
-
-            trace["steps"].append({
-                "step": "verify_result",
-                "verification_passed": is_valid,
-                "duration_ms": int((verification_end - verification_start).total_seconds() * 1000)
-            })
-
             # Step 6: Register artifacts in database
             from artifact_registry import ArtifactRegistry
 
@@ -1425,6 +1470,27 @@ class GoalExecutorV2:
         except Exception as e:
             logger.error("execution_error", error=str(e), exc_info=True)
 
+            if lock_released:
+                # "active" is already committed - re-lock the goal before
+                # moving it to blocked (roll back a broken transaction first)
+                try:
+                    await uow.session.refresh(goal, with_for_update=True)
+                except Exception:
+                    await uow.session.rollback()
+                    await uow.session.refresh(goal, with_for_update=True)
+
+                if goal.status != "active":
+                    logger.warning(
+                        "goal_changed_during_skill_execution",
+                        goal_id=str(goal.id),
+                        status=goal.status
+                    )
+                    return {
+                        "status": "superseded",
+                        "message": f"Goal status changed to {goal.status} during execution",
+                        "goal_id": str(goal.id)
+                    }
+
             # PHASE 1: Complete execution record on failure
             execution_end = datetime.utcnow()
             execution_rec.completed_at = execution_end
@@ -7,17 +7,21 @@ UoW MIGRATION: Мутации теперь атомарны - все опера
 import uuid
 from typing import Dict, Optional
 from datetime import datetime
-from langchain_core.messages import HumanMessage
 from sqlalchemy import select
 from database import AsyncSessionLocal
 from models import Goal
-from agent_graph import app_graph
+from structured_llm import complete_json
+from agents.schemas import GoalTypeChange, StrengthenMutation, WeakenMutation
+from logging_config import get_logger
 
 # UoW imports для новой архитектуры
 from infrastructure.uow import UnitOfWork, GoalRepository
 from goal_transition_service import transition_service
 
 
+logger = get_logger(__name__)
+
+
 class GoalMutator:
     """
     Мутатор целей - изменяет цели в runtime
@@ -116,19 +120,7 @@ class GoalMutator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=strengthen_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            mutation_data = json.loads(result)
+            mutation_data = await complete_json(strengthen_prompt, StrengthenMutation)
 
             # Применяем мутацию
             async with AsyncSessionLocal() as db:
@@ -209,19 +201,7 @@ class GoalMutator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=weaken_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            mutation_data = json.loads(result)
+            mutation_data = await complete_json(weaken_prompt, WeakenMutation)
 
             # Применяем мутацию
             async with AsyncSessionLocal() as db:
@@ -310,19 +290,7 @@ class GoalMutator:
 """
 
             try:
-                response = await app_graph.ainvoke({
-                    "messages": [HumanMessage(content=type_change_prompt)]
-                })
-
-                result = response["messages"][-1].content
-
-                import json
-                if "```json" in result:
-                    result = result.split("```json")[1].split("```")[0].strip()
-                elif "```" in result:
-                    result = result.split("```")[1].split("```")[0].strip()
-
-                type_data = json.loads(result)
+                type_data = await complete_json(type_change_prompt, GoalTypeChange)
                 new_type = type_data.get("new_type")
 
             except Exception as e:
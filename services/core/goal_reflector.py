@@ -4,16 +4,18 @@ GOAL REFLECTOR - v3.0
 НЕ проверяет выполнение - это делает StrictEvaluator
 
 UoW MIGRATION: Рефлексия теперь атомарна - все операции в одной транзакции.
+BATCH: reflect_on_goals_batch_with_uow - волна целей за минимум LLM-вызовов.
 """
 import os
 import uuid
 from typing import Dict, List, Optional
 from datetime import datetime
-from langchain_core.messages import HumanMessage
 from sqlalchemy import select
 from database import AsyncSessionLocal
 from models import Goal
-from agent_graph import app_graph
+from structured_llm import complete_json, complete_json_batch
+from agents.schemas import FailureReflection, NextGoalProposal, ReflectionSummary, SuccessReflection
+from logging_config import get_logger
 from goal_contract_validator import goal_contract_validator
 
 # UoW imports для новой архитектуры
@@ -21,8 +23,22 @@ from infrastructure.uow import UnitOfWork, GoalRepository
 from goal_transition_service import transition_service
 
 
+logger = get_logger(__name__)
+
 TELEGRAM_URL = os.getenv("TELEGRAM_URL", "http://telegram:8004")
 
+# Общая часть batch-промптов (карточки целей добавляет complete_batch)
+SUCCESS_BATCH_INSTRUCTIONS = '''Проанализируй ПОЧЕМУ каждая цель успешно выполнена:
+какие факторы привели к успеху, какие паттерны можно переиспользовать,
+что делать дальше (следующая цель).
+Поля ответа: "why", "lessons_learned": [...], "recommendations": [...],
+"next_goal": {"title", "description", "goal_type": "achievable"} или null, "action": "complete"'''
+
+FAILURE_BATCH_INSTRUCTIONS = '''Проанализируй ПОЧЕМУ каждая цель НЕ выполнена:
+какие факторы привели к неудаче, что можно улучшить, продолжать ли цель.
+Поля ответа: "why", "lessons_learned": [...], "recommendations": [...],
+"action": "continue|adjust|mutate"'''
+
 
 class GoalReflector:
     """
@@ -109,19 +125,7 @@ class GoalReflector:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=reflection_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            reflection = json.loads(result)
+            reflection = await complete_json(reflection_prompt, SuccessReflection)
 
             # Генерируем следующую цель если нужно
             next_goals = []
@@ -185,19 +189,7 @@ class GoalReflector:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=reflection_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            reflection = json.loads(result)
+            reflection = await complete_json(reflection_prompt, FailureReflection)
 
             # Генерируем корректирующие цели
             improvement_goals = []
@@ -270,19 +262,7 @@ class GoalReflector:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=next_goal_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            data = json.loads(result)
+            data = await complete_json(next_goal_prompt, NextGoalProposal)
             next_goal_data = data.get("next_goal")
 
             if not next_goal_data:
@@ -448,53 +428,51 @@ SCORE: {score}
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=reflection_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            reflection = json.loads(result)
-
-            # Создаём next goal если нужно
-            next_goal_data = reflection.get("next_goal")
-            next_goal = None
-            if next_goal_data:
-                next_goal = await self._create_next_goal_with_uow(
-                    uow, goal, next_goal_data, reflection.get("why", "")
-                )
+            reflection = await complete_json(reflection_prompt, ReflectionSummary)
+            return await self._apply_success_reflection_with_uow(uow, goal, reflection)
 
-            # Сохраняем рефлексию
-            goal.reflection = reflection
-            await GoalRepository(uow).update(uow.session, goal)
+        except Exception as e:
+            return self._reflection_error(goal, e, success=True)
+
+    async def _apply_success_reflection_with_uow(self, uow: UnitOfWork, goal: Goal, reflection: Dict) -> Dict:
+        """Сохраняет рефлексию успеха и создаёт next goal"""
+        # Создаём next goal если нужно
+        next_goal_data = reflection.get("next_goal")
+        next_goal = None
+        if next_goal_data:
+            next_goal = await self._create_next_goal_with_uow(
+                uow, goal, next_goal_data, reflection.get("why", "")
+            )
 
-            return {
-                "why": reflection.get("why", ""),
-                "lessons_learned": reflection.get("lessons_learned", []),
-                "recommendations": reflection.get("recommendations", []),
-                "next_goal": {
-                    "id": str(next_goal.id) if next_goal else None,
-                    "title": next_goal.title if next_goal else None
-                } if next_goal else None,
-                "action": reflection.get("action", "complete"),
-                "goal_id": str(goal.id)
-            }
+        # Сохраняем рефлексию
+        goal.reflection = reflection
+        await GoalRepository(uow).update(uow.session, goal)
 
-        except Exception as e:
-            return {
-                "why": f"Reflection error: {str(e)}",
-                "lessons_learned": [],
-                "recommendations": ["Review goal manually"],
-                "next_goal": None,
-                "action": "complete",
-                "goal_id": str(goal.id)
-            }
+        return {
+            "why": reflection.get("why", ""),
+            "lessons_learned": reflection.get("lessons_learned", []),
+            "recommendations": reflection.get("recommendations", []),
+            "next_goal": {
+                "id": str(next_goal.id) if next_goal else None,
+                "title": next_goal.title if next_goal else None
+            } if next_goal else None,
+            "action": reflection.get("action", "complete"),
+            "goal_id": str(goal.id)
+        }
+
+    @staticmethod
+    def _reflection_error(goal: Goal, error: Exception, success: bool) -> Dict:
+        """Результат рефлексии, когда LLM-анализ не удался"""
+        result = {
+            "why": f"Reflection error: {str(error)}",
+            "lessons_learned": [],
+            "recommendations": ["Review goal manually"],
+            "action": "complete" if success else "continue",
+            "goal_id": str(goal.id)
+        }
+        if success:
+            result["next_goal"] = None
+        return result
 
     async def _reflect_on_failure_with_uow(self, uow: UnitOfWork, goal: Goal, score: float) -> Dict:
         """Анализ неудачи через UoW"""
@@ -519,52 +497,37 @@ SCORE: {score}
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=reflection_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            reflection = json.loads(result)
-
-            # Сохраняем рефлексию
-            goal.reflection = reflection
-            await GoalRepository(uow).update(uow.session, goal)
-
-            action = reflection.get("action", "continue")
-
-            # Если action = mutate, замораживаем текущую цель
-            if action == "mutate":
-                await transition_service.transition(
-                    uow=uow,
-                    goal_id=goal.id,
-                    new_state="frozen",
-                    reason=f"Reflection suggests mutation: {reflection.get('why', '')}",
-                    actor="goal_reflector"
-                )
-
-            return {
-                "why": reflection.get("why", ""),
-                "lessons_learned": reflection.get("lessons_learned", []),
-                "recommendations": reflection.get("recommendations", []),
-                "action": action,
-                "goal_id": str(goal.id)
-            }
+            reflection = await complete_json(reflection_prompt, ReflectionSummary)
+            return await self._apply_failure_reflection_with_uow(uow, goal, reflection)
 
         except Exception as e:
-            return {
-                "why": f"Reflection error: {str(e)}",
-                "lessons_learned": [],
-                "recommendations": ["Review goal manually"],
-                "action": "continue",
-                "goal_id": str(goal.id)
-            }
+            return self._reflection_error(goal, e, success=False)
+
+    async def _apply_failure_reflection_with_uow(self, uow: UnitOfWork, goal: Goal, reflection: Dict) -> Dict:
+        """Сохраняет рефлексию неудачи (mutate -> frozen)"""
+        # Сохраняем рефлексию
+        goal.reflection = reflection
+        await GoalRepository(uow).update(uow.session, goal)
+
+        action = reflection.get("action", "continue")
+
+        # Если action = mutate, замораживаем текущую цель
+        if action == "mutate":
+            await transition_service.transition(
+                uow=uow,
+                goal_id=goal.id,
+                new_state="frozen",
+                reason=f"Reflection suggests mutation: {reflection.get('why', '')}",
+                actor="goal_reflector"
+            )
+
+        return {
+            "why": reflection.get("why", ""),
+            "lessons_learned": reflection.get("lessons_learned", []),
+            "recommendations": reflection.get("recommendations", []),
+            "action": action,
+            "goal_id": str(goal.id)
+        }
 
     async def _reflect_on_degradation_with_uow(self, uow: UnitOfWork, goal: Goal) -> Dict:
         """Анализ деградации через UoW"""
@@ -592,6 +555,78 @@ SCORE: {score}
             "goal_id": str(goal.id)
         }
 
+    # ============= BATCH: рефлексия волны целей =============
+
+    async def reflect_on_goals_batch_with_uow(
+        self,
+        uow: UnitOfWork,
+        strict_evaluations: Dict[str, Dict]
+    ) -> Dict[str, Dict]:
+        """
+        Рефлексия по нескольким целям ВНУТРИ одной UoW транзакции.
+
+        Цели блокируются одним запросом; успехи и неудачи анализируются
+        двумя complete_batch (по одному на сценарий), деградация - без LLM.
+        Цель без валидного LLM-ответа получает тот же результат, что и при
+        ошибке одиночной рефлексии.
+
+        Args:
+            uow: UnitOfWork с активной транзакцией
+            strict_evaluations: {goal_id: результат StrictEvaluator}
+
+        Returns:
+            {goal_id: результат в формате reflect_on_goal_with_uow}
+        """
+        from uuid import UUID
+        repo = GoalRepository(uow)
+        goals = await repo.bulk_get_for_update(uow.session, [UUID(g) for g in strict_evaluations])
+        goals_by_id = {str(g.id): g for g in goals}
+
+        results: Dict[str, Dict] = {
+            goal_id: {"error": "Goal not found"}
+            for goal_id in strict_evaluations if goal_id not in goals_by_id
+        }
+        successes: Dict[str, str] = {}
+        failures: Dict[str, str] = {}
+
+        for goal_id, goal in goals_by_id.items():
+            evaluation = strict_evaluations[goal_id]
+            card = f"""ЦЕЛЬ: {goal.title}
+ОПИСАНИЕ: {goal.description or 'Не указано'}
+SCORE: {evaluation.get("score", 0.0)}"""
+            if evaluation.get("passed", False):
+                successes[goal_id] = card
+            elif evaluation.get("trend") == "degrading":
+                try:
+                    results[goal_id] = await self._reflect_on_degradation_with_uow(uow, goal)
+                except Exception as e:
+                    results[goal_id] = {"error": str(e), "goal_id": goal_id}
+            else:
+                failures[goal_id] = card
+
+        for cards, instructions, apply, success in (
+            (successes, SUCCESS_BATCH_INSTRUCTIONS, self._apply_success_reflection_with_uow, True),
+            (failures, FAILURE_BATCH_INSTRUCTIONS, self._apply_failure_reflection_with_uow, False),
+        ):
+            if not cards:
+                continue
+            try:
+                reflections, errors = await complete_json_batch(cards, ReflectionSummary, instructions)
+            except Exception as e:
+                reflections, errors = {}, {goal_id: str(e) for goal_id in cards}
+
+            for goal_id in cards:
+                goal = goals_by_id[goal_id]
+                reflection = reflections.get(goal_id)
+                try:
+                    if reflection is None:
+                        raise ValueError(errors.get(goal_id, "no reflection"))
+                    results[goal_id] = await apply(uow, goal, reflection)
+                except Exception as e:
+                    results[goal_id] = self._reflection_error(goal, e, success=success)
+
+        return results
+
     async def _create_next_goal_with_uow(
         self,
         uow: UnitOfWork,
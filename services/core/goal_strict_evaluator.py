@@ -6,22 +6,44 @@ GOAL STRICT EVALUATOR - v3.0
 ARCHITECTURE v3.0:
 - Uses UnitOfWork pattern for transaction management
 - Integrates EmotionalFeedbackLoop for memory
+- evaluate_goals_batch_with_uow: N целей, артефакты одним запросом,
+  LLM-оценки упакованы в минимум вызовов (structured_llm.complete_batch)
 """
 import uuid
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
-from langchain_core.messages import HumanMessage
 from sqlalchemy import select
 from database import AsyncSessionLocal
 from models import Goal
-from agent_graph import app_graph
+from structured_llm import complete_json, complete_json_batch
+from agents.schemas import BinaryEvaluation, ScalarEvaluation, TrendEvaluation
+from logging_config import get_logger
 from goal_contract_validator import goal_contract_validator
 from infrastructure.uow import UnitOfWork, GoalRepository
 from goal_transition_service import transition_service
 from emotional_feedback_loop import emotional_feedback_loop
 
 
+logger = get_logger(__name__)
+
+# Общая часть batch-промптов по режимам (карточки целей добавляет complete_batch)
+BATCH_INSTRUCTIONS = {
+    "binary": """Строго оцени: ВЫПОЛНЕНА ли каждая цель? Учитывай только факты и артефакты.
+Поля ответа: "passed": true/false, "confidence": 0.0-1.0, "evidence": ["Факт 1", "Факт 2"]""",
+    "scalar": """Оцени степень выполнения каждой цели по шкале 0.0-1.0.
+Поля ответа: "score": 0.0-1.0, "evidence": ["Факт 1"], "gaps": ["Что не выполнено"]""",
+    "trend": """Оцени ТРЕНД выполнения каждой непрерывной цели.
+Поля ответа: "trend": "improving|stable|degrading", "score": 0.0-1.0, "evidence": ["Факт 1"]""",
+}
+
+BATCH_SCHEMAS = {
+    "binary": BinaryEvaluation,
+    "scalar": ScalarEvaluation,
+    "trend": TrendEvaluation,
+}
+
+
 class GoalStrictEvaluator:
     """
     Строгий оценщик целей - проверяет факт выполнения
@@ -188,19 +210,7 @@ class GoalStrictEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=eval_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            evaluation = json.loads(result)
+            evaluation = await complete_json(eval_prompt, BinaryEvaluation)
 
             passed = evaluation.get("passed", False)
             confidence = evaluation.get("confidence", 0.5)
@@ -267,19 +277,7 @@ class GoalStrictEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=eval_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            evaluation = json.loads(result)
+            evaluation = await complete_json(eval_prompt, ScalarEvaluation)
 
             score = evaluation.get("score", 0.0)
             passed = score >= 0.7  # Порог для скалярной оценки
@@ -343,19 +341,7 @@ class GoalStrictEvaluator:
 """
 
         try:
-            response = await app_graph.ainvoke({
-                "messages": [HumanMessage(content=eval_prompt)]
-            })
-
-            result = response["messages"][-1].content
-
-            import json
-            if "```json" in result:
-                result = result.split("```json")[1].split("```")[0].strip()
-            elif "```" in result:
-                result = result.split("```")[1].split("```")[0].strip()
-
-            evaluation = json.loads(result)
+            evaluation = await complete_json(eval_prompt, TrendEvaluation)
 
             trend = evaluation.get("trend", "stable")
             score = evaluation.get("score", 0.5)
@@ -541,6 +527,181 @@ class GoalStrictEvaluator:
                 "checks": {"error": str(e)}
             }
 
+    # ============= BATCH: оценка волны целей =============
+
+    async def evaluate_goals_batch_with_uow(
+        self,
+        uow: UnitOfWork,
+        goal_ids: List[str]
+    ) -> Dict[str, Dict]:
+        """
+        Строго оценивает несколько целей ВНУТРИ одной UoW транзакции.
+
+        - цели: один SELECT ... FOR UPDATE, артефакты: один запрос
+        - LLM: по одному complete_batch на режим (binary/scalar/trend),
+          карточки целей упакованы в минимум вызовов
+        - переходы решаются как в evaluate_goal_with_uow (артефакты /
+          progress >= 0.8 / сохранённый trend); вердикт LLM может лишь
+          отклонить passed, но не завершить и не заблокировать цель
+        - частичный отказ: цель без валидного LLM-ответа оценивается
+          детерминированно (артефакты / progress / сохранённый trend),
+          ошибка в результате ("llm_error"); ошибка перехода не
+          останавливает остальные цели
+
+        Args:
+            uow: UnitOfWork с активной транзакцией
+            goal_ids: ID целей
+
+        Returns:
+            {goal_id: результат в формате evaluate_goal_with_uow}
+        """
+        from artifact_registry import artifact_registry
+
+        repo = GoalRepository(uow)
+        goals = await repo.bulk_get_for_update(uow.session, [UUID(g) for g in goal_ids])
+        goals_by_id = {str(g.id): g for g in goals}
+
+        results: Dict[str, Dict] = {
+            goal_id: {"error": "Goal not found"}
+            for goal_id in goal_ids if goal_id not in goals_by_id
+        }
+        if not goals_by_id:
+            return results
+
+        artifacts = await artifact_registry.list_by_goals(list(goals_by_id), session=uow.session)
+
+        by_mode: Dict[str, Dict[str, Goal]] = {}
+        for goal_id, goal in goals_by_id.items():
+            by_mode.setdefault(self._determine_evaluation_mode(goal), {})[goal_id] = goal
+
+        for mode, mode_goals in by_mode.items():
+            cards = {
+                goal_id: self._render_goal_card(goal, artifacts[goal_id])
+                for goal_id, goal in mode_goals.items()
+            }
+            try:
+                judgements, errors = await complete_json_batch(
+                    cards, BATCH_SCHEMAS[mode], BATCH_INSTRUCTIONS[mode]
+                )
+            except Exception as e:
+                judgements, errors = {}, {goal_id: str(e) for goal_id in cards}
+
+            for goal_id, goal in mode_goals.items():
+                try:
+                    results[goal_id] = await self._apply_batch_judgement_with_uow(
+                        uow, goal, mode, artifacts[goal_id],
+                        judgements.get(goal_id), errors.get(goal_id)
+                    )
+                except Exception as e:
+                    logger.warning("batch_evaluation_goal_failed", goal_id=goal_id, error=str(e))
+                    results[goal_id] = {
+                        "passed": False,
+                        "evaluation_mode": mode,
+                        "error": str(e),
+                        "goal_id": goal_id
+                    }
+
+        logger.info(
+            "batch_evaluation_complete",
+            goals=len(goal_ids),
+            passed=sum(1 for r in results.values() if r.get("passed")),
+            llm_errors=sum(1 for r in results.values() if "llm_error" in r)
+        )
+        return results
+
+    @staticmethod
+    def _render_goal_card(goal: Goal, artifacts: List[Dict]) -> str:
+        """Карточка цели для batch-промпта"""
+        passed = sum(1 for a in artifacts if a.get("verification_status") == "passed")
+        listed = ", ".join(
+            f"{a.get('type')} ({a.get('verification_status')})" for a in artifacts[:5]
+        )
+        return f"""ЦЕЛЬ: {goal.title}
+ОПИСАНИЕ: {goal.description or 'Не указано'}
+КРИТЕРИИ УСПЕХА: {goal.success_definition or goal.completion_criteria or 'Не определены'}
+ТЕКУЩИЙ ПРОГРЕСС: {int((goal.progress or 0.0) * 100)}%
+АРТЕФАКТЫ: {passed}/{len(artifacts)} passed{': ' + listed if listed else ''}"""
+
+    async def _apply_batch_judgement_with_uow(
+        self,
+        uow: UnitOfWork,
+        goal: Goal,
+        mode: str,
+        artifacts: List[Dict],
+        judgement: Optional[Dict],
+        llm_error: Optional[str]
+    ) -> Dict:
+        """Вердикт по одной цели из batch-оценки + state transition"""
+        goal_id = str(goal.id)
+
+        if mode == "binary":
+            passed_artifacts = [a for a in artifacts if a.get("verification_status") == "passed"]
+            # Факт выполнения - только по проверенным артефактам, LLM может лишь отклонить
+            passed = bool(passed_artifacts) and (judgement is None or judgement.get("passed", False))
+            result = {
+                "passed": passed,
+                "score": 1.0 if passed else 0.0,
+                "confidence": (judgement or {}).get("confidence", 0.5),
+                "evaluation_mode": "binary",
+                "checks": {
+                    "artifacts_exist": bool(artifacts),
+                    "artifacts_passed": bool(passed_artifacts)
+                }
+            }
+            transition = None
+            if passed:
+                transition = ("done", f"Binary evaluation passed: {len(passed_artifacts)}/{len(artifacts)} artifacts passed")
+
+        elif mode == "scalar":
+            # Как в _evaluate_scalar_with_uow: порог по progress, LLM может лишь отклонить
+            score = goal.progress or 0.0
+            passed = score >= 0.8 and (judgement is None or judgement.get("score", 0.0) >= 0.8)
+            result = {
+                "passed": passed,
+                "score": score,
+                "threshold": 0.8,
+                "evaluation_mode": "scalar"
+            }
+            transition = ("done", f"Scalar evaluation passed: {score:.2f} >= 0.80") if passed else None
+
+        else:
+            # Блокировка - только по сохранённому trend, LLM может лишь снять passed
+            stored = goal.evaluation_result if isinstance(goal.evaluation_result, dict) else {}
+            trend = stored.get("trend", "stable")
+            llm_trend = (judgement or {}).get("trend")
+            result = {
+                "passed": trend in ["improving", "stable"] and llm_trend != "degrading",
+                "trend": trend,
+                "score": (judgement or {}).get("score", 0.5),
+                "evaluation_mode": "trend"
+            }
+            transition = ("blocked", "Trend evaluation: performance degrading") if trend == "degrading" else None
+
+        if judgement is not None:
+            result["strict_result"] = judgement
+            evaluation_result = {"mode": mode, **judgement}
+            if mode == "trend":
+                # Не подменять измеренный trend оценкой LLM
+                evaluation_result["llm_trend"] = evaluation_result.pop("trend", None)
+                if "trend" in stored:
+                    evaluation_result["trend"] = stored["trend"]
+            goal.evaluation_result = evaluation_result
+        else:
+            result["llm_error"] = llm_error
+
+        if transition:
+            new_state, reason = transition
+            await transition_service.transition(
+                uow=uow,
+                goal_id=goal.id,
+                new_state=new_state,
+                reason=reason,
+                actor="goal_strict_evaluator"
+            )
+
+        result["goal_id"] = goal_id
+        return result
+
     def _determine_evaluation_mode(self, goal: Goal) -> str:
         """Определяет режим оценки для цели"""
         if goal.goal_type == "continuous":
@@ -26,6 +26,7 @@ from enum import Enum
 from uuid import UUID
 
 from models import Goal
+from change_feed import publish_goal_transition
 
 
 class TransitionResult(Enum):
@@ -160,6 +161,11 @@ class GoalTransitionService:
                 actor=actor
             )
             
+            # Delivered to /ui/stream on COMMIT only
+            await publish_goal_transition(
+                uow.session, goal_id, from_state, new_state, reason, actor
+            )
+            
             logger.info(f"  ✅ Transition: SUCCESS ({from_state} → {new_state})")
             logger.info(f"{'='*70}\n")
             
@@ -278,6 +284,9 @@ class GoalTransitionService:
         
         if old_status != new_status:
             goal._internal_set_status(new_status)
+            await publish_goal_transition(
+                session, goal_id, old_status, new_status, result.reason, "completion_engine"
+            )
             
             logger.info(
                 "status_synced",
@@ -350,6 +359,9 @@ class BulkTransitionService:
                 
                 from domain.goal_domain_service import goal_domain_service
                 event = goal_domain_service.transition(goal, goal_state, reason)
+                await publish_goal_transition(
+                    uow.session, goal_id, old_state, new_state, reason, actor
+                )
                 
                 results.append({
                     "goal_id": str(goal_id),
@@ -5,3 +5,7 @@ from .uow import (
     AuditLogger,
     create_uow_provider
 )
+from .goal_work_queue import (
+    GoalWorkQueue,
+    LeasedGoalSelector
+)
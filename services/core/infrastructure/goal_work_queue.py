@@ -0,0 +1,189 @@
+"""
+Goal Work Queue - leased claiming of ready atomic goals
+=======================================================
+
+Several scheduler/worker replicas used to select the same
+"is_atomic AND progress < 1.0" goals and sort it out through optimistic
+lock failures - after every replica had already paid for the LLM calls.
+
+Claiming:
+    UPDATE goals SET lease_owner = :owner, lease_expires_at = now() + :lease
+    WHERE id IN (
+        SELECT id FROM goals
+        WHERE is_atomic AND progress < 1.0
+          AND (lease_expires_at IS NULL OR lease_expires_at < now())
+        ORDER BY priority DESC, created_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id
+
+- SKIP LOCKED: concurrent claimers never wait on or receive the same row
+- The claim commits immediately (short transaction); the lease, not a
+  held row lock, protects the goal while it executes
+- A crashed worker's goals become claimable once the lease expires;
+  reap_expired() clears stale leases for visibility/metrics
+- Index: idx_goals_ready_queue (priority DESC, created_at)
+  WHERE is_atomic AND progress < 1.0
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import os
+import socket
+import uuid
+from datetime import timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select, update, func
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+GOAL_LEASE_SECONDS = float(os.getenv("GOAL_LEASE_SECONDS", "900"))
+
+
+def default_owner() -> str:
+    """Unique per process: host:pid:random."""
+    return f"{socket.gethostname()[:32]}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class GoalWorkQueue:
+    """
+    Lease-based work queue over the goals table.
+
+    Every method runs in its own short transaction from session_factory,
+    so leases are visible to other replicas as soon as they are taken.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        owner: Optional[str] = None,
+        lease_seconds: float = GOAL_LEASE_SECONDS
+    ):
+        if session_factory is None:
+            from database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self._session_factory = session_factory
+        self.owner = owner or default_owner()
+        self.lease_seconds = lease_seconds
+
+    # ------------------------------------------------------------------
+    # Statements (exposed for tests / EXPLAIN)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def ready_predicate():
+        from models import Goal
+        return and_(Goal.is_atomic == True, Goal.progress < 1.0)  # noqa: E712
+
+    def claim_statement(self, limit: int):
+        from models import Goal
+
+        candidates = (
+            select(Goal.id)
+            .where(self.ready_predicate())
+            .where(or_(Goal.lease_expires_at.is_(None), Goal.lease_expires_at < func.now()))
+            .order_by(Goal.priority.desc(), Goal.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return (
+            update(Goal)
+            .where(Goal.id.in_(candidates.scalar_subquery()))
+            .values(
+                lease_owner=self.owner,
+                lease_expires_at=func.now() + timedelta(seconds=self.lease_seconds),
+                # Leasing is not a goal modification - keep the optimistic lock version
+                updated_at=Goal.updated_at,
+            )
+            .returning(Goal.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    # ------------------------------------------------------------------
+    # Queue operations
+    # ------------------------------------------------------------------
+
+    async def claim(self, limit: int) -> List[UUID]:
+        """Lease up to `limit` ready goals for this owner (highest priority first)."""
+        async with self._session_factory() as session:
+            result = await session.execute(self.claim_statement(limit))
+            goal_ids = [row[0] for row in result.all()]
+            await session.commit()
+
+        if goal_ids:
+            logger.info("goals_claimed", owner=self.owner, count=len(goal_ids))
+        return goal_ids
+
+    async def extend(self, goal_ids: List[UUID]) -> int:
+        """Renew leases held by this owner (long-running executions)."""
+        return await self._update_owned(
+            goal_ids,
+            lease_expires_at=func.now() + timedelta(seconds=self.lease_seconds),
+        )
+
+    async def release(self, goal_ids: List[UUID]) -> int:
+        """Drop this owner's leases; goals become claimable again if still ready."""
+        return await self._update_owned(goal_ids, lease_owner=None, lease_expires_at=None)
+
+    async def _update_owned(self, goal_ids: List[UUID], **values) -> int:
+        from models import Goal
+
+        if not goal_ids:
+            return 0
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(Goal)
+                .where(Goal.id.in_(goal_ids))
+                .where(Goal.lease_owner == self.owner)
+                .values(updated_at=Goal.updated_at, **values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def reap_expired(self) -> int:
+        """
+        Clear expired leases (owners that crashed or stalled).
+
+        Claiming already ignores expired leases; reaping keeps lease_owner
+        truthful for monitoring and counts how often workers die mid-goal.
+        """
+        from models import Goal
+
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(Goal)
+                .where(Goal.lease_expires_at < func.now())
+                .values(lease_owner=None, lease_expires_at=None, updated_at=Goal.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        if result.rowcount:
+            logger.warning("goal_leases_reaped", count=result.rowcount)
+        return result.rowcount
+
+
+class LeasedGoalSelector:
+    """
+    GoalSelector replacement for ExecuteReadyGoalsUseCase.
+
+    select_ready() claims instead of plain SELECT; the use-case calls
+    release() after PHASE 2 so unfinished goals return to the queue.
+    """
+
+    def __init__(self, queue: Optional[GoalWorkQueue] = None):
+        self.queue = queue or GoalWorkQueue()
+
+    async def select_ready(self, uow, limit: int | None = None) -> List[UUID]:
+        # uow is read-only; the claim uses its own short write transaction
+        return await self.queue.claim(limit or 10)
+
+    async def release(self, goal_ids: List[UUID]) -> int:
+        return await self.queue.release(goal_ids)
@@ -0,0 +1,99 @@
+"""
+Session Changes - in-memory mirrors fed by ORM session events
+=============================================================
+
+Several components keep an in-memory view of a table so their reads never
+touch the database (autonomy.constraint_counters.GoalCounters,
+goal_conflict_index.GoalConflictIndex). They all follow the same cycle:
+
+    after_flush    -> collect(session): changes of this flush, kept in
+                      session.info under a per-instance key
+    after_commit   -> apply(changes)
+    after_rollback -> changes dropped
+
+and are rebuilt from the database by reconcile() at most every
+reconcile_seconds (ensure_fresh), which corrects drift and picks up
+writes from other processes (Celery workers).
+
+SessionChangeTracker implements the hooks and the staleness check;
+subclasses implement collect(), apply() and reconcile().
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import time
+from typing import Any, List, Optional
+
+
+class SessionChangeTracker:
+    """Base class: session listeners + periodic reconciliation."""
+
+    # Prefix of the session.info key; each instance collects its own changes
+    changes_key_prefix = "session_changes"
+
+    def __init__(self, reconcile_seconds: float):
+        self.reconcile_seconds = reconcile_seconds
+        self.last_reconciled: Optional[float] = None
+        self._installed = False
+        self._changes_key = f"{self.changes_key_prefix}:{id(self)}"
+
+    # =========================================================================
+    # SUBCLASS API
+    # =========================================================================
+
+    def collect(self, session) -> List[Any]:
+        """Changes to mirror from the session's pending flush"""
+        raise NotImplementedError
+
+    def apply(self, changes: List[Any]) -> None:
+        """Apply committed changes (in flush order)"""
+        raise NotImplementedError
+
+    async def reconcile(self) -> None:
+        """Rebuild from the database; must set last_reconciled"""
+        raise NotImplementedError
+
+    # =========================================================================
+    # SESSION HOOKS
+    # =========================================================================
+
+    def install(self):
+        """
+        Listen to every ORM session in this process. Idempotent.
+        """
+        if self._installed:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+        self._installed = True
+
+    def _after_flush(self, session, flush_context):
+        changes = self.collect(session)
+        if changes:
+            session.info.setdefault(self._changes_key, []).extend(changes)
+
+    def _after_commit(self, session):
+        changes = session.info.pop(self._changes_key, None)
+        if changes:
+            self.apply(changes)
+
+    def _after_rollback(self, session):
+        session.info.pop(self._changes_key, None)
+
+    # =========================================================================
+    # RECONCILIATION
+    # =========================================================================
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        if self.last_reconciled is None:
+            return True
+        return (time.time() if now is None else now) - self.last_reconciled >= self.reconcile_seconds
+
+    async def ensure_fresh(self):
+        """Reconcile if the last reconciliation is older than reconcile_seconds"""
+        if self.is_stale():
+            await self.reconcile()
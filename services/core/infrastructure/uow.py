@@ -40,6 +40,16 @@ class UnitOfWork:
                 await self._session.close()
                 self._session = None
     
+    async def commit(self) -> None:
+        """
+        Commit the work done so far and keep the UoW open.
+
+        Releases row locks and returns the connection to the pool; the next
+        statement on the session starts a new transaction. Use it to keep
+        long non-DB work (skill execution) outside of the locked section.
+        """
+        await self.session.commit()
+    
     @property
     def session(self) -> AsyncSession:
         """Доступ к текущей сессии"""
@@ -113,19 +123,24 @@ class AuditLogger:
         reason: str,
         actor: str
     ) -> None:
-        """Логировать успешный переход"""
+        """
+        Логировать успешный переход
+
+        The goal_status_transitions row is written in the caller's session,
+        so it commits (or rolls back) together with the status change.
+        /timeline reads transitions from this table.
+        """
         try:
-            from audit_logger_v2 import audit_logger, AuditEventType
-            await audit_logger.log(
-                event_type=AuditEventType.STATE_TRANSITION,
-                severity="INFO",
-                goal_id=goal_id,
-                goal_type=goal_type,
-                from_state=from_state,
-                to_state=to_state,
-                reason=reason,
-                actor=actor
-            )
+            from uuid import UUID
+            from models import GoalStatusTransition
+
+            session.add(GoalStatusTransition(
+                goal_id=UUID(str(goal_id)),
+                from_status=from_state or "unknown",
+                to_status=to_state,
+                reason=reason or "",
+                triggered_by=(actor or "system")[:32]
+            ))
         except Exception:
             pass  # Logging не должен ломать transitions
     
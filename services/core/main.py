@@ -1,6 +1,7 @@
 import uuid, asyncio, time, os
+from typing import Optional
 from datetime import datetime, timezone
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -107,8 +108,37 @@ async def startup():
     async with engine.begin() as conn: await conn.run_sync(Base.metadata.create_all)
     await bootstrap_dna()
     start_scheduler()
+    await start_change_feed()
+    await restore_tier_reliability()
     logger.info("🚀 SYSTEM ONLINE")
 
+
+async def start_change_feed():
+    """LISTEN for change feed notifications (/ui/stream)"""
+    from change_feed import change_feed_hub
+    # Connects (and retries) in the background; until then the UI
+    # stream degrades to heartbeats only
+    await change_feed_hub.start()
+
+
+async def restore_tier_reliability():
+    """Restore forecast error windows (Redis snapshot) into tier reliability"""
+    from emotional_error_store import emotional_error_store
+    from tier_reliability import tier_reliability_tracker
+    try:
+        restored = await emotional_error_store.load_snapshot()
+        tier_reliability_tracker.update_reliability(emotional_error_store)
+        logger.info("tier_reliability_restored", keys=restored)
+    except Exception as e:
+        # Reliability starts empty and refills from new outcomes
+        logger.error("tier_reliability_restore_failed", error=str(e))
+
+
+@app.on_event("shutdown")
+async def shutdown_change_feed():
+    from change_feed import change_feed_hub
+    await change_feed_hub.stop()
+
 @app.post("/chat", response_model=MessageResponse)
 async def chat(req: MessageCreate, db=Depends(get_db)):
     sid = req.session_id or str(uuid.uuid4())
@@ -937,6 +967,67 @@ async def reflect_on_goal_endpoint(goal_id: str, strict_evaluation: dict, uow: U
         }
 
 
+class BatchEvaluateRequest(BaseModel):
+    goal_ids: list
+
+
+class BatchReflectRequest(BaseModel):
+    strict_evaluations: dict  # {goal_id: strict_evaluation}
+
+
+@app.post("/goals/strict_evaluate/batch")
+async def strict_evaluate_goals_batch_endpoint(req: BatchEvaluateRequest, uow: UnitOfWork = Depends(get_uow)):
+    """
+    Строго оценивает волну целей одной транзакцией
+
+    Артефакты загружаются одним запросом, LLM-оценки упакованы в минимум вызовов.
+    Ошибка по одной цели не прерывает остальные.
+    """
+    from goal_strict_evaluator import goal_strict_evaluator
+
+    try:
+        evaluations = await goal_strict_evaluator.evaluate_goals_batch_with_uow(uow, req.goal_ids)
+
+        return {
+            "status": "ok",
+            "strict_evaluations": evaluations,
+            "transaction": "atomic"
+        }
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return {
+            "status": "error",
+            "message": f"Failed to evaluate goals: {str(e)}"
+        }
+
+
+@app.post("/goals/reflect/batch")
+async def reflect_on_goals_batch_endpoint(req: BatchReflectRequest, uow: UnitOfWork = Depends(get_uow)):
+    """
+    Рефлексия по волне целей одной транзакцией (результаты strict_evaluate/batch)
+    """
+    from goal_reflector import goal_reflector
+
+    try:
+        reflections = await goal_reflector.reflect_on_goals_batch_with_uow(uow, req.strict_evaluations)
+
+        return {
+            "status": "ok",
+            "reflections": reflections,
+            "transaction": "atomic"
+        }
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return {
+            "status": "error",
+            "message": f"Failed to reflect on goals: {str(e)}"
+        }
+
+
 @app.get("/goals/{goal_id}/patterns")
 async def get_goal_patterns(goal_id: str):
     """
@@ -1351,62 +1442,57 @@ async def get_artifact(artifact_id: str):
 
 
 @app.get("/artifacts/{artifact_id}/content")
-async def get_artifact_content(artifact_id: str):
+async def get_artifact_content(artifact_id: str, preview_kb: Optional[int] = None):
     """
-    Возвращает содержимое артефакта (для FILE type)
+    Возвращает превью содержимого артефакта (для FILE type)
 
-    Читает файл с диска или возвращает ошибку если файл не найден
+    Only the first preview_kb KB (default ARTIFACT_PREVIEW_KB, max 1024)
+    are returned; "truncated" tells whether the file is longer.
+    Full content: GET /artifacts/{artifact_id}/download
     """
-    import os
+    from artifact_content import resolve_artifact_file, read_preview, ArtifactContentError
 
-    from artifact_registry import artifact_registry
-    from database import AsyncSessionLocal
-    from sqlalchemy import select
-    from models import Artifact as ArtifactModel
+    try:
+        file_path, st = await resolve_artifact_file(artifact_id)
+        preview = await read_preview(file_path, st.st_size, preview_kb)
+    except ArtifactContentError as e:
+        error = {"status": "error", "message": e.message, "artifact_id": artifact_id}
+        if e.file_path:
+            error["file_path"] = e.file_path
+        if e.message == "File not found on disk":
+            error["hint"] = "The artifact was registered but the file may have been lost during container restart"
+        return error
+    except OSError as e:
+        return {
+            "status": "error",
+            "message": f"Failed to read file: {str(e)}",
+            "artifact_id": artifact_id
+        }
 
-    async with AsyncSessionLocal() as db:
-        stmt = select(ArtifactModel).where(ArtifactModel.id == uuid.UUID(artifact_id))
-        result = await db.execute(stmt)
-        artifact_db = result.scalar_one_or_none()
+    return {
+        "status": "ok",
+        "artifact_id": artifact_id,
+        "file_path": file_path,
+        **preview,
+        "download_url": f"/artifacts/{artifact_id}/download"
+    }
 
-        if not artifact_db:
-            return {"status": "error", "message": "Artifact not found"}
 
-        # Check if file exists
-        file_path = artifact_db.content_location
-        if not file_path:
-            return {
-                "status": "error",
-                "message": "No file location for this artifact",
-                "artifact_id": artifact_id
-            }
+@app.get("/artifacts/{artifact_id}/download")
+async def download_artifact_content(artifact_id: str, request: Request, compress: bool = True):
+    """
+    Отдаёт файл артефакта потоково
 
-        # Try to read file
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+    Supports Range requests, ETag/If-None-Match and gzip
+    (Accept-Encoding, disable with ?compress=false).
+    """
+    from artifact_content import resolve_artifact_file, build_download_response, ArtifactContentError
 
-                return {
-                    "status": "ok",
-                    "artifact_id": artifact_id,
-                    "file_path": file_path,
-                    "file_content": content,
-                    "file_size": len(content)
-                }
-            except Exception as e:
-                return {
-                    "status": "error",
-                    "message": f"Failed to read file: {str(e)}",
-                    "file_path": file_path
-                }
-        else:
-            return {
-                "status": "error",
-                "message": "File not found on disk",
-                "file_path": file_path,
-                "hint": "The artifact was registered but the file may have been lost during container restart"
-            }
+    try:
+        file_path, st = await resolve_artifact_file(artifact_id)
+        return await build_download_response(request, file_path, st, compress=compress)
+    except ArtifactContentError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
 
 
 @app.post("/artifacts/{artifact_id}/verify")
@@ -1837,73 +1923,45 @@ async def get_node_inspector(node_id: str):
 @app.get("/timeline")
 async def get_timeline(
     limit: int = 50,
-    node_type: Optional[str] = None
+    node_type: Optional[str] = None,
+    event_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None
 ):
     """
-    Получает таймлайн событий (создание/обновление целей, артефактов)
+    Получает таймлайн событий (переходы статусов, создание/исполнение целей, артефакты)
+
+    Events come from goal_status_transitions, goals.created_at /
+    execution_*_at and artifacts, merged in a single indexed query.
+    Pass next_cursor from the previous page as ?cursor= to page back.
+    event_type: comma-separated filter (transition, created,
+    execution_started, execution_completed).
     """
-    from models import Goal, Artifact
-    from database import AsyncSessionLocal
-    from sqlalchemy import select, union_all
+    from timeline_service import timeline_service
 
-    events = []
+    event_types = [e.strip() for e in event_type.split(",") if e.strip()] if event_type else None
 
     async with AsyncSessionLocal() as db:
-        # Получаем цели с их created_at/updated_at
-        goal_stmt = select(Goal).order_by(Goal.created_at.desc()).limit(limit)
-        goal_result = await db.execute(goal_stmt)
-        goals = goal_result.scalars().all()
-
-        for g in goals:
-            events.append({
-                "timestamp": g.created_at.isoformat() if g.created_at else None,
-                "node_id": str(g.id),
-                "node_type": "goal",
-                "event_type": "created",
-                "data": {
-                    "title": g.title,
-                    "status": g.status
-                }
-            })
-
-            if g.updated_at:
-                events.append({
-                    "timestamp": g.updated_at.isoformat(),
-                    "node_id": str(g.id),
-                    "node_type": "goal",
-                    "event_type": "updated",
-                    "data": {
-                        "title": g.title,
-                        "status": g.status,
-                        "progress": g.progress
-                    }
-                })
-
-        # Получаем артефакты
-        artifact_stmt = select(Artifact).order_by(Artifact.created_at.desc()).limit(limit)
-        artifact_result = await db.execute(artifact_stmt)
-        artifacts = artifact_result.scalars().all()
-
-        for a in artifacts:
-            events.append({
-                "timestamp": a.created_at.isoformat() if a.created_at else None,
-                "node_id": str(a.id),
-                "node_type": "artifact",
-                "event_type": "created",
-                "data": {
-                    "type": a.type,
-                    "status": a.verification_status
-                }
-            })
-
-        # Сортируем по timestamp
-        events.sort(key=lambda x: x["timestamp"] or "", reverse=True)
+        try:
+            page = await timeline_service.get_page(
+                db,
+                limit=limit,
+                node_type=node_type,
+                event_types=event_types,
+                since=since,
+                until=until,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        return {
-            "status": "ok",
-            "events": events[:limit],
-            "total": len(events)
-        }
+    return {
+        "status": "ok",
+        "events": page["events"],
+        "total": len(page["events"]),
+        "next_cursor": page["next_cursor"]
+    }
 
 
 @app.post("/ui/events")
@@ -1932,16 +1990,22 @@ async def handle_ui_event(event: dict):
 
 
 @app.get("/ui/stream")
-async def stream_ui_updates():
+async def stream_ui_updates(request: Request, last_event_id: Optional[str] = None):
     """
     SSE stream для real-time обновлений UI
+
+    Pushes deltas from the change feed (goal transitions, artifact
+    registrations, execution events). Reconnect with Last-Event-ID header
+    (or ?last_event_id=) to resume; RESYNC event means refetch once.
     """
+    from change_feed import change_feed_hub
+
+    resume_from = request.headers.get("Last-Event-ID") or last_event_id
+
     async def event_generator():
         try:
-            while True:
-                # Отправляем heartbeat
-                yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': datetime.utcnow().isoformat()})}\n\n"
-                await asyncio.sleep(5)
+            async for frame in change_feed_hub.subscribe(resume_from):
+                yield frame
         except asyncio.CancelledError:
             pass
 
@@ -1956,6 +2020,13 @@ async def stream_ui_updates():
     )
 
 
+@app.get("/ui/stream/stats")
+async def stream_ui_stats():
+    """Change feed hub stats (subscribers, last sequence, listener state)"""
+    from change_feed import change_feed_hub
+    return change_feed_hub.get_stats()
+
+
 # ============= ARTIFACTS API ENDPOINTS =============
 
 @app.get("/artifacts")
@@ -2292,6 +2363,9 @@ async def answer_question(question_id: str, answer: str):
     
     # Удаляем из pending
     redis_client.delete(question_key)
+
+    from question_deadlines import question_deadlines
+    await question_deadlines.cancel(question_id)
     
     # Сохраняем ответ в историю
     history_key = f"question_history:{question_data['goal_id']}"
@@ -2372,122 +2446,17 @@ async def get_question_history(goal_id: str, limit: int = 10):
 @app.post("/questions/check-timeouts")
 async def check_question_timeouts():
     """
-    Проверяет все вопросы на таймаут и применяет timeout_action
+    Проверяет вопросы на таймаут и применяет timeout_action
 
-    Вызывается периодически для обработки просроченных вопросов
+    Вызывается периодически для обработки просроченных вопросов.
+    Дедлайны берутся из Redis sorted set (question_deadlines.py):
+    стоимость пропорциональна числу просроченных, а не всех вопросов.
     """
-    from redis import Redis
-    from models import Artifact, Goal
-    from sqlalchemy import select
-    from goal_transition_service import transition_service
-
-    redis_client = Redis(host='redis', port=6379, db=0, decode_responses=True)
-
-    timeout_keys = redis_client.keys("question_timeout:*")
-
-    processed = []
-
-    async with get_uow() as uow:
-        for timeout_key in timeout_keys:
-            ttl = redis_client.ttl(timeout_key)
+    from question_deadlines import question_deadlines
 
-            if ttl == -2:
-                timeout_data_raw = redis_client.get(timeout_key)
-                continue
-
-            elif ttl == -1:
-                continue
-
-            continue
-
-        stmt = select(Artifact).where(
-            Artifact.type == "QUESTION",
-            Artifact.content["status"].astext == "pending"
-        )
-        result = await uow.session.execute(stmt)
-        pending_artifacts = result.scalars().all()
-
-        now = datetime.utcnow()
-
-        for artifact in pending_artifacts:
-            content = artifact.content
-            timeout_at_str = content.get("timeout_at")
-
-            if not timeout_at_str:
-                continue
-
-            timeout_at = datetime.fromisoformat(timeout_at_str)
-
-            if now >= timeout_at:
-                timeout_action = content.get("timeout_action", "continue_with_default")
-                default_answer = content.get("default_answer")
-                goal_id = artifact.metadata.get("goal_id")
-
-                logger.info(f"⏰ Question timeout: {artifact.id}")
-                logger.info(f"   Action: {timeout_action}")
-
-                if timeout_action == "continue_with_default":
-                    if default_answer:
-                        artifact.content["answer"] = default_answer
-                        artifact.content["answered_at"] = now.isoformat()
-                        artifact.content["status"] = "answered_with_default"
-                        artifact.content["timeout_used"] = True
-
-                        await uow.session.flush()
-
-                        processed.append({
-                            "question_id": str(artifact.id),
-                            "action": "continue_with_default",
-                            "default_answer": default_answer[:100] if default_answer else None
-                        })
-
-                        logger.info(f"   ✓ Used default answer")
-                else:
-                    timeout_action = "fail_goal"
-
-            if timeout_action == "fail_goal":
-                if goal_id:
-                    from uuid import UUID
-                    try:
-                        goal_stmt = select(Goal).where(Goal.id == UUID(goal_id))
-                        goal_result = await uow.session.execute(goal_stmt)
-                        goal = goal_result.scalar_one_or_none()
-
-                        if goal:
-                            goal.error_message = f"Question timed out: {content.get('question', 'Unknown')[:100]}"
-
-                            await transition_service.transition(
-                                uow=uow,
-                                goal_id=goal.id,
-                                new_state="failed",
-                                reason=f"Question timed out: {content.get('question', 'Unknown')[:100]}",
-                                actor="system"
-                            )
-
-                            processed.append({
-                                "question_id": str(artifact.id),
-                                "action": "fail_goal",
-                                "goal_id": goal_id
-                            })
-
-                            logger.info(f"   ✗ Goal {goal_id[:8]}... marked as failed")
-                    except Exception as e:
-                        logger.info(f"   Error failing goal: {e}")
-
-            elif timeout_action == "wait_longer":
-                new_timeout = now + timedelta(hours=1)
-                artifact.content["timeout_at"] = new_timeout.isoformat()
-                artifact.content["extended_count"] = artifact.content.get("extended_count", 0) + 1
-
-                await uow.session.flush()
-
-                processed.append({
-                    "question_id": str(artifact.id),
-                    "action": "wait_longer",
-                    "extended_until": new_timeout.isoformat()
-                })
-
-                logger.info(f"   ⏱ Extended until {new_timeout.isoformat()}")
+    now = datetime.utcnow()
+    await question_deadlines.backfill()
+    processed = await question_deadlines.process_expired(now)
 
     return {
         "status": "ok",
@@ -3097,14 +3066,14 @@ async def create_personality_snapshot(user_id: str, reason: str = "update", crea
 @app.get("/personality/{user_id}/snapshots")
 async def get_personality_snapshots(user_id: str, limit: int = 10):
     """
-    Получить историю снапшотов.
+    Получить историю снапшотов (метаданные, без payload).
 
     Args:
         user_id: UUID пользователя
         limit: Макс. количество снапшотов
 
     Returns:
-        List[PersonalitySnapshotSchema]
+        List[PersonalitySnapshotInfoSchema]
     """
     from personality_engine import get_personality_engine
 
@@ -3122,6 +3091,35 @@ async def get_personality_snapshots(user_id: str, limit: int = 10):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/personality/{user_id}/snapshots/{snapshot_version}")
+async def get_personality_snapshot(user_id: str, snapshot_version: int):
+    """
+    Получить состояние профиля на версии снапшота.
+
+    Args:
+        user_id: UUID пользователя
+        snapshot_version: Версия снапшота
+
+    Returns:
+        PersonalitySnapshotSchema
+    """
+    from personality_engine import get_personality_engine
+
+    try:
+        engine = get_personality_engine()
+        snapshot = await engine.get_snapshot(user_id, snapshot_version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not snapshot:
+        raise HTTPException(status_code=404, detail=f"Snapshot version {snapshot_version} not found")
+
+    return {
+        "status": "ok",
+        "snapshot": snapshot.dict()
+    }
+
+
 @app.post("/personality/{user_id}/rollback/{snapshot_version}")
 async def rollback_personality_to_snapshot(user_id: str, snapshot_version: int):
     """
@@ -3244,7 +3242,7 @@ async def check_goal_conflicts(goal_id: str, check_against: list = None):
 
 
 @app.get("/goals/{user_id}/conflicts")
-async def get_goal_conflicts(user_id: str, status: str = None, severity: str = None):
+async def get_goal_conflicts(user_id: str, status: str = None, severity: str = None, scan: bool = False):
     """
     Получить все конфликты пользователя.
 
@@ -3252,6 +3250,7 @@ async def get_goal_conflicts(user_id: str, status: str = None, severity: str = N
         user_id: UUID пользователя
         status: Фильтр по статусу (detected, resolved, ignored)
         severity: Фильтр по severity (low, medium, high, critical)
+        scan: Сначала проверить все пары активных целей (batch scan)
 
     Returns:
         List[SingleConflict]
@@ -3260,14 +3259,18 @@ async def get_goal_conflicts(user_id: str, status: str = None, severity: str = N
 
     try:
         detector = get_goal_conflict_detector()
+        scan_result = await detector.scan_conflicts() if scan else None
         conflicts = await detector.get_conflicts_for_user(user_id, status, severity)
 
-        return {
+        response = {
             "status": "ok",
             "user_id": user_id,
             "count": len(conflicts),
             "conflicts": [c.dict() for c in conflicts]
         }
+        if scan_result is not None:
+            response["scan"] = scan_result
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -4284,7 +4287,7 @@ async def get_intervention_simulation(intervention_id: str):
     Shows "what if" scenarios without applying changes.
     """
     try:
-        simulation = counterfactual_simulator.get_simulation(intervention_id)
+        simulation = await counterfactual_simulator.get_simulation(intervention_id)
 
         if not simulation:
             raise HTTPException(status_code=404, detail="Simulation not found")
@@ -4303,23 +4306,34 @@ async def get_intervention_simulation(intervention_id: str):
 
 
 @app.post("/interventions/{intervention_id}/simulate")
-async def run_intervention_simulation(intervention_id: str, replay_window_days: int = 30):
+async def run_intervention_simulation(
+    intervention_id: str,
+    replay_window_days: int = 30,
+    compare_pending: bool = False
+):
     """
     POST /interventions/{id}/simulate — Run counterfactual simulation
 
-    Runs "what if" analysis on historical data.
+    Runs "what if" analysis on historical data (whole replay window).
     Does NOT modify system state.
+
+    compare_pending=true: additionally replays all proposed candidates
+    on the same window and returns them ranked (not persisted).
     """
     try:
-        simulation = counterfactual_simulator.simulate_intervention(
+        # One window load shared by the simulation and the comparison
+        window = await counterfactual_simulator.load_window(replay_window_days)
+
+        simulation = await counterfactual_simulator.simulate_intervention(
             intervention_id=intervention_id,
-            replay_window_days=replay_window_days
+            replay_window_days=replay_window_days,
+            window=window
         )
 
         if not simulation:
             raise HTTPException(status_code=400, detail="Simulation failed (insufficient data or other error)")
 
-        return {
+        response = {
             "status": "ok",
             "message": "Simulation completed",
             "simulation": {
@@ -4334,6 +4348,14 @@ async def run_intervention_simulation(intervention_id: str, replay_window_days:
             }
         }
 
+        if compare_pending:
+            response["comparison"] = await counterfactual_simulator.compare_candidates(
+                status="proposed",
+                window=window
+            )
+
+        return response
+
     except HTTPException:
         raise
     except Exception as e:
@@ -5666,13 +5688,24 @@ async def get_sk_signals(
 @app.get("/occp/audit")
 async def get_occp_audit(
     source: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    node_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    verify: bool = False
 ):
     """
     GET /occp/audit
 
     Get OCCP audit log (MCL + SK decisions)
+
+    source=federated: OCCP v0.3 gateway audit log (hash-chained segments),
+    filtered by node_id and time range [since, until]; verify=true also
+    recomputes each node's hash chain
     """
+    if source == "federated":
+        return await _get_federated_audit(node_id, since, until, limit, verify)
+
     try:
         from models import OCCPAuditEvent
         from database import AsyncSessionLocal
@@ -5713,6 +5746,59 @@ async def get_occp_audit(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _get_federated_audit(
+    node_id: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    limit: int,
+    verify: bool
+):
+    from occp_audit_log import (
+        AUDIT_ROOT, list_audit_nodes, node_directories, query_directory, validate_node_id, verify_directory
+    )
+
+    if node_id is not None:
+        try:
+            validate_node_id(node_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def _aware(ts: Optional[datetime]) -> Optional[datetime]:
+        return ts.replace(tzinfo=timezone.utc) if ts is not None and ts.tzinfo is None else ts
+
+    since, until = _aware(since), _aware(until)
+    nodes = [node_id] if node_id else list_audit_nodes()
+
+    def _read():
+        events, chains = [], {}
+        for node in nodes:
+            for directory in node_directories(node):
+                events.extend(query_directory(directory, since, until, limit))
+                if verify:
+                    # "node" or "node/writer-<pid>": every directory is its own chain
+                    chains[os.path.relpath(directory, AUDIT_ROOT)] = verify_directory(directory)
+        events.sort(key=lambda e: e["timestamp"], reverse=True)
+        return events[:limit], chains
+
+    try:
+        # Segment reads are file I/O - keep them off the event loop
+        events, chains = await asyncio.get_running_loop().run_in_executor(None, _read)
+        response = {
+            "status": "ok",
+            "source": "federated",
+            "count": len(events),
+            "events": events
+        }
+        if verify:
+            response["chain"] = chains
+        return response
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/occp/info")
 async def get_occp_info():
     """
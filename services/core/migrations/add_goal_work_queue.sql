@@ -0,0 +1,20 @@
+-- Goal work queue
+-- GoalWorkQueue claims ready atomic goals with
+-- "FOR UPDATE SKIP LOCKED" and a lease, so concurrent scheduler/worker
+-- replicas never execute the same goal twice.
+-- Date: 2026-10-18
+
+ALTER TABLE goals ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE goals ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(128);
+ALTER TABLE goals ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+-- Claim order, only rows the queue can ever return
+CREATE INDEX IF NOT EXISTS idx_goals_ready_queue
+    ON goals (priority DESC, created_at)
+    WHERE is_atomic = true AND progress < 1.0;
+
+-- Verification query
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'goals'
+  AND indexname = 'idx_goals_ready_queue';
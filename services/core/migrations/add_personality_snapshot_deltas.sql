@@ -0,0 +1,41 @@
+-- Delta-encoded personality snapshots
+-- personality_snapshots keeps a full checkpoint every
+-- PERSONALITY_SNAPSHOT_CHECKPOINT_INTERVAL snapshots and JSON Patch deltas
+-- between them (personality_snapshots.py). Existing rows become checkpoints.
+-- Old chains are compacted by the scheduler job personality_snapshots_compact.
+-- Date: 2026-10-18
+
+ALTER TABLE personality_snapshots ADD COLUMN IF NOT EXISTS sequence INTEGER;
+ALTER TABLE personality_snapshots ADD COLUMN IF NOT EXISTS base_sequence INTEGER;
+ALTER TABLE personality_snapshots ADD COLUMN IF NOT EXISTS kind VARCHAR(10) NOT NULL DEFAULT 'full';
+ALTER TABLE personality_snapshots ADD COLUMN IF NOT EXISTS delta JSON;
+
+-- Backfill: existing full snapshots numbered per profile in creation order
+UPDATE personality_snapshots s
+SET sequence = n.seq, base_sequence = n.seq
+FROM (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY profile_id ORDER BY created_at, id) AS seq
+    FROM personality_snapshots
+) n
+WHERE s.id = n.id AND s.sequence IS NULL;
+
+ALTER TABLE personality_snapshots ALTER COLUMN sequence SET NOT NULL;
+ALTER TABLE personality_snapshots ALTER COLUMN base_sequence SET NOT NULL;
+
+-- Delta rows carry no payload
+ALTER TABLE personality_snapshots ALTER COLUMN core_traits DROP NOT NULL;
+ALTER TABLE personality_snapshots ALTER COLUMN motivations DROP NOT NULL;
+ALTER TABLE personality_snapshots ALTER COLUMN "values" DROP NOT NULL;
+ALTER TABLE personality_snapshots ALTER COLUMN preferences DROP NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_personality_snapshots_profile_sequence
+    ON personality_snapshots (profile_id, sequence);
+
+-- Chain reads: checkpoint + deltas of one segment
+CREATE INDEX IF NOT EXISTS idx_personality_snapshots_chain
+    ON personality_snapshots (profile_id, base_sequence, sequence);
+
+-- Verification query
+SELECT kind, count(*) AS snapshots, count(DISTINCT profile_id) AS profiles
+FROM personality_snapshots
+GROUP BY kind;
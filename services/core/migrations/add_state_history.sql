@@ -0,0 +1,48 @@
+-- System state history
+-- Append-only time series for SystemState instead of the ever-growing
+-- system_state.trend_history JSON list. Raw points older than
+-- STATE_HISTORY_RAW_RETENTION_DAYS are rolled into hourly buckets, hourly
+-- older than STATE_HISTORY_HOURLY_RETENTION_DAYS into daily buckets
+-- (StateHistory.downsample, scheduler job state_history_downsample).
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS system_state_history (
+    id BIGSERIAL PRIMARY KEY,
+    entity_name VARCHAR(255) NOT NULL,
+    resolution VARCHAR(8) NOT NULL DEFAULT 'raw',   -- raw, hour, day
+    ts TIMESTAMP WITHOUT TIME ZONE NOT NULL,         -- rollups: bucket start
+    value DOUBLE PRECISION NOT NULL,                 -- rollups: mean
+    count INTEGER NOT NULL DEFAULT 1,
+    min_value DOUBLE PRECISION NOT NULL,
+    max_value DOUBLE PRECISION NOT NULL
+);
+
+-- Windowed reads per entity
+CREATE INDEX IF NOT EXISTS idx_state_history_entity_ts
+    ON system_state_history (entity_name, ts);
+
+-- Downsampling scans old rows of one resolution
+CREATE INDEX IF NOT EXISTS idx_state_history_resolution_ts
+    ON system_state_history (resolution, ts);
+
+-- One rollup row per bucket (ON CONFLICT target of downsample)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_state_history_rollup
+    ON system_state_history (entity_name, resolution, ts)
+    WHERE resolution != 'raw';
+
+-- Backfill from trend_history (numeric points only, once)
+INSERT INTO system_state_history (entity_name, resolution, ts, value, count, min_value, max_value)
+SELECT s.entity_name, 'raw', (h->>'date')::timestamp, (h->>'value')::double precision, 1,
+       (h->>'value')::double precision, (h->>'value')::double precision
+FROM system_state s
+CROSS JOIN LATERAL json_array_elements(s.trend_history::json) AS h
+WHERE s.trend_history IS NOT NULL
+  AND json_typeof(h->'value') = 'number'
+  AND NOT EXISTS (
+      SELECT 1 FROM system_state_history x WHERE x.entity_name = s.entity_name
+  );
+
+-- Verification query
+SELECT resolution, count(*) AS rows, count(DISTINCT entity_name) AS entities
+FROM system_state_history
+GROUP BY resolution;
@@ -0,0 +1,25 @@
+-- Timeline indexes
+-- /timeline merges goal_status_transitions, goals and artifacts with
+-- per-source "ORDER BY ts DESC LIMIT n" branches; each branch must be
+-- served by an index scan instead of a full sort.
+-- Date: 2026-10-18
+
+-- goals.created_at had no index
+CREATE INDEX IF NOT EXISTS idx_goals_created_at
+    ON goals (created_at);
+
+-- Execution events: only goals that actually ran
+CREATE INDEX IF NOT EXISTS idx_goals_execution_started_at
+    ON goals (execution_started_at)
+    WHERE execution_started_at IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_goals_execution_completed_at
+    ON goals (execution_completed_at)
+    WHERE execution_completed_at IS NOT NULL;
+
+-- Verification query
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'goals'
+  AND indexname LIKE 'idx_goals_%_at'
+ORDER BY indexname;
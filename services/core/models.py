@@ -141,10 +141,28 @@ class Goal(Base):
     strategy_id = Column(UUID(as_uuid=True), ForeignKey("strategies.id"), nullable=True, index=True)
     # Links goal to the strategy it belongs to. NULL = no strategy (manual or ad-hoc goal)
 
+    # Work queue (see infrastructure/goal_work_queue.py)
+    priority = Column(Integer, default=0, server_default="0", nullable=False)  # выше = раньше
+    lease_owner = Column(String(128), nullable=True)  # host:pid воркера, взявшего цель
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
     # Relationships
     children = relationship("Goal", backref=backref('parent', remote_side=[id]))
     # Additional relations will be loaded via GoalRelation model
 
+    # Timeline indexes (see timeline_service.py): each UNION branch reads
+    # newest-first straight from its index
+    __table_args__ = (
+        Index('idx_goals_created_at', 'created_at'),
+        Index('idx_goals_execution_started_at', 'execution_started_at',
+              postgresql_where=execution_started_at.isnot(None)),
+        Index('idx_goals_execution_completed_at', 'execution_completed_at',
+              postgresql_where=execution_completed_at.isnot(None)),
+        # Ready queue: claim order for GoalWorkQueue, only unfinished atomic goals
+        Index('idx_goals_ready_queue', priority.desc(), 'created_at',
+              postgresql_where=(is_atomic == True) & (progress < 1.0)),  # noqa: E712
+    )
+
 class GoalRelation(Base):
     """
     Relationships between goals beyond parent-child hierarchy
@@ -565,11 +583,20 @@ class PersonalitySnapshot(Base):
     snapshot_version = Column(Integer, nullable=False)
     snapshot_reason = Column(String(200), nullable=True)  # "user_update", "adaptation", "manual"
 
-    # Полный snapshot состояния (JSON)
-    core_traits = Column(JSON, nullable=False)  # {"openness": 0.7, ...}
-    motivations = Column(JSON, nullable=False)  # {"growth": 0.9, ...}
-    values = Column(JSON, nullable=False)  # [{"name": "осознанность", "importance": 0.8}, ...]
-    preferences = Column(JSON, nullable=False)  # {"communication_style": {...}, ...}
+    # Порядковый номер снапшота профиля и checkpoint, от которого считается delta
+    # (см. personality_snapshots.py)
+    sequence = Column(Integer, nullable=False)
+    base_sequence = Column(Integer, nullable=False)  # у checkpoint == sequence
+    kind = Column(String(10), nullable=False, default="full")  # full, delta
+
+    # Полный snapshot состояния (JSON) - только для kind="full"
+    core_traits = Column(JSON, nullable=True)  # {"openness": 0.7, ...}
+    motivations = Column(JSON, nullable=True)  # {"growth": 0.9, ...}
+    values = Column(JSON, nullable=True)  # [{"name": "осознанность", "importance": 0.8}, ...]
+    preferences = Column(JSON, nullable=True)  # {"communication_style": {...}, ...}
+
+    # JSON Patch (RFC 6902) от предыдущего снапшота - только для kind="delta"
+    delta = Column(JSON, nullable=True)  # [{"op": "replace", "path": "/core_traits/openness", "value": 0.8}]
 
     # Метаданные
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -578,6 +605,11 @@ class PersonalitySnapshot(Base):
     # Relationships
     profile = relationship("UserProfile", backref="snapshots")
 
+    __table_args__ = (
+        Index("uq_personality_snapshots_profile_sequence", "profile_id", "sequence", unique=True),
+        Index("idx_personality_snapshots_chain", "profile_id", "base_sequence", "sequence"),
+    )
+
 
 class ContextualMemory(Base):
     """
@@ -90,6 +90,9 @@ class AdversarialTestSandbox(SandboxExecutor):
                     aborted=True
                 )
 
+        except MemoryError:
+            raise  # SandboxExecutor.execute decides: result or worker recycle
+
         except Exception as e:
             return SandboxResult(
                 sandbox_id=self.contract.sandbox_id,
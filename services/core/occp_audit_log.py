@@ -0,0 +1,489 @@
+"""
+OCCP v0.3 Federated Audit Log
+Async, batched, hash-chained audit sink for OCCPGateway
+
+OCCPGateway._audit_log used to open the audit file, take an fcntl lock,
+write one JSON line and close it - synchronously on the event loop, once
+per federated request - and entries were not linked to each other.
+
+FederatedAuditLog:
+- append(): assigns seq + hash chain and queues the entry in memory
+  (no I/O on the request path); backpressure only when MAX_PENDING
+  entries are waiting for the disk
+- Background writer: writes queued entries in one batch and fsyncs every
+  FLUSH_INTERVAL_MS, or immediately once FLUSH_BATCH entries are queued
+- Hash chain: entry_hash = sha256(prev_hash + canonical JSON of the entry);
+  the first entry chains to GENESIS_HASH. verify() recomputes the chain,
+  so a modified, removed or reordered entry is detected
+- Segments: <dir>/segment-000001.jsonl ... rotated at SEGMENT_BYTES;
+  <dir>/index.json keeps per segment seq range, time range and boundary
+  hashes, so query(since, until) only opens overlapping segments
+
+One log (directory) per node - nodes never share an audit log. Within a
+process get_federated_audit_log(node_id) returns the shared instance; a
+second process that finds the directory's writer lock taken writes to
+its own writer-<pid> subdirectory; node_directories() returns both, so
+readers see every entry of the node. Node ids are restricted to
+NODE_ID_PATTERN before they become a path.
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import asyncio
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+AUDIT_ROOT = os.getenv("OCCP_AUDIT_DIR", os.path.join(tempfile.gettempdir(), "occp_federated_audit"))
+FLUSH_INTERVAL_MS = int(os.getenv("OCCP_AUDIT_FLUSH_INTERVAL_MS", "100"))
+FLUSH_BATCH = int(os.getenv("OCCP_AUDIT_FLUSH_BATCH", "256"))
+SEGMENT_BYTES = int(os.getenv("OCCP_AUDIT_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+MAX_PENDING = int(os.getenv("OCCP_AUDIT_MAX_PENDING", "50000"))
+
+GENESIS_HASH = "0" * 64
+INDEX_FILE = "index.json"
+LOCK_FILE = ".writer.lock"
+WRITER_DIR_PREFIX = "writer-"
+
+# Node id is a single path component: no separators, no "." / ".."
+NODE_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+def _canonical(entry: Dict[str, Any]) -> bytes:
+    return json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def chain_hash(prev_hash: str, entry: Dict[str, Any]) -> str:
+    """Hash of an entry (without its entry_hash field) chained to prev_hash."""
+    body = {k: v for k, v in entry.items() if k != "entry_hash"}
+    return hashlib.sha256(prev_hash.encode() + _canonical(body)).hexdigest()
+
+
+def _parse_ts(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+class FederatedAuditLog:
+    """Hash-chained, segmented, batch-fsynced JSONL audit log."""
+
+    def __init__(
+        self,
+        directory: str,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        flush_batch: int = FLUSH_BATCH,
+        segment_bytes: int = SEGMENT_BYTES,
+        max_pending: int = MAX_PENDING
+    ):
+        self.directory = directory
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.flush_batch = flush_batch
+        self.segment_bytes = segment_bytes
+        self.max_pending = max_pending
+
+        self._pending: Deque[Dict[str, Any]] = deque()  # touched on the event loop only
+        self._inflight = 0
+        self._io_lock = threading.Lock()  # writer thread vs atexit flush_sync
+        self._opened = False
+        self._opened_before = False
+        self._lock_fd: Optional[int] = None
+        self._index: List[Dict[str, Any]] = []
+        self._seq = 0
+        self._last_hash = GENESIS_HASH
+
+        self._writer: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Event] = None
+
+        self._stats = {"appended": 0, "written": 0, "batches": 0, "fsyncs": 0, "write_errors": 0}
+
+    # =========================================================================
+    # OPEN / RECOVERY
+    # =========================================================================
+
+    def _open(self) -> None:
+        """Take the writer lock, load the index and continue the chain."""
+        if self._opened:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+
+        fd = os.open(os.path.join(self.directory, LOCK_FILE), os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            fallback = os.path.join(self.directory, f"{WRITER_DIR_PREFIX}{os.getpid()}")
+            logger.warning("occp_audit_dir_locked", directory=self.directory, fallback=fallback)
+            self.directory = fallback
+            return self._open()
+        self._lock_fd = fd
+
+        self._index = self._read_index(self.directory)
+        if self._index:
+            self._recover_tail()
+        if not self._opened_before:
+            atexit.register(self.flush_sync)
+        self._opened = self._opened_before = True
+
+    def _recover_tail(self) -> None:
+        """Trust the active segment's content over the index (crash between write and index update)."""
+        active = self._index[-1]
+        last = None
+        count = 0
+        good_bytes = 0
+        path = os.path.join(self.directory, active["file"])
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("torn line")
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last write - the chain continues from the last full entry
+                    last = entry
+                    count += 1
+                    good_bytes += len(line)
+            if good_bytes < os.path.getsize(path):
+                logger.warning("occp_audit_torn_tail_truncated", segment=active["file"], bytes=good_bytes)
+                os.truncate(path, good_bytes)
+
+        active["bytes"] = good_bytes
+        if last is not None:
+            active.update(
+                last_seq=last["seq"], last_ts=last["timestamp"],
+                last_hash=last["entry_hash"], entries=count
+            )
+            self._seq, self._last_hash = last["seq"], last["entry_hash"]
+        else:
+            self._seq = active["first_seq"] - 1
+            self._last_hash = active["prev_hash"]
+
+    @staticmethod
+    def _read_index(directory: str) -> List[Dict[str, Any]]:
+        try:
+            with open(os.path.join(directory, INDEX_FILE)) as f:
+                return json.load(f)["segments"]
+        except FileNotFoundError:
+            return []
+
+    # =========================================================================
+    # APPEND (request path)
+    # =========================================================================
+
+    async def append(self, entry: Dict[str, Any]) -> str:
+        """
+        Chain and queue an entry; returns its entry_hash.
+
+        No disk I/O here - the background writer persists it.
+        """
+        self._open()
+        self._ensure_writer()
+
+        if len(self._pending) >= self.max_pending:
+            # Backpressure: disk is behind, wait for the writer instead of dropping
+            self._wakeup.set()
+            await self._drained.wait()
+
+        self._seq += 1
+        entry = dict(entry, seq=self._seq, prev_hash=self._last_hash)
+        entry["entry_hash"] = chain_hash(self._last_hash, entry)
+        self._last_hash = entry["entry_hash"]
+
+        self._pending.append(entry)
+        self._drained.clear()
+        self._stats["appended"] += 1
+        if len(self._pending) >= self.flush_batch:
+            self._wakeup.set()
+        return entry["entry_hash"]
+
+    def _ensure_writer(self) -> None:
+        """(Re)start the writer in the running loop (e.g. after asyncio.run() ended)."""
+        loop = asyncio.get_running_loop()
+        if self._writer is not None and not self._writer.done() and self._writer.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._writer = loop.create_task(self._run(), name="occp-audit-writer")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if len(self._pending) < self.flush_batch:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+            if self._pending:
+                batch = list(self._pending)
+                self._pending.clear()
+                self._inflight = len(batch)
+                try:
+                    await loop.run_in_executor(None, self._write_batch, batch)
+                except Exception as e:
+                    # Back to the front of the queue; retried on the next tick
+                    self._pending.extendleft(reversed(batch))
+                    self._stats["write_errors"] += 1
+                    logger.error("occp_audit_write_failed", directory=self.directory, error=str(e))
+                finally:
+                    self._inflight = 0
+            if not self._pending:
+                self._drained.set()
+
+    async def flush(self) -> None:
+        """Wait until everything appended so far is on disk."""
+        if self._writer is None or self._writer.done():
+            self.flush_sync()
+            return
+        while self._pending or self._inflight:
+            self._wakeup.set()
+            await self._drained.wait()
+
+    async def close(self) -> None:
+        """Flush, stop the writer and release the directory lock."""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            self._opened = False
+
+    # =========================================================================
+    # WRITER (executor thread)
+    # =========================================================================
+
+    def flush_sync(self) -> None:
+        """Synchronous drain (atexit, or no running writer)."""
+        if self._opened and self._pending:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Append batch to the segments, fsync, then update the index.
+
+        Safe to retry with the same batch: segment stats are only advanced
+        after a segment's fsync, so entries already written (seq <= last
+        written seq) are skipped, and a partial write is truncated back to
+        the recorded segment size before appending again.
+        """
+        with self._io_lock:
+            written_seq = self._index[-1]["last_seq"] if self._index else 0
+            batch = [entry for entry in batch if entry["seq"] > written_seq]
+            lines = [_canonical(entry) + b"\n" for entry in batch]
+
+            start = 0
+            while start < len(batch):
+                segment = self._active_segment(len(lines[start]), batch[start])
+
+                # As many entries as fit into this segment (at least one)
+                end, size = start, 0
+                while end < len(batch) and (end == start or segment["bytes"] + size + len(lines[end]) <= self.segment_bytes):
+                    size += len(lines[end])
+                    end += 1
+
+                path = os.path.join(self.directory, segment["file"])
+                if os.path.exists(path) and os.path.getsize(path) > segment["bytes"]:
+                    # Leftover of a failed write - drop it, the entries are in this batch
+                    os.truncate(path, segment["bytes"])
+                with open(path, "ab") as f:
+                    f.write(b"".join(lines[start:end]))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._stats["fsyncs"] += 1
+
+                last = batch[end - 1]
+                segment.update(
+                    last_seq=last["seq"], last_ts=last["timestamp"], last_hash=last["entry_hash"],
+                    entries=segment["entries"] + end - start, bytes=segment["bytes"] + size
+                )
+                start = end
+
+            self._write_index()
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+
+    def _active_segment(self, incoming_bytes: int, first: Dict[str, Any]) -> Dict[str, Any]:
+        if self._index:
+            active = self._index[-1]
+            if active["entries"] == 0 or active["bytes"] + incoming_bytes <= self.segment_bytes:
+                return active
+
+        segment = {
+            "file": f"segment-{len(self._index) + 1:06d}.jsonl",
+            "first_seq": first["seq"],
+            "last_seq": first["seq"] - 1,
+            "first_ts": first["timestamp"],
+            "last_ts": first["timestamp"],
+            "prev_hash": first["prev_hash"],
+            "last_hash": first["prev_hash"],
+            "entries": 0,
+            "bytes": 0,
+        }
+        self._index.append(segment)
+        if len(self._index) > 1:
+            logger.info("occp_audit_segment_rotated", directory=self.directory, segment=segment["file"])
+        return segment
+
+    def _write_index(self) -> None:
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"segments": self._index}, f)
+        os.replace(tmp, path)
+
+    # =========================================================================
+    # READ: query / verify
+    # =========================================================================
+
+    def query(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Entries with since <= timestamp <= until, newest first (persisted entries only)."""
+        return query_directory(self.directory, since, until, limit)
+
+    def verify(self) -> Dict[str, Any]:
+        """Recompute the whole chain (persisted entries only)."""
+        return verify_directory(self.directory)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "pending": len(self._pending),
+            "segments": len(self._index),
+            "last_seq": self._seq,
+            **self._stats,
+        }
+
+
+# =============================================================================
+# DIRECTORY READERS (also used by /occp/audit without a writer)
+# =============================================================================
+
+def query_directory(
+    directory: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for segment in reversed(FederatedAuditLog._read_index(directory)):
+        if since is not None and _parse_ts(segment["last_ts"]) < since:
+            break  # segments are time-ordered: everything older is out of range
+        if until is not None and _parse_ts(segment["first_ts"]) > until:
+            continue
+
+        with open(os.path.join(directory, segment["file"]), "rb") as f:
+            # A line without "\n" is a write in progress (or torn by a crash)
+            entries = [json.loads(line) for line in f if line.endswith(b"\n") and line.strip()]
+        for entry in reversed(entries):
+            ts = _parse_ts(entry["timestamp"])
+            if (since is None or ts >= since) and (until is None or ts <= until):
+                results.append(entry)
+                if len(results) >= limit:
+                    return results
+    return results
+
+
+def verify_directory(directory: str) -> Dict[str, Any]:
+    prev_hash = GENESIS_HASH
+    expected_seq = 1
+    checked = 0
+
+    for segment in FederatedAuditLog._read_index(directory):
+        if segment["prev_hash"] != prev_hash:
+            return {"valid": False, "entries": checked, "broken_at": segment["first_seq"], "segment": segment["file"]}
+
+        with open(os.path.join(directory, segment["file"]), "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n") or not line.strip():
+                    continue  # write in progress / torn tail
+                entry = json.loads(line)
+                if (
+                    entry.get("seq") != expected_seq
+                    or entry.get("prev_hash") != prev_hash
+                    or chain_hash(prev_hash, entry) != entry.get("entry_hash")
+                ):
+                    return {"valid": False, "entries": checked, "broken_at": expected_seq, "segment": segment["file"]}
+                prev_hash = entry["entry_hash"]
+                expected_seq += 1
+                checked += 1
+
+    return {"valid": True, "entries": checked, "last_hash": prev_hash}
+
+
+def validate_node_id(node_id: str) -> str:
+    """
+    Raises:
+        ValueError: node_id is not a safe single path component
+    """
+    if not isinstance(node_id, str) or not NODE_ID_PATTERN.match(node_id):
+        raise ValueError(f"Invalid node_id: {node_id!r}")
+    return node_id
+
+
+def node_directories(node_id: str, root: str = AUDIT_ROOT) -> List[str]:
+    """
+    Log directories of a node: the main one and writer-<pid> fallbacks
+    (see FederatedAuditLog._open), only those with an index.
+    """
+    directory = os.path.join(root, validate_node_id(node_id))
+    if not os.path.isdir(directory):
+        return []
+    candidates = [directory] + [
+        os.path.join(directory, name) for name in sorted(os.listdir(directory))
+        if name.startswith(WRITER_DIR_PREFIX)
+    ]
+    return [d for d in candidates if os.path.exists(os.path.join(d, INDEX_FILE))]
+
+
+def list_audit_nodes(root: str = AUDIT_ROOT) -> List[str]:
+    """Node ids that have a federated audit log under root."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        name for name in os.listdir(root)
+        if NODE_ID_PATTERN.match(name) and node_directories(name, root)
+    )
+
+
+# =============================================================================
+# PER-NODE INSTANCES
+# =============================================================================
+
+_logs: Dict[str, FederatedAuditLog] = {}
+
+
+def get_federated_audit_log(node_id: str, root: str = AUDIT_ROOT) -> FederatedAuditLog:
+    """
+    Shared audit log for node_id in this process.
+
+    Raises:
+        ValueError: unsafe node_id (see validate_node_id)
+    """
+    directory = os.path.join(root, validate_node_id(node_id))
+    log = _logs.get(directory)
+    if log is None:
+        log = _logs[directory] = FederatedAuditLog(directory)
+    return log
@@ -91,6 +91,9 @@ class ComputeAssistSandbox(SandboxExecutor):
                     aborted=True
                 )
 
+        except MemoryError:
+            raise  # SandboxExecutor.execute decides: result or worker recycle
+
         except Exception as e:
             return SandboxResult(
                 sandbox_id=self.contract.sandbox_id,
@@ -281,6 +284,8 @@ class ComputeAssistSandbox(SandboxExecutor):
 
         try:
             func()
+        except MemoryError:
+            raise  # SandboxExecutor.execute decides: result or worker recycle
         except Exception as e:
             logger.debug("timed_function_error", error=str(e))
             pass  # Error handled elsewhere
@@ -14,8 +14,10 @@ Gateway ONLY:
 4. Returns result or denial
 """
 import asyncio
+import os
 import time
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from occp_v03_types import (
     FederatedRequest,
     FederatedResponse,
@@ -27,6 +29,9 @@ from occp_v03_types import (
     FederatedAuditEvent,
     OCCPDecisionSchema
 )
+from logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 # =============================================================================
@@ -90,6 +95,155 @@ class TokenBucket:
         )
 
 
+class RateLimitTable:
+    """
+    Sharded (source_node, request_type) -> TokenBucket table
+
+    PRINCIPLE: O(1) lookup, no lock on the hot path
+    - Get-or-create has no await between lookup and insert, so it is atomic
+      on the event loop - the old global asyncio.Lock only serialized requests
+    - Buckets are created lazily and kept per shard in access order
+      (OrderedDict), so idle eviction only inspects the oldest entries
+    - Idle eviction is lossless: a bucket idle longer than its refill time is
+      full again, exactly like a new one
+    - max_buckets caps memory (LRU) when many sources are active at once
+
+    Optional Redis-shared buckets (api.rate_limit.RedisBucketStore, one Lua
+    round trip) keep limits consistent across gateway instances. On Redis
+    errors the local bucket is used - throttling is an availability decision,
+    not a security one.
+    """
+
+    REDIS_KEY_PREFIX = "occp:"
+
+    def __init__(
+        self,
+        capacity: int = 200,
+        refill_rate: float = 100.0,
+        shards: int = 16,
+        max_buckets: int = 100_000,
+        idle_ttl_seconds: float = 60.0,
+        redis_url: Optional[str] = None
+    ):
+        """
+        Args:
+            capacity: Max burst size per bucket (tokens)
+            refill_rate: Tokens per second refilled
+            shards: Number of independent LRU shards
+            max_buckets: Total bucket cap across shards (LRU beyond it)
+            idle_ttl_seconds: Idle time after which a bucket is dropped
+                (never less than the bucket refill time)
+            redis_url: Share buckets via Redis (default: OCCP_RATE_LIMIT_REDIS_URL)
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.idle_ttl_seconds = max(idle_ttl_seconds, capacity / refill_rate)
+        self._shards: List["OrderedDict[Tuple[str, str], TokenBucket]"] = [
+            OrderedDict() for _ in range(max(1, shards))
+        ]
+        self._shard_cap = max(1, max_buckets // len(self._shards))
+
+        # Metrics
+        self.allowed = 0
+        self.rejected = 0
+        self.rejected_by_type: Dict[str, int] = {}
+        self.evicted_idle = 0
+        self.evicted_lru = 0
+        self.redis_errors = 0
+
+        self.shared = None
+        self._policy = None
+        redis_url = redis_url or os.getenv("OCCP_RATE_LIMIT_REDIS_URL")
+        if redis_url:
+            try:
+                # Lazy import: api.rate_limit imports TokenBucket from this module
+                from api.rate_limit import RateLimitPolicy, RedisBucketStore
+                self.shared = RedisBucketStore(redis_url)
+                self._policy = RateLimitPolicy(capacity=capacity, refill_rate=refill_rate)
+            except ImportError:
+                logger.warning("occp_rate_limit_redis_unavailable", reason="redis package not installed")
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def get_bucket(self, source_node: str, request_type: str) -> TokenBucket:
+        """Get or lazily create the local bucket (no await - atomic on the loop)"""
+        key = (source_node, request_type)
+        shard = self._shards[hash(key) % len(self._shards)]
+        bucket = shard.get(key)
+        if bucket is not None:
+            shard.move_to_end(key)
+            return bucket
+
+        self._evict(shard, time.monotonic())
+        bucket = TokenBucket(capacity=self.capacity, refill_rate=self.refill_rate)
+        shard[key] = bucket
+        return bucket
+
+    def _evict(self, shard: "OrderedDict[Tuple[str, str], TokenBucket]", now: float):
+        self._evict_idle_shard(shard, now)
+        while len(shard) >= self._shard_cap:
+            shard.popitem(last=False)
+            self.evicted_lru += 1
+
+    def _evict_idle_shard(self, shard: "OrderedDict[Tuple[str, str], TokenBucket]", now: float):
+        # Oldest first: stop at the first bucket that is still in use
+        while shard:
+            bucket = next(iter(shard.values()))
+            if now - bucket.last_refill < self.idle_ttl_seconds:
+                break
+            shard.popitem(last=False)
+            self.evicted_idle += 1
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop idle buckets from all shards (e.g. from a periodic task)"""
+        now = time.monotonic() if now is None else now
+        before = self.evicted_idle
+        for shard in self._shards:
+            self._evict_idle_shard(shard, now)
+        return self.evicted_idle - before
+
+    async def allow(self, source_node: str, request_type: str) -> bool:
+        """Consume one token for (source_node, request_type)"""
+        allowed = None
+        if self.shared is not None:
+            try:
+                decision = await self.shared.acquire(
+                    f"{self.REDIS_KEY_PREFIX}{source_node}:{request_type}", self._policy
+                )
+                allowed = decision.allowed
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("occp_rate_limit_redis_error", error=str(e))
+
+        if allowed is None:
+            allowed = self.get_bucket(source_node, request_type).allow()
+
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+            self.rejected_by_type[request_type] = self.rejected_by_type.get(request_type, 0) + 1
+        return allowed
+
+    def get_stats(self) -> Dict:
+        """Bucket count and throttling metrics"""
+        return {
+            "buckets": len(self),
+            "shards": len(self._shards),
+            "shared": self.shared is not None,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "rejected_by_type": dict(self.rejected_by_type),
+            "evicted_idle": self.evicted_idle,
+            "evicted_lru": self.evicted_lru,
+            "redis_errors": self.redis_errors,
+        }
+
+    async def close(self):
+        if self.shared is not None:
+            await self.shared.close()
+
 
 class OCCPGatewayError(Exception):
     """Raised when Gateway invariant is violated"""
@@ -108,13 +262,28 @@ class OCCPGateway:
     - All denials MUST have reason_code
     """
 
-    def __init__(self, node_id: str, mcl_checker, sk_checker, resource_manager):
+    def __init__(
+        self,
+        node_id: str,
+        mcl_checker,
+        sk_checker,
+        resource_manager,
+        sandbox_pool=None,
+        audit_log=None,
+        rate_limits=None
+    ):
         """
         Args:
             node_id: This node's ID
             mcl_checker: Local MCL permission checker
             sk_checker: Local SK veto checker
             resource_manager: Local resource availability checker
+            sandbox_pool: Optional occp_sandbox_pool.SandboxPool - run sandboxes
+                in isolated worker processes instead of this event loop
+            audit_log: Optional occp_audit_log.FederatedAuditLog
+                (default: this node's shared log)
+            rate_limits: Optional RateLimitTable (default: local table with
+                the safe federated defaults)
         """
         self.node_id = node_id
         self.mcl_checker = mcl_checker
@@ -124,14 +293,20 @@ class OCCPGateway:
         # Priority 1 Fix: Concurrent SK Veto Lock
         self._sk_lock = asyncio.Lock()
 
-        # Priority 3 Fix: Audit log file path
-        import tempfile
-        self.audit_file = tempfile.gettempdir() + "/occp_federated_audit.log"
+        # Priority 3 Fix: Hash-chained audit log, written by a background batch writer
+        if audit_log is None:
+            from occp_audit_log import get_federated_audit_log
+            audit_log = get_federated_audit_log(node_id)
+        self.audit_log = audit_log
 
         # Priority 4 Fix: Rate limiter storage
-        # Key: (node_id, request_type) -> TokenBucket
-        self._rate_limits: Dict[Tuple[str, str], TokenBucket] = {}
-        self._rate_limits_lock = asyncio.Lock()
+        # Key: (source_node, request_type) -> TokenBucket, sharded, lock-free
+        self.rate_limits = rate_limits if rate_limits is not None else RateLimitTable()
+
+        # Sandbox runtime: process pool, or warm in-process sandboxes
+        # Key: (kind, max_tokens, max_time_seconds)
+        self.sandbox_pool = sandbox_pool
+        self._sandboxes: Dict[Tuple[str, int, int], object] = {}
 
     async def handle_request(self, request: FederatedRequest) -> FederatedResponse:
         """
@@ -315,33 +490,27 @@ class OCCPGateway:
         Check if request is within rate limits
 
         Priority 4: Token bucket throttling
-        - Key: (node_id, request_type)
+        - Key: (source_node, request_type)
         - Does NOT go to SK (availability decision, not security)
 
         Returns:
             True if within rate limit, False if throttled
         """
-        limiter = await self._get_rate_limiter(request)
-        return limiter.allow()
+        return await self.rate_limits.allow(request.source_node, str(request.request_type))
 
     async def _get_rate_limiter(self, request: FederatedRequest) -> TokenBucket:
         """
-        Get or create rate limiter for (source_node, request_type) key
+        Get or create the local rate limiter for (source_node, request_type) key
 
         Priority 4: Safe defaults for federated requests
         - Capacity: 200 (max burst)
         - Refill rate: 100 tokens/sec (sustained rate)
         """
-        key = (request.source_node, str(request.request_type))
+        return self.rate_limits.get_bucket(request.source_node, str(request.request_type))
 
-        async with self._rate_limits_lock:
-            if key not in self._rate_limits:
-                # Create new limiter with safe defaults
-                self._rate_limits[key] = TokenBucket(
-                    capacity=200,      # Max burst
-                    refill_rate=100.0  # Tokens per second
-                )
-            return self._rate_limits[key]
+    def get_rate_limit_stats(self) -> Dict:
+        """Rate limiter metrics: bucket count, allowed/rejected, evictions"""
+        return self.rate_limits.get_stats()
 
     async def _sandbox_execute(self, request: FederatedRequest) -> Dict:
         """
@@ -351,71 +520,49 @@ class OCCPGateway:
         Gateway delegates to appropriate sandbox based on request_type
         """
         from occp_v03_types import OCCPRequestType
-        from occp_compute_sandbox import create_compute_assist_sandbox
-        from occp_adversarial_sandbox import create_adversarial_test_sandbox
         from occp_sandbox import SandboxOp
 
+        max_tokens = request.resource_bound.compute_seconds * 100  # Rough estimate
+        max_time_seconds = int(request.resource_bound.compute_seconds)
+
         # Route to appropriate sandbox
         if request.request_type == OCCPRequestType.COMPUTE_ASSIST:
-            sandbox = create_compute_assist_sandbox(
-                max_tokens=request.resource_bound.compute_seconds * 100,  # Rough estimate
-                max_time_seconds=int(request.resource_bound.compute_seconds)
-            )
-
-            # Execute compute operation
-            result = await sandbox.execute(
-                SandboxOp.COMPUTE,
-                {
-                    "operation_type": "compute",
-                    "input_data": request.dict()
-                }
-            )
+            kind, operation = "compute", SandboxOp.COMPUTE
+            payload = {
+                "operation_type": "compute",
+                "input_data": request.dict()
+            }
 
         elif request.request_type == OCCPRequestType.ADVERSARIAL_TEST:
-            sandbox = create_adversarial_test_sandbox(
-                max_tokens=request.resource_bound.compute_seconds * 100,
-                max_time_seconds=int(request.resource_bound.compute_seconds)
-            )
-
-            # Execute adversarial test
-            result = await sandbox.execute(
-                SandboxOp.REDTEAM,
-                {
-                    "target_type": "generic",
-                    "test_type": "injection",
-                    "payload": request.dict()
-                }
-            )
+            kind, operation = "adversarial", SandboxOp.REDTEAM
+            payload = {
+                "target_type": "generic",
+                "test_type": "injection",
+                "payload": request.dict()
+            }
 
         elif request.request_type == OCCPRequestType.COGNITIVE_REVIEW:
             # Use compute sandbox for cognitive review
-            sandbox = create_compute_assist_sandbox(
-                max_tokens=request.resource_bound.compute_seconds * 100,
-                max_time_seconds=int(request.resource_bound.compute_seconds)
-            )
-
-            result = await sandbox.execute(
-                SandboxOp.ANALYZE,
-                {
-                    "operation_type": "analyze",
-                    "input_data": request.dict()
-                }
-            )
+            kind, operation = "compute", SandboxOp.ANALYZE
+            payload = {
+                "operation_type": "analyze",
+                "input_data": request.dict()
+            }
 
         else:
             # Fallback for other request types
-            sandbox = create_compute_assist_sandbox(
-                max_tokens=10000,
-                max_time_seconds=30
-            )
+            kind, operation = "compute", SandboxOp.COMPUTE
+            max_tokens, max_time_seconds = 10000, 30
+            payload = {
+                "operation_type": "compute",
+                "input_data": {"request_type": request.request_type}
+            }
 
-            result = await sandbox.execute(
-                SandboxOp.COMPUTE,
-                {
-                    "operation_type": "compute",
-                    "input_data": {"request_type": request.request_type}
-                }
-            )
+        sandbox = self._get_sandbox(kind, max_tokens, max_time_seconds)
+        if self.sandbox_pool is not None:
+            result = await self.sandbox_pool.execute(kind, sandbox.contract, operation, payload)
+        else:
+            result = await sandbox.execute(operation, payload)
 
         # Convert SandboxResult to Dict
         if result.success:
@@ -436,6 +583,28 @@ class OCCPGateway:
                 "timeout": result.timeout
             }
 
+    def _get_sandbox(self, kind: str, max_tokens: int, max_time_seconds: int):
+        """
+        Warm sandbox per (kind, limits) instead of a new one per request
+
+        With a sandbox_pool only its contract is used (the pool workers keep
+        their own warm instances).
+        """
+        key = (kind, max_tokens, max_time_seconds)
+        sandbox = self._sandboxes.get(key)
+        if sandbox is None:
+            if kind == "adversarial":
+                from occp_adversarial_sandbox import create_adversarial_test_sandbox
+                sandbox = create_adversarial_test_sandbox(max_tokens=max_tokens, max_time_seconds=max_time_seconds)
+            else:
+                from occp_compute_sandbox import create_compute_assist_sandbox
+                sandbox = create_compute_assist_sandbox(max_tokens=max_tokens, max_time_seconds=max_time_seconds)
+            if len(self._sandboxes) >= 64:
+                # Limits come from remote resource_bound - keep the cache bounded
+                self._sandboxes.clear()
+            self._sandboxes[key] = sandbox
+        return sandbox
+
     def _deny(self, request: FederatedRequest, decision: OCCPDecisionSchema) -> FederatedResponse:
         """
         Return federated denial
@@ -454,25 +623,18 @@ class OCCPGateway:
 
     async def _audit_log(self, request, decisions, result):
         """
-        Write to federated audit log with atomic append
+        Append to federated audit log
 
-        Priority 3 Fix: File locking prevents concurrent write corruption
+        Priority 3 Fix: Single writer (FederatedAuditLog) chains and batches
+        entries - no file I/O or locking on the request path
         """
-        import fcntl
-        import json
-        from datetime import datetime, timezone
-
         entry = self._create_audit_entry(request, decisions, result)
 
         try:
-            with open(self.audit_file, 'a') as f:
-                # Exclusive lock for atomic append
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                f.write(json.dumps(entry) + '\n')
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            await self.audit_log.append(entry)
         except Exception as e:
             # Log failure but don't fail the request
-            logger.info(f"Warning: Failed to write audit log: {e}")
+            logger.warning("occp_audit_append_failed", request_id=request.request_id, error=str(e))
 
     def _create_audit_entry(self, request, decisions, result):
         """
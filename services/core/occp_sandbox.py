@@ -3,10 +3,13 @@ OCCP v0.3 Sandbox Contract Layer
 Trust Without Trust — Physical enforcement, not promises
 """
 from enum import Enum
-from typing import Dict, List, Optional, Literal, Set
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Literal, Set, Tuple
 from pydantic import BaseModel, Field
 from datetime import datetime, timedelta
 import asyncio
+import itertools
+import re
 
 
 class SandboxOp(str, Enum):
@@ -112,6 +115,119 @@ class SandboxViolation(BaseModel):
     contract_sandbox_id: str
 
 
+# =============================================================================
+# FORBIDDEN CONTEXT MATCHER
+# =============================================================================
+
+_UNCACHED = object()
+
+
+class ForbiddenContextMatcher:
+    """
+    Forbidden context detector for payload keys, compiled once per
+    forbidden_contexts list
+
+    Semantics (unchanged from the recursive key-path check):
+    - Variants: "goals" -> goals, goal; "mcl_state" -> mcl_state, mcl_states
+    - A key is forbidden if a variant is a substring of its last dotted
+      component (lowercased)
+    - Nested dicts and lists of dicts are searched
+    - Reported: the first forbidden context (contract order) found anywhere,
+      with the first key path (pre-order) containing it
+
+    All variants go into ONE compiled regex; the payload is walked with an
+    explicit stack and key paths are joined only for the reported match.
+    """
+
+    KEY_CACHE_SIZE = 4096
+
+    def __init__(self, forbidden_contexts: Tuple[str, ...]):
+        self.forbidden_contexts = forbidden_contexts
+        self._variants = [
+            (forbidden, forbidden[:-1]) if forbidden.endswith('s') else (forbidden, forbidden + 's')
+            for forbidden in forbidden_contexts
+        ]
+        alternatives = sorted({v for variants in self._variants for v in variants}, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, alternatives))) if alternatives else None
+
+        # key -> index of first matching forbidden context (None = clean)
+        self._key_cache: Dict[str, Optional[int]] = {}
+
+    def _forbidden_index(self, key: Any) -> Optional[int]:
+        index = None
+        last_component = str(key).lower().rsplit('.', 1)[-1]
+        if self._pattern is not None and self._pattern.search(last_component):
+            for i, variants in enumerate(self._variants):
+                if any(variant in last_component for variant in variants):
+                    index = i
+                    break
+
+        if type(key) is str:
+            if len(self._key_cache) >= self.KEY_CACHE_SIZE:
+                self._key_cache.clear()
+            self._key_cache[key] = index
+        return index
+
+    def find(self, payload: Dict) -> Optional[Tuple[str, str]]:
+        """
+        Returns:
+            (forbidden_context, key_path) or None if payload is clean
+        """
+        best_index = None
+        best_node = None
+        key_cache = self._key_cache
+
+        # Path nodes are (parent_node, key) - no string building while walking
+        stack = [(iter(payload.items()), None)]
+        while stack:
+            items, parent = stack[-1]
+            for k, v in items:
+                node = (parent, k)
+
+                index = key_cache.get(k, _UNCACHED) if type(k) is str else _UNCACHED
+                if index is _UNCACHED:
+                    index = self._forbidden_index(k)
+                if index is not None and (best_index is None or index < best_index):
+                    best_index, best_node = index, node
+                    if index == 0:
+                        return self.forbidden_contexts[0], self._key_path(node)
+
+                if isinstance(v, dict):
+                    stack.append((iter(v.items()), node))
+                    break
+                if isinstance(v, list) and len(v) > 0 and isinstance(v[0], dict):
+                    # Handle list of dicts: every dict item under the same path
+                    stack.append((
+                        itertools.chain.from_iterable(item.items() for item in v if isinstance(item, dict)),
+                        node
+                    ))
+                    break
+            else:
+                stack.pop()
+
+        if best_node is None:
+            return None
+        return self.forbidden_contexts[best_index], self._key_path(best_node)
+
+    @staticmethod
+    def _key_path(node) -> str:
+        keys = []
+        while node is not None:
+            node, key = node
+            keys.append(key)
+
+        full_key = ""
+        for k in reversed(keys):
+            full_key = f"{full_key}.{k}" if full_key else k
+        return full_key
+
+
+@lru_cache(maxsize=128)
+def compile_forbidden_matcher(forbidden_contexts: Tuple[str, ...]) -> ForbiddenContextMatcher:
+    """Shared matcher per distinct forbidden_contexts list"""
+    return ForbiddenContextMatcher(forbidden_contexts)
+
+
 # =============================================================================
 # SANDBOX EXECUTOR INTERFACE
 # =============================================================================
@@ -133,6 +249,10 @@ class SandboxExecutor:
         self.start_time = None
         self.tokens_used = 0
         self.aborted = False
+        self._forbidden_matcher = compile_forbidden_matcher(tuple(contract.forbidden_contexts))
+        # SandboxPool workers set this: the worker reports resource_memory
+        # and is recycled. In-process execution returns a failed result.
+        self.reraise_memory_errors = False
 
     async def execute(
         self,
@@ -196,6 +316,16 @@ class SandboxExecutor:
                 aborted=True
             )
 
+        except MemoryError:
+            if self.reraise_memory_errors:
+                raise
+            return SandboxResult(
+                sandbox_id=self.contract.sandbox_id,
+                success=False,
+                error=f"Memory limit exceeded: {self.contract.max_memory_mb}MB",
+                aborted=True
+            )
+
         except Exception as e:
             return SandboxResult(
                 sandbox_id=self.contract.sandbox_id,
@@ -206,7 +336,8 @@ class SandboxExecutor:
 
     def _check_payload(self, payload: Dict) -> Optional[SandboxViolation]:
         """
-        Check payload for forbidden contexts (recursive) with constant-time padding
+        Check payload for forbidden contexts (compiled matcher, see
+        ForbiddenContextMatcher) with constant-time padding
 
         Priority 2 Fix: Uses busy-wait for minimal overhead timing normalization
         """
@@ -215,60 +346,24 @@ class SandboxExecutor:
         start = time.monotonic()
         target = 0.000020  # 20μs target (only pad outliers)
 
-        def get_all_keys(d: Dict, prefix: str = "") -> List[str]:
-            """Recursively get all keys from nested dict"""
-            keys = []
-            for k, v in d.items():
-                full_key = f"{prefix}.{k}" if prefix else k
-                keys.append(full_key)
-                if isinstance(v, dict):
-                    keys.extend(get_all_keys(v, full_key))
-                elif isinstance(v, list) and len(v) > 0 and isinstance(v[0], dict):
-                    # Handle list of dicts
-                    for item in v:
-                        if isinstance(item, dict):
-                            keys.extend(get_all_keys(item, full_key))
-            return keys
-
-        all_keys = get_all_keys(payload)
-
-        for forbidden in self.contract.forbidden_contexts:
-            # Generate variants (e.g., "goals" -> "goal", "goals")
-            variants = [forbidden]
-            if forbidden.endswith('s'):
-                variants.append(forbidden[:-1])  # Remove trailing 's'
-            elif not forbidden.endswith('s'):
-                variants.append(forbidden + 's')  # Add trailing 's'
-
-            # Check if any key contains forbidden word
-            for key in all_keys:
-                key_lower = str(key).lower()
-                # Get only the last component (after last dot)
-                last_component = key_lower.split('.')[-1]
-
-                for variant in variants:
-                    # Check if variant is in last component
-                    if variant in last_component:
-                        # Pad before returning (constant-time)
-                        elapsed = time.monotonic() - start
-                        if elapsed < target:
-                            # Busy-wait for very short delay (avoid async overhead)
-                            while (time.monotonic() - start) < target:
-                                pass
-
-                        return SandboxViolation(
-                            violation_type="forbidden_context",
-                            reason=f"Payload contains forbidden context: {forbidden} (found in key: {key})",
-                            contract_sandbox_id=self.contract.sandbox_id
-                        )
-
-        # Pad at end if no violation found
+        match = self._forbidden_matcher.find(payload)
+
+        # Pad before returning (constant-time), violation or not
         elapsed = time.monotonic() - start
         if elapsed < target:
+            # Busy-wait for very short delay (avoid async overhead)
             while (time.monotonic() - start) < target:
                 pass
 
-        return None
+        if match is None:
+            return None
+
+        forbidden, key = match
+        return SandboxViolation(
+            violation_type="forbidden_context",
+            reason=f"Payload contains forbidden context: {forbidden} (found in key: {key})",
+            contract_sandbox_id=self.contract.sandbox_id
+        )
 
     async def _execute_operation(
         self,
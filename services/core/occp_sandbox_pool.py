@@ -0,0 +1,486 @@
+"""
+OCCP v0.3 Sandbox Pool
+Process isolation for sandbox execution - physical enforcement, not promises
+
+SandboxExecutor.execute() runs inside the gateway's event loop:
+asyncio.wait_for() cannot preempt CPU-bound sandbox code and the sandbox
+shares the gateway's address space. SandboxPool runs sandboxes in a pool
+of pre-started worker processes instead:
+
+- Pre-forked + warm: workers are started once (forkserver with the sandbox
+  modules preloaded) and keep their sandbox instances per contract across
+  requests; a worker is recycled after MAX_JOBS_PER_WORKER jobs
+- RLIMIT_AS: during a job the soft limit is the worker's current address
+  space + contract.max_memory_mb (MemoryError → resource_memory)
+- RLIMIT_CPU: during a job the soft limit is the CPU already used +
+  contract.max_time_ms (SIGXCPU → resource_timeout)
+- Wall clock: the parent SIGKILLs a worker that has not answered within
+  max_time_ms + KILL_GRACE_SECONDS and starts a replacement
+- Payloads: pickled (operation, payload) below SHM_THRESHOLD_BYTES go
+  through the pipe; larger ones are written once into the worker's
+  preallocated shared memory segment and unpickled straight from the
+  mapping (a temporary segment is used if the payload does not fit)
+
+A worker that hit a resource limit, died or was killed never serves
+another request.
+
+POSIX only (resource limits, add_reader on the pipe).
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import asyncio
+import itertools
+import math
+import os
+import pickle
+import resource
+import signal
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from multiprocessing import get_context, shared_memory
+from typing import Any, Dict, Optional, Set, Tuple
+
+from occp_sandbox import SandboxContract, SandboxOp, SandboxResult
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+POOL_WORKERS = int(os.getenv("OCCP_SANDBOX_POOL_WORKERS", str(os.cpu_count() or 2)))
+START_METHOD = os.getenv("OCCP_SANDBOX_START_METHOD", "forkserver")
+SHM_THRESHOLD_BYTES = int(os.getenv("OCCP_SANDBOX_SHM_THRESHOLD", str(64 * 1024)))
+SHM_SEGMENT_BYTES = int(os.getenv("OCCP_SANDBOX_SHM_BYTES", str(8 * 1024 * 1024)))
+MAX_JOBS_PER_WORKER = int(os.getenv("OCCP_SANDBOX_MAX_JOBS_PER_WORKER", "1000"))
+KILL_GRACE_SECONDS = 0.25
+
+# kind → (module, class); modules are preloaded into the forkserver
+SANDBOX_KINDS: Dict[str, Tuple[str, str]] = {
+    "compute": ("occp_compute_sandbox", "ComputeAssistSandbox"),
+    "adversarial": ("occp_adversarial_sandbox", "AdversarialTestSandbox"),
+}
+
+_MB = 1024 * 1024
+_WARM_SANDBOXES_PER_WORKER = 32
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+class _CpuLimitExceeded(BaseException):
+    """
+    Raised by the SIGXCPU handler.
+
+    BaseException on purpose: sandboxes wrap their work in `except Exception`
+    and must not be able to swallow the limit.
+    """
+
+
+_in_job = False
+
+
+def _on_sigxcpu(signum, frame):
+    if _in_job:
+        raise _CpuLimitExceeded()
+
+
+def _address_space_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _capped(limit: int, hard: int) -> int:
+    return limit if hard == resource.RLIM_INFINITY else min(limit, hard)
+
+
+@contextmanager
+def _job_limits(max_memory_mb: int, max_time_ms: int):
+    """Lower RLIMIT_AS / RLIMIT_CPU soft limits for one job, restore afterwards."""
+    global _in_job
+
+    as_soft, as_hard = resource.getrlimit(resource.RLIMIT_AS)
+    cpu_soft, cpu_hard = resource.getrlimit(resource.RLIMIT_CPU)
+
+    address_space = _address_space_bytes()
+    if address_space is not None:
+        resource.setrlimit(
+            resource.RLIMIT_AS,
+            (_capped(address_space + max_memory_mb * _MB, as_hard), as_hard)
+        )
+    cpu_limit = int(_cpu_seconds()) + math.ceil(max_time_ms / 1000) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (_capped(cpu_limit, cpu_hard), cpu_hard))
+
+    _in_job = True
+    try:
+        yield
+    finally:
+        _in_job = False
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_soft, cpu_hard))
+        resource.setrlimit(resource.RLIMIT_AS, (as_soft, as_hard))
+
+
+def _warm_sandbox(cache: "OrderedDict[Tuple[str, str], Any]", kind: str, contract: SandboxContract):
+    """Sandbox instance per (kind, contract limits), reused across requests."""
+    key = (kind, contract.model_dump_json(exclude={"sandbox_id", "created_at"}))
+    sandbox = cache.get(key)
+    if sandbox is None:
+        module_name, class_name = SANDBOX_KINDS[kind]
+        module = __import__(module_name, fromlist=[class_name])
+        sandbox = getattr(module, class_name)(contract)
+        sandbox.reraise_memory_errors = True  # -> resource_memory in _run_job
+        cache[key] = sandbox
+        if len(cache) > _WARM_SANDBOXES_PER_WORKER:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return sandbox
+
+
+def _load_payload(inline: Optional[bytes], shm, size: int, segment_name: Optional[str]):
+    if inline is not None:
+        return pickle.loads(inline)
+    if segment_name is not None:
+        segment = shared_memory.SharedMemory(name=segment_name)
+        try:
+            with segment.buf[:size] as view:
+                return pickle.loads(view)
+        finally:
+            segment.close()
+    with shm.buf[:size] as view:
+        return pickle.loads(view)
+
+
+def _run_job(job: tuple, shm, loop, sandboxes) -> Tuple[tuple, bool]:
+    """Returns (reply, recycle_worker)."""
+    job_id, kind, contract, inline, size, segment_name = job
+    try:
+        sandbox = _warm_sandbox(sandboxes, kind, contract)
+        with _job_limits(contract.max_memory_mb, contract.max_time_ms):
+            operation, payload = _load_payload(inline, shm, size, segment_name)
+            result = loop.run_until_complete(sandbox.execute(operation, payload))
+        return (job_id, result.model_dump(), None), False
+    except _CpuLimitExceeded:
+        return (job_id, None, "resource_timeout"), True
+    except MemoryError:
+        return (job_id, None, "resource_memory"), True
+
+
+def _worker_main(conn, shm_name: str) -> None:
+    """Worker loop: one job at a time until EOF / None / resource violation."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # shutdown is driven by the parent
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    sandboxes: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+    try:
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                break
+            if job is None:
+                break
+
+            reply, recycle = _run_job(job, shm, loop, sandboxes)
+            conn.send(reply)
+            if recycle:
+                break
+    finally:
+        loop.close()
+        shm.close()
+        conn.close()
+
+
+# =============================================================================
+# PARENT SIDE
+# =============================================================================
+
+class _Worker:
+    __slots__ = ("process", "conn", "shm", "jobs")
+
+    def __init__(self, process, conn, shm):
+        self.process = process
+        self.conn = conn
+        self.shm = shm
+        self.jobs = 0
+
+
+class SandboxPool:
+    """
+    Pool of pre-started sandbox worker processes.
+
+    Usage:
+        pool = SandboxPool(workers=4)
+        result = await pool.execute("compute", contract, SandboxOp.COMPUTE, payload)
+        await pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        workers: int = POOL_WORKERS,
+        start_method: str = START_METHOD,
+        shm_threshold: int = SHM_THRESHOLD_BYTES,
+        shm_bytes: int = SHM_SEGMENT_BYTES,
+        max_jobs_per_worker: int = MAX_JOBS_PER_WORKER
+    ):
+        self.size = max(1, workers)
+        self.start_method = start_method
+        self.shm_threshold = shm_threshold
+        self.shm_bytes = shm_bytes
+        self.max_jobs_per_worker = max_jobs_per_worker
+
+        self._ctx = get_context(start_method)
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: Set[_Worker] = set()
+        self._respawns: Set[asyncio.Task] = set()
+        self._start_lock = asyncio.Lock()
+        self._closed = False
+        self._job_ids = itertools.count()
+        self._stats: Counter = Counter()
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    async def start(self) -> None:
+        """Start all workers (idempotent; execute() calls it lazily)."""
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            if self.start_method == "forkserver":
+                self._ctx.set_forkserver_preload(
+                    ["occp_sandbox"] + [module for module, _ in SANDBOX_KINDS.values()]
+                )
+
+            loop = asyncio.get_running_loop()
+            idle: asyncio.Queue = asyncio.Queue()
+            for _ in range(self.size):
+                worker = await loop.run_in_executor(None, self._spawn)
+                self._workers.add(worker)
+                idle.put_nowait(worker)
+            self._idle = idle
+
+        logger.info("occp_sandbox_pool_started", workers=self.size, start_method=self.start_method)
+
+    def _spawn(self) -> _Worker:
+        shm = shared_memory.SharedMemory(create=True, size=self.shm_bytes)
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, shm.name),
+            name="occp-sandbox",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn, shm)
+
+    @staticmethod
+    def _destroy(worker: _Worker) -> None:
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=5)
+        worker.conn.close()
+        worker.shm.close()
+        worker.shm.unlink()
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill `worker` and put a fresh one into the idle queue (in background)."""
+        self._workers.discard(worker)
+        task = asyncio.get_running_loop().create_task(self._respawn(worker))
+        self._respawns.add(task)
+        task.add_done_callback(self._respawns.discard)
+
+    async def _respawn(self, worker: _Worker) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._destroy, worker)
+        if self._closed:
+            return
+        try:
+            fresh = await loop.run_in_executor(None, self._spawn)
+        except Exception as e:
+            logger.error("occp_sandbox_respawn_failed", error=str(e), workers=len(self._workers))
+            return
+        self._workers.add(fresh)
+        self._stats["respawned"] += 1
+        self._idle.put_nowait(fresh)
+
+    async def shutdown(self) -> None:
+        """Stop all workers and release their shared memory."""
+        self._closed = True
+        if self._respawns:
+            await asyncio.gather(*self._respawns, return_exceptions=True)
+
+        loop = asyncio.get_running_loop()
+        for worker in list(self._workers):
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            await loop.run_in_executor(None, worker.process.join, 1)
+            await loop.run_in_executor(None, self._destroy, worker)
+        self._workers.clear()
+        self._idle = None
+
+        logger.info("occp_sandbox_pool_stopped", **self.get_stats())
+
+    # =========================================================================
+    # EXECUTION
+    # =========================================================================
+
+    async def execute(
+        self,
+        kind: str,
+        contract: SandboxContract,
+        operation: SandboxOp,
+        payload: Dict
+    ) -> SandboxResult:
+        """
+        Run sandbox `kind` (see SANDBOX_KINDS) with `contract` in a worker.
+
+        Same result shape as SandboxExecutor.execute(); resource violations
+        come back as aborted SandboxResults, never as exceptions.
+        """
+        if kind not in SANDBOX_KINDS:
+            raise ValueError(f"Unknown sandbox kind: {kind}")
+        if self._closed:
+            raise RuntimeError("SandboxPool is shut down")
+        if self._idle is None:
+            await self.start()
+
+        data = pickle.dumps((operation, payload), protocol=pickle.HIGHEST_PROTOCOL)
+        worker = await self._idle.get()
+        segment = None
+        reusable = False
+
+        try:
+            job, segment = self._job(worker, kind, contract, data)
+            worker.jobs += 1
+
+            try:
+                worker.conn.send(job)
+                reply = await asyncio.wait_for(
+                    self._recv(worker),
+                    timeout=contract.max_time_ms / 1000.0 + KILL_GRACE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                self._stats["killed"] += 1
+                logger.warning(
+                    "occp_sandbox_worker_killed",
+                    pid=worker.process.pid,
+                    sandbox_id=contract.sandbox_id,
+                    max_time_ms=contract.max_time_ms
+                )
+                return self._violation(contract, "resource_timeout")
+            except (EOFError, OSError):
+                self._stats["crashed"] += 1
+                logger.error(
+                    "occp_sandbox_worker_died",
+                    pid=worker.process.pid,
+                    exitcode=worker.process.exitcode,
+                    sandbox_id=contract.sandbox_id
+                )
+                return SandboxResult(
+                    sandbox_id=contract.sandbox_id,
+                    success=False,
+                    error="Sandbox worker died",
+                    aborted=True
+                )
+
+            _, result_data, violation = reply
+            if violation:
+                self._stats[violation] += 1
+                return self._violation(contract, violation)
+
+            self._stats["executed"] += 1
+            reusable = worker.jobs < self.max_jobs_per_worker
+            result = SandboxResult(**result_data)
+            result.sandbox_id = contract.sandbox_id  # warm sandbox may carry an older id
+            return result
+
+        finally:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+            if reusable:
+                self._idle.put_nowait(worker)
+            else:
+                # Timed out, violated, died, cancelled or served its quota
+                self._replace(worker)
+
+    def _job(self, worker: _Worker, kind: str, contract: SandboxContract, data: bytes):
+        """Job tuple + temporary segment to unlink after the reply (if any)."""
+        job_id = next(self._job_ids)
+        size = len(data)
+
+        if size < self.shm_threshold:
+            self._stats["inline_payloads"] += 1
+            return (job_id, kind, contract, data, size, None), None
+
+        self._stats["shm_payloads"] += 1
+        if size <= worker.shm.size:
+            worker.shm.buf[:size] = data
+            return (job_id, kind, contract, None, size, None), None
+
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        segment.buf[:size] = data
+        return (job_id, kind, contract, None, size, segment.name), segment
+
+    @staticmethod
+    async def _recv(worker: _Worker):
+        """Await one reply without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        reply = loop.create_future()
+        fd = worker.conn.fileno()
+
+        def on_readable():
+            if reply.done():
+                return
+            try:
+                reply.set_result(worker.conn.recv())
+            except Exception as e:
+                reply.set_exception(e)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            return await reply
+        finally:
+            loop.remove_reader(fd)
+
+    @staticmethod
+    def _violation(contract: SandboxContract, violation_type: str) -> SandboxResult:
+        if violation_type == "resource_memory":
+            error = f"Memory limit exceeded: {contract.max_memory_mb}MB"
+        else:
+            error = f"Timeout after {contract.max_time_ms}ms"
+        return SandboxResult(
+            sandbox_id=contract.sandbox_id,
+            success=False,
+            error=error,
+            timeout=violation_type == "resource_timeout",
+            aborted=True
+        )
+
+    # =========================================================================
+    # METRICS
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            **self._stats,
+        }
@@ -17,6 +17,8 @@ import os
 
 # Centralized logging
 from logging_config import get_logger
+# Persistent per-process loop (registers worker_process_init hooks)
+from worker_runtime import run_async
 
 logger = get_logger(__name__)
 
@@ -40,7 +42,6 @@ def auto_decompose_stuck_goals():
     Runs every hour
     Finds goals stuck > 1 hour in pending and decomposes them
     """
-    import asyncio
     from auto_decomposer import auto_decomposer
 
     logger.info("auto_decompose_stuck_goals_started")
@@ -56,18 +57,7 @@ def auto_decompose_stuck_goals():
 
         return report
 
-    # Fix asyncio.run() anti-pattern
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, run_decompose())
-                return future.result()
-        else:
-            return loop.run_until_complete(run_decompose())
-    except RuntimeError:
-        return asyncio.run(run_decompose())
+    return run_async(run_decompose())
 
 
 @celery_app.task(name='recalculate_parent_progress')
@@ -78,7 +68,6 @@ def recalculate_parent_progress():
     Runs every 6 hours
     Ensures parent.progress reflects actual children status
     """
-    import asyncio
     from parent_progress_aggregator import parent_progress_aggregator
 
     logger.info("recalculate_parent_progress_started")
@@ -94,18 +83,7 @@ def recalculate_parent_progress():
 
         return report
 
-    # Fix asyncio.run() anti-pattern
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, run_recalculate())
-                return future.result()
-        else:
-            return loop.run_until_complete(run_recalculate())
-    except RuntimeError:
-        return asyncio.run(run_recalculate())
+    return run_async(run_recalculate())
 
 
 @celery_app.task(name='update_parent_on_child_complete')
@@ -115,7 +93,6 @@ def update_parent_on_child_complete(child_goal_id: str):
 
     Should be called from goal_executor when child goal done
     """
-    import asyncio
     from parent_progress_aggregator import parent_progress_aggregator
 
     async def run_update():
@@ -130,18 +107,7 @@ def update_parent_on_child_complete(child_goal_id: str):
 
         return report
 
-    # Fix asyncio.run() anti-pattern
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, run_update())
-                return future.result()
-        else:
-            return loop.run_until_complete(run_update())
-    except RuntimeError:
-        return asyncio.run(run_update())
+    return run_async(run_update())
 
 
 # =============================================================================
@@ -180,7 +146,6 @@ def acceleration_system_health_check():
 
     Collects metrics and logs summary
     """
-    import asyncio
     from acceleration_architecture import acceleration_architecture
 
     logger.info("daily_system_health_check_started")
@@ -226,18 +191,7 @@ def acceleration_system_health_check():
 
         return health
 
-    # Fix asyncio.run() anti-pattern
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, run_health_check())
-                return future.result()
-        else:
-            return loop.run_until_complete(run_health_check())
-    except RuntimeError:
-        return asyncio.run(run_health_check())
+    return run_async(run_health_check())
 
 
 # =============================================================================
@@ -126,11 +126,8 @@ class PersonalityAwareDecisionField:
         """
         engine = get_personality_engine()
 
-        # 1. Получить профиль личности
-        profile = await engine.get_profile(user_id)
-
-        # 2. Получить контекстную память
-        context_memory = await engine.get_contextual_memory(user_id)
+        # 1-2. Профиль личности и контекстная память (один запрос к БД)
+        profile, context_memory = await engine.get_decision_context(user_id)
 
         # 3. Создать PersonalityContext
         personality_ctx = PersonalityContext(
@@ -509,9 +506,33 @@ async def get_personality_context_for_agent(user_id: str) -> Dict:
     """
     engine = get_personality_engine()
 
-    profile = await engine.get_profile(user_id)
-    context_memory = await engine.get_contextual_memory(user_id)
+    # Профиль (из кэша) и контекстная память - не больше одного запроса
+    profile, context_memory = await engine.get_decision_context(user_id)
+
+    return _agent_context(user_id, profile, context_memory)
+
+
+async def get_personality_contexts_for_agents(user_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Personality context для нескольких пользователей одним чтением из БД.
+
+    Returns:
+        Dict[str(user_id)] -> personality context (как get_personality_context_for_agent)
+    """
+    engine = get_personality_engine()
+    contexts = await engine.get_decision_contexts(user_ids)
+
+    return {
+        key: _agent_context(key, profile, context_memory)
+        for key, (profile, context_memory) in contexts.items()
+    }
+
 
+def _agent_context(
+    user_id: str,
+    profile: PersonalityProfileSchema,
+    context_memory: ContextualMemorySchema
+) -> Dict:
     return {
         "user_id": user_id,
         "tone": profile.preferences.communication_style.tone,
@@ -12,18 +12,26 @@ Phase 1: Core Engine
 - UserPreference (communication style, boundaries)
 - PersonalityFeedback (adaptation loop)
 """
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from database import AsyncSessionLocal
 from models import (
     UserProfile, UserValue, UserPreference, PersonalityFeedback,
-    PersonalitySnapshot, ContextualMemory
+    ContextualMemory
 )
+from personality_snapshots import snapshot_store
 from pydantic import BaseModel, Field
 from datetime import datetime
+import os
+import time
 import uuid
 import json
 
+# Профили, изменённые другими процессами, видны не позже чем через TTL
+PROFILE_CACHE_TTL_SECONDS = float(os.getenv("PERSONALITY_PROFILE_CACHE_TTL_SECONDS", "60"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PERSONALITY_PROFILE_CACHE_MAX_ENTRIES", "10000"))
+
 
 # =============================================================================
 # Pydantic Schemas для API
@@ -140,6 +148,72 @@ class PersonalitySnapshotSchema(BaseModel):
     created_by: str
 
 
+class PersonalitySnapshotInfoSchema(BaseModel):
+    """Снапшот профиля без payload (для списков)"""
+    snapshot_version: int
+    snapshot_reason: Optional[str] = None
+    kind: str  # full, delta
+    sequence: int
+    created_at: datetime
+    created_by: Optional[str] = None
+
+
+# =============================================================================
+# Profile Cache
+# =============================================================================
+
+class ProfileCache:
+    """
+    Кэш PersonalityProfileSchema по user_id.
+
+    У каждого пользователя есть версия кэша, которая растёт при каждой
+    записи (update_profile, record_feedback, rollback_to_snapshot).
+    Загрузка запоминает версию до запроса (begin_load) и кладёт профиль
+    только если версия не изменилась - профиль, прочитанный до записи,
+    не попадёт в кэш после неё.
+
+    Записи из других процессов видны не позже чем через ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float = PROFILE_CACHE_TTL_SECONDS,
+                 max_entries: int = PROFILE_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[PersonalityProfileSchema, float]] = {}
+        self._versions: Dict[str, int] = {}
+
+    def get(self, user_id: str) -> Optional[PersonalityProfileSchema]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        schema, loaded_at = entry
+        if time.monotonic() - loaded_at >= self.ttl_seconds:
+            del self._entries[user_id]
+            return None
+        return schema
+
+    def begin_load(self, user_id: str) -> int:
+        return self._versions.get(user_id, 0)
+
+    def put(self, user_id: str, schema: PersonalityProfileSchema, version: int) -> bool:
+        if self._versions.get(user_id, 0) != version:
+            return False  # профиль изменён во время загрузки
+        self._entries.pop(user_id, None)
+        if len(self._entries) >= self.max_entries:
+            # Вытеснить самую старую запись (dict хранит порядок вставки)
+            del self._entries[next(iter(self._entries))]
+        self._entries[user_id] = (schema, time.monotonic())
+        return True
+
+    def invalidate(self, user_id: str):
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        for user_id in list(self._entries):
+            self.invalidate(user_id)
+
+
 # =============================================================================
 # Personality Engine Core
 # =============================================================================
@@ -155,6 +229,9 @@ class PersonalityEngine:
     - Feedback collection для адаптации
     """
 
+    def __init__(self, cache_ttl_seconds: float = PROFILE_CACHE_TTL_SECONDS):
+        self.profile_cache = ProfileCache(ttl_seconds=cache_ttl_seconds)
+
     async def get_profile(self, user_id: str) -> Optional[PersonalityProfileSchema]:
         """
         Получить профиль пользователя.
@@ -165,29 +242,146 @@ class PersonalityEngine:
         Returns:
             PersonalityProfileSchema или None если не найден
         """
+        profiles = await self.get_profiles([user_id])
+        return profiles.get(str(user_id))
+
+    async def get_profiles(self, user_ids: List[str]) -> Dict[str, PersonalityProfileSchema]:
+        """
+        Получить профили нескольких пользователей.
+
+        Кэшированные профили отдаются без обращения к БД, остальные
+        загружаются одним запросом (profile + values + preferences).
+        Отсутствующие профили создаются с дефолтными значениями.
+
+        Args:
+            user_ids: UUID пользователей
+
+        Returns:
+            Dict[str(user_id)] -> PersonalityProfileSchema
+        """
+        keys = list(dict.fromkeys(str(u) for u in user_ids))
+        profiles = {}
+        missing = []
+        for key in keys:
+            cached = self.profile_cache.get(key)
+            if cached is not None:
+                profiles[key] = cached
+            else:
+                missing.append(key)
+
+        if missing:
+            async with AsyncSessionLocal() as db:
+                loaded = await self._load_profiles(db, missing)
+                not_found = [key for key in missing if key not in loaded]
+                if not_found:
+                    for key in not_found:
+                        await self._create_default_profile(db, uuid.UUID(key))
+                    loaded.update(await self._load_profiles(db, not_found))
+            for key, schema in loaded.items():
+                profiles[key] = schema
+
+        return {key: profiles[key].model_copy(deep=True) for key in keys if key in profiles}
+
+    async def get_decision_context(self, user_id: str):
+        """
+        Профиль и контекстная память для одного решения.
+
+        Returns:
+            (PersonalityProfileSchema, ContextualMemorySchema)
+        """
+        contexts = await self.get_decision_contexts([user_id])
+        return contexts[str(user_id)]
+
+    async def get_decision_contexts(self, user_ids: List[str]) -> Dict[str, tuple]:
+        """
+        Профили и контекстная память нескольких пользователей.
+
+        Один запрос к БД: профили из кэша + память, либо (кэш промахнулся)
+        профиль, values, preferences и память одним JOIN. Контекстная
+        память не создаётся при чтении - отсутствующая отдаётся дефолтной.
+
+        Returns:
+            Dict[str(user_id)] -> (PersonalityProfileSchema, ContextualMemorySchema)
+        """
+        keys = list(dict.fromkeys(str(u) for u in user_ids))
+        profiles = {}
+        for key in keys:
+            cached = self.profile_cache.get(key)
+            if cached is not None:
+                profiles[key] = cached
+        missing = [key for key in keys if key not in profiles]
+        cached_keys = [key for key in keys if key in profiles]
+
+        memories = {}
         async with AsyncSessionLocal() as db:
-            # Найти профиль
-            stmt = select(UserProfile).where(UserProfile.user_id == user_id)
-            result = await db.execute(stmt)
-            profile_db = result.scalar_one_or_none()
+            if missing:
+                loaded, loaded_memories = await self._load_profiles(db, missing, with_memory=True)
+                profiles.update(loaded)
+                memories.update(loaded_memories)
+            if cached_keys:
+                stmt = select(ContextualMemory).where(
+                    ContextualMemory.user_id.in_([uuid.UUID(k) for k in cached_keys])
+                )
+                for mem_db in (await db.execute(stmt)).scalars().all():
+                    memories[str(mem_db.user_id)] = self._memory_to_schema(mem_db)
+
+        not_found = [key for key in missing if key not in profiles]
+        if not_found:
+            # Первое обращение пользователя - создать дефолтный профиль
+            profiles.update(await self.get_profiles(not_found))
+
+        return {
+            key: (
+                profiles[key].model_copy(deep=True),
+                memories.get(key) or ContextualMemorySchema(user_id=key)
+            )
+            for key in keys
+        }
 
-            if not profile_db:
-                # Создать дефолтный профиль
-                profile_db = await self._create_default_profile(db, user_id)
+    def invalidate_profile(self, user_id: str):
+        """Сбросить кэш профиля после записи"""
+        self.profile_cache.invalidate(str(user_id))
 
-            # Загрузить связанные данные
-            # Values
-            stmt_vals = select(UserValue).where(UserValue.profile_id == profile_db.id)
-            result_vals = await db.execute(stmt_vals)
-            values_db = result_vals.scalars().all()
+    async def _load_profiles(self, db, user_ids: List[str], with_memory: bool = False):
+        """
+        Загрузить профили одним запросом и положить их в кэш.
 
-            # Preferences
-            stmt_prefs = select(UserPreference).where(UserPreference.profile_id == profile_db.id)
-            result_prefs = await db.execute(stmt_prefs)
-            prefs_db = result_prefs.scalar_one_or_none()
+        Returns:
+            Dict[str(user_id)] -> PersonalityProfileSchema
+            (+ Dict[str(user_id)] -> ContextualMemorySchema если with_memory)
+        """
+        tokens = {key: self.profile_cache.begin_load(key) for key in user_ids}
 
-            # Конвертировать в Pydantic schema
-            return self._db_to_schema(profile_db, values_db, prefs_db)
+        stmt = select(UserProfile).where(UserProfile.user_id.in_([uuid.UUID(k) for k in user_ids])).options(
+            joinedload(UserProfile.values),
+            joinedload(UserProfile.preferences)
+        )
+        if with_memory:
+            stmt = stmt.add_columns(ContextualMemory).outerjoin(
+                ContextualMemory, ContextualMemory.user_id == UserProfile.user_id
+            )
+        result = await db.execute(stmt)
+
+        profiles = {}
+        memories = {}
+        if with_memory:
+            rows = result.unique().all()
+        else:
+            rows = [(profile_db, None) for profile_db in result.unique().scalars().all()]
+
+        for profile_db, mem_db in rows:
+            key = str(profile_db.user_id)
+            if key in profiles:
+                continue  # несколько профилей одного пользователя - берём первый
+            schema = self._db_to_schema(profile_db, profile_db.values, profile_db.preferences)
+            self.profile_cache.put(key, schema, tokens[key])
+            profiles[key] = schema
+            if mem_db is not None:
+                memories[key] = self._memory_to_schema(mem_db)
+
+        if with_memory:
+            return profiles, memories
+        return profiles
 
     async def _create_default_profile(self, db, user_id: str) -> UserProfile:
         """
@@ -422,7 +616,7 @@ class PersonalityEngine:
                         prefs.requires_confirmation_for = bounds.requires_confirmation_for
 
             await db.commit()
-            await db.refresh(profile)
+            self.invalidate_profile(user_id)
 
             # Вернуть обновлённый профиль
             return await self.get_profile(user_id)
@@ -461,6 +655,7 @@ class PersonalityEngine:
             )
             db.add(feedback)
             await db.commit()
+            self.invalidate_profile(user_id)
 
     async def get_value_matrix(self, user_id: str) -> Dict[str, float]:
         """
@@ -524,6 +719,9 @@ class PersonalityEngine:
         """
         Создать снапшот профиля для версионирования.
 
+        Хранится как checkpoint или JSON Patch от предыдущего снапшота
+        (см. personality_snapshots.py).
+
         Args:
             user_id: UUID пользователя
             reason: Причина снапшота ("user_update", "adaptation", "manual")
@@ -533,122 +731,133 @@ class PersonalityEngine:
             PersonalitySnapshotSchema
         """
         async with AsyncSessionLocal() as db:
-            # Получить или создать профиль
-            stmt = select(UserProfile).where(UserProfile.user_id == user_id)
-            result = await db.execute(stmt)
-            profile = result.scalar_one_or_none()
-
+            profile = await self._get_profile_db(db, user_id)
             if not profile:
                 # Автоматически создать дефолтный профиль
-                profile = await self.get_profile(user_id)
-
-            # Получить связанные данные
-            stmt_vals = select(UserValue).where(UserValue.profile_id == profile.id)
-            result_vals = await db.execute(stmt_vals)
-            values_db = result_vals.scalars().all()
-
-            stmt_prefs = select(UserPreference).where(UserPreference.profile_id == profile.id)
-            result_prefs = await db.execute(stmt_prefs)
-            prefs_db = result_prefs.scalar_one_or_none()
-
-            # Создать snapshot
-            snapshot = PersonalitySnapshot(
-                profile_id=profile.id,
-                snapshot_version=profile.version,
-                snapshot_reason=reason,
-                # Сериализовать в JSON
-                core_traits={
-                    "openness": profile.openness,
-                    "conscientiousness": profile.conscientiousness,
-                    "extraversion": profile.extraversion,
-                    "agreeableness": profile.agreeableness,
-                    "neuroticism": profile.neuroticism,
-                },
-                motivations={
-                    "growth": profile.motivation_growth,
-                    "achievement": profile.motivation_achievement,
-                    "comfort": profile.motivation_comfort,
-                    "recognition": profile.motivation_recognition,
-                    "social_connection": profile.motivation_social_connection,
-                },
-                values=[{"name": v.value_name, "importance": v.importance} for v in values_db],
-                preferences={
-                    "communication_style": {
-                        "tone": prefs_db.tone if prefs_db else "спокойный",
-                        "humor": prefs_db.humor if prefs_db else "умеренный",
-                        "detail_level": prefs_db.detail_level if prefs_db else "средний",
-                        "language": prefs_db.language if prefs_db else "ru",
-                    },
-                    "learning_style": prefs_db.learning_style if prefs_db else "через примеры",
-                    "activity_patterns": {
-                        "active_hours": prefs_db.active_hours if prefs_db else [],
-                        "focus_span": prefs_db.focus_span if prefs_db else "45-60 мин",
-                    },
-                    "boundaries": {
-                        "no_autonomous_actions": prefs_db.no_autonomous_actions if prefs_db else True,
-                        "requires_confirmation_for": prefs_db.requires_confirmation_for if prefs_db else [],
-                    }
-                } if prefs_db else {},
-                created_by=created_by,
+                await self.get_profile(user_id)
+                profile = await self._get_profile_db(db, user_id)
+
+            snapshot, document = await snapshot_store.create(
+                db,
+                profile.id,
+                profile.version,
+                self._profile_document(profile),
+                reason=reason,
+                created_by=created_by
             )
-
-            db.add(snapshot)
             await db.commit()
             await db.refresh(snapshot)
 
             return PersonalitySnapshotSchema(
                 snapshot_version=snapshot.snapshot_version,
                 snapshot_reason=snapshot.snapshot_reason,
-                core_traits=snapshot.core_traits,
-                motivations=snapshot.motivations,
-                values=snapshot.values,
-                preferences=snapshot.preferences,
                 created_at=snapshot.created_at,
                 created_by=snapshot.created_by,
+                **document
             )
 
-    async def get_snapshots(self, user_id: str, limit: int = 10) -> List[PersonalitySnapshotSchema]:
+    @staticmethod
+    async def _get_profile_db(db, user_id: str) -> Optional[UserProfile]:
+        """UserProfile с values и preferences (один запрос)"""
+        stmt = select(UserProfile).where(UserProfile.user_id == user_id).options(
+            joinedload(UserProfile.values),
+            joinedload(UserProfile.preferences)
+        )
+        return (await db.execute(stmt)).unique().scalars().first()
+
+    @staticmethod
+    def _profile_document(profile: UserProfile) -> Dict:
+        """Состояние профиля для снапшота (core_traits, motivations, values, preferences)"""
+        prefs_db = profile.preferences
+        return {
+            "core_traits": {
+                "openness": profile.openness,
+                "conscientiousness": profile.conscientiousness,
+                "extraversion": profile.extraversion,
+                "agreeableness": profile.agreeableness,
+                "neuroticism": profile.neuroticism,
+            },
+            "motivations": {
+                "growth": profile.motivation_growth,
+                "achievement": profile.motivation_achievement,
+                "comfort": profile.motivation_comfort,
+                "recognition": profile.motivation_recognition,
+                "social_connection": profile.motivation_social_connection,
+            },
+            "values": [{"name": v.value_name, "importance": v.importance} for v in profile.values],
+            "preferences": {
+                "communication_style": {
+                    "tone": prefs_db.tone,
+                    "humor": prefs_db.humor,
+                    "detail_level": prefs_db.detail_level,
+                    "language": prefs_db.language,
+                },
+                "learning_style": prefs_db.learning_style,
+                "activity_patterns": {
+                    "active_hours": prefs_db.active_hours or [],
+                    "focus_span": prefs_db.focus_span,
+                },
+                "boundaries": {
+                    "no_autonomous_actions": prefs_db.no_autonomous_actions,
+                    "requires_confirmation_for": prefs_db.requires_confirmation_for or [],
+                }
+            } if prefs_db else {},
+        }
+
+    async def get_snapshots(self, user_id: str, limit: int = 10) -> List[PersonalitySnapshotInfoSchema]:
         """
-        Получить историю снапшотов.
+        Получить историю снапшотов (только метаданные, без payload).
+
+        Состояние конкретной версии - get_snapshot().
 
         Args:
             user_id: UUID пользователя
             limit: Макс. количество снапшотов
 
         Returns:
-            List[PersonalitySnapshotSchema]
+            List[PersonalitySnapshotInfoSchema], новые первыми
         """
         async with AsyncSessionLocal() as db:
             # Найти профиль
-            stmt = select(UserProfile).where(UserProfile.user_id == user_id)
-            result = await db.execute(stmt)
-            profile = result.scalar_one_or_none()
+            stmt = select(UserProfile.id).where(UserProfile.user_id == user_id)
+            profile_id = (await db.execute(stmt)).scalars().first()
 
-            if not profile:
+            if not profile_id:
                 return []
 
-            # Получить снапшоты
-            stmt_snaps = select(PersonalitySnapshot)\
-                .where(PersonalitySnapshot.profile_id == profile.id)\
-                .order_by(PersonalitySnapshot.created_at.desc())\
-                .limit(limit)
-
-            result_snaps = await db.execute(stmt_snaps)
-            snapshots = result_snaps.scalars().all()
-
-            return [
-                PersonalitySnapshotSchema(
-                    snapshot_version=s.snapshot_version,
-                    snapshot_reason=s.snapshot_reason,
-                    core_traits=s.core_traits,
-                    motivations=s.motivations,
-                    values=s.values,
-                    preferences=s.preferences,
-                    created_at=s.created_at,
-                    created_by=s.created_by,
-                )
-                for s in snapshots
-            ]
+            rows = await snapshot_store.list_snapshots(db, profile_id, limit)
+            return [PersonalitySnapshotInfoSchema(**row) for row in rows]
+
+    async def get_snapshot(self, user_id: str, snapshot_version: int) -> Optional[PersonalitySnapshotSchema]:
+        """
+        Получить состояние профиля на версии снапшота.
+
+        Args:
+            user_id: UUID пользователя
+            snapshot_version: Версия снапшота
+
+        Returns:
+            PersonalitySnapshotSchema или None если не найден
+        """
+        async with AsyncSessionLocal() as db:
+            stmt = select(UserProfile.id).where(UserProfile.user_id == user_id)
+            profile_id = (await db.execute(stmt)).scalars().first()
+
+            if not profile_id:
+                return None
+
+            found = await snapshot_store.materialize(db, profile_id, snapshot_version)
+            if not found:
+                return None
+
+            snapshot, document = found
+            return PersonalitySnapshotSchema(
+                snapshot_version=snapshot.snapshot_version,
+                snapshot_reason=snapshot.snapshot_reason,
+                created_at=snapshot.created_at,
+                created_by=snapshot.created_by,
+                **document
+            )
 
     async def rollback_to_snapshot(self, user_id: str, snapshot_version: int) -> PersonalityProfileSchema:
         """
@@ -673,31 +882,28 @@ class PersonalityEngine:
             if not profile:
                 raise ValueError(f"Profile not found for user {user_id}")
 
-            # Найти снапшот
-            stmt_snap = select(PersonalitySnapshot)\
-                .where(PersonalitySnapshot.profile_id == profile.id)\
-                .where(PersonalitySnapshot.snapshot_version == snapshot_version)
-
-            result_snap = await db.execute(stmt_snap)
-            snapshot = result_snap.scalar_one_or_none()
+            # Найти снапшот (checkpoint + replay delta)
+            found = await snapshot_store.materialize(db, profile.id, snapshot_version)
 
-            if not snapshot:
+            if not found:
                 raise ValueError(f"Snapshot version {snapshot_version} not found")
 
+            _, snapshot = found
+
             # Восстановить из снапшота
             # Core traits
-            profile.openness = snapshot.core_traits["openness"]
-            profile.conscientiousness = snapshot.core_traits["conscientiousness"]
-            profile.extraversion = snapshot.core_traits["extraversion"]
-            profile.agreeableness = snapshot.core_traits["agreeableness"]
-            profile.neuroticism = snapshot.core_traits["neuroticism"]
+            profile.openness = snapshot["core_traits"]["openness"]
+            profile.conscientiousness = snapshot["core_traits"]["conscientiousness"]
+            profile.extraversion = snapshot["core_traits"]["extraversion"]
+            profile.agreeableness = snapshot["core_traits"]["agreeableness"]
+            profile.neuroticism = snapshot["core_traits"]["neuroticism"]
 
             # Motivations
-            profile.motivation_growth = snapshot.motivations["growth"]
-            profile.motivation_achievement = snapshot.motivations["achievement"]
-            profile.motivation_comfort = snapshot.motivations["comfort"]
-            profile.motivation_recognition = snapshot.motivations["recognition"]
-            profile.motivation_social_connection = snapshot.motivations["social_connection"]
+            profile.motivation_growth = snapshot["motivations"]["growth"]
+            profile.motivation_achievement = snapshot["motivations"]["achievement"]
+            profile.motivation_comfort = snapshot["motivations"]["comfort"]
+            profile.motivation_recognition = snapshot["motivations"]["recognition"]
+            profile.motivation_social_connection = snapshot["motivations"]["social_connection"]
 
             # Увеличить версию
             profile.version += 1
@@ -710,7 +916,7 @@ class PersonalityEngine:
             for v in old_values:
                 await db.delete(v)
 
-            for val in snapshot.values:
+            for val in snapshot["values"]:
                 db.add(UserValue(
                     profile_id=profile.id,
                     value_name=val["name"],
@@ -726,27 +932,27 @@ class PersonalityEngine:
                 prefs = UserPreference(profile_id=profile.id)
                 db.add(prefs)
 
-            comm = snapshot.preferences.get("communication_style", {})
+            comm = snapshot["preferences"].get("communication_style", {})
             if comm:
                 prefs.tone = comm.get("tone", "спокойный")
                 prefs.humor = comm.get("humor", "умеренный")
                 prefs.detail_level = comm.get("detail_level", "средний")
                 prefs.language = comm.get("language", "ru")
 
-            prefs.learning_style = snapshot.preferences.get("learning_style", "через примеры")
+            prefs.learning_style = snapshot["preferences"].get("learning_style", "через примеры")
 
-            act = snapshot.preferences.get("activity_patterns", {})
+            act = snapshot["preferences"].get("activity_patterns", {})
             if act:
                 prefs.active_hours = act.get("active_hours", [])
                 prefs.focus_span = act.get("focus_span", "45-60 мин")
 
-            bounds = snapshot.preferences.get("boundaries", {})
+            bounds = snapshot["preferences"].get("boundaries", {})
             if bounds:
                 prefs.no_autonomous_actions = bounds.get("no_autonomous_actions", True)
                 prefs.requires_confirmation_for = bounds.get("requires_confirmation_for", [])
 
             await db.commit()
-            await db.refresh(profile)
+            self.invalidate_profile(user_id)
 
             # Вернуть обновлённый профиль
             return await self.get_profile(user_id)
@@ -777,20 +983,25 @@ class PersonalityEngine:
                 await db.commit()
                 await db.refresh(mem_db)
 
-            return ContextualMemorySchema(
-                user_id=str(mem_db.user_id),
-                recent_goals=[
-                    RecentGoalSchema(**g) for g in (mem_db.recent_goals or [])
-                ],
-                emotional_tone_recent=mem_db.emotional_tone_recent,
-                emotional_tone_confidence=mem_db.emotional_tone_confidence,
-                behavioral_summary_week=BehavioralSummarySchema(
-                    **(mem_db.behavioral_summary_week or {})
-                ) if mem_db.behavioral_summary_week else None,
-                last_interaction_at=mem_db.last_interaction_at,
-                interaction_streak=mem_db.interaction_streak,
-                updated_at=mem_db.updated_at,
-            )
+            return self._memory_to_schema(mem_db)
+
+    @staticmethod
+    def _memory_to_schema(mem_db: ContextualMemory) -> ContextualMemorySchema:
+        """Конвертировать ContextualMemory в Pydantic schema"""
+        return ContextualMemorySchema(
+            user_id=str(mem_db.user_id),
+            recent_goals=[
+                RecentGoalSchema(**g) for g in (mem_db.recent_goals or [])
+            ],
+            emotional_tone_recent=mem_db.emotional_tone_recent,
+            emotional_tone_confidence=mem_db.emotional_tone_confidence,
+            behavioral_summary_week=BehavioralSummarySchema(
+                **(mem_db.behavioral_summary_week or {})
+            ) if mem_db.behavioral_summary_week else None,
+            last_interaction_at=mem_db.last_interaction_at,
+            interaction_streak=mem_db.interaction_streak,
+            updated_at=mem_db.updated_at,
+        )
 
     async def update_contextual_memory(self, user_id: str,
                                       recent_goals: List[Dict] = None,
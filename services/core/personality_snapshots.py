@@ -0,0 +1,328 @@
+"""
+Personality Snapshots — delta-encoded история профиля личности.
+
+Вместо полной копии профиля на каждый снапшот:
+- каждые CHECKPOINT_INTERVAL снапшотов - полный checkpoint (kind="full")
+- между ними - JSON Patch (RFC 6902) от предыдущего снапшота (kind="delta")
+
+Цепочка (segment) = checkpoint + следующие за ним delta. Все строки цепочки
+имеют base_sequence = sequence checkpoint'а, поэтому любая версия
+материализуется одним запросом: checkpoint + не более CHECKPOINT_INTERVAL - 1
+патчей.
+
+Costs:
+- create: один запрос (текущая цепочка) + INSERT
+- materialize / rollback: один запрос, replay <= CHECKPOINT_INTERVAL патчей
+- list_snapshots: только метаданные, без payload
+- compact: старые цепочки сворачиваются до checkpoint + последнего
+  состояния (промежуточные delta удаляются)
+
+Usage:
+    from personality_snapshots import snapshot_store
+
+    row, document = await snapshot_store.create(db, profile.id, profile.version, document)
+    await db.commit()
+    row, document = await snapshot_store.materialize(db, profile.id, snapshot_version=7)
+"""
+import copy
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, select, tuple_
+
+from database import AsyncSessionLocal
+from logging_config import get_logger
+from models import PersonalitySnapshot
+
+logger = get_logger(__name__)
+
+CHECKPOINT_INTERVAL = int(os.getenv("PERSONALITY_SNAPSHOT_CHECKPOINT_INTERVAL", "20"))
+DELTA_RETENTION_DAYS = int(os.getenv("PERSONALITY_SNAPSHOT_DELTA_RETENTION_DAYS", "90"))
+
+DOCUMENT_FIELDS = ("core_traits", "motivations", "values", "preferences")
+
+
+# =============================================================================
+# JSON Patch (RFC 6902: add / remove / replace)
+# =============================================================================
+
+def _escape(token) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> List[Dict]:
+    """
+    JSON Patch, переводящий old в new.
+
+    Словари сравниваются по ключам, списки одной длины - по индексам,
+    остальное заменяется целиком.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [
+            {"op": "remove", "path": f"{path}/{_escape(key)}"}
+            for key in old if key not in new
+        ]
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": copy.deepcopy(value)})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(make_patch(a, b, f"{path}/{i}"))
+        return ops
+
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": copy.deepcopy(new)}]
+
+
+def apply_patch(document: Any, patch: List[Dict]) -> Any:
+    """
+    Применить JSON Patch к document (in place) и вернуть результат.
+
+    Raises:
+        ValueError: неизвестная операция или путь
+    """
+    for op in patch:
+        path = op["path"]
+        value = copy.deepcopy(op.get("value"))
+        if path == "":
+            if op["op"] == "remove":
+                raise ValueError("Cannot remove document root")
+            document = value
+            continue
+
+        tokens = [_unescape(t) for t in path.split("/")[1:]]
+        parent = document
+        try:
+            for token in tokens[:-1]:
+                parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+            last = tokens[-1]
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                if op["op"] == "add":
+                    parent.insert(index, value)
+                elif op["op"] == "remove":
+                    del parent[index]
+                elif op["op"] == "replace":
+                    parent[index] = value
+                else:
+                    raise ValueError(f"Unsupported patch op: {op['op']}")
+            else:
+                if op["op"] in ("add", "replace"):
+                    parent[last] = value
+                elif op["op"] == "remove":
+                    del parent[last]
+                else:
+                    raise ValueError(f"Unsupported patch op: {op['op']}")
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Invalid patch path {path}: {e}")
+    return document
+
+
+# =============================================================================
+# Snapshot chain (pure)
+# =============================================================================
+
+def row_document(row) -> Dict:
+    """Документ полного снапшота (kind="full")"""
+    return {field: copy.deepcopy(getattr(row, field)) for field in DOCUMENT_FIELDS}
+
+
+def replay(chain: List) -> Dict:
+    """
+    Материализовать последний снапшот цепочки.
+
+    Args:
+        chain: строки одной цепочки по возрастанию sequence, первая - checkpoint
+    """
+    if not chain or chain[0].kind != "full":
+        raise ValueError("Snapshot chain must start with a full checkpoint")
+    document = row_document(chain[0])
+    for row in chain[1:]:
+        document = apply_patch(document, row.delta or [])
+    return document
+
+
+def plan_snapshot(
+    chain: List,
+    document: Dict,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL
+) -> Dict:
+    """
+    Поля новой строки снапшота после текущей цепочки.
+
+    Args:
+        chain: текущая (последняя) цепочка профиля, может быть пустой
+        document: состояние профиля для снапшота
+
+    Returns:
+        {"sequence", "base_sequence", "kind", "delta" | DOCUMENT_FIELDS}
+    """
+    if not chain or len(chain) >= checkpoint_interval:
+        sequence = chain[-1].sequence + 1 if chain else 1
+        fields = {"sequence": sequence, "base_sequence": sequence, "kind": "full", "delta": None}
+        fields.update(copy.deepcopy(document))
+        return fields
+
+    return {
+        "sequence": chain[-1].sequence + 1,
+        "base_sequence": chain[0].sequence,
+        "kind": "delta",
+        "delta": make_patch(replay(chain), document),
+        **{field: None for field in DOCUMENT_FIELDS}
+    }
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class PersonalitySnapshotStore:
+    """Чтение и запись personality_snapshots (checkpoint + delta)"""
+
+    def __init__(
+        self,
+        checkpoint_interval: int = CHECKPOINT_INTERVAL,
+        delta_retention_days: int = DELTA_RETENTION_DAYS
+    ):
+        self.checkpoint_interval = checkpoint_interval
+        self.delta_retention_days = delta_retention_days
+
+    @staticmethod
+    async def _current_chain(db, profile_id) -> List[PersonalitySnapshot]:
+        s = PersonalitySnapshot
+        latest_base = select(func.max(s.base_sequence)).where(s.profile_id == profile_id).scalar_subquery()
+        stmt = select(s).where(
+            s.profile_id == profile_id,
+            s.base_sequence == latest_base
+        ).order_by(s.sequence)
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def create(
+        self,
+        db,
+        profile_id,
+        snapshot_version: int,
+        document: Dict,
+        reason: str = "update",
+        created_by: str = "system"
+    ) -> Tuple[PersonalitySnapshot, Dict]:
+        """
+        Добавить снапшот (caller commits).
+
+        Returns:
+            (PersonalitySnapshot, document)
+        """
+        chain = await self._current_chain(db, profile_id)
+        snapshot = PersonalitySnapshot(
+            profile_id=profile_id,
+            snapshot_version=snapshot_version,
+            snapshot_reason=reason,
+            created_by=created_by,
+            **plan_snapshot(chain, document, self.checkpoint_interval)
+        )
+        db.add(snapshot)
+        return snapshot, document
+
+    async def materialize(
+        self,
+        db,
+        profile_id,
+        snapshot_version: int
+    ) -> Optional[Tuple[PersonalitySnapshot, Dict]]:
+        """
+        Восстановить состояние снапшота версии snapshot_version
+        (последнего, если их несколько). Один запрос.
+
+        Returns:
+            (PersonalitySnapshot, document) или None если не найден
+        """
+        s = PersonalitySnapshot
+        target = select(s.sequence, s.base_sequence).where(
+            s.profile_id == profile_id,
+            s.snapshot_version == snapshot_version
+        ).order_by(s.sequence.desc()).limit(1).subquery()
+
+        stmt = select(s).join(
+            target,
+            and_(s.base_sequence == target.c.base_sequence, s.sequence <= target.c.sequence)
+        ).where(s.profile_id == profile_id).order_by(s.sequence)
+
+        chain = list((await db.execute(stmt)).scalars().all())
+        if not chain:
+            return None
+        return chain[-1], replay(chain)
+
+    async def list_snapshots(self, db, profile_id, limit: int = 10) -> List[Dict]:
+        """Метаданные последних снапшотов (без payload), новые первыми"""
+        s = PersonalitySnapshot
+        stmt = select(
+            s.snapshot_version, s.snapshot_reason, s.kind, s.sequence, s.created_at, s.created_by
+        ).where(s.profile_id == profile_id).order_by(s.sequence.desc()).limit(limit)
+
+        return [dict(row._mapping) for row in (await db.execute(stmt)).all()]
+
+    async def compact(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Свернуть цепочки, последний снапшот которых старше
+        delta_retention_days: checkpoint и последнее состояние цепочки
+        остаются (последнее - как новый checkpoint), промежуточные delta
+        удаляются. Одна транзакция.
+
+        Returns:
+            {"chains": свёрнутых цепочек, "deleted": удалённых delta}
+        """
+        s = PersonalitySnapshot
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.delta_retention_days)
+
+        async with AsyncSessionLocal() as db:
+            old_chains = select(s.profile_id, s.base_sequence).group_by(
+                s.profile_id, s.base_sequence
+            ).having(and_(func.max(s.created_at) < cutoff, func.count() > 2))
+
+            keys = [tuple(row) for row in (await db.execute(old_chains)).all()]
+            if not keys:
+                return {"chains": 0, "deleted": 0}
+
+            stmt = select(s).where(
+                tuple_(s.profile_id, s.base_sequence).in_(keys)
+            ).order_by(s.profile_id, s.base_sequence, s.sequence)
+            rows = (await db.execute(stmt)).scalars().all()
+
+            chains: Dict[tuple, List[PersonalitySnapshot]] = {}
+            for row in rows:
+                chains.setdefault((row.profile_id, row.base_sequence), []).append(row)
+
+            deleted_ids = []
+            for chain in chains.values():
+                last = chain[-1]
+                document = replay(chain)
+                last.kind = "full"
+                last.base_sequence = last.sequence
+                last.delta = None
+                for field in DOCUMENT_FIELDS:
+                    setattr(last, field, document[field])
+                deleted_ids.extend(row.id for row in chain[1:-1])
+
+            if deleted_ids:
+                await db.execute(delete(s).where(s.id.in_(deleted_ids)))
+            await db.commit()
+
+        result = {"chains": len(chains), "deleted": len(deleted_ids)}
+        logger.info("personality_snapshots_compacted", **result)
+        return result
+
+
+# Singleton instance
+snapshot_store = PersonalitySnapshotStore()
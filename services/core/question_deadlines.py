@@ -0,0 +1,329 @@
+"""
+QUESTION DEADLINES - timeout scheduling for user questions
+==========================================================
+
+/questions/check-timeouts used to run KEYS question_timeout:* (+ TTL per
+key) and then load every pending QUESTION artifact through a JSON-path
+filter, parsing content["timeout_at"] in Python - O(all questions) on
+every check.
+
+Deadlines now live in one Redis sorted set:
+
+    question_deadlines   member = question (artifact) id
+                         score  = timeout_at as unix epoch
+
+- schedule()/cancel(): ZADD when a question is indexed or extended,
+  ZREM when it is answered
+- pop_expired(): Lua ZRANGEBYSCORE -inf..now LIMIT n + ZREM, atomic, so
+  concurrent checkers never receive the same question
+- process_expired(): pops batches, loads the batch's artifacts with one
+  SELECT ... WHERE id IN (...) and applies every timeout_action in ONE UoW;
+  on failure the batch goes back into the set
+
+Cost per check = O(expired questions * log N).
+
+Timeout actions (see canonical_skills/ASK_USER_README.md):
+    continue_with_default  answer with default_answer (no default → "timeout")
+    wait_longer            +1 hour, at most MAX_EXTENSIONS times, then fail_goal
+    fail_goal              goal → failed via transition_service
+
+Questions are written as artifacts by other services, so nothing here sees
+them being created. backfill() runs before every check and indexes pending
+QUESTION artifacts created after a watermark (question_deadlines:watermark,
+max created_at seen so far, re-scanned with a SYNC_OVERLAP margin for
+late-committing transactions). The first run has no watermark and scans
+every question once. Backfill cost = O(questions created since last check).
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+DEADLINES_KEY = "question_deadlines"
+WATERMARK_KEY = "question_deadlines:watermark"
+SYNC_OVERLAP = timedelta(minutes=5)
+BATCH_SIZE = int(os.getenv("QUESTION_TIMEOUT_BATCH_SIZE", "100"))
+EXTENSION = timedelta(hours=1)
+MAX_EXTENSIONS = 3
+
+# Atomic "pop due members": returns [member, score, member, score, ...]
+_POP_EXPIRED_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+for i = 1, #due, 2 do
+    redis.call('ZREM', KEYS[1], due[i])
+end
+return due
+"""
+
+
+def _epoch(ts: datetime) -> float:
+    # timeout_at is stored as naive UTC (datetime.utcnow().isoformat())
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+class QuestionDeadlineScheduler:
+    """Sorted-set deadline index for QUESTION artifacts."""
+
+    def __init__(self, redis_client=None, uow_factory=None, batch_size: int = BATCH_SIZE):
+        self._redis = redis_client
+        self._uow_factory = uow_factory
+        self._pop_script = None
+        self.batch_size = batch_size
+
+    # =========================================================================
+    # WIRING
+    # =========================================================================
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+        return self._redis
+
+    def _open_uow(self):
+        if self._uow_factory is None:
+            from infrastructure.uow import create_uow_provider
+            self._uow_factory = create_uow_provider()
+        return self._uow_factory()
+
+    # =========================================================================
+    # INDEX
+    # =========================================================================
+
+    async def schedule(self, question_id: str, timeout_at: datetime) -> None:
+        await self.redis.zadd(DEADLINES_KEY, {str(question_id): _epoch(timeout_at)})
+
+    async def cancel(self, question_id: str) -> None:
+        await self.redis.zrem(DEADLINES_KEY, str(question_id))
+
+    async def pending_count(self) -> int:
+        return await self.redis.zcard(DEADLINES_KEY)
+
+    async def pop_expired(self, now: datetime, limit: int) -> List[Tuple[str, float]]:
+        """Atomically remove and return up to `limit` due (question_id, score)."""
+        if self._pop_script is None:
+            self._pop_script = self.redis.register_script(_POP_EXPIRED_LUA)
+        flat = await self._pop_script(keys=[DEADLINES_KEY], args=[_epoch(now), limit])
+        return [(flat[i], float(flat[i + 1])) for i in range(0, len(flat), 2)]
+
+    async def _restore(self, popped: List[Tuple[str, float]]) -> None:
+        if popped:
+            await self.redis.zadd(DEADLINES_KEY, {member: score for member, score in popped})
+
+    # =========================================================================
+    # PROCESSING
+    # =========================================================================
+
+    async def process_expired(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Apply timeout_action to every expired question.
+
+        One UoW per batch of `batch_size` questions.
+        """
+        now = now or datetime.utcnow()
+        processed: List[Dict[str, Any]] = []
+
+        while True:
+            popped = await self.pop_expired(now, self.batch_size)
+            if not popped:
+                break
+
+            try:
+                batch_processed, reschedule = await self._apply_batch([m for m, _ in popped], now)
+            except Exception:
+                await self._restore(popped)
+                raise
+
+            for question_id, timeout_at in reschedule:
+                await self.schedule(question_id, timeout_at)
+            processed.extend(batch_processed)
+
+            if len(popped) < self.batch_size:
+                break
+
+        if processed:
+            logger.info("question_timeouts_processed", count=len(processed))
+        return processed
+
+    async def _apply_batch(
+        self,
+        question_ids: List[str],
+        now: datetime
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[str, datetime]]]:
+        from sqlalchemy import select
+        from models import Artifact, Goal
+        from goal_transition_service import transition_service
+
+        processed: List[Dict[str, Any]] = []
+        reschedule: List[Tuple[str, datetime]] = []
+        to_fail: List[Tuple[Any, str]] = []  # (artifact, goal_id)
+
+        async with self._open_uow() as uow:
+            result = await uow.session.execute(
+                select(Artifact).where(Artifact.id.in_([UUID(q) for q in question_ids]))
+            )
+
+            for artifact in result.scalars().all():
+                content = dict(artifact.content or {})
+                if content.get("status") != "pending":
+                    continue  # answered in the meantime
+
+                timeout_at_str = content.get("timeout_at")
+                if timeout_at_str and datetime.fromisoformat(timeout_at_str) > now:
+                    # Deadline moved later without rescheduling - honour the artifact
+                    reschedule.append((str(artifact.id), datetime.fromisoformat(timeout_at_str)))
+                    continue
+
+                timeout_action = content.get("timeout_action", "continue_with_default")
+                logger.info("question_timeout", question_id=str(artifact.id), action=timeout_action)
+
+                if timeout_action == "wait_longer" and content.get("extended_count", 0) >= MAX_EXTENSIONS:
+                    timeout_action = "fail_goal"
+
+                if timeout_action == "continue_with_default":
+                    default_answer = content.get("default_answer")
+                    if default_answer:
+                        content.update(
+                            answer=default_answer,
+                            answered_at=now.isoformat(),
+                            status="answered_with_default",
+                            timeout_used=True,
+                        )
+                        processed.append({
+                            "question_id": str(artifact.id),
+                            "action": "continue_with_default",
+                            "default_answer": default_answer[:100]
+                        })
+                    else:
+                        content["status"] = "timeout"
+                        processed.append({"question_id": str(artifact.id), "action": "timeout"})
+
+                elif timeout_action == "wait_longer":
+                    new_timeout = now + EXTENSION
+                    content["timeout_at"] = new_timeout.isoformat()
+                    content["extended_count"] = content.get("extended_count", 0) + 1
+                    reschedule.append((str(artifact.id), new_timeout))
+                    processed.append({
+                        "question_id": str(artifact.id),
+                        "action": "wait_longer",
+                        "extended_until": new_timeout.isoformat()
+                    })
+
+                else:
+                    content["status"] = "timeout"
+                    goal_id = content.get("goal_id") or (str(artifact.goal_id) if artifact.goal_id else None)
+                    if goal_id:
+                        to_fail.append((artifact, goal_id))
+
+                # Reassign: in-place JSON mutation is not tracked by SQLAlchemy
+                artifact.content = content
+
+            if to_fail:
+                # One SELECT for the goals, then a per-goal transition in this UoW
+                goal_uuids = set()
+                for _, goal_id in to_fail:
+                    try:
+                        goal_uuids.add(UUID(goal_id))
+                    except ValueError:
+                        pass  # reported as missing below
+                goal_result = await uow.session.execute(select(Goal).where(Goal.id.in_(goal_uuids)))
+                goals = {str(goal.id): goal for goal in goal_result.scalars().all()}
+
+                for artifact, goal_id in to_fail:
+                    goal = goals.get(goal_id)
+                    if goal is None:
+                        logger.warning("question_timeout_goal_missing", question_id=str(artifact.id), goal_id=goal_id)
+                        continue
+
+                    reason = f"Question timed out: {artifact.content.get('question', 'Unknown')[:100]}"
+                    goal.error_message = reason
+                    try:
+                        res = await transition_service.transition(
+                            uow=uow,
+                            goal_id=goal.id,
+                            new_state="failed",
+                            reason=reason,
+                            actor="system"
+                        )
+                    except Exception as e:
+                        logger.warning("question_timeout_fail_goal_error", goal_id=goal_id, error=str(e))
+                        res = {"result": "failed"}
+
+                    processed.append({
+                        "question_id": str(artifact.id),
+                        "action": "fail_goal",
+                        "goal_id": goal_id,
+                        "result": res.get("result")
+                    })
+            # ← ONE COMMIT for the batch
+
+        return processed, reschedule
+
+    # =========================================================================
+    # INCREMENTAL BACKFILL
+    # =========================================================================
+
+    async def backfill(self) -> int:
+        """
+        Index pending questions created since the last call.
+
+        ZADD is idempotent, so rows re-read within SYNC_OVERLAP (or by a
+        concurrent checker) just rewrite the same deadline.
+        """
+        watermark_str = await self.redis.get(WATERMARK_KEY)
+        since = datetime.fromisoformat(watermark_str) - SYNC_OVERLAP if watermark_str else None
+
+        rows = await self._load_questions(since)
+
+        deadlines: Dict[str, float] = {}
+        latest = datetime.fromisoformat(watermark_str) if watermark_str else None
+        for artifact_id, content, created_at in rows:
+            if created_at is not None and (latest is None or created_at > latest):
+                latest = created_at
+            content = content or {}
+            if content.get("status") != "pending":
+                continue
+            timeout_at_str = content.get("timeout_at")
+            if timeout_at_str:
+                deadlines[str(artifact_id)] = _epoch(datetime.fromisoformat(timeout_at_str))
+
+        if deadlines:
+            await self.redis.zadd(DEADLINES_KEY, deadlines)
+        if latest is not None and latest.isoformat() != watermark_str:
+            await self.redis.set(WATERMARK_KEY, latest.isoformat())
+        if deadlines:
+            logger.info("question_deadlines_backfilled", count=len(deadlines))
+        return len(deadlines)
+
+    async def _load_questions(self, since: Optional[datetime]) -> List[Tuple[Any, Dict, datetime]]:
+        """(id, content, created_at) of QUESTION artifacts created after since."""
+        from sqlalchemy import select
+        from models import Artifact
+
+        stmt = select(Artifact.id, Artifact.content, Artifact.created_at).where(
+            Artifact.type == "QUESTION"
+        )
+        if since is None:
+            # First run: only pending ones matter, the rest never get a deadline
+            stmt = stmt.where(Artifact.content["status"].astext == "pending")
+        else:
+            stmt = stmt.where(Artifact.created_at > since)
+
+        async with self._open_uow() as uow:
+            result = await uow.session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+
+
+question_deadlines = QuestionDeadlineScheduler()
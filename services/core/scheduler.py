@@ -87,6 +87,7 @@ def _create_use_cases():
     v3.0: Теперь включает Arbitration layer.
     """
     from infrastructure.uow import create_uow_provider, get_uow
+    from infrastructure.goal_work_queue import GoalWorkQueue, LeasedGoalSelector
     from application.bulk_transition_engine import bulk_transition_engine
     from application.use_cases import (
         ResumePendingGoalsUseCase,
@@ -122,6 +123,8 @@ def _create_use_cases():
 
     capital_allocator = FixedBudgetAllocator(budget=10.0)
 
+    goal_queue = GoalWorkQueue()
+
     resume_use_case = ResumePendingGoalsUseCase(
         uow_factory=uow_factory,
         bulk_engine=bulk_transition_engine,
@@ -134,6 +137,7 @@ def _create_use_cases():
         arbitrator=arbitrator,  # ✅ v3.0: Arbitration layer
         capital_allocator=capital_allocator,  # ✅ v3.0: Budget management
         event_bus=event_bus,
+        selector=LeasedGoalSelector(goal_queue),  # SKIP LOCKED + lease: safe with N replicas
     )
 
     decomposer_instance = GoalDecomposer()
@@ -148,6 +152,7 @@ def _create_use_cases():
         "decompose": decompose_use_case,
         "arbitrator": arbitrator,  # For API access
         "capital_allocator": capital_allocator,  # For API access
+        "goal_queue": goal_queue,
     }
 
 
@@ -185,9 +190,9 @@ async def execute_atomic_goals():
     start_time = time()
 
     use_cases = _get_use_cases()
+    # Wave size / concurrency: EXECUTE_WAVE_SIZE, EXECUTE_CONCURRENCY
     result = await use_cases["execute"].run(
-        actor="scheduler.atomic_executor",
-        limit=3
+        actor="scheduler.atomic_executor"
     )
 
     duration = time() - start_time
@@ -201,6 +206,30 @@ async def execute_atomic_goals():
     )
 
 
+async def reap_goal_leases():
+    """
+    Снимает просроченные leases (воркер упал посреди цели).
+    """
+    use_cases = _get_use_cases()
+    reaped = await use_cases["goal_queue"].reap_expired()
+    if reaped:
+        logger.info("goal_leases_reap_summary", reaped=reaped)
+
+
+async def check_question_timeouts():
+    """
+    Применяет timeout_action к просроченным вопросам пользователю.
+
+    Дешево при любом числе вопросов: читается только sorted set дедлайнов.
+    """
+    from question_deadlines import question_deadlines
+
+    await question_deadlines.backfill()
+    processed = await question_deadlines.process_expired()
+    if processed:
+        logger.info("question_timeouts_summary", processed=len(processed))
+
+
 async def auto_resume_pending_goals():
     """
     Активирует pending цели без детей.
@@ -317,6 +346,32 @@ async def decay_memory_signals():
         return {"error": str(e)}
 
 
+async def downsample_state_history():
+    """
+    Rollup старых точек system_state_history (raw -> hour -> day).
+    """
+    from autonomy.state_history import state_history
+
+    try:
+        return await state_history.downsample()
+    except Exception as e:
+        logger.error("state_history_downsample_error", error=str(e))
+        return {"error": str(e)}
+
+
+async def compact_personality_snapshots():
+    """
+    Свернуть старые delta-цепочки personality_snapshots.
+    """
+    from personality_snapshots import snapshot_store
+
+    try:
+        return await snapshot_store.compact()
+    except Exception as e:
+        logger.error("personality_snapshots_compact_error", error=str(e))
+        return {"error": str(e)}
+
+
 def start_scheduler():
     """
     Регистрация всех jobs.
@@ -351,6 +406,25 @@ def start_scheduler():
         **JOB_CONFIG
     )
 
+    # Goal work queue: expired leases every 1 minute
+    scheduler.add_job(
+        reap_goal_leases,
+        'interval',
+        minutes=1,
+        id='goal_lease_reaper',
+        **JOB_CONFIG
+    )
+
+    # Question timeouts every 1 minute
+    scheduler.add_job(
+        check_question_timeouts,
+        'interval',
+        minutes=1,
+        id='question_timeouts',
+        max_instances=1,
+        **JOB_CONFIG
+    )
+
     # Pending Goals Auto-Resume every 5 mins
     scheduler.add_job(
         auto_resume_pending_goals,
@@ -408,6 +482,26 @@ def start_scheduler():
         **JOB_CONFIG
     )
 
+    # Autonomy: state history downsampling hourly
+    scheduler.add_job(
+        downsample_state_history,
+        'interval',
+        hours=1,
+        id='state_history_downsample',
+        max_instances=1,
+        **JOB_CONFIG
+    )
+
+    # Personality: snapshot delta compaction daily
+    scheduler.add_job(
+        compact_personality_snapshots,
+        'interval',
+        hours=24,
+        id='personality_snapshots_compact',
+        max_instances=1,
+        **JOB_CONFIG
+    )
+
     # Skill Evolution: Controlled evolution every 6 hours
     async def run_skill_evolution():
         from controlled_evolution import run_controlled_evolution_cycle
@@ -4,16 +4,22 @@ Retroactive Artifact Re-verification Script
 
 Re-verifies all failed artifacts with the new inline content detection logic.
 
+Artifacts are processed in keyset-paginated batches: only the columns the
+verifier needs are selected, each batch is verified in the verifier's
+thread pool (artifact_verifier.verify_many) and fixed rows are written
+with one bulk UPDATE per batch.
+
 Usage:
-    docker exec ns_core python /app/scripts/retroverify_artifacts.py [--dry-run]
+    docker exec ns_core python /app/scripts/retroverify_artifacts.py [--dry-run] [--batch-size 1000]
 """
 import asyncio
 import sys
+import time
 import argparse
 
 sys.path.insert(0, '/app')
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from database import AsyncSessionLocal
 from models import Artifact
 from artifact_verifier import artifact_verifier
@@ -22,77 +28,107 @@ from logging_config import get_logger
 logger = get_logger(__name__)
 
 
-async def retroverify_artifacts(dry_run: bool = False):
+async def _fetch_batch(session, after_id, batch_size: int):
+    stmt = (
+        select(Artifact.id, Artifact.type, Artifact.content_kind, Artifact.content_location)
+        .where(Artifact.verification_status == 'failed')
+        .order_by(Artifact.id)
+        .limit(batch_size)
+    )
+    if after_id is not None:
+        stmt = stmt.where(Artifact.id > after_id)
+    return (await session.execute(stmt)).all()
+
+
+async def retroverify_artifacts(dry_run: bool = False, batch_size: int = 1000, verbose: bool = False):
     """
     Re-verify all failed artifacts.
-    
+
     Args:
         dry_run: If True, only print what would be changed
+        batch_size: Artifacts per SELECT / verify_many / UPDATE round
+        verbose: Print every artifact, not only fixed ones
     """
+    print(f"\n{'='*70}")
+    print(f"RETROACTIVE ARTIFACT RE-VERIFICATION")
+    print(f"{'='*70}")
+
+    fixed_count = 0
+    still_failed = 0
+    after_id = None
+    started = time.perf_counter()
+
     async with AsyncSessionLocal() as session:
-        # Get all failed artifacts
-        stmt = select(Artifact).where(Artifact.verification_status == 'failed')
-        result = await session.execute(stmt)
-        failed_artifacts = result.scalars().all()
-        
-        print(f"\n{'='*70}")
-        print(f"RETROACTIVE ARTIFACT RE-VERIFICATION")
-        print(f"{'='*70}")
-        print(f"Total failed artifacts: {len(failed_artifacts)}")
-        print()
-        
-        fixed_count = 0
-        still_failed = 0
-        
-        for artifact in failed_artifacts:
-            # Prepare artifact data for verification
-            artifact_data = {
-                'type': artifact.type,
-                'content_kind': artifact.content_kind,
-                'content_location': artifact.content_location
-            }
-            
-            # Re-verify
-            results = artifact_verifier.verify(artifact_data)
-            new_status = artifact_verifier.get_overall_status(results)
-            
-            old_status = artifact.verification_status
-            
-            if new_status == 'passed' and old_status == 'failed':
-                fixed_count += 1
-                
-                if not dry_run:
-                    # Update artifact
-                    artifact.verification_status = new_status
-                    artifact.verification_results = [r.to_dict() for r in results]
-                
-                print(f"✓ FIXED: {artifact.content_location[:50]}...")
-                print(f"  Old: {old_status} → New: {new_status}")
-            else:
-                still_failed += 1
-                print(f"✗ STILL FAILED: {artifact.content_location[:50]}...")
-        
-        print()
-        print(f"{'='*70}")
-        print(f"RESULTS:")
-        print(f"  Total processed: {len(failed_artifacts)}")
-        print(f"  Fixed: {fixed_count}")
-        print(f"  Still failed: {still_failed}")
-        
-        if dry_run:
-            print(f"\n  DRY RUN - No changes made")
-        else:
-            await session.commit()
-            print(f"\n  Changes committed to database")
-        
-        print(f"{'='*70}\n")
-        
-        return fixed_count, still_failed
+        while True:
+            rows = await _fetch_batch(session, after_id, batch_size)
+            if not rows:
+                break
+            after_id = rows[-1].id
+
+            batch_results = await artifact_verifier.verify_many([
+                {
+                    'type': row.type,
+                    'content_kind': row.content_kind,
+                    'content_location': row.content_location
+                }
+                for row in rows
+            ])
+
+            updates = []
+            for row, results in zip(rows, batch_results):
+                new_status = artifact_verifier.get_overall_status(results)
+
+                if new_status == 'passed':
+                    fixed_count += 1
+                    updates.append({
+                        'id': row.id,
+                        'verification_status': new_status,
+                        'verification_results': [r.to_dict() for r in results],
+                    })
+                    print(f"✓ FIXED: {row.content_location[:50]}...")
+                else:
+                    still_failed += 1
+                    if verbose:
+                        print(f"✗ STILL FAILED: {row.content_location[:50]}...")
+
+            if updates and not dry_run:
+                # Keyset pagination is by id, so fixed rows never shift the next page
+                await session.execute(update(Artifact), updates)
+                await session.commit()
+
+            processed = fixed_count + still_failed
+            logger.info(
+                "retroverify_batch",
+                processed=processed,
+                fixed=fixed_count,
+                rate_per_s=round(processed / (time.perf_counter() - started), 1)
+            )
+
+    elapsed = time.perf_counter() - started
+
+    print()
+    print(f"{'='*70}")
+    print(f"RESULTS:")
+    print(f"  Total processed: {fixed_count + still_failed} in {elapsed:.1f}s")
+    print(f"  Fixed: {fixed_count}")
+    print(f"  Still failed: {still_failed}")
+    print(f"  Verifier cache: {artifact_verifier.get_cache_stats()}")
+
+    if dry_run:
+        print(f"\n  DRY RUN - No changes made")
+    else:
+        print(f"\n  Changes committed to database")
+
+    print(f"{'='*70}\n")
+
+    return fixed_count, still_failed
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Re-verify failed artifacts')
     parser.add_argument('--dry-run', action='store_true', help='Only print changes, do not commit')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Artifacts per batch')
+    parser.add_argument('--verbose', action='store_true', help='Print still-failed artifacts too')
     args = parser.parse_args()
-    
-    asyncio.run(retroverify_artifacts(dry_run=args.dry_run))
+
+    asyncio.run(retroverify_artifacts(dry_run=args.dry_run, batch_size=args.batch_size, verbose=args.verbose))
@@ -0,0 +1,208 @@
+"""
+SKILL RUNTIME - Executes canonical skills off the event loop
+============================================================
+
+Canonical skills are synchronous (Skill.execute is a plain method) and
+many of them block: httpx.get in WebResearchSkill, file writes,
+subprocesses in RunCommandSkill. Called directly from async code they
+freeze the event loop for the whole skill runtime.
+
+SkillRuntime dispatches them to executors:
+  thread   (default) bounded ThreadPoolExecutor - I/O-bound skills
+  process  ProcessPoolExecutor - CPU-heavy skills
+           (skill, inputs and result must be picklable)
+  inline   run directly on the loop - only for trivial skills
+
+Skills pick mode and timeout via class attributes (Skill.execution_mode,
+Skill.timeout_seconds); SKILL_PROCESS_SKILLS forces process mode for
+comma-separated skill ids without touching the skill code.
+
+Timeouts: after timeout_seconds the caller gets a failed SkillResult.
+A running thread can not be killed - it finishes in the background and
+keeps its pool slot until then, so skills should keep their own I/O
+timeouts (httpx timeout=...) below the runtime timeout.
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from canonical_skills.base import SkillResult
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+SKILL_THREAD_WORKERS = int(os.getenv("SKILL_THREAD_WORKERS", "8"))
+SKILL_PROCESS_WORKERS = int(os.getenv("SKILL_PROCESS_WORKERS", "2"))
+SKILL_TIMEOUT_SECONDS = float(os.getenv("SKILL_TIMEOUT_SECONDS", "300"))
+SKILL_VERIFY_TIMEOUT_SECONDS = float(os.getenv("SKILL_VERIFY_TIMEOUT_SECONDS", "60"))
+PROCESS_SKILLS = {
+    s.strip() for s in os.getenv("SKILL_PROCESS_SKILLS", "").split(",") if s.strip()
+}
+
+EXECUTION_MODES = ("thread", "process", "inline")
+
+
+def _run_skill(skill, inputs: Dict[str, Any], context: Dict[str, Any]) -> SkillResult:
+    # Module-level so it can be pickled for the process pool
+    return skill.execute(inputs, context)
+
+
+def _verify_skill(skill, result: SkillResult) -> bool:
+    return skill.verify(result)
+
+
+class SkillRuntime:
+    """
+    Bounded executor for skill.execute() / skill.verify().
+
+    Pools are created lazily, so importing the module in a process that
+    never runs skills costs nothing.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int = SKILL_THREAD_WORKERS,
+        process_workers: int = SKILL_PROCESS_WORKERS,
+        default_timeout: float = SKILL_TIMEOUT_SECONDS,
+        verify_timeout: float = SKILL_VERIFY_TIMEOUT_SECONDS,
+        process_skills: Optional[set] = None,
+    ):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.default_timeout = default_timeout
+        self.verify_timeout = verify_timeout
+        self.process_skills = PROCESS_SKILLS if process_skills is None else process_skills
+
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+        self.executed = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    # ------------------------------------------------------------------
+    # Executors
+    # ------------------------------------------------------------------
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers, thread_name_prefix="skill"
+            )
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._process_pool
+
+    def mode_for(self, skill) -> str:
+        if getattr(skill, "id", None) in self.process_skills:
+            return "process"
+        mode = getattr(skill, "execution_mode", "thread")
+        return mode if mode in EXECUTION_MODES else "thread"
+
+    def timeout_for(self, skill) -> float:
+        return getattr(skill, "timeout_seconds", None) or self.default_timeout
+
+    def _dispatch(self, mode: str, fn, *args):
+        """Return an awaitable running fn(*args) in the executor for mode."""
+        loop = asyncio.get_running_loop()
+        if mode == "process":
+            return loop.run_in_executor(self.process_pool, functools.partial(fn, *args))
+        return loop.run_in_executor(self.thread_pool, functools.partial(fn, *args))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def execute(self, skill, inputs: Dict[str, Any], context: Dict[str, Any]) -> SkillResult:
+        """
+        Run skill.execute(inputs, context) without blocking the loop.
+
+        Skill exceptions propagate to the caller; a timeout becomes a
+        failed SkillResult.
+        """
+        skill_id = getattr(skill, "id", type(skill).__name__)
+        mode = self.mode_for(skill)
+        timeout = self.timeout_for(skill)
+
+        if asyncio.iscoroutinefunction(skill.execute):
+            awaitable = skill.execute(inputs, context)
+        elif mode == "inline":
+            self.executed += 1
+            return skill.execute(inputs, context)
+        else:
+            awaitable = self._dispatch(mode, _run_skill, skill, inputs, context)
+
+        self.in_flight += 1
+        try:
+            result = await asyncio.wait_for(awaitable, timeout=timeout)
+            self.executed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning("skill_execution_timeout", skill_id=skill_id, mode=mode, timeout_seconds=timeout)
+            return SkillResult(
+                success=False,
+                output={},
+                artifacts=[],
+                error=f"Skill {skill_id} timed out after {timeout:.0f}s",
+            )
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault) - next call gets a fresh pool
+            self._process_pool = None
+            self.errors += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def verify(self, skill, result: SkillResult) -> bool:
+        """Run skill.verify(result) off the loop; timeout counts as not verified."""
+        mode = self.mode_for(skill)
+        if mode == "inline":
+            return skill.verify(result)
+        # verify() needs no isolation - always the thread pool
+        try:
+            return await asyncio.wait_for(
+                self._dispatch("thread", _verify_skill, skill, result),
+                timeout=self.verify_timeout,
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning("skill_verify_timeout", skill_id=getattr(skill, "id", None))
+            return False
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            "in_flight": self.in_flight,
+            "executed": self.executed,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+skill_runtime = SkillRuntime()
@@ -1,12 +1,20 @@
 """
 OCCP v0.3 Stress Tester
 Tests sandbox isolation, gateway validation, and resource limits under load
+
+Runtimes:
+    inprocess - new sandbox per request in this event loop (legacy)
+    pool      - occp_sandbox_pool.SandboxPool worker processes
+
+Benchmark (throughput + p50/p95/p99 latency + event loop stall, both runtimes):
+    python services/core/stress_test_occp.py --benchmark --heavy-ratio 0.1 --large-ratio 0.1
 """
+import argparse
 import asyncio
 import time
 import random
 import sys
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 from collections import defaultdict
@@ -17,6 +25,9 @@ sys.path.insert(0, 'services/core')
 from occp_compute_sandbox import create_compute_assist_sandbox
 from occp_adversarial_sandbox import create_adversarial_test_sandbox
 from occp_sandbox import SandboxOp, SandboxViolation
+from logging_config import get_logger
+
+logger = get_logger(__name__)
 
 # ========================
 # CONFIGURATION
@@ -30,6 +41,12 @@ class StressTestConfig:
 
     # Payload distribution
     forbidden_ratio: float = 0.3  # 30% forbidden payloads
+    heavy_ratio: float = 0.0      # CPU-heavy payloads (hash over a large input)
+    large_ratio: float = 0.0      # Payloads above the pool's shared memory threshold
+
+    # Sandbox runtime: "inprocess" or "pool"
+    runtime: str = "inprocess"
+    pool_workers: int = 4
 
     # Resource limits for testing
     max_tokens: int = 10000
@@ -64,9 +81,16 @@ class TestMetrics:
     # Error breakdown
     errors_by_type: Dict[str, int] = field(default_factory=dict)
 
+    # Latency distribution + wall clock of the whole run
+    latencies: List[float] = field(default_factory=list)
+    wall_time: float = 0.0
+    max_loop_stall: float = 0.0
+
     def calculate_throughput(self):
         """Calculate requests per second"""
-        if self.total_time > 0:
+        if self.wall_time > 0:
+            self.requests_per_second = self.total_requests / self.wall_time
+        elif self.total_time > 0:
             self.requests_per_second = self.total_requests / self.total_time
 
     def update_time(self, elapsed: float):
@@ -74,6 +98,14 @@ class TestMetrics:
         self.total_time += elapsed
         self.min_time = min(self.min_time, elapsed)
         self.max_time = max(self.max_time, elapsed)
+        self.latencies.append(elapsed)
+
+    def percentile(self, p: float) -> float:
+        """Latency percentile in seconds (nearest rank)"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
 
 
 # ========================
@@ -141,11 +173,57 @@ class PayloadGenerator:
             }
         }
 
+    @staticmethod
+    def generate_heavy() -> Dict:
+        """Generate CPU-heavy payload (token estimate + hash over ~1MB of input)"""
+        return {
+            "operation_type": "hash",
+            "input_data": {
+                "values": [random.randint(1, 10**6) for _ in range(100_000)]
+            }
+        }
+
+    @staticmethod
+    def generate_large() -> Dict:
+        """Generate payload above the pool's shared memory threshold"""
+        return {
+            "operation_type": "sum",
+            "input_data": {
+                "values": [random.randint(1, 100) for _ in range(40_000)]
+            }
+        }
+
+    @classmethod
+    def generate_wide(cls, key_count: int = 10_000, forbidden: bool = False) -> Dict:
+        """
+        Generate nested payload with ~key_count keys (allowed payloads grouped
+        in batches of 25); forbidden=True appends a nested forbidden context
+        as the very last key (worst case for the checker)
+        """
+        keys_per_item = 5  # item_j + operation_type, input_data, values, action
+        batches = {}
+        for i in range(max(1, key_count // (keys_per_item * 25 + 1))):
+            batches[f"batch_{i}"] = {
+                f"item_{j}": cls.generate_allowed()
+                for j in range(25)
+            }
+        payload = {"operation_type": "compute", "input_data": batches}
+        if forbidden:
+            batches["tail"] = cls.generate_forbidden_nested()["input_data"]
+        return payload
+
     @classmethod
     def generate(cls, config: StressTestConfig) -> Tuple[Dict, str]:
         """Generate payload with label"""
         rand = random.random()
 
+        if rand < config.heavy_ratio:
+            return cls.generate_heavy(), 'allowed_heavy'
+        rand -= config.heavy_ratio
+        if rand < config.large_ratio:
+            return cls.generate_large(), 'allowed_large'
+        rand -= config.large_ratio
+
         if rand < config.forbidden_ratio:
             # Forbidden payload
             choice = random.choice(['simple', 'nested', 'obfuscated'])
@@ -167,8 +245,10 @@ class PayloadGenerator:
 class StressTestWorker:
     """Execute sandbox operations under stress"""
 
-    def __init__(self, config: StressTestConfig):
+    def __init__(self, config: StressTestConfig, pool=None, payloads: Optional[List[Tuple[Dict, str]]] = None):
         self.config = config
+        self.pool = pool
+        self.payloads = payloads  # pre-generated stream (benchmark), else generated per request
         self.metrics = TestMetrics()
         self.lock = asyncio.Lock()
         self.log_file = open(config.log_file, 'w') if config.log_file else None
@@ -192,7 +272,10 @@ class StressTestWorker:
         start_time = time.perf_counter()
 
         try:
-            result = await sandbox.execute(SandboxOp.COMPUTE, payload)
+            if self.pool is not None:
+                result = await self.pool.execute("compute", sandbox.contract, SandboxOp.COMPUTE, payload)
+            else:
+                result = await sandbox.execute(SandboxOp.COMPUTE, payload)
             elapsed = time.perf_counter() - start_time
 
             # Analyze result
@@ -238,10 +321,14 @@ class StressTestWorker:
                 async with self.lock:
                     if self.metrics.total_requests >= self.config.total_requests:
                         break
+                    request_index = self.metrics.total_requests
                     self.metrics.total_requests += 1
 
                 # Generate payload
-                payload, payload_type = PayloadGenerator.generate(self.config)
+                if self.payloads is not None:
+                    payload, payload_type = self.payloads[request_index]
+                else:
+                    payload, payload_type = PayloadGenerator.generate(self.config)
 
                 # Execute
                 result = await self.execute_sandbox(payload, payload_type)
@@ -277,7 +364,10 @@ class StressTestWorker:
 # STRESS TEST RUNNER
 # ========================
 
-async def run_stress_test(config: StressTestConfig) -> TestMetrics:
+async def run_stress_test(
+    config: StressTestConfig,
+    payloads: Optional[List[Tuple[Dict, str]]] = None
+) -> TestMetrics:
     """Run stress test with given configuration"""
     logger.info(f"\n{'='*70}")
     logger.info(f"OCCP v0.3 Stress Test")
@@ -285,13 +375,21 @@ async def run_stress_test(config: StressTestConfig) -> TestMetrics:
     logger.info(f"Concurrent Instances: {config.concurrent_instances}")
     logger.info(f"Total Requests: {config.total_requests}")
     logger.info(f"Forbidden Ratio: {config.forbidden_ratio:.1%}")
+    logger.info(f"Runtime: {config.runtime}")
     logger.info(f"Log File: {config.log_file}")
     logger.info(f"{'='*70}\n")
 
-    worker = StressTestWorker(config)
+    pool = None
+    if config.runtime == "pool":
+        from occp_sandbox_pool import SandboxPool
+        pool = SandboxPool(workers=config.pool_workers)
+        await pool.start()  # pre-fork outside the measured window
+
+    worker = StressTestWorker(config, pool=pool, payloads=payloads)
     semaphore = asyncio.Semaphore(config.concurrent_instances)
+    ticker = asyncio.create_task(_measure_loop_stall(worker.metrics))
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     # Launch workers
     tasks = [
@@ -302,7 +400,11 @@ async def run_stress_test(config: StressTestConfig) -> TestMetrics:
     # Wait for completion
     await asyncio.gather(*tasks)
 
-    end_time = time.time()
+    worker.metrics.wall_time = time.perf_counter() - start_time
+    ticker.cancel()
+
+    if pool is not None:
+        await pool.shutdown()
 
     # Calculate final metrics
     worker.metrics.calculate_throughput()
@@ -314,10 +416,48 @@ async def run_stress_test(config: StressTestConfig) -> TestMetrics:
     return worker.metrics
 
 
+async def _measure_loop_stall(metrics: TestMetrics, interval: float = 0.01):
+    """Track the longest time the event loop was blocked (CPU-bound sandboxes)"""
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        metrics.max_loop_stall = max(metrics.max_loop_stall, time.perf_counter() - expected)
+
+
+async def run_runtime_benchmark(config: StressTestConfig, seed: int = 42) -> Dict[str, TestMetrics]:
+    """Same pre-generated payload stream through both runtimes"""
+    random.seed(seed)
+    payloads = [PayloadGenerator.generate(config) for _ in range(config.total_requests)]
+
+    results = {}
+    for runtime in ("inprocess", "pool"):
+        config.runtime = runtime
+        results[runtime] = await run_stress_test(config, payloads)
+    return results
+
+
 # ========================
 # REPORTING
 # ========================
 
+def print_runtime_benchmark(results: Dict[str, TestMetrics], config: StressTestConfig):
+    """Throughput / latency table for inprocess vs pool"""
+    print(f"\n{'='*70}")
+    print(f"OCCP SANDBOX RUNTIME BENCHMARK: {config.total_requests} requests, "
+          f"{config.concurrent_instances} concurrent, pool {config.pool_workers} workers")
+    print(f"heavy {config.heavy_ratio:.0%}, large {config.large_ratio:.0%}, forbidden {config.forbidden_ratio:.0%}")
+    print(f"{'='*70}")
+    print(f"{'runtime':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'stall ms':>9} {'ok %':>7}")
+    for runtime, m in results.items():
+        ok = m.successful_requests / m.total_requests * 100 if m.total_requests else 0
+        print(
+            f"{runtime:<10} {m.requests_per_second:>9.1f} "
+            f"{m.percentile(50) * 1000:>9.2f} {m.percentile(95) * 1000:>9.2f} "
+            f"{m.percentile(99) * 1000:>9.2f} {m.max_loop_stall * 1000:>9.1f} {ok:>7.1f}"
+        )
+    print(f"{'='*70}\n")
+
+
 def print_metrics(metrics: TestMetrics):
     """Print test metrics"""
     logger.info(f"\n{'='*70}")
@@ -378,14 +518,35 @@ def print_metrics(metrics: TestMetrics):
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="OCCP v0.3 stress test")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--forbidden-ratio", type=float, default=0.3)
+    parser.add_argument("--heavy-ratio", type=float, default=0.0)
+    parser.add_argument("--large-ratio", type=float, default=0.0)
+    parser.add_argument("--runtime", choices=["inprocess", "pool"], default="inprocess")
+    parser.add_argument("--pool-workers", type=int, default=4)
+    parser.add_argument("--benchmark", action="store_true", help="Compare inprocess vs pool")
+    args = parser.parse_args()
+
     config = StressTestConfig(
-        concurrent_instances=50,
-        total_requests=500,
-        forbidden_ratio=0.3,
+        concurrent_instances=args.concurrency,
+        total_requests=args.requests,
+        forbidden_ratio=args.forbidden_ratio,
+        heavy_ratio=args.heavy_ratio,
+        large_ratio=args.large_ratio,
+        runtime=args.runtime,
+        pool_workers=args.pool_workers,
         verbose=False,
         log_file="/tmp/occp_stress_test.log"
     )
 
+    if args.benchmark:
+        # Heavy / large payloads must fit the token budget
+        config.max_tokens = 1_000_000
+        print_runtime_benchmark(asyncio.run(run_runtime_benchmark(config)), config)
+        return
+
     # Run stress test
     metrics = asyncio.run(run_stress_test(config))
 
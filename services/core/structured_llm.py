@@ -0,0 +1,496 @@
+"""
+Structured LLM Client - one model call per judgement
+
+Evaluators, reflectors and mutators need ONE JSON answer per prompt.
+Routing that through app_graph (supervisor_node, emotional context, worker
+hops, MemorySaver checkpoint) costs several model round trips; this client
+sends the prompt straight to the OpenAI-compatible endpoint (LiteLLM) with a
+JSON schema and validates the answer against a pydantic model.
+
+- response_format=json_schema (falls back to json_object / plain prompt if
+  the backend rejects it; the downgrade is remembered)
+- Tolerant extraction: ```json fences, prose around the object
+- Malformed or schema-violating output -> re-ask in the same conversation
+  with the validation error, up to max_retries times
+- One pooled httpx.AsyncClient per event loop
+- complete_batch(): many independent items packed into as few calls as the
+  context window allows ({"results": [{"id": ...}, ...]}); items missing or
+  invalid in the answer are re-sent, the rest are kept (partial failure)
+
+Usage:
+    from structured_llm import complete_json
+    from agents.schemas import GoalEvaluation
+
+    evaluation = await complete_json(eval_prompt, GoalEvaluation)
+    passed = evaluation.get("passed", False)
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+import httpx
+from pydantic import BaseModel, ValidationError, create_model
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+STRUCTURED_LLM_MODEL = os.getenv(
+    "STRUCTURED_LLM_MODEL", os.getenv("LLM_MODEL", "ollama/qwen3-coder:480b-cloud")
+)
+STRUCTURED_LLM_MAX_RETRIES = int(os.getenv("STRUCTURED_LLM_MAX_RETRIES", "2"))
+
+# Batch packing: prompt budget of one call, answer tokens reserved per item
+STRUCTURED_LLM_CONTEXT_TOKENS = int(os.getenv("STRUCTURED_LLM_CONTEXT_TOKENS", "32000"))
+STRUCTURED_LLM_ITEM_OUTPUT_TOKENS = int(os.getenv("STRUCTURED_LLM_ITEM_OUTPUT_TOKENS", "400"))
+STRUCTURED_LLM_MAX_BATCH = int(os.getenv("STRUCTURED_LLM_MAX_BATCH", "25"))
+
+# Downgrade order when the backend does not support a response_format
+_RESPONSE_FORMATS = ("json_schema", "json_object", None)
+
+
+class StructuredLLMError(Exception):
+    """Raised when no valid structured answer was obtained"""
+    pass
+
+
+class MalformedOutputError(ValueError):
+    """Model answered, but not with JSON matching the schema"""
+    pass
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the JSON object from a model answer.
+
+    Accepts bare JSON, ```json fenced blocks and an object surrounded by prose.
+    """
+    if text is None:
+        raise MalformedOutputError("Empty answer")
+    text = text.strip()
+    if "```json" in text:
+        text = text.split("```json", 1)[1].split("```", 1)[0].strip()
+    elif "```" in text:
+        text = text.split("```", 1)[1].split("```", 1)[0].strip()
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise MalformedOutputError(f"No JSON object in answer: {e}")
+        try:
+            return json.loads(text[start:end + 1])
+        except json.JSONDecodeError as inner:
+            raise MalformedOutputError(f"Invalid JSON: {inner}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _validation_summary(error: ValidationError, limit: int = 5) -> str:
+    parts = []
+    for item in error.errors()[:limit]:
+        location = ".".join(str(p) for p in item["loc"]) or "<root>"
+        parts.append(f"{location}: {item['msg']}")
+    return "; ".join(parts)
+
+
+@lru_cache(maxsize=64)
+def _batch_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """{"results": [schema + id]} wrapper, used for response_format only"""
+    item = create_model(f"{schema.__name__}Item", __base__=schema, id=(str, ...))
+    return create_model(f"{schema.__name__}Batch", results=(List[item], ...))
+
+
+@dataclass
+class BatchResult:
+    """Per-item outcome of complete_batch()"""
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    requests: int = 0
+
+
+class StructuredLLMClient:
+    """
+    Single-call structured completion client (OpenAI-compatible API)
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.2,
+        timeout: float = 120.0,
+        max_retries: int = STRUCTURED_LLM_MAX_RETRIES,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            base_url: OpenAI-compatible base URL (default: LLM_BASE_URL / OPENAI_API_BASE)
+            api_key: API key (default: OPENAI_API_KEY)
+            model: Model name (default: STRUCTURED_LLM_MODEL / LLM_MODEL)
+            temperature: Sampling temperature (judgements: low)
+            timeout: Per-request timeout (seconds)
+            max_retries: Re-asks after malformed output
+            transport: Custom httpx transport (tests)
+        """
+        self.base_url = (
+            base_url
+            or os.getenv("LLM_BASE_URL")
+            or os.getenv("OPENAI_API_BASE", "http://litellm:4000/v1")
+        ).rstrip("/")
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY", "sk-1234")
+        self.model = model or STRUCTURED_LLM_MODEL
+        self.temperature = temperature
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.transport = transport
+
+        self._format_index = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self.requests = 0
+        self.malformed = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def _http(self) -> httpx.AsyncClient:
+        # httpx pools are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+            self._client_loop = loop
+        return self._client
+
+    @staticmethod
+    def _response_format(schema: Type[BaseModel], format_index: int) -> Optional[Dict]:
+        kind = _RESPONSE_FORMATS[format_index]
+        if kind == "json_schema":
+            return {
+                "type": "json_schema",
+                "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema()},
+            }
+        if kind == "json_object":
+            return {"type": "json_object"}
+        return None
+
+    async def _post(self, messages: List[Dict], schema: Type[BaseModel], temperature: float) -> str:
+        while True:
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+            }
+            format_index = self._format_index
+            response_format = self._response_format(schema, format_index)
+            if response_format is not None:
+                payload["response_format"] = response_format
+
+            self.requests += 1
+            response = await self._http().post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+
+            if (
+                response.status_code in (400, 422)
+                and response_format is not None
+                and "response_format" in response.text
+            ):
+                # Backend does not support this mode - downgrade for this client.
+                # Relative to the format this request sent: concurrent chunks
+                # rejected for the same mode downgrade only once
+                if self._format_index > format_index:
+                    continue
+                self._format_index = format_index + 1
+                logger.info(
+                    "structured_llm_response_format_downgraded",
+                    model=self.model,
+                    response_format=_RESPONSE_FORMATS[self._format_index],
+                )
+                continue
+
+            response.raise_for_status()
+            data = response.json()
+            usage = data.get("usage") or {}
+            self.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.completion_tokens += usage.get("completion_tokens", 0)
+            return data["choices"][0]["message"]["content"]
+
+    async def complete(
+        self,
+        prompt: str,
+        schema: Type[T],
+        system: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> T:
+        """
+        One structured judgement.
+
+        Args:
+            prompt: User prompt (should describe the expected JSON)
+            schema: pydantic model the answer must satisfy
+            system: Optional system message
+            temperature: Override the client temperature
+
+        Returns:
+            Validated schema instance
+
+        Raises:
+            StructuredLLMError: transport error or still malformed after retries
+        """
+        messages: List[Dict] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        temperature = self.temperature if temperature is None else temperature
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                content = await self._post(messages, schema, temperature)
+            except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+                self.failures += 1
+                raise StructuredLLMError(f"LLM request failed: {e}") from e
+
+            try:
+                return schema.model_validate(extract_json(content))
+            except (MalformedOutputError, ValidationError) as e:
+                self.malformed += 1
+                error = _validation_summary(e) if isinstance(e, ValidationError) else str(e)
+                logger.warning(
+                    "structured_llm_malformed_output",
+                    schema=schema.__name__,
+                    attempt=attempt + 1,
+                    error=error,
+                )
+                # Re-ask in the same conversation, with the concrete problem
+                messages.append({"role": "assistant", "content": content or ""})
+                messages.append({
+                    "role": "user",
+                    "content": (
+                        f"Ответ не прошёл проверку: {error}. "
+                        "Верни ТОЛЬКО исправленный JSON-объект, без пояснений."
+                    ),
+                })
+
+        self.failures += 1
+        raise StructuredLLMError(
+            f"No valid {schema.__name__} after {self.max_retries + 1} attempts"
+        )
+
+    # =========================================================================
+    # BATCH
+    # =========================================================================
+
+    def pack(self, items: Dict[str, str], instructions: str) -> List[List[str]]:
+        """
+        Split item ids into chunks that fit one call.
+
+        Greedy in input order: prompt tokens of the item plus the answer
+        reserved for it must fit next to the instructions. An item larger
+        than the whole budget still gets a chunk of its own.
+        """
+        budget = STRUCTURED_LLM_CONTEXT_TOKENS - estimate_tokens(instructions)
+        chunks: List[List[str]] = []
+        chunk: List[str] = []
+        used = 0
+        for item_id, text in items.items():
+            cost = estimate_tokens(text) + STRUCTURED_LLM_ITEM_OUTPUT_TOKENS
+            if chunk and (used + cost > budget or len(chunk) >= STRUCTURED_LLM_MAX_BATCH):
+                chunks.append(chunk)
+                chunk, used = [], 0
+            chunk.append(item_id)
+            used += cost
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    @staticmethod
+    def _batch_prompt(instructions: str, items: Dict[str, str], ids: List[str]) -> str:
+        parts = [
+            instructions.strip(),
+            "",
+            "Оцени КАЖДЫЙ элемент ниже независимо от остальных. Верни ТОЛЬКО JSON:",
+            '{"results": [{"id": "<id элемента>", ...поля ответа...}]}',
+            "Ровно один объект на каждый id.",
+        ]
+        for item_id in ids:
+            parts.append(f"\n### id: {item_id}\n{items[item_id].strip()}")
+        return "\n".join(parts)
+
+    async def _complete_chunk(
+        self,
+        items: Dict[str, str],
+        ids: List[str],
+        schema: Type[T],
+        instructions: str,
+        system: Optional[str],
+        temperature: float
+    ) -> Tuple[Dict[str, T], Dict[str, str]]:
+        messages: List[Dict] = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": self._batch_prompt(instructions, items, ids)})
+
+        results: Dict[str, T] = {}
+        errors: Dict[str, str] = {}
+        try:
+            content = await self._post(messages, _batch_schema(schema), temperature)
+            answer = extract_json(content)
+        except MalformedOutputError as e:
+            self.malformed += 1
+            return results, {item_id: str(e) for item_id in ids}
+
+        entries = answer.get("results", []) if isinstance(answer, dict) else answer
+        if not isinstance(entries, list):
+            entries = []
+        expected = set(ids)
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            entry = dict(entry)
+            item_id = str(entry.pop("id", ""))
+            if item_id not in expected or item_id in results:
+                continue
+            try:
+                results[item_id] = schema.model_validate(entry)
+            except ValidationError as e:
+                errors[item_id] = _validation_summary(e)
+
+        for item_id in ids:
+            if item_id not in results and item_id not in errors:
+                errors[item_id] = "missing in batch answer"
+        if errors:
+            self.malformed += 1
+            logger.warning(
+                "structured_llm_batch_partial",
+                schema=schema.__name__,
+                items=len(ids),
+                invalid=len(errors),
+            )
+        return results, errors
+
+    async def complete_batch(
+        self,
+        items: Dict[str, str],
+        schema: Type[T],
+        instructions: str,
+        system: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> BatchResult:
+        """
+        Independent judgements for many items in as few calls as possible.
+
+        Args:
+            items: item id -> item description (goal card, etc.)
+            schema: pydantic model each item's answer must satisfy
+            instructions: Task description shared by all items
+            system: Optional system message
+            temperature: Override the client temperature
+
+        Returns:
+            BatchResult: validated answers by id, and errors for the items
+            that still failed after max_retries re-sends. Transport errors
+            fail only the chunk they happened in.
+        """
+        temperature = self.temperature if temperature is None else temperature
+        outcome = BatchResult()
+        requests_before = self.requests
+        pending = dict(items)
+
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            chunks = self.pack(pending, instructions)
+            answers = await asyncio.gather(
+                *(
+                    self._complete_chunk(pending, ids, schema, instructions, system, temperature)
+                    for ids in chunks
+                ),
+                return_exceptions=True
+            )
+
+            retry: Dict[str, str] = {}
+            for ids, answer in zip(chunks, answers):
+                if isinstance(answer, BaseException):
+                    if not isinstance(answer, (httpx.HTTPError, KeyError, IndexError, ValueError)):
+                        raise answer
+                    self.failures += 1
+                    for item_id in ids:
+                        outcome.errors[item_id] = f"LLM request failed: {answer}"
+                    continue
+                results, errors = answer
+                outcome.results.update(results)
+                for item_id, error in errors.items():
+                    outcome.errors[item_id] = error
+                    retry[item_id] = pending[item_id]
+            for item_id in outcome.results:
+                outcome.errors.pop(item_id, None)
+            pending = retry
+
+        outcome.requests = self.requests - requests_before
+        return outcome
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "requests": self.requests,
+            "malformed": self.malformed,
+            "failures": self.failures,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "response_format": _RESPONSE_FORMATS[self._format_index],
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global instance
+structured_llm = StructuredLLMClient()
+
+
+async def complete_json(prompt: str, schema: Type[BaseModel], **kwargs) -> Dict[str, Any]:
+    """
+    Structured judgement as a plain dict (drop-in for json.loads of the answer).
+
+    Optional fields the model left out are omitted, so callers keep their
+    .get(key, default) fallbacks.
+    """
+    result = await structured_llm.complete(prompt, schema, **kwargs)
+    return result.model_dump(exclude_none=True)
+
+
+async def complete_json_batch(
+    items: Dict[str, str],
+    schema: Type[BaseModel],
+    instructions: str,
+    **kwargs
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Batched complete_json: (answers by id as plain dicts, errors by id).
+    """
+    outcome = await structured_llm.complete_batch(items, schema, instructions, **kwargs)
+    results = {
+        item_id: result.model_dump(exclude_none=True)
+        for item_id, result in outcome.results.items()
+    }
+    return results, outcome.errors
@@ -1,5 +1,4 @@
 import os
-import asyncio
 import httpx
 from celery import Celery
 from langchain_core.messages import HumanMessage
@@ -11,6 +10,8 @@ import redis
 from goal_executor import execute_goal_task, execute_complex_goal_task
 # Import shared celery app
 from celery_config import celery_app
+# Persistent per-process loop, DB pool and HTTP client (see worker_runtime)
+from worker_runtime import run_async as _run_async, get_http_client
 
 # NEW: Centralized logging and error handling
 from logging_config import get_logger
@@ -22,13 +23,14 @@ monitor = SystemMonitor()
 async def notify(msg, sid=None):
     """Send notification via Telegram with error handling"""
     try:
+        client = get_http_client()
         if sid and "tg_" in sid:
-            await httpx.post(
+            await client.post(
                 f"{os.getenv('TELEGRAM_URL')}/ask_human",
                 json={"chat_id": sid, "text": msg}
             )
         else:
-            await httpx.post(
+            await client.post(
                 f"{os.getenv('TELEGRAM_URL')}/notify",
                 json={"message": msg}
             )
@@ -85,28 +87,6 @@ async def _exec(sid, input_msg=None):
         logger.warning("failed_to_check_human_pause", error=str(e))
 
 
-# NEW: Proper async task execution without asyncio.run()
-def _run_async(coro):
-    """
-    Run async coroutine in existing event loop.
-    Replaces asyncio.run() which creates new loop each time.
-    """
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, we can't use run_until_complete
-            # This shouldn't happen in Celery worker, but handle gracefully
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, coro)
-                return future.result()
-        else:
-            return loop.run_until_complete(coro)
-    except RuntimeError:
-        # No event loop exists, create one (shouldn't happen in production)
-        return asyncio.run(coro)
-
-
 @celery_app.task(bind=True)
 def run_chat_task(self, session_id, content, image_url=None):
     """Celery task for chat execution with proper error handling"""
@@ -366,6 +366,121 @@ class TestSandboxEscapePrevention:
         assert sandbox.contract.io_policy.no_network == True
 
 
+class TestForbiddenContextMatcher:
+    """
+    Test compiled forbidden-context matcher (SandboxExecutor._check_payload)
+    """
+
+    def test_matcher_reports_contract_order_and_key_path(self):
+        """
+        First forbidden context in contract order wins, with its full key path
+        """
+        from occp_sandbox import ForbiddenContextMatcher
+
+        matcher = ForbiddenContextMatcher(("goals", "vectors"))
+        payload = {
+            "meta": {"vector_ref": 1},
+            "items": [{"name": "a"}, {"nested": {"Goal_ID": "g-1"}}]
+        }
+
+        assert matcher.find(payload) == ("goals", "items.nested.Goal_ID")
+        assert matcher.find({"meta": {"vector_ref": 1}}) == ("vectors", "meta.vector_ref")
+        assert matcher.find({"values": [1, 2], "items": [[{"goal": 1}]]}) is None
+
+    def test_matcher_handles_deep_nesting(self):
+        """
+        Deeply nested payloads MUST NOT escape the check via RecursionError
+        """
+        contract = build_compute_assist_contract()
+        sandbox = ComputeAssistSandbox(contract)
+
+        payload = node = {}
+        for _ in range(5000):
+            node["level"] = {}
+            node = node["level"]
+        node["sk_state"] = "x"
+
+        violation = sandbox._check_payload(payload)
+        assert violation is not None
+        assert violation.reason.startswith("Payload contains forbidden context: sk_state")
+
+
+class _SpinSandbox(ComputeAssistSandbox):
+    """Runaway CPU-bound sandbox (never yields to the event loop)"""
+
+    async def _execute_operation(self, operation, payload):
+        while True:
+            pass
+
+
+class TestSandboxPoolEnforcement:
+    """
+    Test process-isolated sandbox pool (occp_sandbox_pool)
+    """
+
+    
+    async def test_pool_executes_and_rejects_forbidden(self):
+        """
+        Pool MUST return the same results as in-process sandboxes
+        """
+        from occp_sandbox_pool import SandboxPool
+
+        pool = SandboxPool(workers=1)
+        contract = build_compute_assist_contract(max_tokens=1000000)
+        try:
+            ok = await pool.execute("compute", contract, SandboxOp.COMPUTE, {
+                "operation_type": "sum",
+                "input_data": {"values": [1, 2, 3]}
+            })
+            large = await pool.execute("compute", contract, SandboxOp.COMPUTE, {
+                "operation_type": "sum",
+                "input_data": {"values": list(range(50000))}
+            })
+            denied = await pool.execute("compute", contract, SandboxOp.COMPUTE, {
+                "operation_type": "sum",
+                "input_data": {"goal_id": "g-1"}
+            })
+        finally:
+            await pool.shutdown()
+
+        assert ok.success and ok.output["result"] == {"sum": 6}
+        assert ok.sandbox_id == contract.sandbox_id
+        assert large.success and large.output["result"] == {"sum": sum(range(50000))}
+        assert denied.success == False and "forbidden context" in denied.error
+        assert pool.get_stats()["shm_payloads"] == 1
+
+    
+    async def test_pool_kills_runaway_worker(self, monkeypatch):
+        """
+        Pool MUST hard-stop CPU-bound code and keep serving requests
+        """
+        import occp_sandbox_pool
+        from occp_sandbox_pool import SandboxPool
+
+        # fork: the worker inherits the patched registry
+        monkeypatch.setitem(occp_sandbox_pool.SANDBOX_KINDS, "spin", (__name__, "_SpinSandbox"))
+        pool = SandboxPool(workers=1, start_method="fork")
+        contract = SandboxContract(
+            allowed_ops={SandboxOp.COMPUTE},
+            max_tokens=10000,
+            max_time_ms=300,
+            max_memory_mb=64
+        )
+        try:
+            runaway = await pool.execute("spin", contract, SandboxOp.COMPUTE, {"operation_type": "spin"})
+            after = await pool.execute("compute", build_compute_assist_contract(), SandboxOp.COMPUTE, {
+                "operation_type": "count",
+                "input_data": {"items": [1, 2]}
+            })
+        finally:
+            await pool.shutdown()
+
+        assert runaway.success == False
+        assert runaway.timeout == True and runaway.aborted == True
+        assert after.success and after.output["result"] == {"count": 2}
+        assert pool.get_stats()["killed"] == 1
+
+
 # =============================================================================
 # RUN ALL TESTS
 # =============================================================================
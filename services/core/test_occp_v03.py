@@ -301,6 +301,36 @@ class TestOCCPGateway:
         assert response.denial is None
         assert response.request_id == request.request_id
 
+    @pytest.mark.asyncio
+    async def test_rate_limit_per_source_with_eviction(self):
+        """
+        Throttling MUST be per (source_node, request_type)
+
+        Idle buckets are evicted, total buckets are capped
+        """
+        from occp_gateway import RateLimitTable
+
+        table = RateLimitTable(capacity=2, refill_rate=1.0, shards=4, max_buckets=8, idle_ttl_seconds=0)
+        compute = str(OCCPRequestType.COMPUTE_ASSIST)
+        assert [await table.allow("node-a", compute) for _ in range(3)] == [True, True, False]
+        # Other source / other type have their own buckets
+        assert await table.allow("node-b", compute)
+        assert await table.allow("node-a", str(OCCPRequestType.ADVERSARIAL_TEST))
+
+        stats = table.get_stats()
+        assert stats["buckets"] == 3
+        assert stats["rejected"] == 1
+        assert stats["rejected_by_type"] == {compute: 1}
+
+        # Idle longer than the refill time: bucket is full again, safe to drop
+        assert table.evict_idle(now=table.get_bucket("node-a", compute).last_refill + 10) == 3
+        assert len(table) == 0
+
+        for i in range(100):
+            await table.allow(f"node-{i}", compute)
+        assert len(table) <= 8
+        assert table.get_stats()["evicted_lru"] > 0
+
 
 class TestDualConsent:
     """
@@ -362,14 +392,125 @@ class TestAuditTrail:
         pass
 
     @pytest.mark.asyncio
-    async def test_both_nodes_log_audit(self):
+    async def test_both_nodes_log_audit(self, tmp_path):
         """
         BOTH nodes MUST log audit independently
 
         No shared audit log
         """
-        # TODO: Implement audit test
-        pass
+        from occp_audit_log import get_federated_audit_log
+
+        log_a = get_federated_audit_log("node-a", root=str(tmp_path))
+        log_b = get_federated_audit_log("node-b", root=str(tmp_path))
+        assert log_a is not log_b
+        assert log_a is get_federated_audit_log("node-a", root=str(tmp_path))
+
+        await log_a.append({"timestamp": "2026-01-01T00:00:00+00:00", "request_id": "r-1"})
+        await log_b.append({"timestamp": "2026-01-01T00:00:01+00:00", "request_id": "r-1"})
+        await log_a.close()
+        await log_b.close()
+
+        assert [e["request_id"] for e in log_a.query()] == ["r-1"]
+        assert [e["request_id"] for e in log_b.query()] == ["r-1"]
+        assert log_a.directory != log_b.directory
+
+    @pytest.mark.asyncio
+    async def test_audit_chain_detects_tampering(self, tmp_path):
+        """
+        Audit entries MUST form a verifiable hash chain across segments
+        """
+        import json
+        from datetime import datetime, timedelta, timezone
+        from occp_audit_log import FederatedAuditLog
+
+        t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        log = FederatedAuditLog(str(tmp_path), segment_bytes=2000)
+        for i in range(40):
+            await log.append({"timestamp": (t0 + timedelta(minutes=i)).isoformat(), "i": i})
+        await log.close()
+
+        assert log.get_stats()["segments"] > 1
+        assert log.verify() == {"valid": True, "entries": 40, "last_hash": log._last_hash}
+
+        # Time-range query only returns entries inside [since, until], newest first
+        window = log.query(since=t0 + timedelta(minutes=10), until=t0 + timedelta(minutes=12))
+        assert [e["i"] for e in window] == [12, 11, 10]
+
+        # Reopening continues the chain
+        log = FederatedAuditLog(str(tmp_path), segment_bytes=2000)
+        await log.append({"timestamp": (t0 + timedelta(minutes=40)).isoformat(), "i": 40})
+        await log.close()
+        assert log.verify()["entries"] == 41
+
+        # Rewrite one entry in the second segment
+        segment = tmp_path / "segment-000002.jsonl"
+        lines = segment.read_text().splitlines()
+        entry = json.loads(lines[0])
+        entry["i"] = -1
+        lines[0] = json.dumps(entry)
+        segment.write_text("\n".join(lines) + "\n")
+
+        result = log.verify()
+        assert result["valid"] is False
+        assert result["broken_at"] == entry["seq"]
+
+    @pytest.mark.asyncio
+    async def test_audit_retry_after_partial_write(self, tmp_path, monkeypatch):
+        """
+        A batch retried after a failed write MUST NOT duplicate entries
+        """
+        from datetime import datetime, timedelta, timezone
+        from occp_audit_log import FederatedAuditLog, query_directory
+
+        t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        log = FederatedAuditLog(str(tmp_path), segment_bytes=1000)
+        for i in range(20):
+            await log.append({"timestamp": (t0 + timedelta(minutes=i)).isoformat(), "i": i})
+        batch = list(log._pending)
+        log._pending.clear()
+
+        # First segment is written, the index update fails
+        monkeypatch.setattr(log, "_write_index", Mock(side_effect=OSError("disk full")))
+        with pytest.raises(OSError):
+            log._write_batch(batch)
+        monkeypatch.undo()
+
+        # Torn tail left by a crashed write in the active segment
+        with open(tmp_path / log._index[-1]["file"], "ab") as f:
+            f.write(b'{"torn": ')
+        assert len(query_directory(str(tmp_path), limit=100)) < 20
+
+        log._write_batch(batch)
+        assert [e["i"] for e in log.query(limit=100)] == list(range(19, -1, -1))
+        assert log.verify()["entries"] == 20
+        await log.close()
+
+    @pytest.mark.asyncio
+    async def test_audit_readers_see_writer_fallback(self, tmp_path):
+        """
+        Entries of a second process (writer-<pid> fallback) MUST be readable;
+        node ids MUST NOT escape the audit root
+        """
+        from occp_audit_log import (
+            FederatedAuditLog, list_audit_nodes, node_directories, validate_node_id
+        )
+
+        first = FederatedAuditLog(str(tmp_path / "node-a"))
+        await first.append({"timestamp": "2026-01-01T00:00:00+00:00", "request_id": "r-1"})
+        second = FederatedAuditLog(str(tmp_path / "node-a"))  # lock taken -> writer-<pid>
+        await second.append({"timestamp": "2026-01-01T00:00:01+00:00", "request_id": "r-2"})
+        await first.flush()
+        await second.flush()
+
+        directories = node_directories("node-a", root=str(tmp_path))
+        assert directories == [first.directory, second.directory]
+        assert list_audit_nodes(str(tmp_path)) == ["node-a"]
+        await first.close()
+        await second.close()
+
+        for bad in ("..", "../etc", "a/b", ".hidden", ""):
+            with pytest.raises(ValueError):
+                validate_node_id(bad)
 
 
 # =============================================================================
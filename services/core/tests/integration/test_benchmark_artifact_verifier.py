@@ -0,0 +1,122 @@
+"""
+Artifact Verifier Benchmark
+===========================
+
+Повторная верификация N файловых артефактов (как retroverify_artifacts.py):
+
+- legacy:       копия старых проверок - f.read() целиком, pandas.read_csv
+                (если pandas не установлен - csv целиком в список)
+- streaming:    ArtifactVerifier.verify() последовательно, холодный кэш
+- verify_many:  ArtifactVerifier.verify_many() в thread pool, холодный кэш
+- cached:       verify_many() повторно (файлы не менялись)
+
+Набор: REPORT .md (~200KB), KNOWLEDGE .txt (~50KB), DATASET .csv (~2MB),
+FILE .json (~20KB) в равных долях.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_artifact_verifier.py --artifacts 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from artifact_verifier import ArtifactVerifier
+
+
+def legacy_verify(artifact_type: str, path: str) -> int:
+    """Old per-type checks: whole file in memory."""
+    if artifact_type == "DATASET":
+        try:
+            import pandas as pd
+            return len(pd.read_csv(path))
+        except ImportError:
+            import csv
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                return len(list(csv.reader(f))) - 1
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if path.endswith('.json'):
+        json.loads(content)
+    return len(content)
+
+
+def make_artifacts(root: str, count: int):
+    line = "Findings paragraph with enough words to look like a real report.\n"
+    report = "# Report\n\n" + line * (200 * 1024 // len(line))
+    knowledge = line * (50 * 1024 // len(line))
+    dataset = "id,name,value\n" + "".join(f"{i},item_{i},{i * 0.5}\n" for i in range(100_000))
+    document = json.dumps({"items": [{"id": i, "text": line} for i in range(250)]})
+
+    kinds = [
+        ("REPORT", "md", report),
+        ("KNOWLEDGE", "txt", knowledge),
+        ("DATASET", "csv", dataset),
+        ("FILE", "json", document),
+    ]
+    artifacts = []
+    for i in range(count):
+        artifact_type, ext, body = kinds[i % len(kinds)]
+        path = os.path.join(root, f"artifact_{i}.{ext}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
+        artifacts.append({"type": artifact_type, "content_kind": "file", "content_location": path})
+    return artifacts
+
+
+def report(name: str, elapsed: float, count: int, target: int):
+    rate = count / elapsed
+    print(f"{name:<12} {elapsed:>8.2f}s {rate:>10.0f} {target / rate / 60:>16.1f}")
+
+
+async def run(count: int, workers: int, target: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        artifacts = make_artifacts(tmp, count)
+        verifier = ArtifactVerifier(base_path=tmp, workers=workers)
+
+        print(f"{'='*60}")
+        print(f"ARTIFACT VERIFIER: {count} artifacts, {workers} threads")
+        print(f"{'='*60}")
+        print(f"{'path':<12} {'wall':>9} {'artifacts/s':>10} {f'{target // 1000}k est, min':>16}")
+
+        started = time.perf_counter()
+        for a in artifacts:
+            legacy_verify(a["type"], a["content_location"])
+        report("legacy", time.perf_counter() - started, count, target)
+
+        started = time.perf_counter()
+        for a in artifacts:
+            verifier.verify(a)
+        report("streaming", time.perf_counter() - started, count, target)
+
+        verifier.clear_cache()
+        started = time.perf_counter()
+        await verifier.verify_many(artifacts)
+        report("verify_many", time.perf_counter() - started, count, target)
+
+        started = time.perf_counter()
+        await verifier.verify_many(artifacts)
+        report("cached", time.perf_counter() - started, count, target)
+
+        print(f"{'='*60}")
+        print(f"cache: {verifier.get_cache_stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artifact verifier benchmark")
+    parser.add_argument("--artifacts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--target", type=int, default=50_000, help="Extrapolate wall time for this many")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.artifacts, args.workers, args.target))
+
+
+if __name__ == "__main__":
+    main()
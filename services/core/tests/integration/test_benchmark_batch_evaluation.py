@@ -0,0 +1,109 @@
+"""
+Batch Goal Evaluation Benchmark
+===============================
+
+Стоимость строгой оценки волны из N целей:
+
+- per-goal: как evaluate_goal - один structured_llm.complete на цель
+            (последовательно, как main.py вызывает strict_evaluate)
+- batch:    structured_llm.complete_batch - карточки целей упакованы
+            в минимум вызовов (evaluate_goals_batch_with_uow)
+
+Модель - stub сервер из test_benchmark_structured_llm (считает запросы,
+usage по ~4 символа на токен, задержка = первый токен + генерация).
+Колонки: latency и токены (prompt + completion) в пересчёте на одну цель.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_batch_evaluation.py --goals 1 10 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agents.schemas import BinaryEvaluation
+from structured_llm import StructuredLLMClient
+from test_benchmark_structured_llm import StubModel
+
+INSTRUCTIONS = """Строго оцени: ВЫПОЛНЕНА ли каждая цель? Учитывай только факты и артефакты.
+Поля ответа: "passed": true/false, "confidence": 0.0-1.0, "evidence": ["Факт 1", "Факт 2"]"""
+
+
+def goal_card(n: int) -> str:
+    return f"""ЦЕЛЬ: Подготовить отчёт по метрике #{n}
+ОПИСАНИЕ: Собрать данные за неделю, построить график и описать отклонения
+КРИТЕРИИ УСПЕХА: Отчёт в формате markdown, график, выводы
+ТЕКУЩИЙ ПРОГРЕСС: 100%
+АРТЕФАКТЫ: 1/2 passed: REPORT (passed), FILE (pending)"""
+
+
+def single_prompt(n: int) -> str:
+    return f"""Строго оцени: ВЫПОЛНЕНА ли эта цель?
+
+{goal_card(n)}
+
+Верни ТОЛЬКО JSON:
+{{
+    "passed": true/false,
+    "confidence": 0.0-1.0,
+    "evidence": ["Факт 1", "Факт 2"]
+}}
+"""
+
+
+async def per_goal(client: StructuredLLMClient, goals: int):
+    for n in range(goals):
+        await client.complete(single_prompt(n), BinaryEvaluation)
+
+
+async def batch(client: StructuredLLMClient, goals: int):
+    outcome = await client.complete_batch(
+        {f"goal-{n}": goal_card(n) for n in range(goals)}, BinaryEvaluation, INSTRUCTIONS
+    )
+    assert not outcome.errors and len(outcome.results) == goals
+
+
+async def run(goal_counts, latency_ms: float, token_latency_ms: float):
+    print(f"{'='*60}")
+    print(f"BATCH EVALUATION: stub latency {latency_ms:.0f}ms + {token_latency_ms}ms/token")
+    print(f"{'='*60}")
+    print(f"{'N':>4} {'path':<9} {'requests':>8} {'ms/goal':>9} {'tokens/goal':>12} {'speedup':>8}")
+
+    for goals in goal_counts:
+        baseline = None
+        for name, fn in (("per-goal", per_goal), ("batch", batch)):
+            stub = StubModel(latency_ms=latency_ms, token_latency_ms=token_latency_ms)
+            client = StructuredLLMClient(base_url=stub.start(), model="stub")
+            started = time.perf_counter()
+            try:
+                await fn(client, goals)
+            finally:
+                await client.close()
+                stub.stop()
+            ms_per_goal = (time.perf_counter() - started) * 1000 / goals
+            stats = client.get_stats()
+            tokens = (stats["prompt_tokens"] + stats["completion_tokens"]) / goals
+            baseline = baseline or ms_per_goal
+            print(f"{goals:>4} {name:<9} {stats['requests']:>8} {ms_per_goal:>9.1f} "
+                  f"{tokens:>12.0f} {baseline / ms_per_goal:>7.1f}x")
+
+    print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch goal evaluation benchmark")
+    parser.add_argument("--goals", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--token-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.goals, args.latency_ms, args.token_latency_ms))
+
+
+if __name__ == "__main__":
+    main()
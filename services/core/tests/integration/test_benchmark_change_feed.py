@@ -0,0 +1,100 @@
+"""
+Change Feed Fan-out Benchmark
+=============================
+
+500 concurrent SSE subscribers на ChangeFeedHub:
+- delivery latency (append → subscriber получил frame) p50/p95/max
+- throughput событий
+- сравнение нагрузки с polling моделью (dashboard перезапрашивал
+  /graph, /goals/list, /timeline каждые N секунд)
+
+Hub тестируется in-process (без Postgres): это верхняя граница стоимости
+fan-out внутри одного API процесса. NOTIFY → hub - один callback на событие.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_change_feed.py --subscribers 500 --events 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from change_feed import ChangeFeedHub
+
+
+async def run(subscribers: int, events: int, rate: float, poll_interval: float):
+    hub = ChangeFeedHub(capacity=max(10000, events * 2))
+    latencies = []
+    received = [0] * subscribers
+    done = asyncio.Event()
+
+    async def consume(idx: int):
+        async for frame in hub.subscribe(heartbeat_seconds=30):
+            data = frame.split("data: ", 1)[1]
+            sent_at = json.loads(data)["sent_at"]
+            latencies.append(time.perf_counter() - sent_at)
+            received[idx] += 1
+            if received[idx] == events:
+                return
+
+    tasks = [asyncio.create_task(consume(i)) for i in range(subscribers)]
+    await asyncio.sleep(0.1)  # all subscribers attached
+
+    started = time.perf_counter()
+    for i in range(events):
+        hub.append(json.dumps({
+            "type": "GOAL_STATUS_CHANGED",
+            "goalId": f"goal-{i}",
+            "newStatus": "done",
+            "sent_at": time.perf_counter(),
+        }))
+        if rate:
+            await asyncio.sleep(1.0 / rate)
+        else:
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=120)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    deliveries = len(latencies)
+
+    print(f"{'='*60}")
+    print(f"CHANGE FEED FAN-OUT: {subscribers} subscribers x {events} events")
+    print(f"{'='*60}")
+    print(f"Deliveries:        {deliveries} (expected {subscribers * events})")
+    print(f"Elapsed:           {elapsed:.2f}s")
+    print(f"Deliveries/sec:    {deliveries / elapsed:,.0f}")
+    print(f"Latency p50:       {statistics.median(latencies) * 1000:.2f}ms")
+    print(f"Latency p95:       {latencies[int(deliveries * 0.95) - 1] * 1000:.2f}ms")
+    print(f"Latency max:       {latencies[-1] * 1000:.2f}ms")
+
+    # Polling model: each dashboard re-fetches 3 full-table endpoints per interval
+    polling_qps = subscribers * 3 / poll_interval
+    print(f"\n📉 Dashboard DB load")
+    print(f"   Polling ({poll_interval:.0f}s, 3 endpoints): {polling_qps:,.0f} full-table queries/sec")
+    print(f"   Change feed:                0 queries/sec (1 LISTEN connection)")
+    print(f"{'='*60}")
+
+    assert deliveries == subscribers * events, "lost deliveries"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Change feed fan-out benchmark")
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=0, help="Events/sec (0 = as fast as possible)")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Old dashboard poll interval")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.subscribers, args.events, args.rate, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
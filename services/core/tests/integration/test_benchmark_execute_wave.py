@@ -0,0 +1,169 @@
+"""
+Execute Wave Concurrency Benchmark
+==================================
+
+goals/sec ExecuteReadyGoalsUseCase.run() в зависимости от concurrency
+PHASE 1 при skill с искусственной задержкой (I/O-bound: LLM, HTTP).
+
+Зависимости use-case заменены in-process двойниками:
+- executor:     asyncio.sleep(latency) + ExecutionOutcome-like объект
+- read UoW:     счётчик одновременно открытых read-сессий
+- arbitrator:   выбирает все intents (бюджет не ограничивает)
+- bulk engine:  считает applied, один "commit" на волну
+
+Arbitration и PHASE 2 не меняются - измеряется только PHASE 1.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_execute_wave.py --wave-size 20 --latency-ms 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from application.use_cases.execute_ready_goals import ExecuteReadyGoalsUseCase
+
+
+@dataclass
+class FakeOutcome:
+    status: str = "completed"
+    confidence: float = 0.9
+    attempts: int = 1
+    artifacts: list = field(default_factory=list)
+
+
+class LatencyExecutor:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def execute_goal(self, *, goal_id: str, uow):
+        await asyncio.sleep(self.latency)
+        return FakeOutcome(artifacts=[{"type": "KNOWLEDGE", "content_kind": "db", "content_location": goal_id}])
+
+
+class SessionCounter:
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+
+
+class FakeReadUoW:
+    def __init__(self, counter: SessionCounter):
+        self._counter = counter
+        self.session = None
+
+    async def __aenter__(self):
+        self._counter.open += 1
+        self._counter.peak = max(self._counter.peak, self._counter.open)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._counter.open -= 1
+
+
+class FakeSelector:
+    def __init__(self, goal_ids):
+        self.goal_ids = goal_ids
+
+    async def select_ready(self, uow, limit=None):
+        return self.goal_ids[:limit]
+
+
+class FakeRepo:
+    async def get(self, session, goal_id):
+        return type("GoalSnapshot", (), {"updated_at": datetime.utcnow()})()
+
+
+@dataclass
+class Selected:
+    intent: object
+
+
+@dataclass
+class ArbitrationResult:
+    selected: list
+    rejected: list
+    selection_rate: float
+    total_cost: float
+    budget_remaining: float
+
+
+class SelectAllArbitrator:
+    async def evaluate(self, intents, budget):
+        return ArbitrationResult([Selected(i) for i in intents], [], 1.0, float(len(intents)), budget)
+
+
+class UnlimitedAllocator:
+    async def current_budget(self):
+        return 1e9
+
+
+class CountingBulkEngine:
+    async def apply_execution_intents(self, uow, intents, actor):
+        return {"applied": len(intents), "failed": 0, "skipped": 0}
+
+
+async def run_once(wave_size: int, latency: float, concurrency: int):
+    counter = SessionCounter()
+    goal_ids = [uuid.uuid4() for _ in range(wave_size)]
+    use_case = ExecuteReadyGoalsUseCase(
+        uow_factory=lambda: FakeReadUoW(SessionCounter()),
+        executor=LatencyExecutor(latency),
+        bulk_engine=CountingBulkEngine(),
+        arbitrator=SelectAllArbitrator(),
+        capital_allocator=UnlimitedAllocator(),
+        event_bus=None,
+        wave_size=wave_size,
+        concurrency=concurrency,
+        read_uow_factory=lambda: FakeReadUoW(counter),
+        selector=FakeSelector(goal_ids),
+        goal_repository=FakeRepo(),
+    )
+
+    started = time.perf_counter()
+    result = await use_case.run(actor="benchmark")
+    elapsed = time.perf_counter() - started
+    assert result.completed == wave_size, result
+    return elapsed, counter.peak
+
+
+async def run(wave_size: int, latency_ms: int, levels):
+    latency = latency_ms / 1000
+    print(f"{'='*60}")
+    print(f"EXECUTE WAVE: {wave_size} goals/wave, skill latency {latency_ms}ms")
+    print(f"{'='*60}")
+    print(f"{'concurrency':>11} {'wave time':>10} {'goals/s':>9} {'speedup':>8} {'read sessions':>14}")
+
+    baseline = None
+    for concurrency in levels:
+        elapsed, peak = await run_once(wave_size, latency, concurrency)
+        baseline = baseline or elapsed
+        print(
+            f"{concurrency:>11} {elapsed:>9.2f}s {wave_size / elapsed:>9.1f}"
+            f" {baseline / elapsed:>7.1f}x {peak:>14}"
+        )
+
+    print(f"{'='*60}")
+    print(f"Old scheduler: limit=3, sequential → 3 goals per tick, {1 / latency:.1f} goals/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Execute wave concurrency benchmark")
+    parser.add_argument("--wave-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=500)
+    parser.add_argument("--levels", default="1,2,5,10,20", help="Comma-separated concurrency levels")
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.levels.split(",")]
+    asyncio.run(run(args.wave_size, args.latency_ms, levels))
+
+
+if __name__ == "__main__":
+    main()
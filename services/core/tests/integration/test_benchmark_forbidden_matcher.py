@@ -0,0 +1,106 @@
+"""
+Forbidden Context Matcher Benchmark
+===================================
+
+SandboxExecutor._check_payload на вложенных payload с ~10k ключей
+(stress_test_occp.PayloadGenerator.generate_wide):
+
+- legacy:    копия старой проверки - рекурсивный список полных путей ключей,
+             forbidden × variants × keys подстрочные проверки
+- compiled:  ForbiddenContextMatcher (один regex, итеративный обход),
+             холодный кэш ключей (новый matcher на каждый вызов)
+- warm:      тот же matcher повторно (как SandboxExecutor между запросами)
+
+Сценарии: clean (нарушения нет), forbidden в последнем ключе (худший случай),
+forbidden в первом ключе. Результаты legacy и compiled сверяются.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_forbidden_matcher.py --keys 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from occp_sandbox import ForbiddenContextMatcher, build_compute_assist_contract
+from stress_test_occp import PayloadGenerator
+
+
+def legacy_find(payload, forbidden_contexts):
+    """Old _check_payload logic (without padding)."""
+    def get_all_keys(d, prefix=""):
+        keys = []
+        for k, v in d.items():
+            full_key = f"{prefix}.{k}" if prefix else k
+            keys.append(full_key)
+            if isinstance(v, dict):
+                keys.extend(get_all_keys(v, full_key))
+            elif isinstance(v, list) and len(v) > 0 and isinstance(v[0], dict):
+                for item in v:
+                    if isinstance(item, dict):
+                        keys.extend(get_all_keys(item, full_key))
+        return keys
+
+    all_keys = get_all_keys(payload)
+    for forbidden in forbidden_contexts:
+        variants = [forbidden]
+        if forbidden.endswith('s'):
+            variants.append(forbidden[:-1])
+        else:
+            variants.append(forbidden + 's')
+        for key in all_keys:
+            last_component = str(key).lower().split('.')[-1]
+            for variant in variants:
+                if variant in last_component:
+                    return forbidden, key
+    return None
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def run(keys: int, repeat: int):
+    forbidden_contexts = tuple(build_compute_assist_contract().forbidden_contexts)
+    first = PayloadGenerator.generate_forbidden_simple()["input_data"]
+    scenarios = [
+        ("clean", PayloadGenerator.generate_wide(keys)),
+        ("forbidden_last", PayloadGenerator.generate_wide(keys, forbidden=True)),
+        ("forbidden_first", {**first, **PayloadGenerator.generate_wide(keys)}),
+    ]
+
+    print(f"{'='*60}")
+    print(f"FORBIDDEN MATCHER: ~{keys} keys, {len(forbidden_contexts)} contexts, {repeat} runs")
+    print(f"{'='*60}")
+    print(f"{'scenario':<16} {'legacy ms':>10} {'compiled ms':>12} {'warm ms':>9} {'speedup':>8}")
+
+    warm = ForbiddenContextMatcher(forbidden_contexts)
+    for name, payload in scenarios:
+        expected = legacy_find(payload, forbidden_contexts)
+        assert warm.find(payload) == expected, f"{name}: matcher disagrees with legacy"
+
+        legacy_ms = timed(lambda: legacy_find(payload, forbidden_contexts), repeat)
+        cold_ms = timed(lambda: ForbiddenContextMatcher(forbidden_contexts).find(payload), repeat)
+        warm_ms = timed(lambda: warm.find(payload), repeat)
+        print(f"{name:<16} {legacy_ms:>10.2f} {cold_ms:>12.2f} {warm_ms:>9.2f} {legacy_ms / warm_ms:>7.1f}x")
+
+    print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forbidden context matcher benchmark")
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.keys, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+OCCP Gateway Audit Benchmark
+============================
+
+Пропускная способность OCCPGateway.handle_request() с разными audit sink:
+
+- none:     аудит отключён (верхняя граница)
+- legacy:   копия старого _audit_log - open + fcntl.flock + write + close
+            синхронно на event loop для каждого запроса (без fsync)
+- legacy+fsync: то же + fsync на каждую запись (та же гарантия
+            сохранности, что у chained)
+- chained:  FederatedAuditLog - очередь в памяти, фоновый batch writer,
+            fsync по интервалу/размеру, hash chain, сегменты
+
+После chained-прогона цепочка проверяется verify().
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_occp_audit.py --requests 5000 --concurrency 100
+"""
+import argparse
+import asyncio
+import fcntl
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from occp_audit_log import FederatedAuditLog
+from occp_gateway import OCCPGateway
+from occp_v03_types import FederatedRequest, OCCPRequestType, ResourceBound
+
+
+class AllowAll:
+    """MCL / SK / resource stub: everything allowed."""
+    current_mode = "normal"
+    veto_reason_code = None
+    veto_explanation = ""
+
+    async def allows_federated(self, request):
+        return True
+
+    async def available(self, resource_bound):
+        return True
+
+
+class NoAudit:
+    async def append(self, entry):
+        return None
+
+
+class LegacyFileAudit:
+    """Old OCCPGateway._audit_log body."""
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+
+    async def append(self, entry):
+        with open(self.path, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            f.write(json.dumps(entry) + '\n')
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+async def run_gateway(audit_log, requests: int, concurrency: int) -> float:
+    checker = AllowAll()
+    gateway = OCCPGateway(
+        node_id="bench-node",
+        mcl_checker=checker,
+        sk_checker=checker,
+        resource_manager=checker,
+        audit_log=audit_log
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await gateway.handle_request(FederatedRequest(
+                request_type=OCCPRequestType.COMPUTE_ASSIST,
+                source_node=f"bench-source-{i % 1000}",  # stay under the per-source rate limit
+                resource_bound=ResourceBound(compute_seconds=10.0, memory_mb=256)
+            ))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    if hasattr(audit_log, "flush"):
+        await audit_log.flush()  # count the time until everything is durable
+    return time.perf_counter() - started
+
+
+async def run(requests: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        chained = FederatedAuditLog(os.path.join(tmp, "chained"))
+        sinks = [
+            ("none", NoAudit()),
+            ("legacy", LegacyFileAudit(os.path.join(tmp, "legacy.log"))),
+            ("legacy+fsync", LegacyFileAudit(os.path.join(tmp, "legacy_fsync.log"), fsync=True)),
+            ("chained", chained),
+        ]
+        await run_gateway(NoAudit(), min(requests, 500), concurrency)  # warm-up: imports, sandboxes
+
+        print(f"{'='*60}")
+        print(f"OCCP GATEWAY AUDIT: {requests} requests, concurrency {concurrency}")
+        print(f"{'='*60}")
+        print(f"{'audit':<13} {'wall':>9} {'req/s':>10}")
+
+        for name, sink in sinks:
+            elapsed = await run_gateway(sink, requests, concurrency)
+            print(f"{name:<13} {elapsed:>8.2f}s {requests / elapsed:>10.0f}")
+
+        print(f"{'='*60}")
+        print(f"chained stats: {chained.get_stats()}")
+        print(f"chain verify:  {chained.verify()}")
+        await chained.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCCP gateway audit benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
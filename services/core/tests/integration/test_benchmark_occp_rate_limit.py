@@ -0,0 +1,110 @@
+"""
+OCCP Gateway Rate Limit Benchmark
+=================================
+
+Rate limit check OCCPGateway на 10k различных source_node:
+
+- legacy:  копия старого _get_rate_limiter - глобальный asyncio.Lock +
+           dict без вытеснения (растёт с каждым новым source_node)
+- table:   RateLimitTable - шардированные OrderedDict, без lock,
+           ленивое создание, вытеснение idle/LRU
+
+Нагрузка: concurrency корутин, каждая делает rate limit check для
+случайного source_node (горячий набор + длинный хвост).
+После прогона печатаются метрики таблицы (buckets, rejected, evictions).
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_occp_rate_limit.py --sources 10000 --requests 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from occp_gateway import RateLimitTable, TokenBucket
+
+
+class LegacyRateLimits:
+    """Old OCCPGateway._get_rate_limiter + _check_rate_limit."""
+
+    def __init__(self):
+        self._rate_limits = {}
+        self._rate_limits_lock = asyncio.Lock()
+
+    async def allow(self, source_node: str, request_type: str) -> bool:
+        key = (source_node, request_type)
+        async with self._rate_limits_lock:
+            if key not in self._rate_limits:
+                self._rate_limits[key] = TokenBucket(capacity=200, refill_rate=100.0)
+            limiter = self._rate_limits[key]
+        return limiter.allow()
+
+
+def make_keys(sources: int, requests: int, seed: int = 42):
+    """80% of requests from 10% hot sources, the rest from the long tail."""
+    rng = random.Random(seed)
+    hot = max(1, sources // 10)
+    types = ("compute_assist", "adversarial_test")
+    keys = []
+    for _ in range(requests):
+        node = rng.randrange(hot) if rng.random() < 0.8 else rng.randrange(sources)
+        keys.append((f"node-{node}", types[node % 2]))
+    return keys
+
+
+async def run_limiter(limiter, keys, concurrency: int):
+    chunk = (len(keys) + concurrency - 1) // concurrency
+    rejected = 0
+
+    async def worker(part):
+        nonlocal rejected
+        for source_node, request_type in part:
+            if not await limiter.allow(source_node, request_type):
+                rejected += 1
+            await asyncio.sleep(0)  # interleave like real handlers
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(keys[i:i + chunk]) for i in range(0, len(keys), chunk)))
+    return time.perf_counter() - started, rejected
+
+
+async def run(sources: int, requests: int, concurrency: int):
+    keys = make_keys(sources, requests)
+    limiters = [
+        ("legacy", LegacyRateLimits()),
+        ("table", RateLimitTable()),
+    ]
+    await run_limiter(RateLimitTable(), keys[:5000], concurrency)  # warm-up
+
+    print(f"{'='*60}")
+    print(f"OCCP RATE LIMIT: {sources} sources, {requests} checks, concurrency {concurrency}")
+    print(f"{'='*60}")
+    print(f"{'limiter':<10} {'wall':>9} {'checks/s':>12} {'us/check':>10} {'rejected':>10}")
+
+    for name, limiter in limiters:
+        elapsed, rejected = await run_limiter(limiter, keys, concurrency)
+        print(f"{name:<10} {elapsed:>8.2f}s {requests / elapsed:>12.0f} "
+              f"{elapsed / requests * 1e6:>10.2f} {rejected:>10}")
+
+    print(f"{'='*60}")
+    print(f"legacy buckets: {len(limiters[0][1]._rate_limits)}")
+    print(f"table stats:    {limiters[1][1].get_stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCCP gateway rate limit benchmark")
+    parser.add_argument("--sources", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sources, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Policy Condition Benchmark
+==========================
+
+Оценка правил PolicyEngine для пачки SystemStateEntity:
+
+- legacy:    копия старого evaluate_condition - re.match по строке условия
+             при каждой оценке, ветвление по префиксу
+- compiled:  PolicyEngine.evaluate_batch - условия скомпилированы в замыкания
+             один раз, правила проиндексированы по entity_name
+
+Колонки batch - полный проход (PolicyEvaluationResult, логи сработавших
+правил), cond - только оценка условий по тем же парам (entity, rule).
+
+Правила - только формы, которые понимал legacy (delta/value/trend/confidence),
+результаты legacy и compiled сверяются.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_policy_conditions.py --rules 200 --entities 1000
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from autonomy.policy_conditions import compile_condition
+from autonomy.policy_engine import ActionType, PolicyEngine, PolicyEvaluationResult, PolicyRule
+from autonomy.system_state import EntityType, SystemStateEntity
+
+
+def legacy_evaluate_condition(condition: str, entity):
+    """Old PolicyEngine.evaluate_condition (delta/value/trend/confidence branches)."""
+    delta = entity.get_delta("value")
+    value = entity.current_value.get("value")
+    trend = entity.get_trend("value")
+    condition = condition.strip()
+
+    def compare(name, actual, op, threshold):
+        met = {"<": actual < threshold, ">": actual > threshold, "<=": actual <= threshold,
+               ">=": actual >= threshold, "==": actual == threshold}.get(op, False)
+        if met:
+            return True, f"{name} ({actual}) {op} {threshold}"
+        return False, f"{name} ({actual}) does not meet: {condition}"
+
+    if condition.startswith("delta"):
+        if delta is None:
+            return False, "No delta available (first measurement)"
+        match = re.match(r"delta\s*([<>=!]+)\s*(-?\d+\.?\d*)", condition)
+        if match:
+            return compare("delta", delta, match.group(1), float(match.group(2)))
+    elif condition.startswith("value"):
+        if value is None:
+            return False, "No 'value' key in current_value"
+        match = re.match(r"value\s*([<>=!]+)\s*(-?\d+\.?\d*)", condition)
+        if match:
+            return compare("value", value, match.group(1), float(match.group(2)))
+    elif condition.startswith("trend"):
+        match = re.match(r"trend\s*==\s*['\"](\w+)['\"]", condition)
+        if match:
+            if trend == match.group(1):
+                return True, f"trend is '{trend}'"
+            return False, f"trend is '{trend}', expected '{match.group(1)}'"
+    elif condition.startswith("confidence"):
+        match = re.match(r"confidence\s*([<>=!]+)\s*(\d+\.?\d*)", condition)
+        if match:
+            return compare("confidence", entity.confidence, match.group(1), float(match.group(2)))
+    return False, f"Unknown condition format: {condition}"
+
+
+def make_rules(count: int, entity_names, rng):
+    templates = [
+        lambda: f"delta < {rng.randint(-20, 0)}",
+        lambda: f"delta > {rng.randint(0, 20)}",
+        lambda: f"value >= {rng.randint(50, 150)}",
+        lambda: f"value < {rng.randint(50, 150)}",
+        lambda: f"trend == '{rng.choice(['up', 'down', 'stable'])}'",
+        lambda: f"confidence < 0.{rng.randint(1, 9)}",
+    ]
+    return [
+        PolicyRule(
+            id=uuid4(),
+            name=f"rule-{i}",
+            entity_name=rng.choice(entity_names),
+            entity_type=EntityType.METRIC,
+            condition_expression=rng.choice(templates)(),
+            action_type=ActionType.ALERT,
+            action_payload={},
+            priority=rng.randint(1, 3),
+            cooldown_minutes=0
+        )
+        for i in range(count)
+    ]
+
+
+def make_entities(count: int, entity_names, rng):
+    return [
+        SystemStateEntity(
+            id=uuid4(),
+            entity_name=rng.choice(entity_names),
+            entity_type=EntityType.METRIC,
+            current_value={"value": rng.randint(50, 150)},
+            previous_value={"value": rng.randint(50, 150)} if rng.random() < 0.9 else None,
+            confidence=rng.random()
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_batch(engine, rules, entities):
+    """Old evaluate() loop per entity (rules filtered by name, conditions re-parsed)."""
+    results = []
+    for entity in entities:
+        for rule in [r for r in rules if r.entity_name == entity.entity_name]:
+            condition_met, reason = legacy_evaluate_condition(rule.condition_expression, entity)
+            results.append(PolicyEvaluationResult(
+                rule=rule,
+                entity=entity,
+                triggered=condition_met and not engine.is_in_cooldown(rule),
+                condition_met=condition_met,
+                reason=reason
+            ))
+    return results
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+async def timed_async(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+async def run(rule_counts, entities: int, names: int, repeat: int):
+    rng = random.Random(42)
+    entity_names = [f"metric_{i}" for i in range(names)]
+    snapshots = make_entities(entities, entity_names, rng)
+    engine = PolicyEngine()
+
+    print(f"{'='*60}")
+    print(f"POLICY CONDITIONS: {entities} snapshots, {names} entities, {repeat} runs")
+    print(f"{'='*60}")
+    print(f"{'rules':>6} {'batch legacy':>13} {'compiled':>9} {'speedup':>8} "
+          f"{'cond legacy':>12} {'compiled':>9} {'speedup':>8}")
+
+    for count in rule_counts:
+        rules = make_rules(count, entity_names, rng)
+        results = await engine.evaluate_batch(snapshots, rules=rules)
+
+        # Compare per (entity, rule) verdicts
+        expected = {(id(r.entity), r.rule.id): r.condition_met for r in legacy_batch(engine, rules, snapshots)}
+        actual = {(id(r.entity), r.rule.id): r.condition_met for r in results}
+        assert actual == expected, "compiled conditions disagree with legacy"
+
+        legacy_ms = timed(lambda: legacy_batch(engine, rules, snapshots), repeat)
+        compiled_ms = await timed_async(lambda: engine.evaluate_batch(snapshots, rules=rules), repeat)
+
+        pairs = [(r.rule.condition_expression, r.entity) for r in results]
+        compiled_pairs = [(compile_condition(c), e) for c, e in pairs]
+        cond_legacy_ms = timed(lambda: [legacy_evaluate_condition(c, e) for c, e in pairs], repeat)
+        cond_compiled_ms = timed(lambda: [c.evaluate(e) for c, e in compiled_pairs], repeat)
+
+        print(f"{count:>6} {legacy_ms:>11.2f}ms {compiled_ms:>7.2f}ms {legacy_ms / compiled_ms:>7.1f}x "
+              f"{cond_legacy_ms:>10.2f}ms {cond_compiled_ms:>7.2f}ms {cond_legacy_ms / cond_compiled_ms:>7.1f}x")
+
+    print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Policy condition benchmark")
+    parser.add_argument("--rules", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--names", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rules, args.entities, args.names, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
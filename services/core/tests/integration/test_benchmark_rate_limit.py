@@ -0,0 +1,105 @@
+"""
+Rate Limiter Benchmark
+======================
+
+Per-request overhead rate limiter при росте числа клиентов и истории запросов:
+- legacy:  Dict[str, List[float]] sliding window (старый RateLimitMiddleware)
+- bucket:  api.rate_limit.RateLimiter (local token bucket store)
+- redis:   api.rate_limit.RateLimiter с Redis Lua script (если --redis-url)
+
+Ожидание: bucket - константа на запрос независимо от limit/clients,
+legacy - растёт линейно с requests_per_minute.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_rate_limit.py
+    docker exec ns_core python /app/tests/integration/test_benchmark_rate_limit.py --redis-url redis://ns_redis:6379/2
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from api.rate_limit import RateLimiter, RateLimitPolicy
+
+
+class LegacySlidingWindow:
+    """Copy of the previous RateLimitMiddleware bookkeeping."""
+
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.requests: Dict[str, List[float]] = {}
+
+    async def acquire(self, path: str, client_id: str, api_key=None) -> bool:
+        current_time = time.time()
+        if client_id in self.requests:
+            self.requests[client_id] = [
+                t for t in self.requests[client_id] if current_time - t < 60
+            ]
+        else:
+            self.requests[client_id] = []
+        if len(self.requests[client_id]) >= self.requests_per_minute:
+            return False
+        self.requests[client_id].append(current_time)
+        return True
+
+
+async def measure(limiter, clients: int, requests: int, seed: int = 42) -> float:
+    """Return mean microseconds per acquire()."""
+    rng = random.Random(seed)
+    client_ids = [f"10.0.{i // 256}.{i % 256}" for i in range(clients)]
+    started = time.perf_counter()
+    for _ in range(requests):
+        await limiter.acquire("/goals/list", rng.choice(client_ids))
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Rate limiter benchmark")
+    parser.add_argument("--requests", type=int, default=50000, help="Requests per scenario")
+    parser.add_argument("--redis-url", default=None, help="Also benchmark Redis-shared store")
+    args = parser.parse_args()
+
+    scenarios = [
+        # (clients, requests_per_minute)
+        (10, 600),
+        (10, 6000),
+        (1000, 600),
+        (10000, 600),
+    ]
+
+    print(f"{'='*72}")
+    print(f"RATE LIMITER BENCHMARK: {args.requests} requests per scenario")
+    print(f"{'='*72}")
+    print(f"{'clients':>8} {'rpm':>6} {'legacy us/req':>14} {'bucket us/req':>14} {'redis us/req':>13} {'tables':>12}")
+
+    for clients, rpm in scenarios:
+        legacy = LegacySlidingWindow(rpm)
+        bucket = RateLimiter(default_policy=RateLimitPolicy.per_minute(rpm))
+
+        legacy_us = await measure(legacy, clients, args.requests)
+        bucket_us = await measure(bucket, clients, args.requests)
+
+        redis_us = float("nan")
+        if args.redis_url:
+            shared = RateLimiter(default_policy=RateLimitPolicy.per_minute(rpm), redis_url=args.redis_url)
+            redis_us = await measure(shared, clients, min(args.requests, 10000))
+            await shared.shared.close()
+
+        legacy_entries = sum(len(v) for v in legacy.requests.values())
+        print(
+            f"{clients:>8} {rpm:>6} {legacy_us:>14.2f} {bucket_us:>14.2f} {redis_us:>13.2f}"
+            f"   {legacy_entries:>6}/{len(bucket.local):<6}"
+        )
+
+    print(f"{'='*72}")
+    print("tables = legacy timestamps stored / bucket entries stored")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""
+Skill Runtime Concurrency Benchmark
+===================================
+
+N атомарных целей одновременно, каждая запускает блокирующий skill
+(time.sleep - как httpx.get в WebResearchSkill):
+
+- legacy:  skill.execute() прямо в async методе, внутри транзакции,
+           которая держит FOR UPDATE lock и соединение из пула
+- runtime: SkillRuntime (thread pool) + транзакция разделена на
+           PHASE A (transition → active, commit) и PHASE B (re-lock, результат)
+
+DB моделируется asyncio.Semaphore размером с пул SQLAlchemy
+(pool_size 5 + max_overflow 10) и короткими sleep на транзакционные шаги.
+
+Метрики:
+- wall time / goals per second
+- event loop stall (max задержка тикера 10ms) - время, когда API не отвечал
+- max время удержания соединения/lock одной целью
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_skill_runtime.py --goals 50 --skill-ms 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from canonical_skills.base import Skill, SkillResult
+from skill_runtime import SkillRuntime
+
+
+DB_POOL_SIZE = 15       # SQLAlchemy defaults: pool_size=5 + max_overflow=10
+DB_STEP_SECONDS = 0.005  # one transactional step (SELECT FOR UPDATE / UPDATE / INSERT)
+
+
+class BlockingResearchSkill(Skill):
+    id = "bench.blocking_research"
+    version = "1.0"
+    description = "Blocking HTTP stand-in"
+    capabilities = ["research"]
+    requirements = []
+    input_schema = {}
+    output_schema = {}
+    produces_artifacts = ["KNOWLEDGE"]
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def execute(self, input_data, context) -> SkillResult:
+        time.sleep(self.delay)
+        return self._success_result({"findings": 3}, [])
+
+    def verify(self, result: SkillResult) -> bool:
+        return result.success
+
+
+class Stats:
+    def __init__(self):
+        self.max_hold = 0.0
+
+    def held(self, seconds: float):
+        self.max_hold = max(self.max_hold, seconds)
+
+
+async def db_steps(n: int):
+    for _ in range(n):
+        await asyncio.sleep(DB_STEP_SECONDS)
+
+
+async def legacy_goal(skill, pool: asyncio.Semaphore, stats: Stats):
+    async with pool:
+        acquired = time.perf_counter()
+        await db_steps(2)                    # read goal, transition → active (lock taken)
+        result = skill.execute({}, {})       # blocks the loop, lock held
+        skill.verify(result)
+        await db_steps(4)                    # artifacts, evaluation, transition → done
+        stats.held(time.perf_counter() - acquired)
+
+
+async def runtime_goal(skill, runtime: SkillRuntime, pool: asyncio.Semaphore, stats: Stats):
+    async with pool:                         # PHASE A
+        acquired = time.perf_counter()
+        await db_steps(2)
+        stats.held(time.perf_counter() - acquired)
+
+    result = await runtime.execute(skill, {}, {})
+    await runtime.verify(skill, result)
+
+    async with pool:                         # PHASE B
+        acquired = time.perf_counter()
+        await db_steps(5)                    # re-lock + apply result
+        stats.held(time.perf_counter() - acquired)
+
+
+async def scenario(name: str, make_goal, goals: int):
+    stats = Stats()
+    pool = asyncio.Semaphore(DB_POOL_SIZE)
+    max_stall = 0.0
+    sleep_started = time.perf_counter()
+
+    async def ticker():
+        nonlocal max_stall, sleep_started
+        while True:
+            sleep_started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_stall = max(max_stall, time.perf_counter() - sleep_started - 0.01)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(make_goal(pool, stats) for _ in range(goals)))
+    elapsed = time.perf_counter() - started
+    max_stall = max(max_stall, time.perf_counter() - sleep_started - 0.01)
+    tick.cancel()
+
+    print(
+        f"{name:<10} {elapsed:>8.2f}s {goals / elapsed:>9.1f} {max_stall * 1000:>12.0f}"
+        f" {stats.max_hold * 1000:>14.0f}"
+    )
+
+
+async def run(goals: int, skill_ms: int, workers: int):
+    skill = BlockingResearchSkill(skill_ms / 1000)
+    runtime = SkillRuntime(thread_workers=workers)
+
+    print(f"{'='*60}")
+    print(f"SKILL RUNTIME: {goals} goals, blocking skill {skill_ms}ms, {workers} skill threads")
+    print(f"{'='*60}")
+    print(f"{'path':<10} {'wall':>9} {'goals/s':>9} {'loop stall ms':>13} {'max lock hold ms':>16}")
+
+    await scenario("legacy", lambda pool, stats: legacy_goal(skill, pool, stats), goals)
+    await scenario("runtime", lambda pool, stats: runtime_goal(skill, runtime, pool, stats), goals)
+
+    print(f"{'='*60}")
+    runtime.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill runtime concurrency benchmark")
+    parser.add_argument("--goals", type=int, default=50)
+    parser.add_argument("--skill-ms", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16, help="Skill thread pool size")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.goals, args.skill_ms, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Structured LLM Benchmark
+========================
+
+Сколько запросов к модели стоит одна оценка (GoalStrictEvaluator-style
+judgement) через:
+
+- graph:   старый путь app_graph.ainvoke - supervisor_node -> worker (PM) ->
+           Evaluator -> supervisor_node (FINISH), MemorySaver checkpoint
+           (нужны langgraph/langchain_openai и DB для dna_manager - только в ns_core)
+- direct:  structured_llm.StructuredLLMClient - один запрос с json_schema,
+           повтор только при невалидном ответе
+
+Модель - stub OpenAI-совместимый сервер (http.server в отдельном потоке),
+считает запросы. --malformed-ratio: доля первых ответов с битым JSON
+(проверка повторов).
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_structured_llm.py --judgements 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+JUDGEMENT = {"passed": True, "confidence": 0.9, "evidence": ["stub"]}
+
+PROMPT = """Строго оцени: ВЫПОЛНЕНА ли эта цель?
+
+ЦЕЛЬ: Benchmark goal
+ОПИСАНИЕ: Не указано
+КРИТЕРИИ УСПЕХА: Не определены
+ТЕКУЩИЙ ПРОГРЕСС: 100%
+
+Верни ТОЛЬКО JSON:
+{
+    "passed": true/false,
+    "confidence": 0.0-1.0,
+    "evidence": ["Факт 1", "Факт 2"]
+}
+"""
+
+
+class StubModel:
+    """OpenAI-compatible /chat/completions stub that counts requests."""
+
+    def __init__(self, malformed_ratio: float = 0.0, latency_ms: float = 0.0, seed: int = 42,
+                 token_latency_ms: float = 0.0):
+        self.malformed_ratio = malformed_ratio
+        self.latency = latency_ms / 1000
+        self.token_latency = token_latency_ms / 1000
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+
+    def answer(self, body: dict) -> str:
+        messages = body.get("messages", [])
+        text = " ".join(str(m.get("content", "")) for m in messages)
+        has_assistant = any(m.get("role") == "assistant" for m in messages)
+
+        if "### id: " in text:
+            # structured_llm.complete_batch: one judgement per item id
+            ids = [line.split("### id: ", 1)[1] for line in text.splitlines() if line.startswith("### id: ")]
+            return json.dumps({"results": [{"id": item_id, **JUDGEMENT} for item_id in ids]})
+        if "Who should act next" in text:
+            # supervisor_node: route to PM, finish once a worker has answered
+            return json.dumps({"next_node": "FINISH" if has_assistant else "PM"})
+        if not has_assistant and self.rng.random() < self.malformed_ratio:
+            return "Цель выполнена, passed: да"
+        return json.dumps(JUDGEMENT)
+
+    def start(self) -> str:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests += 1
+                    content = stub.answer(body)
+                prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+                completion_tokens = len(content) // 4
+                # Time to first token + generation time
+                delay = stub.latency + completion_tokens * stub.token_latency
+                if delay:
+                    time.sleep(delay)
+                data = json.dumps({
+                    "id": "stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def stop(self):
+        self.server.shutdown()
+
+
+async def run_direct(base_url: str, judgements: int):
+    from agents.schemas import BinaryEvaluation
+    from structured_llm import StructuredLLMClient
+
+    client = StructuredLLMClient(base_url=base_url, model="stub")
+    for _ in range(judgements):
+        result = await client.complete(PROMPT, BinaryEvaluation)
+        assert result.passed
+    await client.close()
+    return client.get_stats()
+
+
+async def run_graph(base_url: str, judgements: int):
+    os.environ["LLM_BASE_URL"] = base_url
+    from langchain_core.messages import HumanMessage
+    from agent_graph import app_graph
+
+    for i in range(judgements):
+        response = await app_graph.ainvoke(
+            {"messages": [HumanMessage(content=PROMPT)]},
+            config={"configurable": {"thread_id": f"bench-{i}"}},
+        )
+        assert json.loads(response["messages"][-1].content)["passed"]
+
+
+async def run(modes, judgements: int, malformed_ratio: float, latency_ms: float):
+    print(f"{'='*60}")
+    print(f"STRUCTURED LLM: {judgements} judgements, malformed {malformed_ratio:.0%}, "
+          f"stub latency {latency_ms:.0f}ms")
+    print(f"{'='*60}")
+    print(f"{'path':<8} {'requests':>9} {'req/judgement':>14} {'wall':>9}")
+
+    for mode in modes:
+        stub = StubModel(malformed_ratio=malformed_ratio, latency_ms=latency_ms)
+        base_url = stub.start()
+        started = time.perf_counter()
+        try:
+            if mode == "direct":
+                await run_direct(base_url, judgements)
+            else:
+                await run_graph(base_url, judgements)
+        except ImportError as e:
+            print(f"{mode:<8} unavailable ({e})")
+            continue
+        finally:
+            stub.stop()
+        elapsed = time.perf_counter() - started
+        print(f"{mode:<8} {stub.requests:>9} {stub.requests / judgements:>14.2f} {elapsed:>8.2f}s")
+
+    print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured LLM benchmark")
+    parser.add_argument("--judgements", type=int, default=50)
+    parser.add_argument("--malformed-ratio", type=float, default=0.1)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--modes", nargs="+", default=["graph", "direct"], choices=["graph", "direct"])
+    args = parser.parse_args()
+
+    asyncio.run(run(args.modes, args.judgements, args.malformed_ratio, args.latency_ms))
+
+
+if __name__ == "__main__":
+    main()
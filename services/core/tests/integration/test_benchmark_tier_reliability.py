@@ -0,0 +1,119 @@
+"""
+Tier Reliability Benchmark
+==========================
+
+Стоимость обновления TierReliabilityTracker после каждой новой записи
+EmotionalErrorStore (как в emotional_feedback_loop):
+
+- legacy:  копия старого update_reliability - полный проход по history
+           для сбора action_types + get_recent (фильтр и сортировка всей
+           истории) на каждый (action_type, tier)
+- online:  record() обновляет окно и суммы ключа, update_reliability
+           переносит в кэш только изменившиеся ключи
+
+Результаты legacy и online сверяются по кэшу после прогона.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_benchmark_tier_reliability.py --records 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from emotional_error_store import EmotionalErrorStore
+from tier_reliability import TierReliabilityTracker
+
+DIMENSIONS = ("valence", "arousal", "dominance", "focus", "confidence")
+
+
+def legacy_metrics(store, action_type, tier, limit):
+    """Old get_metrics_for_key: filter + sort whole history, aggregate."""
+    records = [r for r in store.history if r["action_type"] == action_type and r["tier"] == tier]
+    records = sorted(records, key=lambda x: x["timestamp"], reverse=True)[:limit]
+    dims = [e for r in records for e in r["errors"].values()]
+    n = len(dims)
+    if n == 0:
+        return {"direction_acc": 0.0, "mae": 0.0, "bias": 0.0, "sample_count": 0}
+    return {
+        "direction_acc": round(sum(1 for e in dims if e["direction_match"]) / n, 4),
+        "mae": round(sum(e["abs"] for e in dims) / n, 4),
+        "bias": round(sum(e["signed"] for e in dims) / n, 4),
+        "sample_count": n
+    }
+
+
+def legacy_update(tracker, store):
+    """Old update_reliability: every action_type x tier on every call."""
+    action_types = {r["action_type"] for r in store.history}
+    for action_type in action_types:
+        tiers = tracker.reliability_cache.setdefault(action_type, {})
+        for tier in TierReliabilityTracker.TIERS:
+            tiers[tier] = legacy_metrics(store, action_type, tier, tracker.window_size)
+
+
+def make_records(count: int, action_types: int, rng):
+    names = [f"action_{i}" for i in range(action_types)]
+    records = []
+    for _ in range(count):
+        errors = {}
+        for dim in DIMENSIONS:
+            signed = rng.uniform(-0.5, 0.5)
+            errors[dim] = {"signed": signed, "abs": abs(signed), "direction_match": rng.random() < 0.7}
+        records.append((rng.choice(names), rng.choice(TierReliabilityTracker.TIERS), errors))
+    return records
+
+
+def run_mode(mode: str, records, max_history: int):
+    store = EmotionalErrorStore(max_history=max_history)
+    tracker = TierReliabilityTracker()
+    update = legacy_update if mode == "legacy" else TierReliabilityTracker.update_reliability
+
+    started = time.perf_counter()
+    for action_type, tier, errors in records:
+        store.record("bench-user", action_type, tier, 0.8, errors)
+        update(tracker, store)
+    elapsed = time.perf_counter() - started
+    return elapsed, tracker
+
+
+def run(record_counts, action_types: int, max_history: int):
+    rng = random.Random(42)
+
+    print(f"{'='*60}")
+    print(f"TIER RELIABILITY: {action_types} action types, history {max_history}")
+    print(f"{'='*60}")
+    print(f"{'records':>8} {'legacy':>10} {'online':>10} {'speedup':>8} {'us/record':>10}")
+
+    for count in record_counts:
+        records = make_records(count, action_types, rng)
+        legacy_s, legacy_tracker = run_mode("legacy", records, max_history)
+        online_s, online_tracker = run_mode("online", records, max_history)
+
+        # Legacy окно ограничено history; при count <= max_history совпадают
+        if count <= max_history:
+            assert online_tracker.reliability_cache == legacy_tracker.reliability_cache, \
+                "online metrics disagree with legacy"
+
+        print(f"{count:>8} {legacy_s:>9.2f}s {online_s:>9.3f}s {legacy_s / online_s:>7.1f}x "
+              f"{online_s / count * 1e6:>10.1f}")
+
+    print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tier reliability benchmark")
+    parser.add_argument("--records", type=int, nargs="+", default=[500, 1000, 5000])
+    parser.add_argument("--action-types", type=int, default=10)
+    parser.add_argument("--max-history", type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.records, args.action_types, args.max_history)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Worker Runtime Benchmark
+========================
+
+Сравнивает per-task overhead и connection churn для Celery задач:
+- legacy:     asyncio.run() + новый httpx.AsyncClient на каждую задачу
+- persistent: worker_runtime.run_async() + shared httpx client
+
+Broker stand-in: in-process queue.Queue + consumer thread (как prefork child,
+который получает задачи по одной). HTTP stub: локальный asyncio сервер,
+считает принятые TCP соединения.
+
+Запуск:
+    docker exec ns_core_worker python /app/tests/integration/test_benchmark_worker_runtime.py --tasks 500
+"""
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+sys.path.insert(0, '/app')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+os.environ.setdefault("WORKER_DB_WARMUP", "false")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+# ============================================================================
+# SECTION 1: HTTP STUB (counts connections)
+# ============================================================================
+
+class CountingHTTPStub:
+    """Minimal HTTP/1.1 keep-alive server, counts accepted connections."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self.port = None
+        self._loop = None
+        self._ready = threading.Event()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in headers.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\n{}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    def start(self):
+        def _serve():
+            self._loop = asyncio.new_event_loop()
+            server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, "127.0.0.1", 0)
+            )
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=_serve, daemon=True).start()
+        self._ready.wait()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/notify"
+
+
+# ============================================================================
+# SECTION 2: TASK BODIES
+# ============================================================================
+
+@dataclass
+class ModeResult:
+    mode: str
+    latencies_ms: List[float] = field(default_factory=list)
+    connections: int = 0
+    loops_created: int = 0
+
+    @property
+    def p50(self) -> float:
+        return statistics.median(self.latencies_ms)
+
+    @property
+    def p95(self) -> float:
+        return sorted(self.latencies_ms)[int(len(self.latencies_ms) * 0.95) - 1]
+
+
+async def _legacy_task(url: str, calls: int):
+    import httpx
+    async with httpx.AsyncClient() as client:
+        for _ in range(calls):
+            await client.post(url, json={"message": "ok"})
+
+
+async def _persistent_task(url: str, calls: int):
+    from worker_runtime import get_http_client
+    client = get_http_client()
+    for _ in range(calls):
+        await client.post(url, json={"message": "ok"})
+
+
+# ============================================================================
+# SECTION 3: BROKER STAND-IN
+# ============================================================================
+
+def run_mode(mode: str, stub: CountingHTTPStub, tasks: int, calls: int) -> ModeResult:
+    result = ModeResult(mode=mode)
+    broker: "queue.Queue" = queue.Queue()
+    for i in range(tasks):
+        broker.put(i)
+    broker.put(None)
+
+    connections_before = stub.connections
+
+    def _consumer():
+        if mode == "persistent":
+            from worker_runtime import worker_runtime
+            worker_runtime.init_process()
+            result.loops_created = 1
+
+        while broker.get() is not None:
+            started = time.perf_counter()
+            if mode == "legacy":
+                asyncio.run(_legacy_task(stub.url, calls))
+                result.loops_created += 1
+            else:
+                from worker_runtime import run_async
+                run_async(_persistent_task(stub.url, calls))
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+        if mode == "persistent":
+            from worker_runtime import worker_runtime
+            worker_runtime.shutdown_process()
+
+    consumer = threading.Thread(target=_consumer)
+    consumer.start()
+    consumer.join()
+
+    result.connections = stub.connections - connections_before
+    return result
+
+
+# ============================================================================
+# SECTION 4: MAIN
+# ============================================================================
+
+def print_result(result: ModeResult, tasks: int):
+    print(f"\n📊 {result.mode}")
+    print(f"   p50 per task:     {result.p50:.2f}ms")
+    print(f"   p95 per task:     {result.p95:.2f}ms")
+    print(f"   Loops created:    {result.loops_created}")
+    print(f"   TCP connections:  {result.connections} ({result.connections / tasks:.2f} per task)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker runtime benchmark")
+    parser.add_argument("--tasks", type=int, default=300, help="Tasks per mode")
+    parser.add_argument("--calls", type=int, default=2, help="HTTP calls per task")
+    args = parser.parse_args()
+
+    stub = CountingHTTPStub()
+    stub.start()
+
+    print(f"{'='*60}")
+    print(f"WORKER RUNTIME BENCHMARK: {args.tasks} tasks x {args.calls} HTTP calls")
+    print(f"{'='*60}")
+
+    legacy = run_mode("legacy", stub, args.tasks, args.calls)
+    persistent = run_mode("persistent", stub, args.tasks, args.calls)
+
+    print_result(legacy, args.tasks)
+    print_result(persistent, args.tasks)
+
+    print(f"\n{'='*60}")
+    print(f"Speedup p50: {legacy.p50 / persistent.p50:.1f}x")
+    print(f"Connection churn: {legacy.connections} -> {persistent.connections}")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Goal Work Queue Contention Test
+===============================
+
+Несколько воркеров одновременно забирают готовые атомарные цели
+через GoalWorkQueue (FOR UPDATE SKIP LOCKED + lease):
+
+1. Создаём N атомарных целей с высоким priority
+2. K воркеров (свои сессии и owner) забирают batches, пока очередь не пуста
+3. Проверяем: каждая цель забрана ровно один раз, никто не ждал lock
+4. Lease expiry: "упавший" воркер не освобождает цели, после истечения
+   lease reaper их освобождает и другой воркер забирает
+5. Priority: цели с большим priority забираются первыми
+
+Чужие (не тестовые) цели, попавшие в claim, сразу освобождаются.
+
+Запуск:
+    docker exec ns_core python /app/tests/integration/test_goal_work_queue_contention.py --goals 200 --workers 8
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import List, Set
+from uuid import UUID, uuid4
+
+sys.path.insert(0, '/app')
+
+TEST_PRIORITY = 1_000_000  # выше любых production целей - тестовые забираются первыми
+
+
+# ============================================================================
+# SECTION 1: ENABLE WRITES
+# ============================================================================
+
+def enable_writes():
+    """Enable writes for test setup"""
+    try:
+        from tests.stress.write_barrier import WRITE_BARRIER
+        WRITE_BARRIER.enable()
+        WRITE_BARRIER.allow()
+    except ImportError:
+        pass
+
+
+# ============================================================================
+# SECTION 2: FIXTURES
+# ============================================================================
+
+async def create_ready_goals(count: int, priority: int = TEST_PRIORITY) -> List[UUID]:
+    from database import AsyncSessionLocal
+    from models import Goal
+    from sqlalchemy import insert
+
+    goal_ids = [uuid4() for _ in range(count)]
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            insert(Goal.__table__),
+            [
+                {
+                    "id": goal_id,
+                    "title": f"Work queue contention goal {i}",
+                    "status": "active",
+                    "is_atomic": True,
+                    "progress": 0.0,
+                    "priority": priority,
+                }
+                for i, goal_id in enumerate(goal_ids)
+            ],
+        )
+        await session.commit()
+    return goal_ids
+
+
+async def complete_goals(goal_ids: List[UUID]):
+    """Имитация выполнения: progress = 1.0 выводит цель из очереди."""
+    from database import AsyncSessionLocal
+    from models import Goal
+    from sqlalchemy import update
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Goal).where(Goal.id.in_(goal_ids)).values(progress=1.0)
+        )
+        await session.commit()
+
+
+async def delete_goals(goal_ids: List[UUID]):
+    from database import AsyncSessionLocal
+    from models import Goal
+    from sqlalchemy import delete
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Goal).where(Goal.id.in_(goal_ids)))
+        await session.commit()
+
+
+async def claim_own(queue, limit: int, own: Set[UUID]) -> List[UUID]:
+    """Claim, keep only test goals, hand foreign goals straight back."""
+    claimed = await queue.claim(limit)
+    mine = [g for g in claimed if g in own]
+    foreign = [g for g in claimed if g not in own]
+    if foreign:
+        await queue.release(foreign)
+    return mine
+
+
+# ============================================================================
+# SECTION 3: MULTI-WORKER CONTENTION
+# ============================================================================
+
+async def test_each_goal_claimed_once(goals: int, workers: int, batch: int) -> bool:
+    from infrastructure.goal_work_queue import GoalWorkQueue
+
+    goal_ids = await create_ready_goals(goals)
+    own = set(goal_ids)
+    claims: Counter = Counter()
+    per_worker: Counter = Counter()
+    max_claim_ms = 0.0
+
+    async def worker(n: int):
+        nonlocal max_claim_ms
+        queue = GoalWorkQueue(owner=f"contention-worker-{n}", lease_seconds=60)
+        while True:
+            started = time.perf_counter()
+            mine = await claim_own(queue, batch, own)
+            max_claim_ms = max(max_claim_ms, (time.perf_counter() - started) * 1000)
+            if not mine:
+                return
+            claims.update(mine)
+            per_worker[n] += len(mine)
+            await asyncio.sleep(0.01)  # "execution"
+            await complete_goals(mine)
+            await queue.release(mine)
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(workers)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await delete_goals(goal_ids)
+
+    duplicates = [g for g, c in claims.items() if c > 1]
+    missing = own - set(claims)
+    print(f"  {goals} goals, {workers} workers, batch {batch}: {elapsed:.2f}s")
+    print(f"  per worker: {dict(sorted(per_worker.items()))}")
+    print(f"  max claim latency: {max_claim_ms:.1f}ms")
+    print(f"  duplicates: {len(duplicates)}, missing: {len(missing)}")
+
+    assert not duplicates, f"{len(duplicates)} goals claimed more than once"
+    assert not missing, f"{len(missing)} goals never claimed"
+    print("✅ Every goal claimed exactly once")
+    return True
+
+
+# ============================================================================
+# SECTION 4: LEASE EXPIRY + REAPER
+# ============================================================================
+
+async def test_expired_lease_reclaimed() -> bool:
+    from infrastructure.goal_work_queue import GoalWorkQueue
+
+    goal_ids = await create_ready_goals(5)
+    own = set(goal_ids)
+    crashed = GoalWorkQueue(owner="contention-crashed", lease_seconds=1)
+    survivor = GoalWorkQueue(owner="contention-survivor", lease_seconds=60)
+
+    try:
+        taken = await claim_own(crashed, 5, own)
+        assert set(taken) == own, f"crashed worker got {len(taken)}/5"
+
+        # Lease still valid: survivor gets nothing
+        assert await claim_own(survivor, 5, own) == []
+        print("  live lease respected")
+
+        await asyncio.sleep(1.5)
+        reaped = await crashed.reap_expired()
+        assert reaped >= 5, f"reaped {reaped}"
+        print(f"  reaper cleared {reaped} expired leases")
+
+        # Survivor takes over; the crashed owner's late release is a no-op
+        reclaimed = await claim_own(survivor, 5, own)
+        assert set(reclaimed) == own, f"survivor reclaimed {len(reclaimed)}/5"
+        assert await crashed.release(goal_ids) == 0
+    finally:
+        await delete_goals(goal_ids)
+
+    print("✅ Expired leases reclaimed by another worker")
+    return True
+
+
+# ============================================================================
+# SECTION 5: PRIORITY ORDER
+# ============================================================================
+
+async def test_priority_order() -> bool:
+    from infrastructure.goal_work_queue import GoalWorkQueue
+
+    low = await create_ready_goals(3, priority=TEST_PRIORITY)
+    high = await create_ready_goals(3, priority=TEST_PRIORITY + 1)
+    queue = GoalWorkQueue(owner="contention-priority", lease_seconds=60)
+
+    try:
+        first = await claim_own(queue, 3, set(low) | set(high))
+        assert set(first) == set(high), "high priority goals must be claimed first"
+        await queue.release(first)
+    finally:
+        await delete_goals(low + high)
+
+    print("✅ Higher priority claimed first")
+    return True
+
+
+# ============================================================================
+# SECTION 6: MAIN RUNNER
+# ============================================================================
+
+async def main(args) -> int:
+    enable_writes()
+
+    print("=" * 60)
+    print("GOAL WORK QUEUE CONTENTION TESTS")
+    print("=" * 60)
+
+    tests = [
+        ("Multi-worker contention", lambda: test_each_goal_claimed_once(args.goals, args.workers, args.batch)),
+        ("Lease expiry + reaper", test_expired_lease_reclaimed),
+        ("Priority order", test_priority_order),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for name, test_fn in tests:
+        print(f"\n[Running] {name}")
+        try:
+            if await test_fn():
+                passed += 1
+            else:
+                failed += 1
+        except Exception as e:
+            print(f"❌ {name} FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Goal work queue contention test")
+    parser.add_argument("--goals", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=10)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -206,3 +206,189 @@ class TestOverallStatus:
         
         status = verifier.get_overall_status([])
         assert status == "failed"
+
+
+class TestStreamingFileChecks:
+    """Test streamed file checks (early stop, CSV reader)."""
+
+    def test_generic_file_stops_early(self):
+        """Large file passes min_length without a full read."""
+        from artifact_verifier import ArtifactVerifier, READ_CHUNK_CHARS
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "big.txt")
+            with open(path, "w") as f:
+                f.write("x" * (READ_CHUNK_CHARS * 4))
+
+            results = ArtifactVerifier(base_path=tmpdir)._verify_generic_file(path)
+            result_dict = {r.name: r for r in results}
+            assert result_dict["min_length"].passed == True
+            assert result_dict["min_length"].details == f"Content length: >= {READ_CHUNK_CHARS}"
+
+    def test_markdown_stripped_length(self):
+        """Whitespace padding must not count towards markdown content."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            verifier = ArtifactVerifier(base_path=tmpdir)
+            short = os.path.join(tmpdir, "short.md")
+            with open(short, "w") as f:
+                f.write(" " * 100 + "# Title" + "\n" * 100)
+            full = os.path.join(tmpdir, "full.md")
+            with open(full, "w") as f:
+                f.write("\n\n# Title\n\nSome real markdown content here\n")
+
+            short_results = {r.name: r for r in verifier._verify_generic_file(short)}
+            full_results = {r.name: r for r in verifier._verify_generic_file(full)}
+            assert short_results["markdown_not_empty"].passed == False
+            assert full_results["markdown_not_empty"].passed == True
+
+    def test_csv_row_count(self):
+        """CSV rows counted without pandas; blank lines skipped."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            with open(path, "w") as f:
+                f.write("a,b,c\n1,2,3\n\n4,5,6\n7,8\n")
+
+            results = {r.name: r for r in ArtifactVerifier(base_path=tmpdir)._verify_dataset_file(path)}
+            assert results["csv_readable"].details == "Rows: 3, Columns: 3"
+            assert results["dataset_not_empty"].passed == True
+
+    def test_csv_quoted_fields(self):
+        """Quoted commas/newlines must not change the row count."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            with open(path, "w") as f:
+                f.write('a,b\n"x, y",1\n"multi\nline",2\n')
+
+            results = {r.name: r for r in ArtifactVerifier(base_path=tmpdir)._verify_dataset_file(path)}
+            assert results["csv_readable"].details == "Rows: 2, Columns: 2"
+
+    def test_csv_header_only_is_empty(self):
+        """Header without rows must fail dataset_not_empty."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            with open(path, "w") as f:
+                f.write("a,b,c\n")
+
+            results = {r.name: r for r in ArtifactVerifier(base_path=tmpdir)._verify_dataset_file(path)}
+            assert results["dataset_not_empty"].passed == False
+
+    def test_csv_too_many_fields_invalid(self):
+        """Row wider than header must fail like pandas did."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            with open(path, "w") as f:
+                f.write("a,b\n1,2\n1,2,3\n")
+
+            results = {r.name: r for r in ArtifactVerifier(base_path=tmpdir)._verify_dataset_file(path)}
+            assert results["dataset_valid"].passed == False
+
+
+class TestVerificationCache:
+    """Test (path, size, mtime) result cache with content fingerprint fallback."""
+
+    def _artifact(self, path):
+        return {"type": "REPORT", "content_kind": "file", "content_location": path}
+
+    def test_repeat_verification_hits_cache(self):
+        """Unchanged file must be served from cache."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "report.md")
+            with open(path, "w") as f:
+                f.write("r" * 300)
+
+            verifier = ArtifactVerifier(base_path=tmpdir)
+            first = verifier.verify(self._artifact(path))
+            second = verifier.verify(self._artifact(path))
+            assert [r.to_dict() for r in first] == [r.to_dict() for r in second]
+            assert verifier.get_cache_stats()["hits"] == 1
+
+    def test_cache_hit_does_not_read_file(self, monkeypatch):
+        """Hit is decided by (path, size, mtime) - no fingerprint read."""
+        import artifact_verifier
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "report.md")
+            with open(path, "w") as f:
+                f.write("r" * 300)
+
+            verifier = ArtifactVerifier(base_path=tmpdir)
+            verifier.verify(self._artifact(path))
+
+            def no_read(*args):
+                raise AssertionError("fingerprint computed on a cache hit")
+            monkeypatch.setattr(artifact_verifier, "_fingerprint", no_read)
+
+            verifier.verify(self._artifact(path))
+            assert verifier.get_cache_stats()["hits"] == 1
+
+    def test_same_content_new_mtime_reuses_results(self):
+        """Touched file: stat miss, fingerprint hit."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "report.md")
+            with open(path, "w") as f:
+                f.write("r" * 300)
+            st = os.stat(path)
+
+            verifier = ArtifactVerifier(base_path=tmpdir)
+            verifier.verify(self._artifact(path))
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            verifier.verify(self._artifact(path))
+            assert verifier.get_cache_stats()["hits"] == 1
+
+    def test_content_change_invalidates(self):
+        """Rewrite with a new mtime must re-verify."""
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "report.md")
+            with open(path, "w") as f:
+                f.write("r" * 300)
+            st = os.stat(path)
+
+            verifier = ArtifactVerifier(base_path=tmpdir)
+            verifier.verify(self._artifact(path))
+
+            with open(path, "w") as f:
+                f.write("s" * 300)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+            verifier.verify(self._artifact(path))
+            assert verifier.get_cache_stats()["hits"] == 0
+            assert verifier.get_cache_stats()["misses"] == 2
+
+
+class TestVerifyMany:
+    """Test async batch verification."""
+
+    def test_verify_many_preserves_order(self):
+        """Results must come back in input order."""
+        import asyncio
+        from artifact_verifier import ArtifactVerifier
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            verifier = ArtifactVerifier(base_path=tmpdir, workers=4)
+            artifacts = []
+            for i in range(20):
+                path = os.path.join(tmpdir, f"report_{i}.md")
+                with open(path, "w") as f:
+                    f.write("r" * (150 if i % 2 else 300))
+                artifacts.append({"type": "REPORT", "content_kind": "file", "content_location": path})
+
+            batch = asyncio.run(verifier.verify_many(artifacts))
+            statuses = [verifier.get_overall_status(results) for results in batch]
+            assert statuses == ["passed" if i % 2 == 0 else "partial" for i in range(20)]
@@ -0,0 +1,172 @@
+"""
+CHANGE FEED TESTS
+
+Tests for the /ui/stream change feed hub (change_feed.ChangeFeedHub).
+Verifies sequencing, resume from Last-Event-ID and lag detection.
+"""
+import sys
+import os
+import asyncio
+import json
+
+# Add app directory to path
+app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
+
+
+def _payload(frame: str) -> dict:
+    data_line = [line for line in frame.split("\n") if line.startswith("data: ")][0]
+    return json.loads(data_line[len("data: "):])
+
+
+class TestRingBuffer:
+    """Test sequencing and resume."""
+
+    def test_append_assigns_increasing_seq(self):
+        from change_feed import ChangeFeedHub
+        hub = ChangeFeedHub(capacity=10)
+        assert hub.append('{"type": "A"}') == 1
+        assert hub.append('{"type": "B"}') == 2
+        assert hub.last_seq == 2
+
+    def test_read_since_returns_missed_frames(self):
+        from change_feed import ChangeFeedHub
+        hub = ChangeFeedHub(capacity=10)
+        for i in range(5):
+            hub.append(json.dumps({"type": "E", "i": i}))
+
+        frames, lagged = hub.read_since(2)
+        assert not lagged
+        assert [_payload(f)["i"] for f in frames] == [2, 3, 4]
+
+    def test_read_since_detects_lag(self):
+        """Overwritten events must be reported, not silently skipped."""
+        from change_feed import ChangeFeedHub
+        hub = ChangeFeedHub(capacity=3)
+        for i in range(10):
+            hub.append(json.dumps({"type": "E", "i": i}))
+
+        frames, lagged = hub.read_since(1)
+        assert lagged
+        assert [_payload(f)["i"] for f in frames] == [7, 8, 9]
+
+    def test_parse_event_id_same_epoch(self):
+        from change_feed import ChangeFeedHub
+        hub = ChangeFeedHub(capacity=10)
+        hub.append('{"type": "A"}')
+        hub.append('{"type": "B"}')
+        assert hub.parse_event_id(f"{hub.epoch}:1") == (1, False)
+
+    def test_parse_event_id_foreign_epoch_needs_resync(self):
+        from change_feed import ChangeFeedHub
+        hub = ChangeFeedHub(capacity=10)
+        hub.append('{"type": "A"}')
+        assert hub.parse_event_id("deadbeef:1") == (1, True)
+
+    def test_frame_carries_sse_id(self):
+        from change_feed import ChangeFeedHub
+        hub = ChangeFeedHub(capacity=10)
+        hub.append('{"type": "A"}')
+        frames, _ = hub.read_since(0)
+        assert frames[0].startswith(f"id: {hub.epoch}:1\n")
+
+
+class TestSubscribe:
+    """Test fan-out to subscribers."""
+
+    def test_all_subscribers_receive_event(self):
+        from change_feed import ChangeFeedHub
+
+        async def run():
+            hub = ChangeFeedHub(capacity=100)
+            received = []
+
+            async def consume():
+                async for frame in hub.subscribe(heartbeat_seconds=5):
+                    received.append(_payload(frame)["type"])
+                    return
+
+            tasks = [asyncio.create_task(consume()) for _ in range(20)]
+            await asyncio.sleep(0)
+            hub.append('{"type": "GOAL_STATUS_CHANGED"}')
+            await asyncio.wait_for(asyncio.gather(*tasks), timeout=2)
+            return received, hub.subscribers
+
+        received, subscribers = asyncio.run(run())
+        assert received == ["GOAL_STATUS_CHANGED"] * 20
+        assert subscribers == 0
+
+    def test_resume_replays_missed_events(self):
+        from change_feed import ChangeFeedHub
+
+        async def run():
+            hub = ChangeFeedHub(capacity=100)
+            for i in range(3):
+                hub.append(json.dumps({"type": "E", "i": i}))
+            got = []
+            async for frame in hub.subscribe(f"{hub.epoch}:1", heartbeat_seconds=5):
+                got.append(_payload(frame)["i"])
+                if len(got) == 2:
+                    break
+            return got
+
+        assert asyncio.run(run()) == [1, 2]
+
+    def test_unknown_epoch_starts_with_resync(self):
+        from change_feed import ChangeFeedHub, RESYNC
+
+        async def run():
+            hub = ChangeFeedHub(capacity=100)
+            async for frame in hub.subscribe("other:5", heartbeat_seconds=5):
+                return _payload(frame)["type"]
+
+        assert asyncio.run(run()) == RESYNC
+
+    def test_idle_stream_sends_heartbeat_comment(self):
+        from change_feed import ChangeFeedHub
+
+        async def run():
+            hub = ChangeFeedHub(capacity=100)
+            async for frame in hub.subscribe(heartbeat_seconds=0.01):
+                return frame
+
+        assert asyncio.run(run()).startswith(":")
+
+
+class TestWatchdog:
+    """Connection is opened by the watchdog, so a down database recovers"""
+
+    def test_start_retries_until_connected(self, monkeypatch):
+        import change_feed
+        from change_feed import ChangeFeedHub
+
+        monkeypatch.setattr(change_feed, "LISTENER_CHECK_SECONDS", 0.01)
+
+        class _Driver:
+            def is_closed(self):
+                return False
+
+        async def run():
+            hub = ChangeFeedHub(capacity=100)
+            attempts = []
+
+            async def listen():
+                attempts.append(1)
+                if len(attempts) < 3:
+                    raise OSError("database unavailable")
+                hub._driver = _Driver()
+
+            hub._listen = listen
+            await hub.start()
+            for _ in range(100):
+                if hub._driver is not None:
+                    break
+                await asyncio.sleep(0.01)
+            hub._watchdog.cancel()
+            return len(attempts), hub.read_since(0)
+
+        attempts, (frames, lagged) = asyncio.run(run())
+        assert attempts == 3
+        # First connect is not a reconnect: nothing was missed
+        assert frames == []
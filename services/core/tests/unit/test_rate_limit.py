@@ -0,0 +1,130 @@
+"""
+RATE LIMIT TESTS
+
+Tests for token bucket rate limiter (api.rate_limit).
+Verifies burst/refill semantics, policy precedence and idle eviction.
+"""
+import pytest
+import sys
+import os
+import asyncio
+
+# Add app directory to path
+app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
+
+pytest.importorskip("pydantic")
+
+
+class TestLocalBucketStore:
+    """Test in-process bucket table."""
+
+    def test_burst_then_reject(self):
+        """Bucket allows capacity requests, then rejects."""
+        from api.rate_limit import LocalBucketStore, RateLimitPolicy
+        store = LocalBucketStore()
+        policy = RateLimitPolicy(capacity=3, refill_rate=0.001)
+
+        results = [store.acquire("c1", policy).allowed for _ in range(4)]
+        assert results == [True, True, True, False]
+
+    def test_rejection_has_retry_after(self):
+        """Rejected decision reports when a token will be available."""
+        from api.rate_limit import LocalBucketStore, RateLimitPolicy
+        store = LocalBucketStore()
+        policy = RateLimitPolicy(capacity=1, refill_rate=1.0)
+
+        store.acquire("c1", policy)
+        decision = store.acquire("c1", policy)
+        assert decision.allowed is False
+        assert 0 < decision.retry_after <= 1.0
+
+    def test_clients_are_independent(self):
+        """Each client has its own bucket."""
+        from api.rate_limit import LocalBucketStore, RateLimitPolicy
+        store = LocalBucketStore()
+        policy = RateLimitPolicy(capacity=1, refill_rate=0.001)
+
+        assert store.acquire("c1", policy).allowed
+        assert store.acquire("c2", policy).allowed
+        assert not store.acquire("c1", policy).allowed
+
+    def test_max_clients_bounds_memory(self):
+        """Table never grows beyond max_clients."""
+        from api.rate_limit import LocalBucketStore, RateLimitPolicy
+        store = LocalBucketStore(max_clients=100)
+        policy = RateLimitPolicy(capacity=5, refill_rate=1.0)
+
+        for i in range(1000):
+            store.acquire(f"c{i}", policy)
+        assert len(store) == 100
+
+    def test_evict_idle_removes_refilled_buckets(self):
+        """Buckets idle longer than refill time are evicted."""
+        import time
+        from api.rate_limit import LocalBucketStore, RateLimitPolicy
+        store = LocalBucketStore()
+        policy = RateLimitPolicy(capacity=10, refill_rate=1.0)
+
+        store.acquire("old", policy)
+        store.acquire("new", policy)
+
+        evicted = store.evict_idle(now=time.monotonic() + policy.refill_seconds + 1)
+        assert evicted == 2
+        assert len(store) == 0
+
+    def test_evict_idle_keeps_active_buckets(self):
+        """Recently used buckets survive eviction."""
+        from api.rate_limit import LocalBucketStore, RateLimitPolicy
+        store = LocalBucketStore()
+        policy = RateLimitPolicy(capacity=10, refill_rate=1.0)
+
+        store.acquire("c1", policy)
+        assert store.evict_idle() == 0
+        assert len(store) == 1
+
+
+class TestRateLimiterPolicies:
+    """Test policy resolution."""
+
+    def _limiter(self):
+        from api.rate_limit import RateLimiter, RateLimitPolicy
+        return RateLimiter(
+            default_policy=RateLimitPolicy.per_minute(60),
+            route_policies={
+                "/goals": RateLimitPolicy.per_minute(30),
+                "/goals/create": RateLimitPolicy.per_minute(5),
+            },
+            api_key_policies={"vip": RateLimitPolicy.per_minute(600)},
+        )
+
+    def test_default_policy(self):
+        scope, policy = self._limiter().resolve("/artifacts", None)
+        assert scope == "default"
+        assert policy.capacity == 60
+
+    def test_longest_route_prefix_wins(self):
+        scope, policy = self._limiter().resolve("/goals/create", None)
+        assert scope == "route:/goals/create"
+        assert policy.capacity == 5
+
+    def test_api_key_policy_overrides_route(self):
+        scope, policy = self._limiter().resolve("/goals/create", "vip")
+        assert scope == "key:vip"
+        assert policy.capacity == 600
+
+    def test_route_scope_does_not_share_default_tokens(self):
+        """Exhausting a route limit leaves the default limit untouched."""
+        from api.rate_limit import RateLimiter, RateLimitPolicy
+        limiter = RateLimiter(
+            default_policy=RateLimitPolicy(capacity=1, refill_rate=0.001),
+            route_policies={"/goals": RateLimitPolicy(capacity=1, refill_rate=0.001)},
+        )
+
+        async def run():
+            assert (await limiter.acquire("/goals", "ip")).allowed
+            assert not (await limiter.acquire("/goals", "ip")).allowed
+            assert (await limiter.acquire("/other", "ip")).allowed
+
+        asyncio.run(run())
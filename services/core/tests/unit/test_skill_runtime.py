@@ -0,0 +1,120 @@
+"""
+SKILL RUNTIME TESTS
+
+Tests for skill dispatch off the event loop (skill_runtime.SkillRuntime).
+Verifies executor selection, timeouts and that the loop stays responsive.
+"""
+import pytest
+import sys
+import os
+import asyncio
+import time
+
+# Add app directory to path
+app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
+
+
+def _make_skill(delay: float = 0.0, mode: str = "thread", timeout=None):
+    from canonical_skills.base import Skill, SkillResult
+
+    class BlockingSkill(Skill):
+        id = "test.blocking"
+        version = "1.0"
+        description = "Sleeps synchronously"
+        capabilities = []
+        requirements = []
+        input_schema = {}
+        output_schema = {}
+        produces_artifacts = []
+        execution_mode = mode
+        timeout_seconds = timeout
+
+        def execute(self, input_data, context):
+            time.sleep(delay)
+            return self._success_result({"echo": input_data.get("text")}, [])
+
+        def verify(self, result: SkillResult) -> bool:
+            return result.success
+
+    return BlockingSkill()
+
+
+class TestSkillRuntime:
+    """Test execution modes and timeouts."""
+
+    def test_thread_mode_returns_result(self):
+        from skill_runtime import SkillRuntime
+        runtime = SkillRuntime(thread_workers=2)
+        result = asyncio.run(runtime.execute(_make_skill(), {"text": "hi"}, {}))
+        assert result.success
+        assert result.output == {"echo": "hi"}
+        assert runtime.executed == 1
+        runtime.shutdown()
+
+    def test_loop_not_blocked(self):
+        from skill_runtime import SkillRuntime
+        runtime = SkillRuntime(thread_workers=4)
+        skill = _make_skill(delay=0.2)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await asyncio.gather(*(runtime.execute(skill, {}, {}) for _ in range(4)))
+            task.cancel()
+            return ticks
+
+        started = time.perf_counter()
+        ticks = asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        # 4 x 0.2s in parallel threads, loop kept ticking meanwhile
+        assert elapsed < 0.6
+        assert ticks >= 10
+        runtime.shutdown()
+
+    def test_timeout_returns_failed_result(self):
+        from skill_runtime import SkillRuntime
+        runtime = SkillRuntime(thread_workers=1)
+        skill = _make_skill(delay=0.5, timeout=0.05)
+        result = asyncio.run(runtime.execute(skill, {}, {}))
+        assert not result.success
+        assert "timed out" in result.error
+        assert runtime.timeouts == 1
+        runtime.shutdown()
+
+    def test_exceptions_propagate(self):
+        from skill_runtime import SkillRuntime
+        runtime = SkillRuntime(thread_workers=1)
+        skill = _make_skill()
+        skill.execute = lambda inputs, context: 1 / 0
+        with pytest.raises(ZeroDivisionError):
+            asyncio.run(runtime.execute(skill, {}, {}))
+        assert runtime.errors == 1
+        runtime.shutdown()
+
+    def test_mode_resolution(self):
+        from skill_runtime import SkillRuntime
+        runtime = SkillRuntime(process_skills={"test.blocking"})
+        assert runtime.mode_for(_make_skill(mode="inline")) == "process"
+        assert SkillRuntime(process_skills=set()).mode_for(_make_skill(mode="inline")) == "inline"
+        assert SkillRuntime(process_skills=set()).mode_for(_make_skill(mode="bogus")) == "thread"
+
+    def test_verify_off_loop(self):
+        from skill_runtime import SkillRuntime
+        runtime = SkillRuntime(thread_workers=1)
+        skill = _make_skill()
+
+        async def run():
+            result = await runtime.execute(skill, {}, {})
+            return await runtime.verify(skill, result)
+
+        assert asyncio.run(run()) is True
+        runtime.shutdown()
@@ -6,6 +6,10 @@ TIER RELIABILITY AGGREGATION
 - MAE (mean abs error)
 - Direction Accuracy (% совпадений)
 - Bias (mean signed error)
+
+Метрики поддерживает EmotionalErrorStore онлайн (окно + скользящие суммы);
+update_reliability переносит в кэш только изменившиеся ключи,
+get_reliability - O(1).
 """
 
 from typing import Dict, Optional
@@ -48,31 +52,35 @@ class TierReliabilityTracker:
         self.reliability_cache: Dict[str, Dict[str, Dict]] = {}
         self.last_update: Dict[str, Dict[str, datetime]] = {}
 
+    TIERS = ("ML", "Clusters", "Rules")
+
     def update_reliability(self, error_store):
         """
         Обновляет агрегированную надежность из error_store.
 
+        Только ключи (action_type, tier), изменившиеся с прошлого вызова
+        (EmotionalErrorStore.take_changed) - O(1) на новую запись.
+
         Args:
             error_store: EmotionalErrorStore instance
         """
-        action_types = set()
-        for record in error_store.history:
-            action_types.add(record["action_type"])
-
-        # Для каждого (action_type, tier) обновляем метрики
-        for action_type in action_types:
-            if action_type not in self.reliability_cache:
-                self.reliability_cache[action_type] = {}
-
-            for tier in ["ML", "Clusters", "Rules"]:
-                metrics = error_store.get_metrics_for_key(
-                    action_type=action_type,
-                    tier=tier,
-                    limit=self.window_size
-                )
-
-                self.reliability_cache[action_type][tier] = metrics
-                self.last_update[action_type] = datetime.now(timezone.utc)
+        now = datetime.now(timezone.utc)
+
+        for action_type, tier in error_store.take_changed():
+            tiers = self.reliability_cache.get(action_type)
+            if tiers is None:
+                # Новый action_type: все tiers присутствуют в summary
+                tiers = self.reliability_cache[action_type] = {
+                    t: error_store.get_metrics_for_key(action_type, t, limit=self.window_size)
+                    for t in self.TIERS
+                }
+
+            tiers[tier] = error_store.get_metrics_for_key(
+                action_type=action_type,
+                tier=tier,
+                limit=self.window_size
+            )
+            self.last_update[action_type] = now
 
     def get_reliability(
         self,
@@ -0,0 +1,216 @@
+"""
+TIMELINE SERVICE - Unified event history for /timeline
+======================================================
+
+Builds the dashboard timeline from real recorded events instead of
+synthesizing "created"/"updated" from row timestamps:
+
+  goal_status_transitions  → goal   / transition
+  goals.created_at         → goal   / created
+  goals.execution_*_at     → goal   / execution_started | execution_completed
+  artifacts.created_at     → artifact / created
+
+All sources are merged server-side:
+
+  SELECT ... FROM (
+      (SELECT ... ORDER BY ts DESC LIMIT :limit)   -- each branch uses its index
+      UNION ALL ...
+  ) ORDER BY ts DESC, event_key DESC LIMIT :limit
+
+Pagination is a keyset cursor on (ts, event_key), so every page costs
+O(limit × branches) regardless of how deep the client pages.
+Only the columns needed for the timeline are projected.
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+MAX_PAGE_SIZE = 500
+
+NODE_TYPES = ("goal", "artifact")
+
+
+# (node_type, event_type, key_prefix, ts_column, key_column, from_sql, extra_where, projection)
+# key_column makes event_key unique: "<prefix>:<row id>"
+# projection: node_id, title, from_status, to_status, detail
+_BRANCHES: List[Tuple[str, str, str, str, str, str, str, str]] = [
+    (
+        "goal", "transition", "t", "t.created_at", "t.id",
+        "goal_status_transitions t JOIN goals g ON g.id = t.goal_id",
+        "",
+        "t.goal_id AS node_id, g.title AS title, t.from_status AS from_status, "
+        "t.to_status AS to_status, t.reason AS detail",
+    ),
+    (
+        "goal", "created", "c", "g.created_at", "g.id",
+        "goals g",
+        "",
+        "g.id AS node_id, g.title AS title, NULL AS from_status, "
+        "NULL AS to_status, g.goal_type AS detail",
+    ),
+    (
+        "goal", "execution_started", "s", "g.execution_started_at", "g.id",
+        "goals g",
+        "g.execution_started_at IS NOT NULL",
+        "g.id AS node_id, g.title AS title, NULL AS from_status, "
+        "NULL AS to_status, NULL AS detail",
+    ),
+    (
+        "goal", "execution_completed", "e", "g.execution_completed_at", "g.id",
+        "goals g",
+        "g.execution_completed_at IS NOT NULL",
+        "g.id AS node_id, g.title AS title, NULL AS from_status, "
+        "NULL AS to_status, NULL AS detail",
+    ),
+    (
+        "artifact", "created", "a", "a.created_at", "a.id",
+        "artifacts a",
+        "",
+        "a.id AS node_id, a.type AS title, NULL AS from_status, "
+        "a.verification_status AS to_status, a.goal_id::text AS detail",
+    ),
+]
+
+
+def encode_cursor(ts: datetime, event_key: str) -> str:
+    raw = f"{ts.isoformat()}|{event_key}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Raises ValueError on malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        ts, event_key = raw.split("|", 1)
+        return datetime.fromisoformat(ts), event_key
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class TimelineService:
+    """Keyset-paginated, server-side merged timeline."""
+
+    def build_query(
+        self,
+        node_type: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        has_cursor: bool = False,
+    ) -> str:
+        """
+        Build the UNION ALL statement for the selected branches.
+
+        Filters are pushed into every branch so each inner LIMIT stays
+        index-ordered.
+        """
+        if node_type is not None and node_type not in NODE_TYPES:
+            raise ValueError(f"Invalid node_type: {node_type}. Expected one of {NODE_TYPES}")
+
+        branches = []
+        for b_node_type, b_event_type, prefix, ts_col, key_col, from_sql, extra_where, projection in _BRANCHES:
+            if node_type and b_node_type != node_type:
+                continue
+            if event_types and b_event_type not in event_types:
+                continue
+
+            key_expr = f"'{prefix}:' || {key_col}::text"
+            where = [extra_where] if extra_where else []
+            if since is not None:
+                where.append(f"{ts_col} >= :since")
+            if until is not None:
+                where.append(f"{ts_col} < :until")
+            if has_cursor:
+                # Range part is index-friendly, tie-break only on equal ts
+                where.append(
+                    f"{ts_col} <= :cursor_ts AND ({ts_col} < :cursor_ts OR {key_expr} < :cursor_key)"
+                )
+            where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+            branches.append(
+                f"(SELECT {ts_col} AS ts, {key_expr} AS event_key, "
+                f"'{b_node_type}' AS node_type, '{b_event_type}' AS event_type, {projection} "
+                f"FROM {from_sql}{where_sql} "
+                f"ORDER BY {ts_col} DESC LIMIT :limit)"
+            )
+
+        if not branches:
+            return ""
+
+        return (
+            "SELECT ts, event_key, node_type, event_type, node_id, title, "
+            "from_status, to_status, detail FROM ("
+            + " UNION ALL ".join(branches)
+            + ") timeline ORDER BY ts DESC, event_key DESC LIMIT :limit"
+        )
+
+    async def get_page(
+        self,
+        session,
+        limit: int = 50,
+        node_type: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One timeline page, newest first.
+
+        Returns:
+            {"events": [...], "next_cursor": str | None}
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        params: Dict[str, Any] = {"limit": limit}
+        if since is not None:
+            params["since"] = since
+        if until is not None:
+            params["until"] = until
+        if cursor:
+            params["cursor_ts"], params["cursor_key"] = decode_cursor(cursor)
+
+        sql = self.build_query(node_type, event_types, since, until, has_cursor=bool(cursor))
+        if not sql:
+            return {"events": [], "next_cursor": None}
+
+        rows = (await session.execute(text(sql), params)).all()
+
+        events = [self._to_event(row) for row in rows]
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.ts, last.event_key)
+
+        return {"events": events, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _to_event(row) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"title": row.title}
+        if row.event_type == "transition":
+            data.update(from_status=row.from_status, to_status=row.to_status, reason=row.detail)
+        elif row.node_type == "artifact":
+            data = {"type": row.title, "status": row.to_status, "goal_id": row.detail}
+        elif row.event_type == "created":
+            data["goal_type"] = row.detail
+
+        return {
+            "timestamp": row.ts.isoformat() if row.ts else None,
+            "event_id": row.event_key,
+            "node_id": str(row.node_id),
+            "node_type": row.node_type,
+            "event_type": row.event_type,
+            "data": data,
+        }
+
+
+timeline_service = TimelineService()
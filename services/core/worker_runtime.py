@@ -0,0 +1,223 @@
+"""
+WORKER RUNTIME - Persistent event loop per Celery worker process
+=================================================================
+
+Celery tasks are synchronous entry points, but almost everything they call
+is async. Spinning up a fresh loop per task (asyncio.run) throws away the
+SQLAlchemy async pool and any httpx clients, because both are bound to the
+loop they were created on.
+
+This module creates ONE long-lived loop per worker process on
+``worker_process_init`` and initialises shared resources on it once:
+- async DB engine/pool (database.engine), reset after fork
+- shared httpx.AsyncClient (keep-alive connections)
+
+Tasks then use ``run_async(coro)`` which schedules the coroutine on that loop.
+
+Usage:
+    from worker_runtime import run_async, get_http_client
+
+    @celery_app.task
+    def my_task():
+        return run_async(do_work())
+
+Author: AI-OS Core Team
+Date: 2026-10-18
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+HTTP_TIMEOUT_SECONDS = float(os.getenv("WORKER_HTTP_TIMEOUT", "120"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("WORKER_HTTP_MAX_CONNECTIONS", "20"))
+DB_WARMUP_ON_INIT = os.getenv("WORKER_DB_WARMUP", "true").lower() == "true"
+
+
+class WorkerRuntime:
+    """
+    Owns the per-process event loop and the resources bound to it.
+
+    One instance per process (module-level ``worker_runtime``). Not thread-safe
+    for concurrent ``run`` calls from different threads - Celery prefork
+    workers execute one task at a time per process, which is the intended use.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_client = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.tasks_run = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Loop for this process, created lazily outside of a worker."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed() or self._pid != os.getpid():
+                self._create_loop()
+            return self._loop
+
+    def _create_loop(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._http_client = None
+        self._pid = os.getpid()
+        self.tasks_run = 0
+
+    def init_process(self) -> None:
+        """
+        Called once per worker process (after fork).
+
+        Creates the loop, resets inherited DB pool state and warms up
+        shared clients so the first task does not pay for it.
+        """
+        with self._lock:
+            self._create_loop()
+
+        self._reset_db_pool_after_fork()
+        self.loop.run_until_complete(self._warmup())
+
+        logger.info("worker_runtime_initialized", pid=self._pid)
+
+    def shutdown_process(self) -> None:
+        """Close shared clients, dispose the pool and close the loop."""
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        try:
+            self._loop.run_until_complete(self._aclose())
+        except Exception as e:
+            logger.warning("worker_runtime_shutdown_error", error=str(e))
+        finally:
+            self._loop.close()
+            self._loop = None
+
+        logger.info("worker_runtime_shutdown", pid=self._pid, tasks_run=self.tasks_run)
+
+    @staticmethod
+    def _reset_db_pool_after_fork() -> None:
+        """
+        Drop pooled connections inherited from the parent process.
+
+        close=False: the parent still owns those sockets, the child must only
+        forget them (SQLAlchemy guidance for multiprocessing).
+        """
+        try:
+            from database import engine
+            engine.sync_engine.dispose(close=False)
+        except Exception as e:
+            logger.warning("worker_db_pool_reset_failed", error=str(e))
+
+    async def _warmup(self) -> None:
+        self.get_http_client()
+
+        if not DB_WARMUP_ON_INIT:
+            return
+
+        try:
+            from sqlalchemy import text
+            from database import engine
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            # Worker must still start - the pool will connect on first use
+            logger.warning("worker_db_warmup_failed", error=str(e))
+
+    async def _aclose(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+        try:
+            from database import engine
+            await engine.dispose()
+        except Exception as e:
+            logger.warning("worker_db_dispose_failed", error=str(e))
+
+    # ------------------------------------------------------------------
+    # Shared resources
+    # ------------------------------------------------------------------
+
+    def get_http_client(self):
+        """
+        Shared httpx.AsyncClient bound to the worker loop.
+
+        Must be used only from coroutines running via ``run``.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            import httpx
+            self._http_client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                ),
+            )
+        return self._http_client
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """
+        Run a coroutine to completion on the worker loop.
+
+        If a loop is already running in this thread (eager tasks called from
+        the API process), the coroutine is executed in a helper thread with
+        its own loop - same behaviour as the old _run_async fallback.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+                return pool.submit(asyncio.run, coro).result()
+
+        self.tasks_run += 1
+        return self.loop.run_until_complete(coro)
+
+
+worker_runtime = WorkerRuntime()
+
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """Run coroutine on the persistent per-process loop."""
+    return worker_runtime.run(coro)
+
+
+def get_http_client():
+    """Shared httpx.AsyncClient of the current worker process."""
+    return worker_runtime.get_http_client()
+
+
+# =============================================================================
+# CELERY SIGNALS
+# =============================================================================
+
+try:
+    from celery.signals import worker_process_init, worker_process_shutdown
+
+    @worker_process_init.connect
+    def _on_worker_process_init(**kwargs):
+        worker_runtime.init_process()
+
+    @worker_process_shutdown.connect
+    def _on_worker_process_shutdown(**kwargs):
+        worker_runtime.shutdown_process()
+
+except ImportError:
+    # API process without celery installed - run_async still works lazily
+    pass
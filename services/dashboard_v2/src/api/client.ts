@@ -16,7 +16,7 @@ import {
   InspectorContext,
 } from '../types';
 
-const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
+export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
 export class AOSClient {
   private client: AxiosInstance;
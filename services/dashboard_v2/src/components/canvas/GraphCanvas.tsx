@@ -496,6 +496,10 @@ function GraphCanvasInner() {
     };
 
     loadGraph();
+
+    // Change feed lost continuity - reload the graph once
+    window.addEventListener('ai-os:resync', loadGraph);
+    return () => window.removeEventListener('ai-os:resync', loadGraph);
   }, [setLoading, setError]);
 
   // Handle node selection
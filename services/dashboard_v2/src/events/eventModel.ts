@@ -167,8 +167,30 @@ export interface SimulationResultEvent {
 export interface ExecutionProgressEvent {
   type: 'EXECUTION_PROGRESS';
   nodeId: NodeId;
-  progress: number; // 0..1
+  progress?: number; // 0..1
   phase?: 'planning' | 'execution' | 'verification';
+  eventType?: string; // backend ExecutionEventType (step_completed, goal_failed, ...)
+  result?: string;
+  message?: string;
+}
+
+/**
+ * Artifact registered for a goal (change feed)
+ */
+export interface ArtifactRegisteredEvent {
+  type: 'ARTIFACT_REGISTERED';
+  artifactId: string;
+  goalId: GoalId;
+  artifactType: string;
+  timestamp: string;
+}
+
+/**
+ * Change feed lost continuity - refetch state once
+ */
+export interface ResyncEvent {
+  type: 'RESYNC';
+  timestamp: string;
 }
 
 /**
@@ -194,6 +216,8 @@ export type SystemEvent =
   | ConflictDetectedEvent
   | SimulationResultEvent
   | ExecutionProgressEvent
+  | ArtifactRegisteredEvent
+  | ResyncEvent
   | SystemErrorEvent;
 
 // ============================================================================
@@ -216,7 +240,8 @@ export function isUIEvent(event: any): event is UIEvent {
 export function isSystemEvent(event: any): event is SystemEvent {
   return event && typeof event.type === 'string' &&
     ['GRAPH_UPDATED', 'GOAL_STATUS_CHANGED', 'CONFLICT_DETECTED',
-     'SIMULATION_RESULT', 'EXECUTION_PROGRESS', 'ERROR'].includes(event.type);
+     'SIMULATION_RESULT', 'EXECUTION_PROGRESS', 'ARTIFACT_REGISTERED', 'RESYNC',
+     'ERROR'].includes(event.type);
 }
 
 /**
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { FileText, Eye, CheckCircle, XCircle, Clock, Download, ChevronDown, ChevronUp } from 'lucide-react';
-import { apiClient } from '../api/client';
+import { apiClient, API_BASE_URL } from '../api/client';
 
 interface Artifact {
   id: string;
@@ -21,6 +21,8 @@ interface ArtifactContent {
   file_path: string;
   file_content?: string;
   file_size?: number;
+  truncated?: boolean;
+  download_url?: string;
   message?: string;
 }
 
@@ -30,6 +32,7 @@ export const Artifacts: React.FC = () => {
   const [error, setError] = useState<string | null>(null);
   const [selectedArtifact, setSelectedArtifact] = useState<Artifact | null>(null);
   const [artifactContent, setArtifactContent] = useState<string | null>(null);
+  const [contentTruncated, setContentTruncated] = useState(false);
   const [contentLoading, setContentLoading] = useState(false);
   const [contentError, setContentError] = useState<string | null>(null);
   const [filter, setFilter] = useState<'all' | 'passed' | 'failed' | 'pending'>('all');
@@ -69,12 +72,14 @@ export const Artifacts: React.FC = () => {
     setSelectedArtifact(artifact);
     setContentLoading(true);
     setContentError(null);
+    setContentTruncated(false);
 
     try {
       const response = await apiClient.get<ArtifactContent>(`/artifacts/${artifact.id}/content`);
 
       if (response && response.status === 'ok' && response.file_content) {
         setArtifactContent(response.file_content);
+        setContentTruncated(Boolean(response.truncated));
       } else {
         setContentError(response?.message || 'Failed to load content');
       }
@@ -292,6 +297,14 @@ export const Artifacts: React.FC = () => {
                     <pre className="bg-gray-900 text-gray-100 p-4 rounded-lg overflow-x-auto text-sm leading-relaxed">
                       {artifactContent}
                     </pre>
+                    {contentTruncated && (
+                      <a
+                        href={`${API_BASE_URL}/artifacts/${artifact.id}/download`}
+                        className="mt-2 inline-block text-xs text-blue-600 hover:underline"
+                      >
+                        Показано превью — скачать полностью
+                      </a>
+                    )}
                   </div>
                 ) : null}
               </div>
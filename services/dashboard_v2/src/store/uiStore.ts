@@ -6,6 +6,7 @@
  */
 
 import { create } from 'zustand';
+import { useGraphStore } from './graphStore';
 import {
   UIState,
   Mode,
@@ -128,11 +129,8 @@ export const useUIStore = create<UIStore>((set, get) => ({
         break;
 
       case 'GOAL_STATUS_CHANGED':
-        // Update focus if it's the selected goal
-        const state = get();
-        if (state.focus.nodeId === event.goalId) {
-          // Refetch node data
-        }
+        // Apply delta from change feed - no graph refetch needed
+        useGraphStore.getState().updateNode(event.goalId, { status: event.newStatus } as any);
         break;
 
       case 'CONFLICT_DETECTED':
@@ -148,6 +146,18 @@ export const useUIStore = create<UIStore>((set, get) => ({
 
       case 'EXECUTION_PROGRESS':
         // Update progress bar
+        if (event.progress !== undefined) {
+          useGraphStore.getState().updateNode(event.nodeId, { progress: event.progress } as any);
+        }
+        break;
+
+      case 'ARTIFACT_REGISTERED':
+        // Artifacts page loads on demand
+        break;
+
+      case 'RESYNC':
+        // Stream lost continuity (server restart / client too far behind)
+        window.dispatchEvent(new CustomEvent('ai-os:resync'));
         break;
 
       case 'ERROR':
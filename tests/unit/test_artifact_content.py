@@ -0,0 +1,154 @@
+"""
+ARTIFACT CONTENT TESTS
+
+Tests for artifact file serving (artifact_content).
+Verifies Range parsing, ETag handling, preview truncation and streaming.
+"""
+import pytest
+import sys
+import os
+import asyncio
+import gzip
+
+# Add app directory to path
+app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
+
+
+def _request(headers: dict):
+    from starlette.requests import Request
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class TestParseRange:
+    """Test Range header parsing."""
+
+    def test_no_header(self):
+        from artifact_content import parse_range
+        assert parse_range(None, 100) is None
+
+    def test_explicit_range(self):
+        from artifact_content import parse_range
+        assert parse_range("bytes=10-19", 100) == (10, 19)
+
+    def test_open_ended_and_suffix(self):
+        from artifact_content import parse_range
+        assert parse_range("bytes=90-", 100) == (90, 99)
+        assert parse_range("bytes=-10", 100) == (90, 99)
+        assert parse_range("bytes=50-500", 100) == (50, 99)
+
+    def test_multi_range_serves_full_body(self):
+        from artifact_content import parse_range
+        assert parse_range("bytes=0-1,5-6", 100) is None
+
+    def test_unsatisfiable(self):
+        from artifact_content import parse_range, RangeNotSatisfiable
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=100-", 100)
+
+
+class TestETag:
+    """Test If-None-Match comparison."""
+
+    def test_matches_plain_weak_and_gzip_variant(self):
+        from artifact_content import etag_matches
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"xyz", "abc-gzip"', '"abc"')
+        assert not etag_matches('"xyz"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+
+class TestPreview:
+    """Test bounded preview reads."""
+
+    def test_truncates_to_preview_size(self, tmp_path):
+        from artifact_content import read_preview
+        path = tmp_path / "report.md"
+        path.write_bytes(b"a" * 5000)
+        preview = asyncio.run(read_preview(str(path), 5000, preview_kb=1))
+        assert preview["truncated"] is True
+        assert preview["preview_bytes"] == 1024
+        assert preview["file_size"] == 5000
+
+    def test_cut_inside_multibyte_character(self, tmp_path):
+        from artifact_content import read_preview
+        path = tmp_path / "ru.md"
+        data = "ж".encode("utf-8") * 1000  # 2 bytes each, cut at 1024 is aligned
+        path.write_bytes(b"x" + data)       # shift by one byte -> cut inside a char
+        preview = asyncio.run(read_preview(str(path), len(data) + 1, preview_kb=1))
+        assert "�" not in preview["file_content"]
+
+
+class TestDownloadResponse:
+    """Test streaming response headers and bodies."""
+
+    def test_full_body_and_range(self, tmp_path):
+        from artifact_content import build_download_response
+        path = tmp_path / "data.bin"
+        content = os.urandom(600 * 1024)
+        path.write_bytes(content)
+        st = os.stat(path)
+
+        async def run():
+            full = await build_download_response(_request({}), str(path), st)
+            partial = await build_download_response(_request({"Range": "bytes=1000-1999"}), str(path), st)
+            return full, await _body(full), partial, await _body(partial)
+
+        full, full_body, partial, partial_body = asyncio.run(run())
+        assert full.status_code == 200
+        assert full_body == content
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == f"bytes 1000-1999/{len(content)}"
+        assert partial_body == content[1000:2000]
+
+    def test_if_none_match_returns_304(self, tmp_path):
+        from artifact_content import build_download_response
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"payload")
+        st = os.stat(path)
+
+        async def run():
+            first = await build_download_response(_request({}), str(path), st)
+            etag = first.headers["etag"]
+            return await build_download_response(_request({"If-None-Match": etag}), str(path), st)
+
+        assert asyncio.run(run()).status_code == 304
+
+    def test_gzip_for_text(self, tmp_path):
+        from artifact_content import build_download_response
+        path = tmp_path / "report.txt"
+        content = b"line of text\n" * 1000
+        path.write_bytes(content)
+        st = os.stat(path)
+
+        async def run():
+            response = await build_download_response(
+                _request({"Accept-Encoding": "gzip, deflate"}), str(path), st
+            )
+            return response, await _body(response)
+
+        response, body = asyncio.run(run())
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(body) == content
+
+    def test_unsatisfiable_range_returns_416(self, tmp_path):
+        from artifact_content import build_download_response
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"0123456789")
+        st = os.stat(path)
+        response = asyncio.run(
+            build_download_response(_request({"Range": "bytes=50-60"}), str(path), st)
+        )
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */10"
@@ -0,0 +1,257 @@
+"""
+STRUCTURED LLM TESTS
+
+Tests for the single-call structured completion client (structured_llm).
+Verifies JSON extraction, schema validation, re-ask on malformed output
+and response_format downgrade.
+"""
+import pytest
+import sys
+import os
+import json
+
+# Add app directory to path
+app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("pydantic")
+
+
+def make_client(answers, reject_formats=()):
+    """Client backed by an in-process transport replaying `answers`."""
+    from structured_llm import StructuredLLMClient
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        response_format = (body.get("response_format") or {}).get("type")
+        if response_format in reject_formats:
+            return httpx.Response(400, text=f"unsupported response_format: {response_format}")
+        content = answers[min(len(requests), len(answers)) - 1]
+        return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+    client = StructuredLLMClient(
+        base_url="http://stub/v1",
+        model="stub-model",
+        max_retries=2,
+        transport=httpx.MockTransport(handler),
+    )
+    return client, requests
+
+
+class TestExtractJson:
+    """Test tolerant JSON extraction."""
+
+    def test_fenced_and_prose(self):
+        from structured_llm import extract_json
+        assert extract_json('```json\n{"passed": true}\n```') == {"passed": True}
+        assert extract_json('Итог:\n{"passed": false} - готово') == {"passed": False}
+
+    def test_no_json(self):
+        from structured_llm import MalformedOutputError, extract_json
+        with pytest.raises(MalformedOutputError):
+            extract_json("не знаю")
+
+
+class TestStructuredLLMClient:
+    """Test single-call structured completions."""
+
+    @pytest.mark.asyncio
+    async def test_single_request_with_schema(self):
+        """Valid answer: exactly one request, json_schema response_format."""
+        from agents.schemas import BinaryEvaluation
+        client, requests = make_client(['{"passed": true, "confidence": 0.9}'])
+
+        result = await client.complete("Оцени цель", BinaryEvaluation)
+
+        assert result.passed is True
+        assert len(requests) == 1
+        assert requests[0]["response_format"]["type"] == "json_schema"
+        assert requests[0]["response_format"]["json_schema"]["name"] == "BinaryEvaluation"
+
+    @pytest.mark.asyncio
+    async def test_reask_on_malformed_then_schema_violation(self):
+        """Malformed JSON and out-of-range values are re-asked with the error."""
+        from agents.schemas import BinaryEvaluation
+        client, requests = make_client([
+            "passed: yes",
+            '{"passed": true, "confidence": 85}',
+            '{"passed": true, "confidence": 0.85}',
+        ])
+
+        result = await client.complete("Оцени цель", BinaryEvaluation)
+
+        assert result.confidence == 0.85
+        assert len(requests) == 3
+        # Retry carries the bad answer and the concrete validation error
+        last = requests[-1]["messages"]
+        assert last[-2] == {"role": "assistant", "content": '{"passed": true, "confidence": 85}'}
+        assert "confidence" in last[-1]["content"]
+        assert client.get_stats()["malformed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retries(self):
+        from agents.schemas import BinaryEvaluation
+        from structured_llm import StructuredLLMError
+        client, requests = make_client(["{}"])
+
+        with pytest.raises(StructuredLLMError):
+            await client.complete("Оцени цель", BinaryEvaluation)
+        assert len(requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_response_format_downgrade_is_remembered(self):
+        """Backend without json_schema support: downgrade once, keep it."""
+        from agents.schemas import BinaryEvaluation
+        client, requests = make_client(['{"passed": false}'], reject_formats=("json_schema",))
+
+        await client.complete("a", BinaryEvaluation)
+        await client.complete("b", BinaryEvaluation)
+
+        assert [(r.get("response_format") or {}).get("type") for r in requests] == [
+            "json_schema", "json_object", "json_object"
+        ]
+        assert client.get_stats()["response_format"] == "json_object"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_rejections_downgrade_once(self):
+        """Concurrent requests rejected for the same mode step down one level."""
+        import asyncio
+        from agents.schemas import BinaryEvaluation
+        from structured_llm import StructuredLLMClient
+        sent = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            response_format = (json.loads(request.content).get("response_format") or {}).get("type")
+            sent.append(response_format)
+            await asyncio.sleep(0)  # let the other requests go out first
+            if response_format == "json_schema":
+                return httpx.Response(400, text="unsupported response_format: json_schema")
+            return httpx.Response(200, json={"choices": [{"message": {"content": '{"passed": true}'}}]})
+
+        client = StructuredLLMClient(
+            base_url="http://stub/v1", model="stub-model", transport=httpx.MockTransport(handler)
+        )
+
+        await asyncio.gather(*(client.complete(str(i), BinaryEvaluation) for i in range(5)))
+
+        assert sent.count("json_schema") == 5
+        assert sent[5:] == ["json_object"] * 5
+        assert client.get_stats()["response_format"] == "json_object"
+
+    @pytest.mark.asyncio
+    async def test_complete_json_drops_missing_optionals(self, monkeypatch):
+        """Dict result keeps callers' .get(key, default) fallbacks working."""
+        import structured_llm
+        from agents.schemas import TrendEvaluation
+        client, _ = make_client(['{"trend": "degrading", "note": "extra kept"}'])
+        monkeypatch.setattr(structured_llm, "structured_llm", client)
+
+        result = await structured_llm.complete_json("Тренд?", TrendEvaluation)
+
+        assert result == {"trend": "degrading", "note": "extra kept"}
+        assert result.get("score", 0.5) == 0.5
+
+
+def make_batch_client(answer):
+    """Client whose stub model answers batch prompts via answer(ids, attempt)."""
+    from structured_llm import StructuredLLMClient
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        prompt = body["messages"][-1]["content"]
+        ids = [line.split("### id: ", 1)[1] for line in prompt.splitlines() if line.startswith("### id: ")]
+        content = json.dumps({"results": answer(ids, len(requests))})
+        return httpx.Response(200, json={
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+        })
+
+    client = StructuredLLMClient(
+        base_url="http://stub/v1",
+        model="stub-model",
+        max_retries=2,
+        transport=httpx.MockTransport(handler),
+    )
+    return client, requests
+
+
+class TestStructuredLLMBatch:
+    """Test packed multi-item completions."""
+
+    @pytest.mark.asyncio
+    async def test_batch_packs_items_into_one_call(self):
+        from agents.schemas import BinaryEvaluation
+        client, requests = make_batch_client(
+            lambda ids, _: [{"id": i, "passed": i.endswith("1")} for i in ids]
+        )
+        items = {f"goal-{n}": f"ЦЕЛЬ: {n}" for n in range(10)}
+
+        outcome = await client.complete_batch(items, BinaryEvaluation, "Оцени цели")
+
+        assert len(requests) == 1
+        assert outcome.errors == {}
+        assert outcome.results["goal-1"].passed is True
+        assert outcome.results["goal-2"].passed is False
+        assert requests[0]["response_format"]["json_schema"]["name"] == "BinaryEvaluationBatch"
+        assert client.get_stats()["prompt_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_context_budget(self, monkeypatch):
+        import structured_llm
+        from agents.schemas import BinaryEvaluation
+        monkeypatch.setattr(structured_llm, "STRUCTURED_LLM_CONTEXT_TOKENS", 1000)
+        monkeypatch.setattr(structured_llm, "STRUCTURED_LLM_ITEM_OUTPUT_TOKENS", 100)
+        client, requests = make_batch_client(lambda ids, _: [{"id": i, "passed": True} for i in ids])
+        items = {f"goal-{n}": "x" * 1200 for n in range(6)}  # ~400 tokens each
+
+        outcome = await client.complete_batch(items, BinaryEvaluation, "Оцени цели")
+
+        assert len(outcome.results) == 6
+        assert len(requests) == 3
+        assert all(prompt_ids <= 2 for prompt_ids in [
+            r["messages"][-1]["content"].count("### id: ") for r in requests
+        ])
+
+    @pytest.mark.asyncio
+    async def test_batch_partial_failure_resends_only_bad_items(self):
+        """Invalid / missing items are re-sent; valid ones are kept."""
+        from agents.schemas import ScalarEvaluation
+
+        def answer(ids, attempt):
+            if attempt == 1:
+                # goal-0 out of range, goal-2 missing
+                return [{"id": "goal-0", "score": 7}, {"id": "goal-1", "score": 0.5}]
+            return [{"id": i, "score": 0.9} for i in ids]
+
+        client, requests = make_batch_client(answer)
+        items = {f"goal-{n}": f"ЦЕЛЬ: {n}" for n in range(3)}
+
+        outcome = await client.complete_batch(items, ScalarEvaluation, "Оцени цели")
+
+        assert len(requests) == 2
+        assert requests[1]["messages"][-1]["content"].count("### id: ") == 2
+        assert outcome.results["goal-1"].score == 0.5
+        assert outcome.results["goal-0"].score == 0.9
+        assert outcome.errors == {}
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_items_that_never_validate(self):
+        from agents.schemas import ScalarEvaluation
+        client, requests = make_batch_client(
+            lambda ids, _: [{"id": i, "score": 0.4} for i in ids if i != "goal-1"]
+        )
+
+        outcome = await client.complete_batch(
+            {"goal-0": "a", "goal-1": "b"}, ScalarEvaluation, "Оцени цели"
+        )
+
+        assert set(outcome.results) == {"goal-0"}
+        assert outcome.errors == {"goal-1": "missing in batch answer"}
+        assert len(requests) == 3
+        assert outcome.requests == 3
@@ -0,0 +1,154 @@
+"""
+TIER RELIABILITY TESTS
+
+Tests for online (action_type, tier) error statistics in EmotionalErrorStore,
+TierReliabilityTracker incremental updates and the Redis snapshot round trip.
+"""
+import pytest
+import sys
+import os
+import random
+
+# Add app directory to path
+app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
+
+TIERS = ("ML", "Clusters", "Rules")
+
+
+def make_errors(rng):
+    errors = {}
+    for dim in ("arousal", "valence", "focus", "confidence"):
+        if rng.random() < 0.85:
+            signed = round(rng.uniform(-0.5, 0.5), 4)
+            errors[dim] = {"signed": signed, "abs": abs(signed), "direction_match": rng.random() < 0.7}
+    return errors
+
+
+def fill(store, count, seed=3, actions=("simple_task", "complex_execution")):
+    rng = random.Random(seed)
+    for _ in range(count):
+        store.record(
+            user_id="u1",
+            action_type=rng.choice(actions),
+            tier=rng.choice(TIERS),
+            confidence=rng.random(),
+            errors=make_errors(rng)
+        )
+
+
+def scan_metrics(store, action_type, tier, limit):
+    """Reference: aggregate the last `limit` records of the key from history."""
+    records = [r for r in store.history if r["action_type"] == action_type and r["tier"] == tier][-limit:]
+    dims = [e for r in records for e in r["errors"].values()]
+    n = len(dims)
+    return {
+        "direction_acc": round(sum(1 for e in dims if e["direction_match"]) / n, 4),
+        "mae": round(sum(e["abs"] for e in dims) / n, 4),
+        "bias": round(sum(e["signed"] for e in dims) / n, 4),
+        "sample_count": n,
+    }
+
+
+class FakeRedis:
+    """In-memory hash storage (hset / hgetall)."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class TestRollingErrorStats:
+    """Test online window statistics."""
+
+    def test_online_metrics_match_history_scan(self):
+        from emotional_error_store import EmotionalErrorStore
+        store = EmotionalErrorStore(max_history=5000)
+        fill(store, 3000)
+
+        for action_type in ("simple_task", "complex_execution"):
+            for tier in TIERS:
+                online = store.get_metrics_for_key(action_type, tier, limit=50)
+                assert online == scan_metrics(store, action_type, tier, limit=50)
+
+    def test_window_evicts_oldest(self):
+        from emotional_error_store import EmotionalErrorStore
+        store = EmotionalErrorStore(stats_window=3)
+        match = {"a": {"signed": 0.1, "abs": 0.1, "direction_match": True}}
+        miss = {"a": {"signed": -0.3, "abs": 0.3, "direction_match": False}}
+
+        for errors in (miss, miss, match, match, match):
+            store.record("u", "task", "ML", 0.5, errors)
+
+        metrics = store.get_metrics_for_key("task", "ML", limit=3)
+        assert metrics == {"direction_acc": 1.0, "mae": 0.1, "bias": 0.1, "sample_count": 3}
+
+    def test_history_is_bounded_without_reslicing(self):
+        from emotional_error_store import EmotionalErrorStore
+        store = EmotionalErrorStore(max_history=100)
+        fill(store, 250)
+
+        assert len(store.history) == 100
+        recent = store.get_recent(tier="ML", limit=5)
+        assert all(r["tier"] == "ML" for r in recent)
+        assert [r["timestamp"] for r in recent] == sorted((r["timestamp"] for r in recent), reverse=True)
+
+
+class TestTierReliabilityTracker:
+    """Test incremental reliability cache."""
+
+    def test_only_changed_keys_are_refreshed(self):
+        from emotional_error_store import EmotionalErrorStore
+        from tier_reliability import TierReliabilityTracker
+        store = EmotionalErrorStore()
+        tracker = TierReliabilityTracker()
+        fill(store, 200)
+        tracker.update_reliability(store)
+
+        assert set(tracker.reliability_cache) == {"simple_task", "complex_execution"}
+        assert store.take_changed() == set()
+
+        store.record("u", "research", "Rules", 0.6, {"a": {"signed": 0.2, "abs": 0.2, "direction_match": True}})
+        tracker.update_reliability(store)
+
+        assert set(tracker.reliability_cache["research"]) == set(TIERS)
+        assert tracker.get_reliability("research", "Rules")["sample_count"] == 1
+        assert tracker.get_reliability("research", "ML")["sample_count"] == 0
+
+    def test_calibrator_reads_tracker_when_metrics_omitted(self):
+        from confidence_calibrator import ConfidenceCalibrator
+        from tier_reliability import tier_reliability_tracker
+
+        # No data for this key → raw confidence is kept
+        assert ConfidenceCalibrator().adjust(0.8, "unseen_action", "ML") == 0.8
+        assert tier_reliability_tracker.get_reliability("unseen_action", "ML")["sample_count"] == 0
+
+
+class TestSnapshot:
+    """Test Redis snapshot round trip."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_restores_windows(self):
+        from emotional_error_store import EmotionalErrorStore
+        from tier_reliability import TierReliabilityTracker
+        redis = FakeRedis()
+        store = EmotionalErrorStore(redis_client=redis)
+        fill(store, 400)
+
+        assert await store.save_snapshot() == 6
+        assert await store.save_snapshot() == 0  # nothing changed since
+
+        restarted = EmotionalErrorStore(redis_client=redis)
+        assert await restarted.load_snapshot() == 6
+        tracker = TierReliabilityTracker()
+        tracker.update_reliability(restarted)
+
+        for action_type in ("simple_task", "complex_execution"):
+            for tier in TIERS:
+                assert tracker.get_reliability(action_type, tier) == store.get_metrics_for_key(action_type, tier)
@@ -0,0 +1,78 @@
+"""
+TIMELINE SERVICE TESTS
+
+Tests for /timeline query building (timeline_service.TimelineService).
+Verifies branch selection, keyset cursor and filters pushed into branches.
+"""
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add app directory to path
+app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
+
+
+class TestBuildQuery:
+    """Test UNION ALL construction."""
+
+    def test_all_sources_merged(self):
+        from timeline_service import TimelineService
+        sql = TimelineService().build_query()
+        assert sql.count("UNION ALL") == 4
+        assert "FROM goal_status_transitions t" in sql
+        assert "FROM artifacts a" in sql
+        assert sql.endswith("ORDER BY ts DESC, event_key DESC LIMIT :limit")
+
+    def test_each_branch_is_limited(self):
+        from timeline_service import TimelineService
+        sql = TimelineService().build_query()
+        # 5 branch limits + outer limit
+        assert sql.count("LIMIT :limit") == 6
+
+    def test_node_type_filter(self):
+        from timeline_service import TimelineService
+        sql = TimelineService().build_query(node_type="artifact")
+        assert "UNION ALL" not in sql
+        assert "goal_status_transitions" not in sql
+
+    def test_event_type_filter(self):
+        from timeline_service import TimelineService
+        sql = TimelineService().build_query(event_types=["transition"])
+        assert "'transition' AS event_type" in sql
+        assert "'created' AS event_type" not in sql
+
+    def test_invalid_node_type(self):
+        from timeline_service import TimelineService
+        with pytest.raises(ValueError):
+            TimelineService().build_query(node_type="skill")
+
+    def test_no_matching_branches(self):
+        from timeline_service import TimelineService
+        assert TimelineService().build_query(node_type="artifact", event_types=["transition"]) == ""
+
+    def test_cursor_and_range_pushed_into_branches(self):
+        from timeline_service import TimelineService
+        sql = TimelineService().build_query(
+            since=datetime(2026, 1, 1, tzinfo=timezone.utc), has_cursor=True
+        )
+        assert sql.count(":cursor_ts") == 10
+        assert sql.count(":since") == 5
+        assert "'t:' || t.id::text < :cursor_key" in sql
+
+
+class TestCursor:
+    """Test keyset cursor encoding."""
+
+    def test_round_trip(self):
+        from timeline_service import encode_cursor, decode_cursor
+        ts = datetime(2026, 10, 18, 12, 30, tzinfo=timezone.utc)
+        cursor = encode_cursor(ts, "t:0b4f")
+        assert decode_cursor(cursor) == (ts, "t:0b4f")
+
+    def test_invalid_cursor(self):
+        from timeline_service import decode_cursor
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")